@@ -1,3 +1,6 @@
+from .routes.admin import router as admin_router
 from .routes.inventory import router as inventory_router
+from .routes.jobs import router as jobs_router
+from .routes.metrics import router as metrics_router
 
-__all__ = ("inventory_router",)
+__all__ = ("admin_router", "inventory_router", "jobs_router", "metrics_router")
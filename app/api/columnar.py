@@ -0,0 +1,203 @@
+from __future__ import annotations
+
+import struct
+import sys
+from array import array
+from collections.abc import Sequence
+from typing import Any
+
+from fastapi import HTTPException, status
+from fastapi.exceptions import RequestValidationError
+from pydantic import ValidationError
+
+from app.api.schemas.inventory import ColumnarSyncInventoryRequest, SyncSettingsIn
+from app.domain.inventory import InventorySnapshot, InventorySnapshotBuilder
+
+try:
+    import msgpack
+except ImportError:  # pragma: no cover - exercised only without msgpack
+    msgpack = None
+
+HAS_MSGPACK = msgpack is not None
+
+JSON_MEDIA_TYPE = "application/json"
+MSGPACK_MEDIA_TYPES = ("application/msgpack", "application/x-msgpack")
+COLUMNS_MEDIA_TYPE = "application/x-inventory-columns"
+
+# Length-prefixed binary layout, all integers little-endian:
+#
+#   b"INVC"  u32 n  settings JSON (n bytes)
+#   u32 rows  quantities (rows x i64)
+#   u32 n  condition_ids (n bytes of UTF-8, NUL-separated)
+COLUMNS_MAGIC = b"INVC"
+_U32 = struct.Struct("<I")
+_ID_SEPARATOR = "\0"
+
+
+def _body_error(msg: str, *loc: str | int) -> RequestValidationError:
+    return RequestValidationError(
+        [{"loc": ("body", *loc), "msg": msg, "type": "value_error"}]
+    )
+
+
+def _build_snapshot(
+    condition_ids: Sequence[str],
+    quantities: Sequence[int],
+) -> InventorySnapshot:
+    builder = InventorySnapshotBuilder()
+    try:
+        builder.add_columns(condition_ids, quantities)
+    except ValueError as e:
+        raise _body_error(str(e)) from None
+    return builder.build()
+
+
+def _from_request(
+    request: ColumnarSyncInventoryRequest,
+) -> tuple[SyncSettingsIn, InventorySnapshot]:
+    inventory = _build_snapshot(request.condition_ids, request.quantities)
+    # the columns are in the snapshot now and need not be kept alive
+    request.condition_ids, request.quantities = [], []
+    return request, inventory
+
+
+def decode_columnar_json(body: bytes) -> tuple[SyncSettingsIn, InventorySnapshot]:
+    """
+    Decodes sync settings with parallel `condition_ids` and `quantities`.
+
+    pydantic validates the two lists natively, without a model per row.
+    """
+
+    try:
+        request = ColumnarSyncInventoryRequest.model_validate_json(body)
+    except ValidationError as e:
+        raise RequestValidationError(e.errors()) from None
+    return _from_request(request)
+
+
+def decode_columnar_msgpack(body: bytes) -> tuple[SyncSettingsIn, InventorySnapshot]:
+    """Same as `decode_columnar_json`, for a msgpack-encoded map."""
+
+    if msgpack is None:
+        raise HTTPException(
+            status_code=status.HTTP_415_UNSUPPORTED_MEDIA_TYPE,
+            detail="msgpack is not installed on this server",
+        )
+
+    try:
+        payload: Any = msgpack.unpackb(body)
+    except ValueError as e:
+        raise _body_error(f"invalid msgpack: {e}") from None
+
+    try:
+        request = ColumnarSyncInventoryRequest.model_validate(payload)
+    except ValidationError as e:
+        raise RequestValidationError(e.errors()) from None
+    return _from_request(request)
+
+
+def encode_columns(
+    settings: SyncSettingsIn,
+    condition_ids: Sequence[str],
+    quantities: Sequence[int],
+) -> bytes:
+    """Encodes an upload in the length-prefixed binary layout."""
+
+    if len(condition_ids) != len(quantities):
+        raise ValueError("condition_ids and quantities must be equal length")
+
+    settings_raw = settings.model_dump_json(
+        include=set(SyncSettingsIn.model_fields)
+    ).encode()
+    qty_column = array("q", quantities)
+    if sys.byteorder == "big":
+        qty_column.byteswap()
+    ids_raw = _ID_SEPARATOR.join(condition_ids).encode()
+
+    return b"".join(
+        [
+            COLUMNS_MAGIC,
+            _U32.pack(len(settings_raw)),
+            settings_raw,
+            _U32.pack(len(qty_column)),
+            qty_column.tobytes(),
+            _U32.pack(len(ids_raw)),
+            ids_raw,
+        ]
+    )
+
+
+def decode_columns(body: bytes) -> tuple[SyncSettingsIn, InventorySnapshot]:
+    """
+    Decodes the length-prefixed binary layout.
+
+    Quantities are copied into an array in one go and condition_ids are
+    split out of one decoded string, so no per-row parsing happens in
+    Python before the snapshot is built.
+    """
+
+    view = memoryview(body)
+    if view[:4] != COLUMNS_MAGIC:
+        raise _body_error("body must start with b'INVC'")
+
+    try:
+        offset = len(COLUMNS_MAGIC)
+        (size,) = _U32.unpack_from(view, offset)
+        offset += _U32.size
+        settings_raw = view[offset : offset + size]
+        offset += size
+
+        (rows,) = _U32.unpack_from(view, offset)
+        offset += _U32.size
+        quantities = array("q")
+        quantities.frombytes(view[offset : offset + rows * quantities.itemsize])
+        offset += rows * quantities.itemsize
+
+        (size,) = _U32.unpack_from(view, offset)
+        offset += _U32.size
+        ids_raw = view[offset : offset + size]
+        offset += size
+    except (struct.error, ValueError):
+        raise _body_error("body is truncated") from None
+
+    if len(quantities) != rows or len(ids_raw) != size or offset != len(view):
+        raise _body_error("section lengths do not match the body")
+
+    if sys.byteorder == "big":
+        quantities.byteswap()
+
+    try:
+        settings = SyncSettingsIn.model_validate_json(bytes(settings_raw))
+    except ValidationError as e:
+        raise RequestValidationError(e.errors()) from None
+
+    try:
+        condition_ids = str(ids_raw, "utf-8").split(_ID_SEPARATOR) if rows else []
+    except UnicodeDecodeError as e:
+        raise _body_error(f"condition_ids are not UTF-8: {e}") from None
+
+    if len(condition_ids) != rows:
+        raise _body_error(f"expected {rows} condition_ids, got {len(condition_ids)}")
+
+    return settings, _build_snapshot(condition_ids, quantities)
+
+
+def decode_columnar(
+    content_type: str,
+    body: bytes,
+) -> tuple[SyncSettingsIn, InventorySnapshot]:
+    """Decodes a columnar upload in the format its Content-Type names."""
+
+    media_type = content_type.split(";")[0].strip().lower()
+    if media_type == JSON_MEDIA_TYPE:
+        return decode_columnar_json(body)
+    if media_type in MSGPACK_MEDIA_TYPES:
+        return decode_columnar_msgpack(body)
+    if media_type == COLUMNS_MEDIA_TYPE:
+        return decode_columns(body)
+
+    supported = ", ".join([JSON_MEDIA_TYPE, *MSGPACK_MEDIA_TYPES, COLUMNS_MEDIA_TYPE])
+    raise HTTPException(
+        status_code=status.HTTP_415_UNSUPPORTED_MEDIA_TYPE,
+        detail=f"Content-Type must be one of {supported}",
+    )
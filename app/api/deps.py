@@ -1,16 +1,37 @@
+import time
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+from dataclasses import replace
+from typing import Any
+
 from fastapi import Request
+from starlette.datastructures import State
 
-from app.api.schemas.inventory import SyncInventoryRequest
+from app.api.schemas.inventory import SyncSettingsIn, SyncTargetIn
+from app.api.schemas.schedules import SyncScheduleIn, SyncSchedulesIn
+from app.application.ports.jobs import SyncJob
+from app.application.ports.marketplaces import MarketplacePortFactory
+from app.application.ports.metrics import SyncMetrics, SyncPhase
+from app.application.ports.warehouse import WarehouseInventoryPort
+from app.application.service.coalescing import SyncCoalescer
+from app.application.service.delta_sync import (
+    DeltaSyncService,
+    InventoryBaselineStore,
+)
+from app.application.service.fan_out import FanOutSyncService
+from app.application.service.listings_cache import CachingMarketplacePortFactory
+from app.application.service.scheduler import SyncSchedule
 from app.application.service.sync_inventory import SyncInventoryService
-from app.domain.marketplace import MarketplaceConfig, MarketplacePolicy
+from app.application.service.sync_jobs import SyncJobRunner
+from app.application.service.tracing import Tracer, span
+from app.domain.inventory import InventorySnapshot, InventorySnapshotBuilder
+from app.domain.marketplace import MarketplaceConfig, MarketplacePolicy, SyncResult
 
 
-def build_sync_service(
-    request: Request,
-    marketplace: str,
-    body: SyncInventoryRequest,
-) -> SyncInventoryService:
-    cfg = MarketplaceConfig(
+def build_marketplace_config(
+    marketplace: str, body: SyncSettingsIn
+) -> MarketplaceConfig:
+    return MarketplaceConfig(
         marketplace=marketplace.lower().strip(),
         account=body.account,
         refresh_token=body.refresh_token,
@@ -23,12 +44,248 @@ def build_sync_service(
         limit_qty_for_marketplace=body.limit_qty_for_marketplace,
     )
 
-    policy = MarketplacePolicy(config=cfg)
 
-    factory = request.app.state.marketplace_factory
+def build_marketplace_factory(
+    request: Request,
+    body: SyncSettingsIn,
+) -> MarketplacePortFactory:
+    return _marketplace_factory(request.app.state, body)
+
+
+def _marketplace_factory(state: State, body: SyncSettingsIn) -> MarketplacePortFactory:
+    factory = state.marketplace_factory
+
+    listings_cache = getattr(state, "listings_cache", None)
+    if listings_cache is not None:
+        factory = CachingMarketplacePortFactory(
+            inner=factory,
+            cache=listings_cache,
+            bypass=body.refresh_listings,
+        )
 
-    return SyncInventoryService(
-        policy=policy,
+    return factory
+
+
+def build_sync_service(
+    request: Request,
+    marketplace: str,
+    body: SyncSettingsIn,
+) -> SyncInventoryService:
+    return _sync_service(request.app.state, marketplace, body)
+
+
+def _sync_service(
+    state: State,
+    marketplace: str,
+    body: SyncSettingsIn,
+) -> SyncInventoryService:
+    with span("build_sync_service", marketplace=marketplace):
+        cfg = build_marketplace_config(marketplace, body)
+
+        policy = MarketplacePolicy(config=cfg)
+
+        factory = _marketplace_factory(state, body)
+
+        service = SyncInventoryService(
+            policy=policy,
+            config=cfg,
+            marketplace_factory=factory,
+            metrics=getattr(state, "metrics", None),
+        )
+
+        app_config = getattr(state, "config", None)
+        if app_config is None:
+            return service
+        return replace(
+            service,
+            update_batch_size=app_config.sync_update_batch_sizes.get(
+                cfg.marketplace, service.update_batch_size
+            ),
+            pipeline_pages=app_config.sync_pipeline_pages,
+            pipeline_batches=app_config.sync_pipeline_batches,
+        )
+
+
+def build_delta_sync_service(
+    request: Request,
+    marketplace: str,
+    body: SyncSettingsIn,
+) -> DeltaSyncService:
+    cfg = build_marketplace_config(marketplace, body)
+
+    return DeltaSyncService(
+        policy=MarketplacePolicy(config=cfg),
         config=cfg,
-        marketplace_factory=factory,
+        marketplace_factory=build_marketplace_factory(request, body),
+        baselines=request.app.state.inventory_baselines,
+    )
+
+
+def build_fan_out_service(
+    request: Request,
+    targets: list[SyncTargetIn],
+) -> FanOutSyncService:
+    state = request.app.state
+
+    async def run_target(
+        service: SyncInventoryService, inventory: InventorySnapshot
+    ) -> SyncResult:
+        cfg = service.config
+        return await run_full_sync_coalesced(
+            state, cfg.marketplace, cfg.account, service, inventory
+        )
+
+    return FanOutSyncService(
+        targets=[_sync_service(state, t.marketplace, t) for t in targets],
+        max_concurrency=state.config.fan_out_max_concurrency,
+        marketplace_concurrency=state.config.fan_out_marketplace_concurrency,
+        runner=run_target,
+    )
+
+
+def observe_snapshot_build(
+    state: State,
+    marketplace: str,
+    started: float,
+    inventory: InventorySnapshot,
+) -> None:
+    """Records building `inventory`, begun at perf_counter() `started`."""
+
+    metrics: SyncMetrics | None = getattr(state, "metrics", None)
+    if metrics is not None:
+        metrics.observe_phase(
+            marketplace.lower().strip(),
+            SyncPhase.SNAPSHOT_BUILD,
+            time.perf_counter() - started,
+            len(inventory),
+        )
+
+
+@asynccontextmanager
+async def full_sync_of(
+    state: State, marketplace: str, account: str
+) -> AsyncIterator[None]:
+    """
+    Wraps a full sync of the account: its delta syncs wait until the full
+    sync is done, then re-read the listings it changed.
+    """
+
+    baselines: InventoryBaselineStore | None = getattr(
+        state, "inventory_baselines", None
+    )
+    if baselines is None:
+        yield
+        return
+
+    key = (marketplace.lower().strip(), account)
+    async with baselines.get(key).lock:
+        try:
+            yield
+        finally:
+            baselines.invalidate_index(key)
+
+
+async def run_full_sync_coalesced(
+    state: State,
+    marketplace: str,
+    account: str,
+    service: SyncInventoryService,
+    inventory: InventorySnapshot | WarehouseInventoryPort,
+) -> SyncResult:
+    """
+    Runs a full sync through the app's SyncCoalescer, when there is one.
+
+    An inventory port is only read once the run starts. Delta syncs of the
+    account are held off while it runs, see `full_sync_of`.
+    """
+
+    async def sync() -> SyncResult:
+        async with full_sync_of(state, marketplace, account):
+            if isinstance(inventory, InventorySnapshot):
+                return await service.run(inventory)
+            return await service.run_from(inventory)
+
+    coalescer: SyncCoalescer | None = getattr(state, "sync_coalescer", None)
+    if coalescer is None:
+        return await sync()
+    return await coalescer.run((marketplace.lower().strip(), account), sync)
+
+
+def sync_job_payload(
+    settings: SyncSettingsIn,
+    inventory: InventorySnapshot,
+) -> dict[str, Any]:
+    return {
+        # `settings` may be a request subclass that also carries inventory
+        "settings": settings.model_dump(include=set(SyncSettingsIn.model_fields)),
+        "inventory": dict(inventory.quantities()),
+    }
+
+
+def build_sync_job_runner(state: State) -> SyncJobRunner:
+    """Runs queued full syncs the same way the sync route does inline."""
+
+    async def run(job: SyncJob) -> SyncResult:
+        tracer: Tracer | None = getattr(state, "tracer", None)
+        if tracer is None:
+            return await run_job(job)
+
+        with tracer.trace("sync_job", job_id=job.id, marketplace=job.marketplace):
+            return await run_job(job)
+
+    async def run_job(job: SyncJob) -> SyncResult:
+        settings = SyncSettingsIn.model_validate(job.payload["settings"])
+
+        started = time.perf_counter()
+        builder = InventorySnapshotBuilder()
+        builder.add_many(job.payload["inventory"].items())
+        inventory = builder.build()
+        observe_snapshot_build(state, job.marketplace, started, inventory)
+
+        service = _sync_service(state, job.marketplace, settings)
+        return await run_full_sync_coalesced(
+            state, job.marketplace, settings.account, service, inventory
+        )
+
+    return run
+
+
+def read_sync_schedules(path: str) -> list[SyncScheduleIn]:
+    """Reads the `{"schedules": [...]}` JSON file at `path`."""
+
+    with open(path, "rb") as f:
+        return SyncSchedulesIn.model_validate_json(f.read()).schedules
+
+
+def build_scheduled_sync(
+    state: State,
+    entry: SyncScheduleIn,
+    warehouse: WarehouseInventoryPort,
+) -> SyncSchedule:
+    """Runs scheduled full syncs the same way the sync route does inline."""
+
+    marketplace = entry.marketplace.lower().strip()
+
+    async def sync() -> SyncResult:
+        tracer: Tracer | None = getattr(state, "tracer", None)
+        if tracer is None:
+            return await run_sync()
+
+        with tracer.trace(
+            "scheduled_sync", marketplace=marketplace, account=entry.account
+        ):
+            return await run_sync()
+
+    async def run_sync() -> SyncResult:
+        service = _sync_service(state, marketplace, entry)
+        return await run_full_sync_coalesced(
+            state, marketplace, entry.account, service, warehouse
+        )
+
+    return SyncSchedule(
+        marketplace=marketplace,
+        account=entry.account,
+        interval_s=entry.interval_s,
+        sync=sync,
+        priority=entry.priority,
     )
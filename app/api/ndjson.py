@@ -0,0 +1,185 @@
+from __future__ import annotations
+
+import asyncio
+import json
+from collections.abc import AsyncIterable, AsyncIterator, Awaitable, Callable, Sequence
+from contextlib import suppress
+from typing import Any
+
+from fastapi.exceptions import RequestValidationError
+from pydantic import ValidationError
+
+from app.api.schemas.inventory import SyncSettingsIn, SyncSummaryOut
+from app.application.service.sync_inventory import UpdateBatchListener
+from app.domain.inventory import InventorySnapshot, InventorySnapshotBuilder
+from app.domain.marketplace import (
+    ListingQuantityUpdate,
+    ListingUpdateFailure,
+    SyncResult,
+)
+
+NDJSON_MEDIA_TYPE = "application/x-ndjson"
+
+
+async def iter_lines(
+    chunks: AsyncIterable[bytes],
+) -> AsyncIterator[tuple[int, bytes]]:
+    """
+    Splits a byte stream into (line_no, line) pairs as chunks arrive.
+
+    Line numbers start at 1; blank lines are skipped but still counted.
+    """
+
+    line_no = 0
+    tail = b""
+    async for chunk in chunks:
+        if not chunk:
+            continue
+
+        lines = (tail + chunk).split(b"\n")
+        tail = lines.pop()
+        for line in lines:
+            line_no += 1
+            if line.strip():
+                yield line_no, line
+
+    if tail.strip():
+        yield line_no + 1, tail
+
+
+def _row_error(line_no: int, msg: str) -> RequestValidationError:
+    return RequestValidationError(
+        [{"loc": ("body", line_no), "msg": msg, "type": "value_error"}]
+    )
+
+
+def parse_inventory_row(line_no: int, line: bytes) -> tuple[str, int]:
+    """Parses one `{"condition_id": ..., "quantity": ...}` line."""
+
+    try:
+        row: Any = json.loads(line)
+    except ValueError as e:
+        raise _row_error(line_no, f"invalid JSON: {e}") from None
+
+    if not isinstance(row, dict):
+        raise _row_error(line_no, "row must be a JSON object")
+
+    condition_id = row.get("condition_id")
+    quantity = row.get("quantity")
+    if not isinstance(condition_id, str):
+        raise _row_error(line_no, "condition_id must be a string")
+    if not isinstance(quantity, int) or isinstance(quantity, bool):
+        raise _row_error(line_no, "quantity must be an integer")
+
+    return condition_id, quantity
+
+
+async def read_sync_stream(
+    chunks: AsyncIterable[bytes],
+) -> tuple[SyncSettingsIn, InventorySnapshot]:
+    """
+    Reads an NDJSON sync upload: a settings object on the first line, then
+    one inventory row per line.
+
+    Rows go straight into the snapshot builder while the body is still
+    arriving, so the upload is never held as a whole. As with the JSON
+    endpoint, quantities of a repeated condition_id are summed.
+    """
+
+    settings: SyncSettingsIn | None = None
+    builder = InventorySnapshotBuilder()
+
+    async for line_no, line in iter_lines(chunks):
+        if settings is None:
+            try:
+                settings = SyncSettingsIn.model_validate_json(line)
+            except ValidationError as e:
+                raise RequestValidationError(e.errors()) from None
+            continue
+
+        condition_id, quantity = parse_inventory_row(line_no, line)
+        try:
+            builder.add(condition_id, quantity)
+        except ValueError as e:
+            raise _row_error(line_no, str(e)) from None
+
+    if settings is None:
+        raise _row_error(1, "first line must hold the sync settings")
+
+    return settings, builder.build()
+
+
+def encode_update_batch(
+    updates: Sequence[ListingQuantityUpdate],
+    failures: Sequence[ListingUpdateFailure],
+) -> bytes:
+    """One `update` record per update, with the reason if it was rejected."""
+
+    reasons = {f.sku: f.reason for f in failures}
+    return b"".join(
+        json.dumps(
+            {
+                "type": "update",
+                "sku": u.sku,
+                "listing_id": u.listing_id,
+                "qty": u.qty,
+                "failure": reasons.get(u.sku),
+            }
+        ).encode()
+        + b"\n"
+        for u in updates
+    )
+
+
+async def stream_sync_records(
+    run: Callable[[UpdateBatchListener], Awaitable[SyncResult]],
+    max_pending_batches: int = 2,
+) -> AsyncIterator[bytes]:
+    """
+    Runs a sync and yields its progress as NDJSON.
+
+    `run` starts the sync with a batch listener; every batch it reports
+    becomes `update` records, and a final `summary` record holds the
+    counts. The response status is sent before the sync ends, so a sync
+    that fails midway ends the stream with an `error` record instead.
+
+    At most `max_pending_batches` encoded batches wait for a slow client
+    before the sync is held back, and a client that disconnects cancels
+    the sync.
+    """
+
+    queue: asyncio.Queue[bytes | None] = asyncio.Queue(maxsize=max_pending_batches)
+    sent = failed = 0
+
+    async def on_batch(
+        updates: Sequence[ListingQuantityUpdate],
+        failures: Sequence[ListingUpdateFailure],
+    ) -> None:
+        nonlocal sent, failed
+        sent += len(updates)
+        failed += len(failures)
+        await queue.put(encode_update_batch(updates, failures))
+
+    async def produce() -> None:
+        try:
+            result = await run(on_batch)
+            summary = SyncSummaryOut(
+                evaluated=result.evaluated,
+                skipped={r.value: n for r, n in result.skipped.items()},
+                updated=sent - failed,
+                failed=failed,
+            )
+            record: dict[str, Any] = {"type": "summary", **summary.model_dump()}
+        except Exception as e:
+            record = {"type": "error", "detail": str(e) or type(e).__name__}
+        await queue.put(json.dumps(record).encode() + b"\n")
+        await queue.put(None)
+
+    task = asyncio.create_task(produce())
+    try:
+        while (chunk := await queue.get()) is not None:
+            yield chunk
+    finally:
+        task.cancel()
+        with suppress(asyncio.CancelledError):
+            await task
@@ -0,0 +1,164 @@
+from collections.abc import Callable
+from dataclasses import asdict
+
+from fastapi import APIRouter, HTTPException, Query, Request, status
+
+from app.api.schemas.admin import (
+    HttpPoolOut,
+    HttpPoolsOut,
+    RateLimitBucketOut,
+    RateLimitsOut,
+    ScheduleOut,
+    SchedulesOut,
+    SpanOut,
+    SyncCoalescingOut,
+    SyncCoalescingStatsOut,
+    TraceOut,
+    TracesOut,
+    TraceSummaryOut,
+)
+from app.application.service.coalescing import SyncKey
+from app.application.service.scheduler import ScheduleStats, SyncScheduler
+from app.infrastructure.tracing import RingBufferExporter, span_tree
+
+router = APIRouter(prefix="/v1/admin", tags=["admin"])
+
+
+@router.get("/rate-limits", response_model=RateLimitsOut)
+async def get_rate_limits(request: Request) -> RateLimitsOut:
+    """Per (marketplace, account, operation) limiter state and wait times."""
+
+    limiter = getattr(request.app.state, "rate_limiter", None)
+    if limiter is None:
+        raise HTTPException(status_code=404, detail="Rate limiting is disabled")
+
+    return RateLimitsOut(
+        buckets=[RateLimitBucketOut(**asdict(stats)) for stats in limiter.stats()]
+    )
+
+
+@router.get("/http-pools", response_model=HttpPoolsOut)
+async def get_http_pools(request: Request) -> HttpPoolsOut:
+    """Per-host connection pool usage and connection-acquire latency."""
+
+    monitor = getattr(request.app.state, "http_pools", None)
+    if monitor is None:
+        raise HTTPException(status_code=404, detail="Pool monitoring is disabled")
+
+    return HttpPoolsOut(
+        pools=[HttpPoolOut(**asdict(stats)) for stats in monitor.stats()]
+    )
+
+
+@router.get("/sync-coalescing", response_model=SyncCoalescingStatsOut)
+async def get_sync_coalescing(request: Request) -> SyncCoalescingStatsOut:
+    """Full sync requests per marketplace, and how many were coalesced."""
+
+    coalescer = getattr(request.app.state, "sync_coalescer", None)
+    if coalescer is None:
+        raise HTTPException(status_code=404, detail="Sync coalescing is disabled")
+
+    return SyncCoalescingStatsOut(
+        marketplaces=[SyncCoalescingOut(**asdict(s)) for s in coalescer.stats()]
+    )
+
+
+def _scheduler(request: Request) -> SyncScheduler:
+    scheduler = getattr(request.app.state, "scheduler", None)
+    if scheduler is None:
+        raise HTTPException(status_code=404, detail="Scheduled syncs are disabled")
+    return scheduler
+
+
+def _schedule_out(
+    request: Request,
+    marketplace: str,
+    account: str,
+    action: Callable[[SyncScheduler, SyncKey], ScheduleStats],
+) -> ScheduleOut:
+    try:
+        stats = action(_scheduler(request), (marketplace.lower().strip(), account))
+    except KeyError:
+        raise HTTPException(status_code=404, detail="Schedule not found") from None
+    return ScheduleOut(**asdict(stats))
+
+
+@router.get("/schedules", response_model=SchedulesOut)
+async def list_schedules(request: Request) -> SchedulesOut:
+    """Registered sync schedules, their state and last outcome."""
+
+    return SchedulesOut(
+        schedules=[ScheduleOut(**asdict(s)) for s in _scheduler(request).stats()]
+    )
+
+
+@router.post("/schedules/{marketplace}/{account}/pause", response_model=ScheduleOut)
+async def pause_schedule(
+    marketplace: str, account: str, request: Request
+) -> ScheduleOut:
+    """Stops timed runs of the schedule; a running sync completes."""
+
+    return _schedule_out(request, marketplace, account, SyncScheduler.pause)
+
+
+@router.post("/schedules/{marketplace}/{account}/resume", response_model=ScheduleOut)
+async def resume_schedule(
+    marketplace: str, account: str, request: Request
+) -> ScheduleOut:
+    """Restarts timed runs of the schedule, the first an interval from now."""
+
+    return _schedule_out(request, marketplace, account, SyncScheduler.resume)
+
+
+@router.post(
+    "/schedules/{marketplace}/{account}/trigger",
+    response_model=ScheduleOut,
+    status_code=status.HTTP_202_ACCEPTED,
+)
+async def trigger_schedule(
+    marketplace: str, account: str, request: Request
+) -> ScheduleOut:
+    """Queues a run now, even when paused, unless one is queued or running."""
+
+    return _schedule_out(request, marketplace, account, SyncScheduler.trigger)
+
+
+def _trace_buffer(request: Request) -> RingBufferExporter:
+    buffer = getattr(request.app.state, "trace_buffer", None)
+    if buffer is None:
+        raise HTTPException(status_code=404, detail="Tracing is disabled")
+    return buffer
+
+
+@router.get("/traces", response_model=TracesOut)
+async def list_traces(
+    request: Request,
+    limit: int = Query(default=50, ge=1, le=1000),
+) -> TracesOut:
+    """Most recent sampled traces, newest first."""
+
+    summaries: list[TraceSummaryOut] = []
+    for spans in _trace_buffer(request).recent(limit):
+        root = spans[0]
+        summaries.append(
+            TraceSummaryOut(
+                trace_id=root.trace_id,
+                name=root.name,
+                start_time=root.start_time,
+                duration_s=root.duration_s,
+                spans=len(spans),
+                error=root.error,
+            )
+        )
+    return TracesOut(traces=summaries)
+
+
+@router.get("/traces/{trace_id}", response_model=TraceOut)
+async def get_trace(trace_id: str, request: Request) -> TraceOut:
+    """The span tree of one trace."""
+
+    spans = _trace_buffer(request).get(trace_id)
+    if spans is None:
+        raise HTTPException(status_code=404, detail="Trace not found")
+
+    return TraceOut(trace_id=trace_id, root=SpanOut(**span_tree(spans)))
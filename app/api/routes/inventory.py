@@ -1,39 +1,394 @@
-from fastapi import APIRouter, Request
+import time
+from typing import Literal
 
-from app.api.deps import build_sync_service
+from fastapi import APIRouter, HTTPException, Query, Request, Response, status
+from fastapi.responses import JSONResponse, StreamingResponse
+
+from app.api.columnar import (
+    COLUMNS_MEDIA_TYPE,
+    JSON_MEDIA_TYPE,
+    MSGPACK_MEDIA_TYPES,
+    decode_columnar,
+)
+from app.api.deps import (
+    build_delta_sync_service,
+    build_fan_out_service,
+    build_sync_service,
+    full_sync_of,
+    observe_snapshot_build,
+    run_full_sync_coalesced,
+    sync_job_payload,
+)
+from app.api.ndjson import NDJSON_MEDIA_TYPE, read_sync_stream, stream_sync_records
 from app.api.schemas.inventory import (
+    ColumnarSyncInventoryRequest,
+    DeltaSyncInventoryRequest,
+    FanOutSyncRequest,
+    FanOutSyncResponse,
     ListingQuantityUpdateOut,
+    ListingUpdateFailureOut,
     SyncInventoryRequest,
     SyncInventoryResponse,
+    SyncSettingsIn,
+    SyncSummaryOut,
+    SyncTargetResultOut,
 )
-from app.domain.inventory import InventoryItem, InventoryKey, InventorySnapshot
+from app.api.schemas.jobs import SyncJobAccepted
+from app.application.service.sync_inventory import UpdateBatchListener
+from app.application.service.tracing import span
+from app.domain.inventory import (
+    InventoryItem,
+    InventorySnapshot,
+    InventorySnapshotBuilder,
+)
+from app.domain.marketplace import ListingQuantityUpdate, SyncResult
 
 router = APIRouter(prefix="/v1/marketplaces", tags=["inventory"])
 
+# `async` queues the sync as a job and answers 202 with its id right away
+SyncMode = Literal["sync", "async"]
 
-def to_domain_snapshot(body: SyncInventoryRequest) -> InventorySnapshot:
-    items = {}
-    for i in body.inventory:
-        key = InventoryKey(condition_id=i.condition_id)
-        item = InventoryItem.create(condition_id=i.condition_id, quantity=i.quantity)
-        items[key] = item
-    return InventorySnapshot.from_items(items)
+# `summary` answers with the counts only; `ndjson` streams update records
+# as each update batch is sent, followed by the counts
+ResponseMode = Literal["full", "summary", "ndjson"]
 
+# Marketplace label of snapshots shared by all targets of a fan-out sync
+FAN_OUT = "fan-out"
 
-@router.post("/{marketplace}/inventory/sync", response_model=SyncInventoryResponse)
-async def sync_inventory(
-    marketplace: str,
-    body: SyncInventoryRequest,
-    request: Request,
-) -> SyncInventoryResponse:
-    service = build_sync_service(request=request, marketplace=marketplace, body=body)
-    inventory = to_domain_snapshot(body)
+ASYNC_SYNC_RESPONSES: dict[int | str, dict] = {
+    status.HTTP_200_OK: {
+        "description": (
+            "The updates; only their counts (SyncSummaryOut) with "
+            "`response=summary`, or NDJSON update records ending with a "
+            "summary record with `response=ndjson`"
+        ),
+        "content": {NDJSON_MEDIA_TYPE: {"schema": {"type": "string"}}},
+    },
+    status.HTTP_202_ACCEPTED: {
+        "model": SyncJobAccepted,
+        "description": "Queued; poll the Location header for the result",
+    },
+}
 
-    updates = await service.sync(inventory=inventory)
+ResponseModeQuery = Query(
+    "full",
+    alias="response",
+    description="full, summary (counts only) or ndjson (streamed records)",
+)
+BatchSizeQuery = Query(
+    None,
+    ge=1,
+    description=(
+        "Updates per streamed batch with response=ndjson; defaults to the "
+        "marketplace's update batch size"
+    ),
+)
 
+
+def to_domain_snapshot(
+    body: SyncInventoryRequest | FanOutSyncRequest,
+) -> InventorySnapshot:
+    with span("to_domain_snapshot") as snapshot_span:
+        builder = InventorySnapshotBuilder()
+        for i in body.inventory:
+            builder.add(i.condition_id, i.quantity)
+        snapshot = builder.build()
+        snapshot_span.set("rows", len(snapshot))
+    return snapshot
+
+
+def to_summary(result: SyncResult) -> SyncSummaryOut:
+    return SyncSummaryOut(
+        evaluated=result.evaluated,
+        skipped={r.value: n for r, n in result.skipped.items()},
+        updated=len(result.updates) - len(result.failures),
+        failed=len(result.failures),
+    )
+
+
+def to_response(updates: list[ListingQuantityUpdate]) -> SyncInventoryResponse:
     return SyncInventoryResponse(
         updates=[
             ListingQuantityUpdateOut(sku=u.sku, listing_id=u.listing_id, qty=u.qty)
             for u in updates
         ]
     )
+
+
+@router.post("/inventory/fan-out", response_model=FanOutSyncResponse)
+async def sync_inventory_fan_out(
+    body: FanOutSyncRequest,
+    request: Request,
+) -> FanOutSyncResponse:
+    """
+    Syncs one inventory to several marketplace accounts concurrently.
+
+    Each target reports its own updates or error; a failing target does
+    not fail the request.
+    """
+
+    service = build_fan_out_service(request=request, targets=body.targets)
+    started = time.perf_counter()
+    inventory = to_domain_snapshot(body)
+    observe_snapshot_build(request.app.state, FAN_OUT, started, inventory)
+
+    outcomes = await service.run(inventory)
+
+    results: list[SyncTargetResultOut] = []
+    for outcome in outcomes:
+        cfg = outcome.config
+        out = SyncTargetResultOut(
+            marketplace=cfg.marketplace,
+            account=cfg.account,
+            ok=outcome.result is not None,
+            error=outcome.error,
+        )
+        if outcome.result is not None:
+            out.updates = to_response(outcome.result.updates).updates
+            out.failures = [
+                ListingUpdateFailureOut(
+                    sku=f.sku, listing_id=f.listing_id, reason=f.reason
+                )
+                for f in outcome.result.failures
+            ]
+        results.append(out)
+
+    return FanOutSyncResponse(results=results)
+
+
+@router.post(
+    "/{marketplace}/inventory/sync",
+    response_model=SyncInventoryResponse,
+    responses=ASYNC_SYNC_RESPONSES,
+)
+async def sync_inventory(
+    marketplace: str,
+    body: SyncInventoryRequest,
+    request: Request,
+    mode: SyncMode = "sync",
+    response_mode: ResponseMode = ResponseModeQuery,
+    batch_size: int | None = BatchSizeQuery,
+) -> SyncInventoryResponse | Response:
+    check_response_mode(mode, response_mode)
+    started = time.perf_counter()
+    inventory = to_domain_snapshot(body)
+    observe_snapshot_build(request.app.state, marketplace, started, inventory)
+    if mode == "async":
+        return await enqueue_full_sync(request, marketplace, body, inventory)
+
+    return await run_full_sync(
+        request, marketplace, body, inventory, response_mode, batch_size
+    )
+
+
+@router.post(
+    "/{marketplace}/inventory/sync/ndjson",
+    response_model=SyncInventoryResponse,
+    responses=ASYNC_SYNC_RESPONSES,
+    openapi_extra={
+        "requestBody": {
+            "required": True,
+            "content": {
+                NDJSON_MEDIA_TYPE: {
+                    "schema": {"type": "string"},
+                    "example": (
+                        '{"account": "acc-1", "refresh_token": "..."}\n'
+                        '{"condition_id": "NEW", "quantity": 10}\n'
+                    ),
+                }
+            },
+        }
+    },
+)
+async def sync_inventory_ndjson(
+    marketplace: str,
+    request: Request,
+    mode: SyncMode = "sync",
+    response_mode: ResponseMode = ResponseModeQuery,
+    batch_size: int | None = BatchSizeQuery,
+) -> SyncInventoryResponse | Response:
+    """
+    Same as the sync route, for large uploads: the first line holds the
+    sync settings and every following line is one inventory row. Rows are
+    parsed while the body is still being received.
+    """
+
+    check_response_mode(mode, response_mode)
+    content_type = request.headers.get("content-type", "")
+    if content_type.split(";")[0].strip().lower() != NDJSON_MEDIA_TYPE:
+        raise HTTPException(
+            status_code=status.HTTP_415_UNSUPPORTED_MEDIA_TYPE,
+            detail=f"Content-Type must be {NDJSON_MEDIA_TYPE}",
+        )
+
+    started = time.perf_counter()
+    with span("read_sync_stream") as stream_span:
+        settings, inventory = await read_sync_stream(request.stream())
+        stream_span.set("rows", len(inventory))
+    observe_snapshot_build(request.app.state, marketplace, started, inventory)
+    if mode == "async":
+        return await enqueue_full_sync(request, marketplace, settings, inventory)
+
+    return await run_full_sync(
+        request, marketplace, settings, inventory, response_mode, batch_size
+    )
+
+
+def check_response_mode(mode: SyncMode, response_mode: ResponseMode) -> None:
+    if mode == "async" and response_mode != "full":
+        raise HTTPException(
+            status_code=400,
+            detail="response=summary and response=ndjson require mode=sync",
+        )
+
+
+@router.post(
+    "/{marketplace}/inventory/sync/columnar",
+    response_model=SyncInventoryResponse,
+    responses=ASYNC_SYNC_RESPONSES,
+    openapi_extra={
+        "requestBody": {
+            "required": True,
+            "content": {
+                JSON_MEDIA_TYPE: {
+                    "schema": ColumnarSyncInventoryRequest.model_json_schema(),
+                },
+                MSGPACK_MEDIA_TYPES[0]: {"schema": {"type": "string"}},
+                COLUMNS_MEDIA_TYPE: {"schema": {"type": "string"}},
+            },
+        }
+    },
+)
+async def sync_inventory_columnar(
+    marketplace: str,
+    request: Request,
+    mode: SyncMode = "sync",
+    response_mode: ResponseMode = ResponseModeQuery,
+    batch_size: int | None = BatchSizeQuery,
+) -> SyncInventoryResponse | Response:
+    """
+    Same as the sync route, with the inventory as parallel `condition_ids`
+    and `quantities` columns next to the settings: in JSON, msgpack or the
+    length-prefixed binary layout of `app.api.columnar`, by Content-Type.
+    Columns go straight into the snapshot, without a model per row.
+    """
+
+    check_response_mode(mode, response_mode)
+    body = await request.body()
+
+    started = time.perf_counter()
+    with span("decode_columnar", bytes=len(body)) as decode_span:
+        settings, inventory = decode_columnar(
+            request.headers.get("content-type", ""), body
+        )
+        decode_span.set("rows", len(inventory))
+    observe_snapshot_build(request.app.state, marketplace, started, inventory)
+    if mode == "async":
+        return await enqueue_full_sync(request, marketplace, settings, inventory)
+
+    return await run_full_sync(
+        request, marketplace, settings, inventory, response_mode, batch_size
+    )
+
+
+async def run_full_sync(
+    request: Request,
+    marketplace: str,
+    settings: SyncSettingsIn,
+    inventory: InventorySnapshot,
+    response_mode: ResponseMode = "full",
+    batch_size: int | None = None,
+) -> SyncInventoryResponse | Response:
+    service = build_sync_service(
+        request=request, marketplace=marketplace, body=settings
+    )
+    state = request.app.state
+
+    if response_mode == "ndjson":
+
+        async def run(on_batch: UpdateBatchListener) -> SyncResult:
+            async with full_sync_of(state, marketplace, settings.account):
+                return await service.run(
+                    inventory, on_update_batch=on_batch, update_batch_size=batch_size
+                )
+
+        return StreamingResponse(stream_sync_records(run), media_type=NDJSON_MEDIA_TYPE)
+
+    # Concurrent full syncs of the account are merged into one run; ndjson
+    # streams cannot be, as their updates go to one caller as they are sent.
+    result = await run_full_sync_coalesced(
+        state, marketplace, settings.account, service, inventory
+    )
+
+    if response_mode == "summary":
+        # bypasses response_model, which describes the full response
+        return JSONResponse(to_summary(result).model_dump())
+
+    return to_response(result.updates)
+
+
+async def enqueue_full_sync(
+    request: Request,
+    marketplace: str,
+    settings: SyncSettingsIn,
+    inventory: InventorySnapshot,
+) -> Response:
+    queue = getattr(request.app.state, "job_queue", None)
+    workers = getattr(request.app.state, "job_workers", None)
+    if queue is None or workers is None:
+        raise HTTPException(status_code=503, detail="Sync jobs are disabled")
+
+    marketplace = marketplace.lower().strip()
+    if not workers.serves(marketplace):
+        raise HTTPException(
+            status_code=400,
+            detail=f"No sync workers for marketplace: {marketplace}",
+        )
+
+    job = await queue.enqueue(marketplace, sync_job_payload(settings, inventory))
+    workers.notify(marketplace)
+
+    return JSONResponse(
+        status_code=status.HTTP_202_ACCEPTED,
+        content=SyncJobAccepted(job_id=job.id, status=job.status).model_dump(),
+        headers={"Location": f"/v1/jobs/{job.id}"},
+    )
+
+
+@router.post(
+    "/{marketplace}/inventory/delta",
+    response_model=SyncInventoryResponse,
+)
+async def sync_inventory_delta(
+    marketplace: str,
+    body: DeltaSyncInventoryRequest,
+    request: Request,
+) -> SyncInventoryResponse:
+    service = build_delta_sync_service(
+        request=request, marketplace=marketplace, body=body
+    )
+    changes = [
+        InventoryItem.create(condition_id=i.condition_id, quantity=i.quantity)
+        for i in body.changes
+    ]
+
+    result = await service.run(changes)
+
+    return to_response(result.updates)
+
+
+@router.delete(
+    "/{marketplace}/accounts/{account}/listings-cache",
+    status_code=status.HTTP_204_NO_CONTENT,
+)
+async def invalidate_listings_cache(
+    marketplace: str,
+    account: str,
+    request: Request,
+) -> Response:
+    cache = getattr(request.app.state, "listings_cache", None)
+    if cache is None:
+        raise HTTPException(status_code=404, detail="Listings cache is disabled")
+
+    cache.invalidate(marketplace.lower().strip(), account)
+    return Response(status_code=status.HTTP_204_NO_CONTENT)
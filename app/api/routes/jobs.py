@@ -0,0 +1,38 @@
+from fastapi import APIRouter, HTTPException, Request
+
+from app.api.schemas.inventory import ListingQuantityUpdateOut, ListingUpdateFailureOut
+from app.api.schemas.jobs import SyncJobOut
+from app.application.ports.jobs import SyncJob
+
+router = APIRouter(prefix="/v1/jobs", tags=["jobs"])
+
+
+def to_job_out(job: SyncJob) -> SyncJobOut:
+    out = SyncJobOut(
+        id=job.id,
+        marketplace=job.marketplace,
+        status=job.status,
+        created_at=job.created_at,
+        updated_at=job.updated_at,
+        error=job.error,
+    )
+    if job.result is not None:
+        out.updates = [
+            ListingQuantityUpdateOut(sku=u.sku, listing_id=u.listing_id, qty=u.qty)
+            for u in job.result.updates
+        ]
+        out.failures = [
+            ListingUpdateFailureOut(sku=f.sku, listing_id=f.listing_id, reason=f.reason)
+            for f in job.result.failures
+        ]
+    return out
+
+
+@router.get("/{job_id}", response_model=SyncJobOut)
+async def get_job(job_id: str, request: Request) -> SyncJobOut:
+    queue = getattr(request.app.state, "job_queue", None)
+    job = None if queue is None else await queue.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+
+    return to_job_out(job)
@@ -0,0 +1,16 @@
+from fastapi import APIRouter, HTTPException, Request, Response
+
+from app.infrastructure.metrics import PROMETHEUS_MEDIA_TYPE
+
+router = APIRouter(tags=["metrics"])
+
+
+@router.get("/metrics", response_class=Response)
+async def get_metrics(request: Request) -> Response:
+    """Sync phase, outbound HTTP and connection pool metrics for Prometheus."""
+
+    metrics = getattr(request.app.state, "metrics", None)
+    if metrics is None:
+        raise HTTPException(status_code=404, detail="Metrics are disabled")
+
+    return Response(content=metrics.registry.render(), media_type=PROMETHEUS_MEDIA_TYPE)
@@ -0,0 +1,115 @@
+from __future__ import annotations
+
+from typing import Any
+
+from pydantic import BaseModel, Field
+
+
+class RateLimitBucketOut(BaseModel):
+    marketplace: str
+    account: str
+    operation: str
+
+    # current bucket parameters (rate adapts to marketplace responses)
+    rate: float
+    burst: int
+    tokens: float
+
+    # callers currently queued for a token, and what they have waited so far
+    waiting: int
+    acquired: int
+    throttled: int
+    total_wait_s: float
+    max_wait_s: float
+
+
+class RateLimitsOut(BaseModel):
+    buckets: list[RateLimitBucketOut]
+
+
+class HttpPoolOut(BaseModel):
+    pool: str
+    max_connections: int
+    http2: bool
+
+    # open connections, and requests waiting for one
+    connections: int
+    idle: int
+    active: int
+    waiting: int
+
+    # time from sending a request to getting a connection for it
+    acquired: int
+    total_acquire_s: float
+    max_acquire_s: float
+
+
+class HttpPoolsOut(BaseModel):
+    pools: list[HttpPoolOut]
+
+
+class SyncCoalescingOut(BaseModel):
+    marketplace: str
+
+    # full sync requests, the runs made for them, and the requests merged
+    # into a run queued by an earlier request
+    requests: int
+    runs: int
+    coalesced: int
+
+    # accounts with a sync running or queued
+    running: int
+
+
+class SyncCoalescingStatsOut(BaseModel):
+    marketplaces: list[SyncCoalescingOut]
+
+
+class ScheduleOut(BaseModel):
+    marketplace: str
+    account: str
+    priority: str
+    interval_s: float
+
+    # idle, queued (due, waiting for a free slot) or running
+    paused: bool
+    state: str
+    next_run_in_s: float | None = None
+
+    runs: int
+    failures: int
+    last_duration_s: float | None = None
+    last_finished_at: float | None = None
+    last_error: str | None = None
+
+
+class SchedulesOut(BaseModel):
+    schedules: list[ScheduleOut]
+
+
+class TraceSummaryOut(BaseModel):
+    trace_id: str
+    name: str
+    start_time: float
+    duration_s: float
+    spans: int
+    error: str | None = None
+
+
+class TracesOut(BaseModel):
+    traces: list[TraceSummaryOut]
+
+
+class SpanOut(BaseModel):
+    span_id: str
+    name: str
+    start_time: float
+    duration_s: float
+    attributes: dict[str, Any] = Field(default_factory=dict)
+    error: str | None = None
+    children: list[SpanOut] = Field(default_factory=list)
+
+
+class TraceOut(BaseModel):
+    trace_id: str
+    root: SpanOut
@@ -1,6 +1,6 @@
 from __future__ import annotations
 
-from pydantic import BaseModel
+from pydantic import BaseModel, Field, model_validator
 
 
 class InventoryItemIn(BaseModel):
@@ -8,7 +8,9 @@ class InventoryItemIn(BaseModel):
     quantity: int
 
 
-class SyncInventoryRequest(BaseModel):
+class SyncSettingsIn(BaseModel):
+    """Account credentials and policy limits shared by all sync requests."""
+
     account: str
     refresh_token: str
 
@@ -23,8 +25,51 @@ class SyncInventoryRequest(BaseModel):
     limit_qty_difference_for_sync: int = 0
     limit_qty_for_marketplace: int = 9999
 
+    # skip the cached listings snapshot and refetch from the marketplace
+    refresh_listings: bool = False
+
+
+class SyncInventoryRequest(SyncSettingsIn):
+    inventory: list[InventoryItemIn]
+
+
+class ColumnarSyncInventoryRequest(SyncSettingsIn):
+    """Inventory as parallel columns: row i is (condition_ids[i], quantities[i])."""
+
+    condition_ids: list[str]
+    quantities: list[int]
+
+    @model_validator(mode="after")
+    def _columns_are_parallel(self) -> ColumnarSyncInventoryRequest:
+        if len(self.condition_ids) != len(self.quantities):
+            raise ValueError("condition_ids and quantities must be equal length")
+        return self
+
+
+class DeltaSyncInventoryRequest(SyncSettingsIn):
+    # only the condition_ids whose quantity changed since the last sync;
+    # rows sharing a condition_id are summed
+    changes: list[InventoryItemIn]
+
+
+class SyncTargetIn(SyncSettingsIn):
+    marketplace: str
+
+
+class FanOutSyncRequest(BaseModel):
+    targets: list[SyncTargetIn] = Field(min_length=1)
     inventory: list[InventoryItemIn]
 
+    @model_validator(mode="after")
+    def _targets_are_unique(self) -> FanOutSyncRequest:
+        seen: set[tuple[str, str]] = set()
+        for target in self.targets:
+            key = (target.marketplace.lower().strip(), target.account)
+            if key in seen:
+                raise ValueError(f"duplicate target: {key[0]}/{key[1]}")
+            seen.add(key)
+        return self
+
 
 class ListingQuantityUpdateOut(BaseModel):
     sku: str
@@ -34,3 +79,32 @@ class ListingQuantityUpdateOut(BaseModel):
 
 class SyncInventoryResponse(BaseModel):
     updates: list[ListingQuantityUpdateOut]
+
+
+class SyncSummaryOut(BaseModel):
+    """Counts of a sync, without its update records."""
+
+    evaluated: int
+    # listings the policy left alone, by reason
+    skipped: dict[str, int]
+    updated: int
+    failed: int
+
+
+class ListingUpdateFailureOut(BaseModel):
+    sku: str
+    listing_id: str | None = None
+    reason: str
+
+
+class SyncTargetResultOut(BaseModel):
+    marketplace: str
+    account: str
+    ok: bool
+    updates: list[ListingQuantityUpdateOut] = []
+    failures: list[ListingUpdateFailureOut] = []
+    error: str | None = None
+
+
+class FanOutSyncResponse(BaseModel):
+    results: list[SyncTargetResultOut]
@@ -0,0 +1,23 @@
+from __future__ import annotations
+
+from pydantic import BaseModel
+
+from app.api.schemas.inventory import ListingQuantityUpdateOut, ListingUpdateFailureOut
+
+
+class SyncJobAccepted(BaseModel):
+    job_id: str
+    status: str
+
+
+class SyncJobOut(BaseModel):
+    id: str
+    marketplace: str
+    status: str
+    created_at: float
+    updated_at: float
+
+    # set once the job has finished
+    updates: list[ListingQuantityUpdateOut] | None = None
+    failures: list[ListingUpdateFailureOut] | None = None
+    error: str | None = None
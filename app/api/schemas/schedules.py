@@ -0,0 +1,32 @@
+from __future__ import annotations
+
+from pydantic import BaseModel, Field, model_validator
+
+from app.api.schemas.inventory import SyncTargetIn
+from app.application.service.scheduler import SyncPriority
+
+
+class SyncScheduleIn(SyncTargetIn):
+    """An account synced on an interval, with inventory from a URL or a file."""
+
+    interval_s: float = Field(gt=0)
+    priority: SyncPriority = SyncPriority.NORMAL
+
+    # warehouse export read by HttpInventorySource
+    inventory_url: str | None = None
+    inventory_headers: dict[str, str] = Field(default_factory=dict)
+
+    # local CSV/TSV export read by FileInventorySource
+    inventory_path: str | None = None
+
+    @model_validator(mode="after")
+    def _one_inventory_source(self) -> SyncScheduleIn:
+        if (self.inventory_url is None) == (self.inventory_path is None):
+            raise ValueError(
+                "exactly one of inventory_url and inventory_path is required"
+            )
+        return self
+
+
+class SyncSchedulesIn(BaseModel):
+    schedules: list[SyncScheduleIn]
@@ -0,0 +1,40 @@
+from __future__ import annotations
+
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+TRACE_ID_HEADER = "x-trace-id"
+
+# Requests that run syncs; other routes are not worth tracing.
+TRACED_PATH_PREFIXES = ("/v1/marketplaces/",)
+
+
+class TracingMiddleware:
+    """
+    Starts a trace for every sampled sync request, using the Tracer in
+    `app.state.tracer`, and reports its id in the `X-Trace-Id` header.
+    """
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        tracer = None
+        if scope["type"] == "http" and scope["path"].startswith(TRACED_PATH_PREFIXES):
+            tracer = getattr(scope["app"].state, "tracer", None)
+        if tracer is None:
+            await self.app(scope, receive, send)
+            return
+
+        with tracer.trace(f"{scope['method']} {scope['path']}") as root:
+            trace_id = root.trace_id
+
+            async def send_with_trace_id(message: Message) -> None:
+                if message["type"] == "http.response.start":
+                    root.set("status", message["status"])
+                    if trace_id is not None:
+                        headers = list(message.get("headers", []))
+                        headers.append((TRACE_ID_HEADER.encode(), trace_id.encode()))
+                        message = {**message, "headers": headers}
+                await send(message)
+
+            await self.app(scope, receive, send_with_trace_id)
@@ -0,0 +1,58 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from enum import StrEnum
+from typing import Any, Protocol
+
+from app.domain.marketplace import SyncResult
+
+
+class JobStatus(StrEnum):
+    QUEUED = "queued"
+    RUNNING = "running"
+    SUCCEEDED = "succeeded"
+    FAILED = "failed"
+
+
+@dataclass(frozen=True, slots=True)
+class SyncJob:
+    """A queued inventory sync together with its outcome once finished."""
+
+    id: str
+    marketplace: str
+    status: JobStatus
+    payload: dict[str, Any]
+    created_at: float
+    updated_at: float
+    result: SyncResult | None = None
+    error: str | None = None
+
+    @property
+    def finished(self) -> bool:
+        return self.status in (JobStatus.SUCCEEDED, JobStatus.FAILED)
+
+
+class SyncJobQueue(Protocol):
+    """Port for a durable queue of sync jobs."""
+
+    async def enqueue(self, marketplace: str, payload: dict[str, Any]) -> SyncJob:
+        """Stores a new job in the QUEUED state."""
+        ...
+
+    async def claim(self, marketplace: str) -> SyncJob | None:
+        """Moves the oldest queued job of `marketplace` to RUNNING."""
+        ...
+
+    async def complete(self, job_id: str, result: SyncResult) -> None: ...
+
+    async def fail(self, job_id: str, error: str) -> None: ...
+
+    async def get(self, job_id: str) -> SyncJob | None: ...
+
+    async def requeue_running(self) -> int:
+        """
+        Puts jobs left RUNNING by a previous process back in the queue.
+
+        Returns how many were requeued.
+        """
+        ...
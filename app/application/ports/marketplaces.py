@@ -1,9 +1,14 @@
 from __future__ import annotations
 
-from collections.abc import Iterable
+from collections.abc import AsyncIterator, Iterable, Sequence
 from typing import Protocol
 
-from app.domain.marketplace import Listing, ListingQuantityUpdate, MarketplaceConfig
+from app.domain.marketplace import (
+    Listing,
+    ListingQuantityUpdate,
+    ListingUpdateFailure,
+    MarketplaceConfig,
+)
 
 
 class MarketplacePort(Protocol):
@@ -13,11 +18,27 @@ class MarketplacePort(Protocol):
         """Returns current marketplace listings snapshot."""
         ...
 
+    def iter_listings(self) -> AsyncIterator[Sequence[Listing]]:
+        """
+        Yields current marketplace listings page by page.
+
+        Lets callers start processing before the whole account is fetched
+        and keeps only the pages in flight in memory. Pages may be columnar
+        ListingBatch instances, which consumers can read without building
+        a Listing per row.
+        """
+        ...
+
     async def update_inventory(
         self,
         updates: Iterable[ListingQuantityUpdate],
-    ) -> None:
-        """Applies quantity updates for marketplace listings."""
+    ) -> list[ListingUpdateFailure]:
+        """
+        Applies quantity updates for marketplace listings.
+
+        Returns the updates the marketplace rejected; an empty list means
+        every update was accepted.
+        """
         ...
 
 
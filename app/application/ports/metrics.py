@@ -0,0 +1,33 @@
+from __future__ import annotations
+
+from enum import StrEnum
+from typing import Protocol
+
+
+class SyncPhase(StrEnum):
+    SNAPSHOT_BUILD = "snapshot_build"
+    FETCH_LISTINGS = "fetch_listings"
+    EVALUATE = "evaluate"
+    UPDATE_INVENTORY = "update_inventory"
+
+
+class SyncMetrics(Protocol):
+    """Port for recording where the time of a sync run goes."""
+
+    def observe_phase(
+        self,
+        marketplace: str,
+        phase: SyncPhase,
+        seconds: float,
+        rows: int,
+    ) -> None:
+        """Records one phase of a sync run and how many rows it handled."""
+        ...
+
+    def count_updates(self, marketplace: str, sent: int, failed: int) -> None:
+        """Records the quantity updates sent, and how many were rejected."""
+        ...
+
+    def count_sync_request(self, marketplace: str, coalesced: bool) -> None:
+        """Records a full sync request, and whether another one absorbed it."""
+        ...
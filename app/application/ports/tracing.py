@@ -0,0 +1,29 @@
+from __future__ import annotations
+
+from collections.abc import Sequence
+from dataclasses import dataclass, field
+from typing import Any, Protocol
+
+
+@dataclass(slots=True)
+class Span:
+    """A finished, timed operation within a trace."""
+
+    trace_id: str
+    span_id: str
+    parent_id: str | None
+    name: str
+
+    # Unix time the span started at, and its duration
+    start_time: float
+    duration_s: float
+    attributes: dict[str, Any] = field(default_factory=dict)
+    error: str | None = None
+
+
+class SpanExporter(Protocol):
+    """Port for shipping the spans of finished traces."""
+
+    def export(self, spans: Sequence[Span]) -> None:
+        """Receives all spans of one trace, root span first."""
+        ...
@@ -0,0 +1,13 @@
+from __future__ import annotations
+
+from typing import Protocol
+
+from app.domain.inventory import InventorySnapshot
+
+
+class WarehouseInventoryPort(Protocol):
+    """Port for pulling the current warehouse inventory, e.g. an export file."""
+
+    async def load_snapshot(self) -> InventorySnapshot:
+        """Returns the inventory as of now; raises if it cannot be read."""
+        ...
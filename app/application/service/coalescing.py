@@ -0,0 +1,154 @@
+from __future__ import annotations
+
+import asyncio
+import contextvars
+from collections.abc import Callable, Coroutine
+from dataclasses import dataclass, field
+from typing import Any
+
+from app.application.ports.metrics import SyncMetrics
+from app.application.service.tracing import span
+from app.domain.marketplace import SyncResult
+
+# (marketplace, account)
+SyncKey = tuple[str, str]
+
+SyncRun = Callable[[], Coroutine[Any, Any, SyncResult]]
+
+
+@dataclass(frozen=True, slots=True)
+class CoalescingStats:
+    marketplace: str
+    # sync requests, the runs made for them, and the requests merged into
+    # a run another request had already queued
+    requests: int
+    runs: int
+    coalesced: int
+    # accounts with a sync running or queued
+    running: int
+
+
+@dataclass(slots=True)
+class _Counts:
+    requests: int = 0
+    runs: int = 0
+    coalesced: int = 0
+
+
+@dataclass(slots=True)
+class _QueuedRun:
+    sync: SyncRun
+    future: asyncio.Future[SyncResult]
+    # context of the caller whose sync runs, so its trace records the run
+    context: contextvars.Context
+
+
+@dataclass(slots=True)
+class _Flight:
+    """Runs of one account: the queued one waits for the running one."""
+
+    task: asyncio.Task[None] | None = None
+    queued: _QueuedRun | None = None
+
+
+@dataclass(slots=True)
+class SyncCoalescer:
+    """
+    Single-flight coordinator for full syncs of the same account.
+
+    At most one sync per (marketplace, account) runs at a time. Requests
+    arriving while it runs are merged into one follow-up run, and the
+    latest request's sync wins since it carries the newest inventory.
+    Every merged caller gets the follow-up's result, which covers its data.
+
+    Runs are not tied to their callers: a caller that goes away stops
+    waiting, but the run it queued still completes for the others.
+    """
+
+    metrics: SyncMetrics | None = None
+
+    _flights: dict[SyncKey, _Flight] = field(
+        default_factory=dict, init=False, repr=False
+    )
+    _counts: dict[str, _Counts] = field(default_factory=dict, init=False, repr=False)
+
+    async def run(self, key: SyncKey, sync: SyncRun) -> SyncResult:
+        """Runs `sync`, or the sync of a later request for the same key."""
+
+        marketplace = key[0]
+        counts = self._counts.setdefault(marketplace, _Counts())
+        counts.requests += 1
+
+        flight = self._flights.get(key)
+        if flight is None:
+            flight = self._flights[key] = _Flight()
+
+        queued = flight.queued
+        coalesced = queued is not None
+        if queued is None:
+            queued = flight.queued = _QueuedRun(
+                sync,
+                asyncio.get_running_loop().create_future(),
+                contextvars.copy_context(),
+            )
+        else:
+            queued.sync = sync
+            queued.context = contextvars.copy_context()
+            counts.coalesced += 1
+
+        if self.metrics is not None:
+            self.metrics.count_sync_request(marketplace, coalesced=coalesced)
+
+        if flight.task is None:
+            flight.task = asyncio.create_task(self._drain(key, flight))
+
+        with span("sync_coalescing", coalesced=coalesced):
+            return await asyncio.shield(queued.future)
+
+    async def close(self) -> None:
+        """Cancels the running syncs; their callers get CancelledError."""
+
+        tasks = [f.task for f in self._flights.values() if f.task is not None]
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+    def stats(self) -> list[CoalescingStats]:
+        running: dict[str, int] = {}
+        for marketplace, _ in self._flights:
+            running[marketplace] = running.get(marketplace, 0) + 1
+
+        return [
+            CoalescingStats(
+                marketplace=marketplace,
+                requests=counts.requests,
+                runs=counts.runs,
+                coalesced=counts.coalesced,
+                running=running.get(marketplace, 0),
+            )
+            for marketplace, counts in self._counts.items()
+        ]
+
+    async def _drain(self, key: SyncKey, flight: _Flight) -> None:
+        counts = self._counts[key[0]]
+        queued = None
+        try:
+            while (queued := flight.queued) is not None:
+                flight.queued = None
+                counts.runs += 1
+                try:
+                    result = await asyncio.create_task(
+                        queued.sync(), context=queued.context
+                    )
+                except Exception as e:
+                    queued.future.set_exception(e)
+                    # retrieved here in case every caller stopped waiting
+                    queued.future.exception()
+                else:
+                    queued.future.set_result(result)
+        finally:
+            # Cancelled on shutdown: release the callers still waiting.
+            for pending in (queued, flight.queued):
+                if pending is not None and not pending.future.done():
+                    pending.future.cancel()
+            del self._flights[key]
@@ -0,0 +1,237 @@
+from __future__ import annotations
+
+import asyncio
+import time
+from collections import OrderedDict
+from collections.abc import Callable, Iterable
+from dataclasses import dataclass, field, replace
+
+from app.application.ports.marketplaces import MarketplacePort, MarketplacePortFactory
+from app.domain.inventory import InventoryItem
+from app.domain.marketplace import (
+    Listing,
+    ListingQuantityUpdate,
+    ListingUpdateFailure,
+    MarketplaceConfig,
+    MarketplacePolicy,
+    SyncResult,
+)
+
+BaselineKey = tuple[str, str]
+
+
+@dataclass(slots=True)
+class AccountBaseline:
+    """
+    Reverse index of one account's marketplace listings by condition_id,
+    and the lock that serializes the account's delta syncs.
+    """
+
+    listings_by_condition: dict[str, list[Listing]] | None = None
+    indexed_at: float = 0.0
+    lock: asyncio.Lock = field(default_factory=asyncio.Lock, repr=False)
+
+
+@dataclass(slots=True)
+class InventoryBaselineStore:
+    """
+    Per-(marketplace, account) baselines for delta syncs.
+
+    At most `max_accounts` baselines are kept (least recently used are
+    dropped, unless a sync holds them), and a listings index older than `index_ttl_s` is rebuilt
+    from the marketplace before it is used again.
+
+    A listings index holds one Listing per marketplace listing of the
+    account. Accounts with more than `max_index_listings` listings are
+    not indexed between deltas: every delta fetches their listings again.
+    """
+
+    max_accounts: int = 1000
+    index_ttl_s: float = 300.0
+    max_index_listings: int = 1_000_000
+    clock: Callable[[], float] = time.monotonic
+
+    _baselines: OrderedDict[BaselineKey, AccountBaseline] = field(
+        default_factory=OrderedDict, init=False, repr=False
+    )
+
+    def __post_init__(self) -> None:
+        if self.max_accounts < 1:
+            raise ValueError("max_accounts must be >= 1")
+
+        if self.index_ttl_s <= 0:
+            raise ValueError("index_ttl_s must be > 0")
+
+        if self.max_index_listings < 1:
+            raise ValueError("max_index_listings must be >= 1")
+
+    def get(self, key: BaselineKey) -> AccountBaseline:
+        """Returns the account baseline, creating an empty one if needed."""
+
+        baseline = self._baselines.get(key)
+        if baseline is None:
+            baseline = AccountBaseline()
+            self._baselines[key] = baseline
+            self._evict(keep=key)
+        else:
+            self._baselines.move_to_end(key)
+        return baseline
+
+    def _evict(self, keep: BaselineKey) -> None:
+        # Baselines whose lock is held stay, so a sync that waits on the
+        # lock never races one that got a newly created baseline.
+        while len(self._baselines) > self.max_accounts:
+            oldest = next(
+                (
+                    k
+                    for k, b in self._baselines.items()
+                    if k != keep and not b.lock.locked()
+                ),
+                None,
+            )
+            if oldest is None:
+                return
+            del self._baselines[oldest]
+
+    def invalidate_index(self, key: BaselineKey) -> None:
+        """Drops the account's listings index, e.g. after a full sync."""
+
+        baseline = self._baselines.get(key)
+        if baseline is not None:
+            baseline.listings_by_condition = None
+
+    def index_is_fresh(self, baseline: AccountBaseline) -> bool:
+        return (
+            baseline.listings_by_condition is not None
+            and self.clock() - baseline.indexed_at < self.index_ttl_s
+        )
+
+
+@dataclass
+class DeltaSyncService:
+    """
+    Evaluates changed inventory rows against only the listings that share
+    their condition_ids.
+    """
+
+    marketplace_factory: MarketplacePortFactory
+    config: MarketplaceConfig
+    policy: MarketplacePolicy
+    baselines: InventoryBaselineStore
+
+    async def run(self, changes: Iterable[InventoryItem]) -> SyncResult:
+        """
+        Synchronizes changed warehouse items to the marketplace.
+
+        Cost is proportional to the number of changed items and their
+        listings, except when the listings index has to be (re)built.
+        """
+
+        key = (self.config.marketplace, self.config.account)
+        baseline = self.baselines.get(key)
+        marketplace = self.marketplace_factory.build(self.config)
+
+        async with baseline.lock:
+            try:
+                return await self._sync(marketplace, baseline, self._stage(changes))
+            except BaseException:
+                # The marketplace state is unknown after a failed call.
+                baseline.listings_by_condition = None
+                raise
+
+    @staticmethod
+    def _stage(changes: Iterable[InventoryItem]) -> dict[str, int]:
+        """
+        New quantities of the changed condition_ids.
+
+        Rows sharing a condition_id are summed, as InventorySnapshotBuilder
+        does for full uploads.
+        """
+
+        staged: dict[str, int] = {}
+        for item in changes:
+            staged[item.condition_id] = staged.get(item.condition_id, 0) + item.quantity
+        return staged
+
+    async def _sync(
+        self,
+        marketplace: MarketplacePort,
+        baseline: AccountBaseline,
+        staged: dict[str, int],
+    ) -> SyncResult:
+        if self.baselines.index_is_fresh(baseline):
+            index = baseline.listings_by_condition or {}
+        else:
+            index, complete = await self._build_index(marketplace, staged)
+            baseline.listings_by_condition = None
+            if complete:
+                baseline.listings_by_condition = index
+                baseline.indexed_at = self.baselines.clock()
+
+        result = SyncResult()
+
+        # (listings bucket, position) of each update, for write-through
+        targets: list[tuple[list[Listing], int]] = []
+
+        for condition_id, warehouse_qty in staged.items():
+            bucket = index.get(condition_id, [])
+
+            for position, listing in enumerate(bucket):
+                if not self.policy.should_sync(
+                    listing=listing,
+                    warehouse_qty=warehouse_qty,
+                ):
+                    continue
+
+                result.updates.append(
+                    ListingQuantityUpdate(
+                        sku=listing.sku,
+                        listing_id=listing.listing_id,
+                        qty=self.policy.calc_target_qty(warehouse_qty),
+                    )
+                )
+                targets.append((bucket, position))
+
+        if result.updates:
+            result.failures = await marketplace.update_inventory(result.updates)
+            self._write_through(targets, result.updates, result.failures)
+
+        return result
+
+    async def _build_index(
+        self,
+        marketplace: MarketplacePort,
+        staged: dict[str, int],
+    ) -> tuple[dict[str, list[Listing]], bool]:
+        """
+        Returns the listings by condition_id, and whether that index is
+        complete.
+
+        Once the account has more than `max_index_listings` listings, only
+        those of the `staged` condition_ids are kept: the index serves this
+        delta alone and is not stored.
+        """
+
+        index: dict[str, list[Listing]] = {}
+        size = 0
+        complete = True
+        async for page in marketplace.iter_listings():
+            size += len(page)
+            if complete and size > self.baselines.max_index_listings:
+                complete = False
+                index = {cid: index[cid] for cid in staged if cid in index}
+            for listing in page:
+                if complete or listing.condition_id in staged:
+                    index.setdefault(listing.condition_id, []).append(listing)
+        return index, complete
+
+    @staticmethod
+    def _write_through(
+        targets: list[tuple[list[Listing], int]],
+        updates: list[ListingQuantityUpdate],
+        failures: list[ListingUpdateFailure],
+    ) -> None:
+        rejected = {f.sku for f in failures}
+        for (bucket, position), update in zip(targets, updates, strict=True):
+            if update.sku not in rejected:
+                bucket[position] = replace(bucket[position], marketplace_qty=update.qty)
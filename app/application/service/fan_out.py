@@ -0,0 +1,77 @@
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Awaitable, Callable, Sequence
+from dataclasses import dataclass
+
+from app.application.service.sync_inventory import SyncInventoryService
+from app.domain.inventory import InventorySnapshot
+from app.domain.marketplace import MarketplaceConfig, SyncResult
+
+# Runs one target's sync, e.g. through a SyncCoalescer
+TargetRunner = Callable[
+    [SyncInventoryService, InventorySnapshot], Awaitable[SyncResult]
+]
+
+
+@dataclass(frozen=True, slots=True)
+class TargetOutcome:
+    """Result of one fan-out target; exactly one of result/error is set."""
+
+    config: MarketplaceConfig
+    result: SyncResult | None = None
+    error: str | None = None
+
+
+@dataclass
+class FanOutSyncService:
+    """
+    Syncs one inventory snapshot to several marketplace accounts at once.
+
+    The snapshot is built once and shared read-only by every target. At
+    most `max_concurrency` targets run at a time, and at most
+    `marketplace_concurrency` of them against the same marketplace. A
+    failing target is reported in its outcome and does not affect others.
+
+    Targets are synced by `runner` when one is given, else by their
+    service's `run`.
+    """
+
+    targets: Sequence[SyncInventoryService]
+    max_concurrency: int = 8
+    marketplace_concurrency: int = 4
+    runner: TargetRunner | None = None
+
+    def __post_init__(self) -> None:
+        if self.max_concurrency < 1:
+            raise ValueError("max_concurrency must be >= 1")
+
+        if self.marketplace_concurrency < 1:
+            raise ValueError("marketplace_concurrency must be >= 1")
+
+    async def run(self, inventory: InventorySnapshot) -> list[TargetOutcome]:
+        """Returns one outcome per target, in target order."""
+
+        overall = asyncio.Semaphore(self.max_concurrency)
+        per_marketplace = {
+            service.config.marketplace: asyncio.Semaphore(self.marketplace_concurrency)
+            for service in self.targets
+        }
+
+        async def run_target(service: SyncInventoryService) -> TargetOutcome:
+            async with per_marketplace[service.config.marketplace], overall:
+                try:
+                    if self.runner is None:
+                        result = await service.run(inventory)
+                    else:
+                        result = await self.runner(service, inventory)
+                except Exception as e:
+                    return TargetOutcome(
+                        config=service.config, error=f"{type(e).__name__}: {e}"
+                    )
+            return TargetOutcome(config=service.config, result=result)
+
+        async with asyncio.TaskGroup() as tg:
+            tasks = [tg.create_task(run_target(service)) for service in self.targets]
+
+        return [task.result() for task in tasks]
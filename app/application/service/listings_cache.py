@@ -0,0 +1,243 @@
+from __future__ import annotations
+
+import time
+from collections import OrderedDict
+from collections.abc import AsyncIterator, Callable, Iterable, Sequence
+from dataclasses import dataclass, field
+
+from app.application.ports.marketplaces import MarketplacePort, MarketplacePortFactory
+from app.domain.marketplace import (
+    Listing,
+    ListingBatch,
+    ListingQuantityUpdate,
+    ListingUpdateFailure,
+    MarketplaceConfig,
+)
+
+CacheKey = tuple[str, str]
+
+
+def cache_key(config: MarketplaceConfig) -> CacheKey:
+    return (config.marketplace, config.account)
+
+
+@dataclass(slots=True)
+class _CachedListings:
+    listings: ListingBatch
+    positions: dict[str, int]
+    stored_at: float
+
+
+@dataclass(slots=True)
+class ListingsCache:
+    """
+    In-process snapshot of marketplace listings per (marketplace, account).
+
+    Snapshots are stored as columnar ListingBatch objects. Entries expire
+    after `ttl_s`. Memory is bounded by `max_listings`, the total number of
+    listings held across all accounts: least recently used accounts are
+    evicted first, and a single account larger than the limit is never
+    cached.
+    """
+
+    ttl_s: float = 300.0
+    max_listings: int = 1_000_000
+    clock: Callable[[], float] = time.monotonic
+
+    _entries: OrderedDict[CacheKey, _CachedListings] = field(
+        default_factory=OrderedDict, init=False, repr=False
+    )
+    _size: int = field(default=0, init=False, repr=False)
+
+    def __post_init__(self) -> None:
+        if self.ttl_s <= 0:
+            raise ValueError("ttl_s must be > 0")
+
+        if self.max_listings < 1:
+            raise ValueError("max_listings must be >= 1")
+
+    @property
+    def size(self) -> int:
+        """Total number of cached listings across all accounts."""
+        return self._size
+
+    def get(self, key: CacheKey) -> ListingBatch | None:
+        """Returns cached listings, or None when missing or expired."""
+
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+
+        if self.clock() - entry.stored_at >= self.ttl_s:
+            self._drop(key)
+            return None
+
+        self._entries.move_to_end(key)
+        return entry.listings
+
+    def put(self, key: CacheKey, listings: Sequence[Listing]) -> bool:
+        """Stores a full listings snapshot. Returns False if it does not fit."""
+
+        self._drop(key)
+        if len(listings) > self.max_listings:
+            return False
+
+        batch = (
+            listings
+            if isinstance(listings, ListingBatch)
+            else ListingBatch.from_listings(listings)
+        )
+        self._entries[key] = _CachedListings(
+            listings=batch,
+            positions={sku: i for i, sku in enumerate(batch.skus)},
+            stored_at=self.clock(),
+        )
+        self._size += len(listings)
+
+        while self._size > self.max_listings:
+            oldest = next(iter(self._entries))
+            self._drop(oldest)
+
+        return True
+
+    def apply_updates(
+        self,
+        key: CacheKey,
+        updates: Iterable[ListingQuantityUpdate],
+        failures: Iterable[ListingUpdateFailure] = (),
+    ) -> None:
+        """
+        Writes accepted quantity updates through into the cached listings.
+
+        Rejected SKUs are left untouched, since the marketplace kept its
+        previous quantity for them.
+        """
+
+        entry = self._entries.get(key)
+        if entry is None:
+            return
+
+        # The cache owns its batches (hits hand out copies), so quantities
+        # are updated in place.
+        quantities = entry.listings.marketplace_qtys
+        rejected = {f.sku for f in failures}
+        for update in updates:
+            if update.sku in rejected:
+                continue
+            position = entry.positions.get(update.sku)
+            if position is not None:
+                quantities[position] = update.qty
+
+    def invalidate(self, marketplace: str, account: str) -> bool:
+        """Drops one account's snapshot. Returns True if one was cached."""
+
+        return self._drop((marketplace, account))
+
+    def clear(self) -> None:
+        self._entries.clear()
+        self._size = 0
+
+    def _drop(self, key: CacheKey) -> bool:
+        entry = self._entries.pop(key, None)
+        if entry is None:
+            return False
+        self._size -= len(entry.listings)
+        return True
+
+
+@dataclass(slots=True)
+class CachingMarketplacePort:
+    """
+    MarketplacePort decorator that serves listings from a ListingsCache.
+
+    A cache miss (or `bypass`) streams pages from the wrapped port and
+    stores the complete snapshot once the iteration finishes. Successful
+    updates are written through so the next sync sees current quantities
+    without a refetch; updates sent while a miss is still being fetched
+    are replayed onto the snapshot before it is stored.
+    """
+
+    inner: MarketplacePort
+    cache: ListingsCache
+    key: CacheKey
+    bypass: bool = False
+    page_size: int = 1000
+
+    # updates sent while a cache miss is being collected, with their failures
+    _unstored: (
+        list[tuple[list[ListingQuantityUpdate], list[ListingUpdateFailure]]] | None
+    ) = field(default=None, init=False, repr=False)
+
+    async def fetch_listings(self) -> list[Listing]:
+        listings: list[Listing] = []
+        async for page in self.iter_listings():
+            listings.extend(page)
+        return listings
+
+    async def iter_listings(self) -> AsyncIterator[Sequence[Listing]]:
+        cached = None if self.bypass else self.cache.get(self.key)
+        if cached is not None:
+            # Slices copy the columns, so write-through updates made while
+            # the caller is still iterating cannot change pages it holds.
+            for start in range(0, len(cached), self.page_size):
+                yield cached[start : start + self.page_size]
+            return
+
+        pages: list[Sequence[Listing]] | None = []
+        collected = 0
+        self._unstored = []
+        try:
+            async for page in self.inner.iter_listings():
+                if pages is not None:
+                    pages.append(page)
+                    collected += len(page)
+                    if collected > self.cache.max_listings:
+                        pages = None
+                yield page
+
+            unstored = self._unstored
+            if (
+                pages is not None
+                and unstored is not None
+                and self.cache.put(self.key, ListingBatch.concat(pages))
+            ):
+                for updates, failures in unstored:
+                    self.cache.apply_updates(self.key, updates, failures)
+        finally:
+            self._unstored = None
+
+    async def update_inventory(
+        self,
+        updates: Iterable[ListingQuantityUpdate],
+    ) -> list[ListingUpdateFailure]:
+        batch = list(updates)
+        try:
+            failures = await self.inner.update_inventory(batch)
+        except BaseException:
+            # The marketplace state is unknown after a failed call, and a
+            # snapshot still being fetched must not be stored.
+            self.cache.invalidate(*self.key)
+            self._unstored = None
+            raise
+
+        if self._unstored is not None:
+            self._unstored.append((batch, failures))
+        self.cache.apply_updates(self.key, batch, failures)
+        return failures
+
+
+@dataclass(slots=True)
+class CachingMarketplacePortFactory:
+    """Wraps ports built by another factory with a shared ListingsCache."""
+
+    inner: MarketplacePortFactory
+    cache: ListingsCache
+    bypass: bool = False
+
+    def build(self, config: MarketplaceConfig) -> MarketplacePort:
+        return CachingMarketplacePort(
+            inner=self.inner.build(config),
+            cache=self.cache,
+            key=cache_key(config),
+            bypass=self.bypass,
+        )
@@ -0,0 +1,292 @@
+from __future__ import annotations
+
+import asyncio
+import heapq
+import itertools
+import logging
+import random
+import time
+from collections.abc import Callable, Coroutine
+from dataclasses import dataclass, field
+from enum import StrEnum
+from typing import Any
+
+from app.application.service.coalescing import SyncKey
+from app.domain.marketplace import SyncResult
+
+logger = logging.getLogger(__name__)
+
+ScheduledSync = Callable[[], Coroutine[Any, Any, SyncResult]]
+
+
+class SyncPriority(StrEnum):
+    HIGH = "high"
+    NORMAL = "normal"
+    LOW = "low"
+
+
+# Due schedules start in this order when workers are scarce
+_PRIORITY_RANK = {SyncPriority.HIGH: 0, SyncPriority.NORMAL: 1, SyncPriority.LOW: 2}
+
+
+class ScheduleState(StrEnum):
+    IDLE = "idle"
+    QUEUED = "queued"
+    RUNNING = "running"
+
+
+@dataclass(frozen=True, slots=True)
+class SyncSchedule:
+    """A full sync of one account, run every `interval_s` seconds."""
+
+    marketplace: str
+    account: str
+    interval_s: float
+    sync: ScheduledSync
+    priority: SyncPriority = SyncPriority.NORMAL
+
+    def __post_init__(self) -> None:
+        if self.interval_s <= 0:
+            raise ValueError("interval_s must be > 0")
+
+    @property
+    def key(self) -> SyncKey:
+        return (self.marketplace, self.account)
+
+
+@dataclass(frozen=True, slots=True)
+class ScheduleStats:
+    marketplace: str
+    account: str
+    priority: SyncPriority
+    interval_s: float
+    paused: bool
+    state: ScheduleState
+    # seconds until the next timed run; None while paused, queued or running
+    next_run_in_s: float | None
+    runs: int
+    failures: int
+    last_duration_s: float | None
+    # on the scheduler's clock, like its due times
+    last_finished_at: float | None
+    last_error: str | None
+
+
+@dataclass(slots=True)
+class _Entry:
+    schedule: SyncSchedule
+    paused: bool = False
+    state: ScheduleState = ScheduleState.IDLE
+    due_at: float | None = None
+    # bumped whenever the entry is re-armed, paused or triggered, so timer
+    # and queue items from before are ignored
+    generation: int = 0
+
+    runs: int = 0
+    failures: int = 0
+    last_duration_s: float | None = None
+    last_finished_at: float | None = None
+    last_error: str | None = None
+
+
+@dataclass(slots=True)
+class SyncScheduler:
+    """
+    Runs registered account syncs on their intervals.
+
+    First runs are spread uniformly over each schedule's interval, and every
+    later interval is stretched or shrunk by up to `jitter` (a fraction), so
+    accounts registered together do not sync in lockstep. At most
+    `max_concurrency` syncs run at once; when more are due, higher priority
+    schedules start first, then the ones due longest.
+
+    The next run is timed from the start of the previous one. A schedule
+    never overlaps itself: a run due while the previous one is still
+    going starts once it finishes.
+    """
+
+    max_concurrency: int = 4
+    jitter: float = 0.1
+    clock: Callable[[], float] = time.monotonic
+    rng: random.Random = field(default_factory=random.Random)
+
+    _entries: dict[SyncKey, _Entry] = field(
+        default_factory=dict, init=False, repr=False
+    )
+    # (due_at, generation, key)
+    _timers: list[tuple[float, int, SyncKey]] = field(
+        default_factory=list, init=False, repr=False
+    )
+    # (priority rank, due_at, sequence, generation, key)
+    _ready: asyncio.PriorityQueue[tuple[int, float, int, int, SyncKey]] = field(
+        default_factory=asyncio.PriorityQueue, init=False, repr=False
+    )
+    _sequence: itertools.count[int] = field(
+        default_factory=itertools.count, init=False, repr=False
+    )
+    _wake: asyncio.Event = field(default_factory=asyncio.Event, init=False, repr=False)
+    _tasks: list[asyncio.Task[None]] = field(
+        default_factory=list, init=False, repr=False
+    )
+
+    def __post_init__(self) -> None:
+        if self.max_concurrency < 1:
+            raise ValueError("max_concurrency must be >= 1")
+
+        if not 0.0 <= self.jitter < 1.0:
+            raise ValueError("jitter must be >= 0 and < 1")
+
+    def register(self, schedule: SyncSchedule) -> None:
+        if schedule.key in self._entries:
+            raise ValueError(f"Schedule already registered: {schedule.key}")
+
+        entry = self._entries[schedule.key] = _Entry(schedule)
+        self._arm(entry, self.clock() + self.rng.uniform(0, schedule.interval_s))
+
+    async def start(self) -> None:
+        self._tasks.append(asyncio.create_task(self._dispatch(), name="sync-scheduler"))
+        for i in range(self.max_concurrency):
+            self._tasks.append(
+                asyncio.create_task(self._work(), name=f"sync-scheduler-{i}")
+            )
+
+    async def stop(self) -> None:
+        """Cancels the dispatcher and the syncs that are running."""
+
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks.clear()
+
+    def stats(self) -> list[ScheduleStats]:
+        return [self._stats(entry) for entry in self._entries.values()]
+
+    def pause(self, key: SyncKey) -> ScheduleStats:
+        """Stops timed runs of `key`; a run already going on completes."""
+
+        entry = self._entry(key)
+        entry.paused = True
+        entry.generation += 1
+        entry.due_at = None
+        if entry.state == ScheduleState.QUEUED:
+            entry.state = ScheduleState.IDLE
+        return self._stats(entry)
+
+    def resume(self, key: SyncKey) -> ScheduleStats:
+        """Restarts timed runs of `key`, the first one an interval from now."""
+
+        entry = self._entry(key)
+        if entry.paused:
+            entry.paused = False
+            if entry.state == ScheduleState.IDLE:
+                self._arm(entry, self.clock() + self._interval(entry.schedule))
+        return self._stats(entry)
+
+    def trigger(self, key: SyncKey) -> ScheduleStats:
+        """
+        Queues a run of `key` now, paused or not, unless one is already
+        queued or running.
+        """
+
+        entry = self._entry(key)
+        if entry.state == ScheduleState.IDLE:
+            entry.generation += 1
+            self._enqueue(entry, self.clock())
+        return self._stats(entry)
+
+    def _entry(self, key: SyncKey) -> _Entry:
+        entry = self._entries.get(key)
+        if entry is None:
+            raise KeyError(key)
+        return entry
+
+    def _stats(self, entry: _Entry) -> ScheduleStats:
+        schedule = entry.schedule
+        next_run_in_s = None
+        if entry.due_at is not None:
+            next_run_in_s = max(0.0, entry.due_at - self.clock())
+
+        return ScheduleStats(
+            marketplace=schedule.marketplace,
+            account=schedule.account,
+            priority=schedule.priority,
+            interval_s=schedule.interval_s,
+            paused=entry.paused,
+            state=entry.state,
+            next_run_in_s=next_run_in_s,
+            runs=entry.runs,
+            failures=entry.failures,
+            last_duration_s=entry.last_duration_s,
+            last_finished_at=entry.last_finished_at,
+            last_error=entry.last_error,
+        )
+
+    def _interval(self, schedule: SyncSchedule) -> float:
+        return schedule.interval_s * (1 + self.rng.uniform(-self.jitter, self.jitter))
+
+    def _arm(self, entry: _Entry, due_at: float) -> None:
+        entry.generation += 1
+        entry.due_at = due_at
+        heapq.heappush(self._timers, (due_at, entry.generation, entry.schedule.key))
+        self._wake.set()
+
+    def _enqueue(self, entry: _Entry, due_at: float) -> None:
+        entry.state = ScheduleState.QUEUED
+        entry.due_at = None
+        rank = _PRIORITY_RANK[entry.schedule.priority]
+        self._ready.put_nowait(
+            (
+                rank,
+                due_at,
+                next(self._sequence),
+                entry.generation,
+                entry.schedule.key,
+            )
+        )
+
+    async def _dispatch(self) -> None:
+        """Moves schedules whose time has come to the ready queue."""
+
+        timers = self._timers
+        while True:
+            now = self.clock()
+            while timers and timers[0][0] <= now:
+                due_at, generation, key = heapq.heappop(timers)
+                entry = self._entries[key]
+                if generation == entry.generation and not entry.paused:
+                    self._enqueue(entry, due_at)
+
+            self._wake.clear()
+            timeout = timers[0][0] - now if timers else None
+            try:
+                await asyncio.wait_for(self._wake.wait(), timeout)
+            except TimeoutError:
+                pass
+
+    async def _work(self) -> None:
+        while True:
+            _, _, _, generation, key = await self._ready.get()
+            entry = self._entries[key]
+            if generation != entry.generation or entry.state != ScheduleState.QUEUED:
+                continue
+
+            entry.state = ScheduleState.RUNNING
+            started = self.clock()
+            try:
+                await entry.schedule.sync()
+            except Exception as e:
+                logger.exception("Scheduled sync of %s failed", key)
+                entry.failures += 1
+                entry.last_error = f"{type(e).__name__}: {e}"
+            else:
+                entry.last_error = None
+            finally:
+                entry.state = ScheduleState.IDLE
+                entry.runs += 1
+                entry.last_duration_s = self.clock() - started
+                entry.last_finished_at = self.clock()
+
+            if not entry.paused:
+                self._arm(
+                    entry, max(self.clock(), started + self._interval(entry.schedule))
+                )
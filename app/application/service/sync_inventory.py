@@ -1,15 +1,65 @@
 from __future__ import annotations
 
+import asyncio
+import time
+from collections.abc import Awaitable, Callable, Coroutine, Iterator, Sequence
 from dataclasses import dataclass
+from typing import Any
 
-from app.application.ports.marketplaces import MarketplacePortFactory
-from app.domain.inventory import InventoryKey, InventorySnapshot
+from app.application.ports.marketplaces import MarketplacePort, MarketplacePortFactory
+from app.application.ports.metrics import SyncMetrics, SyncPhase
+from app.application.ports.warehouse import WarehouseInventoryPort
+from app.application.service.tracing import record_span, span
+from app.domain.inventory import InventorySnapshot
 from app.domain.marketplace import (
+    HAS_NUMPY,
+    Listing,
+    ListingBatch,
     ListingQuantityUpdate,
+    ListingUpdateFailure,
     MarketplaceConfig,
     MarketplacePolicy,
+    SkipReason,
+    SyncResult,
 )
 
+# Receives each update batch once sent, with the failures reported for it
+UpdateBatchListener = Callable[
+    [Sequence[ListingQuantityUpdate], Sequence[ListingUpdateFailure]],
+    Awaitable[None],
+]
+
+
+@dataclass(slots=True)
+class _StageTimes:
+    fetch_s: float = 0.0
+    evaluate_s: float = 0.0
+    update_s: float = 0.0
+    sent: int = 0
+    failed: int = 0
+
+
+async def _run_stages(*stages: Coroutine[Any, Any, None]) -> None:
+    """
+    Runs pipeline stages concurrently until all finish or one fails.
+
+    The first failure cancels the other stages, which might otherwise
+    wait forever on a queue the failed stage no longer serves, and is
+    raised as is.
+    """
+
+    tasks = [asyncio.create_task(stage) for stage in stages]
+    try:
+        done, _ = await asyncio.wait(tasks, return_when=asyncio.FIRST_EXCEPTION)
+    finally:
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+    for task in tasks:
+        if task in done and (exc := task.exception()) is not None:
+            raise exc
+
 
 @dataclass
 class SyncInventoryService:
@@ -19,6 +69,32 @@ class SyncInventoryService:
     config: MarketplaceConfig
     policy: MarketplacePolicy
 
+    # Evaluate listing pages with MarketplacePolicy.evaluate_batch (NumPy)
+    # instead of calling the scalar policy methods once per listing.
+    batch_evaluation: bool = HAS_NUMPY
+
+    metrics: SyncMetrics | None = None
+
+    # Updates per update_inventory call. Batches are sent while later pages
+    # are still being fetched and evaluated.
+    update_batch_size: int = 1000
+
+    # Pipeline queue bounds: fetched pages waiting to be evaluated, and
+    # full update batches waiting to be sent. A full queue holds the stage
+    # before it back, so memory stays bounded however large the account.
+    pipeline_pages: int = 4
+    pipeline_batches: int = 2
+
+    def __post_init__(self) -> None:
+        if self.update_batch_size < 1:
+            raise ValueError("update_batch_size must be >= 1")
+
+        if self.pipeline_pages < 1:
+            raise ValueError("pipeline_pages must be >= 1")
+
+        if self.pipeline_batches < 1:
+            raise ValueError("pipeline_batches must be >= 1")
+
     async def sync(
         self,
         inventory: InventorySnapshot,
@@ -29,33 +105,257 @@ class SyncInventoryService:
         Returns a list of updates that were sent to the marketplace.
         """
 
+        result = await self.run(inventory)
+        return result.updates
+
+    async def run(
+        self,
+        inventory: InventorySnapshot,
+        on_update_batch: UpdateBatchListener | None = None,
+        update_batch_size: int | None = None,
+    ) -> SyncResult:
+        """
+        Synchronizes warehouse inventory to marketplace.
+
+        Returns the updates that were sent together with the ones the
+        marketplace rejected.
+
+        Fetching, evaluation and sending run as a pipeline: pages are
+        evaluated as they arrive, and updates go out in batches of
+        `update_batch_size` (the service's by default) as soon as a batch
+        fills, so a sync takes about as long as its slowest stage.
+
+        With `on_update_batch`, each batch also goes to the listener once
+        sent, and the result carries only the counts, so memory stays
+        bounded by the pipeline however many updates the sync makes.
+        """
+
+        batch_size = (
+            self.update_batch_size if update_batch_size is None else update_batch_size
+        )
+        if batch_size < 1:
+            raise ValueError("update_batch_size must be >= 1")
+
+        with span(
+            "sync_inventory",
+            marketplace=self.config.marketplace,
+            account=self.config.account,
+            inventory_rows=len(inventory),
+        ):
+            return await self._run(inventory, on_update_batch, batch_size)
+
+    async def run_from(
+        self,
+        warehouse: WarehouseInventoryPort,
+        on_update_batch: UpdateBatchListener | None = None,
+        update_batch_size: int | None = None,
+    ) -> SyncResult:
+        """Loads a snapshot from `warehouse` and runs a sync against it."""
+
+        started = time.perf_counter()
+        inventory = await warehouse.load_snapshot()
+        if self.metrics is not None:
+            self.metrics.observe_phase(
+                self.config.marketplace,
+                SyncPhase.SNAPSHOT_BUILD,
+                time.perf_counter() - started,
+                len(inventory),
+            )
+
+        return await self.run(inventory, on_update_batch, update_batch_size)
+
+    async def _run(
+        self,
+        inventory: InventorySnapshot,
+        on_update_batch: UpdateBatchListener | None,
+        update_batch_size: int,
+    ) -> SyncResult:
         marketplace = self.marketplace_factory.build(self.config)
 
-        listings = await marketplace.fetch_listings()
+        result = SyncResult()
+        times = _StageTimes()
+        # None marks the end of each queue
+        pages: asyncio.Queue[Sequence[Listing] | None] = asyncio.Queue(
+            self.pipeline_pages
+        )
+        batches: asyncio.Queue[list[ListingQuantityUpdate] | None] = asyncio.Queue(
+            self.pipeline_batches
+        )
 
-        updates: list[ListingQuantityUpdate] = []
+        await _run_stages(
+            self._fetch(marketplace, pages),
+            self._evaluate(
+                inventory,
+                pages,
+                batches,
+                update_batch_size,
+                result,
+                times,
+                keep_updates=on_update_batch is None,
+            ),
+            self._submit(marketplace, batches, on_update_batch, result, times),
+        )
 
-        for listing in listings:
-            key = InventoryKey(condition_id=listing.condition_id)
-            warehouse_qty = inventory.get_qty(key)
+        if self.metrics is not None:
+            self._record(self.metrics, times, result)
 
-            if not self.policy.should_sync(
-                listing=listing,
-                warehouse_qty=warehouse_qty,
-            ):
-                continue
+        return result
+
+    @staticmethod
+    async def _fetch(
+        marketplace: MarketplacePort,
+        pages: asyncio.Queue[Sequence[Listing] | None],
+    ) -> None:
+        async for page in marketplace.iter_listings():
+            await pages.put(page)
+        await pages.put(None)
 
-            target_qty = self.policy.calc_target_qty(warehouse_qty=warehouse_qty)
+    async def _evaluate(
+        self,
+        inventory: InventorySnapshot,
+        pages: asyncio.Queue[Sequence[Listing] | None],
+        batches: asyncio.Queue[list[ListingQuantityUpdate] | None],
+        update_batch_size: int,
+        result: SyncResult,
+        times: _StageTimes,
+        keep_updates: bool,
+    ) -> None:
+        clock = time.perf_counter
+        get_qty = inventory.get_qty_by_id
+        pending: list[ListingQuantityUpdate] = []
 
-            updates.append(
-                ListingQuantityUpdate(
-                    sku=listing.sku,
-                    listing_id=listing.listing_id,
-                    qty=target_qty,
+        # Fetch time is the time spent waiting for the next page.
+        mark = clock()
+        page_no = 0
+        while (page := await pages.get()) is not None:
+            started = clock()
+            times.fetch_s += started - mark
+            page_no += 1
+            record_span("fetch_page", mark, started, page=page_no, rows=len(page))
+
+            batch = (
+                page
+                if isinstance(page, ListingBatch)
+                else ListingBatch.from_listings(page)
+            )
+            warehouse_qtys = [get_qty(c) for c in batch.condition_ids]
+            queued = len(pending)
+
+            rows = self._evaluate_batch(batch, warehouse_qtys, result.skipped)
+            for row, target_qty in rows:
+                pending.append(
+                    ListingQuantityUpdate(
+                        sku=batch.skus[row],
+                        listing_id=batch.listing_ids[row],
+                        qty=target_qty,
+                    )
                 )
+
+            result.evaluated += len(batch)
+            mark = clock()
+            times.evaluate_s += mark - started
+            record_span(
+                "evaluate",
+                started,
+                mark,
+                page=page_no,
+                rows=len(batch),
+                updates=len(pending) - queued,
+            )
+
+            while len(pending) >= update_batch_size:
+                ready = pending[:update_batch_size]
+                del pending[:update_batch_size]
+                if keep_updates:
+                    result.updates.extend(ready)
+                await batches.put(ready)
+            mark = clock()
+        times.fetch_s += clock() - mark
+
+        if pending:
+            if keep_updates:
+                result.updates.extend(pending)
+            await batches.put(pending)
+        await batches.put(None)
+
+    async def _submit(
+        self,
+        marketplace: MarketplacePort,
+        batches: asyncio.Queue[list[ListingQuantityUpdate] | None],
+        on_update_batch: UpdateBatchListener | None,
+        result: SyncResult,
+        times: _StageTimes,
+    ) -> None:
+        clock = time.perf_counter
+        while (batch := await batches.get()) is not None:
+            started = clock()
+            failures = await self._send_updates(marketplace, batch)
+            times.update_s += clock() - started
+            times.sent += len(batch)
+            times.failed += len(failures)
+
+            if on_update_batch is None:
+                result.failures.extend(failures)
+            else:
+                await on_update_batch(batch, failures)
+
+    @staticmethod
+    async def _send_updates(
+        marketplace: MarketplacePort,
+        updates: list[ListingQuantityUpdate],
+    ) -> list[ListingUpdateFailure]:
+        with span("update_inventory", updates=len(updates)) as update:
+            failures = await marketplace.update_inventory(updates=updates)
+            update.set("failures", len(failures))
+        return failures
+
+    def _record(
+        self,
+        metrics: SyncMetrics,
+        times: _StageTimes,
+        result: SyncResult,
+    ) -> None:
+        market = self.config.marketplace
+        rows = result.evaluated
+
+        metrics.observe_phase(market, SyncPhase.FETCH_LISTINGS, times.fetch_s, rows)
+        metrics.observe_phase(market, SyncPhase.EVALUATE, times.evaluate_s, rows)
+        if times.sent:
+            metrics.observe_phase(
+                market, SyncPhase.UPDATE_INVENTORY, times.update_s, times.sent
             )
+        metrics.count_updates(market, sent=times.sent, failed=times.failed)
 
-        if updates:
-            await marketplace.update_inventory(updates=updates)
+    def _evaluate_batch(
+        self,
+        batch: ListingBatch,
+        warehouse_qtys: Sequence[int],
+        skipped: dict[SkipReason, int],
+    ) -> Iterator[tuple[int, int]]:
+        """
+        Yields (row, target_qty) for every listing row that should sync.
+
+        Rows that should not are counted into `skipped` by reason.
+        """
+
+        if self.batch_evaluation and HAS_NUMPY:
+            mask, targets, counts = self.policy.evaluate_batch(
+                batch.marketplace_qtys,
+                warehouse_qtys,
+                with_skips=True,
+            )
+            for skip, n in counts.items():
+                skipped[skip] = skipped.get(skip, 0) + n
+            for row in mask.nonzero()[0].tolist():
+                yield row, int(targets[row])
+            return
+
+        rows = zip(batch.marketplace_qtys, warehouse_qtys, strict=True)
+        skip_reason = self.policy.skip_reason
+        for row, (marketplace_qty, warehouse_qty) in enumerate(rows):
+            reason = skip_reason(marketplace_qty, warehouse_qty)
+            if reason is not None:
+                skipped[reason] = skipped.get(reason, 0) + 1
+                continue
 
-        return updates
+            yield row, self.policy.calc_target_qty(warehouse_qty=warehouse_qty)
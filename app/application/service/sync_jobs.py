@@ -0,0 +1,109 @@
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import logging
+from collections.abc import Awaitable, Callable, Mapping
+from dataclasses import dataclass, field
+
+from app.application.ports.jobs import SyncJob, SyncJobQueue
+from app.domain.marketplace import SyncResult
+
+logger = logging.getLogger(__name__)
+
+SyncJobRunner = Callable[[SyncJob], Awaitable[SyncResult]]
+
+
+@dataclass(slots=True)
+class SyncJobWorkerPool:
+    """
+    In-process asyncio workers that drain a SyncJobQueue.
+
+    Each marketplace gets its own `concurrency[marketplace]` workers, so a
+    slow marketplace cannot starve the others. Idle workers wake up when
+    `notify` is called for their marketplace, or after `poll_interval_s`
+    to pick up jobs queued by a previous process.
+    """
+
+    queue: SyncJobQueue
+    runner: SyncJobRunner
+    concurrency: Mapping[str, int]
+    poll_interval_s: float = 1.0
+
+    _wakeups: dict[str, asyncio.Event] = field(
+        default_factory=dict, init=False, repr=False
+    )
+    _tasks: list[asyncio.Task[None]] = field(
+        default_factory=list, init=False, repr=False
+    )
+
+    def __post_init__(self) -> None:
+        for marketplace, workers in self.concurrency.items():
+            if workers < 1:
+                raise ValueError(f"concurrency for {marketplace} must be >= 1")
+
+        if self.poll_interval_s <= 0:
+            raise ValueError("poll_interval_s must be > 0")
+
+    def serves(self, marketplace: str) -> bool:
+        return marketplace in self.concurrency
+
+    async def start(self) -> None:
+        """Requeues interrupted jobs and starts the workers."""
+
+        requeued = await self.queue.requeue_running()
+        if requeued:
+            logger.info("Requeued %d interrupted sync jobs", requeued)
+
+        for marketplace, workers in self.concurrency.items():
+            self._wakeups[marketplace] = asyncio.Event()
+            for i in range(workers):
+                self._tasks.append(
+                    asyncio.create_task(
+                        self._work(marketplace),
+                        name=f"sync-worker-{marketplace}-{i}",
+                    )
+                )
+
+    async def stop(self) -> None:
+        """
+        Cancels the workers. Jobs they were running stay RUNNING and are
+        requeued by the next `start`.
+        """
+
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks.clear()
+
+    def notify(self, marketplace: str) -> None:
+        """Wakes idle workers after a job was queued for `marketplace`."""
+
+        wakeup = self._wakeups.get(marketplace)
+        if wakeup is not None:
+            wakeup.set()
+
+    async def _work(self, marketplace: str) -> None:
+        wakeup = self._wakeups[marketplace]
+        while True:
+            # Cleared before claiming, so a notify() racing with an empty
+            # claim still wakes this worker.
+            wakeup.clear()
+            job = await self.queue.claim(marketplace)
+            if job is None:
+                with contextlib.suppress(TimeoutError):
+                    await asyncio.wait_for(wakeup.wait(), self.poll_interval_s)
+                continue
+
+            await self._run(job)
+
+    async def _run(self, job: SyncJob) -> None:
+        try:
+            result = await self.runner(job)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.exception("Sync job %s failed", job.id)
+            await self.queue.fail(job.id, f"{type(e).__name__}: {e}")
+        else:
+            await self.queue.complete(job.id, result)
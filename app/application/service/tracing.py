@@ -0,0 +1,221 @@
+from __future__ import annotations
+
+import random
+import time
+from collections.abc import Sequence
+from contextvars import ContextVar, Token
+from dataclasses import dataclass, field
+from types import TracebackType
+from typing import Any
+
+from app.application.ports.tracing import Span, SpanExporter
+
+
+class _Trace:
+    """Spans collected for one sampled trace until its root span ends."""
+
+    __slots__ = ("anchor_perf", "anchor_wall", "exporters", "rng", "spans", "trace_id")
+
+    def __init__(self, exporters: Sequence[SpanExporter], rng: random.Random) -> None:
+        self.trace_id = f"{rng.getrandbits(128):032x}"
+        self.exporters = exporters
+        self.rng = rng
+        self.spans: list[Span] = []
+        # maps perf_counter() readings to wall-clock time
+        self.anchor_wall = time.time()
+        self.anchor_perf = time.perf_counter()
+
+    def new_span_id(self) -> str:
+        return f"{self.rng.getrandbits(64):016x}"
+
+    def add(
+        self,
+        span_id: str,
+        parent_id: str | None,
+        name: str,
+        start: float,
+        end: float,
+        attributes: dict[str, Any],
+        error: str | None = None,
+    ) -> None:
+        self.spans.append(
+            Span(
+                trace_id=self.trace_id,
+                span_id=span_id,
+                parent_id=parent_id,
+                name=name,
+                start_time=self.anchor_wall + (start - self.anchor_perf),
+                duration_s=end - start,
+                attributes=attributes,
+                error=error,
+            )
+        )
+
+
+class ActiveSpan:
+    """A span that is still running; attributes can be added until it ends."""
+
+    __slots__ = ("attributes", "name", "parent_id", "span_id", "start", "trace")
+
+    def __init__(
+        self,
+        trace: _Trace,
+        name: str,
+        parent_id: str | None,
+        attributes: dict[str, Any],
+    ) -> None:
+        self.trace = trace
+        self.name = name
+        self.span_id = trace.new_span_id()
+        self.parent_id = parent_id
+        self.attributes = attributes
+        self.start = time.perf_counter()
+
+    @property
+    def trace_id(self) -> str | None:
+        return self.trace.trace_id
+
+    def set(self, key: str, value: Any) -> None:
+        self.attributes[key] = value
+
+
+class _NoopSpan:
+    """Stands in for a span when the current request is not sampled."""
+
+    __slots__ = ()
+
+    trace_id: str | None = None
+
+    def set(self, key: str, value: Any) -> None:
+        pass
+
+
+NOOP_SPAN = _NoopSpan()
+
+# What `span` and `Tracer.trace` scopes yield
+TraceSpan = ActiveSpan | _NoopSpan
+
+_active: ContextVar[ActiveSpan | None] = ContextVar("active_span", default=None)
+
+
+class _SpanScope:
+    __slots__ = ("root", "span", "token")
+
+    def __init__(self, span: ActiveSpan, root: bool) -> None:
+        self.span = span
+        self.root = root
+        self.token: Token[ActiveSpan | None] | None = None
+
+    def __enter__(self) -> ActiveSpan:
+        self.token = _active.set(self.span)
+        return self.span
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc: BaseException | None,
+        tb: TracebackType | None,
+    ) -> None:
+        if self.token is not None:
+            _active.reset(self.token)
+
+        span = self.span
+        trace = span.trace
+        error = None if exc_type is None else f"{exc_type.__name__}: {exc}"
+        trace.add(
+            span.span_id,
+            span.parent_id,
+            span.name,
+            span.start,
+            time.perf_counter(),
+            span.attributes,
+            error,
+        )
+
+        if self.root:
+            # The root span ends last, but is exported first.
+            spans = [trace.spans[-1], *trace.spans[:-1]]
+            for exporter in trace.exporters:
+                exporter.export(spans)
+
+
+class _NoopScope:
+    __slots__ = ()
+
+    def __enter__(self) -> _NoopSpan:
+        return NOOP_SPAN
+
+    def __exit__(self, *exc_info: object) -> None:
+        pass
+
+
+_NOOP_SCOPE = _NoopScope()
+
+
+@dataclass(slots=True)
+class Tracer:
+    """
+    Request-scoped, in-process tracing.
+
+    `trace` starts a root span for a sampled fraction of calls; `span` and
+    `record_span` add child spans anywhere below it through a context
+    variable, so traced code does not pass the tracer around. Outside a
+    sampled trace they cost one context variable lookup. Spans of a trace
+    go to the exporters once its root span ends.
+    """
+
+    exporters: Sequence[SpanExporter] = ()
+    sample_rate: float = 0.01
+    rng: random.Random = field(default_factory=random.Random)
+
+    def __post_init__(self) -> None:
+        if not 0.0 <= self.sample_rate <= 1.0:
+            raise ValueError("sample_rate must be between 0 and 1")
+
+    def trace(
+        self,
+        name: str,
+        sampled: bool | None = None,
+        **attributes: Any,
+    ) -> _SpanScope | _NoopScope:
+        """Starts a trace; `sampled` overrides the sampling decision."""
+
+        if sampled is None:
+            sampled = self.rng.random() < self.sample_rate
+        if not sampled or not self.exporters:
+            return _NOOP_SCOPE
+
+        trace = _Trace(self.exporters, self.rng)
+        return _SpanScope(ActiveSpan(trace, name, None, attributes), root=True)
+
+
+def span(name: str, **attributes: Any) -> _SpanScope | _NoopScope:
+    """Opens a child span of the current span, if a trace is being recorded."""
+
+    parent = _active.get()
+    if parent is None:
+        return _NOOP_SCOPE
+    return _SpanScope(
+        ActiveSpan(parent.trace, name, parent.span_id, attributes), root=False
+    )
+
+
+def record_span(name: str, start: float, end: float, **attributes: Any) -> None:
+    """
+    Adds an already finished child span, timed with `time.perf_counter`.
+
+    For operations that cannot be wrapped in `span`, such as waiting for
+    the next item of an async iterator.
+    """
+
+    parent = _active.get()
+    if parent is None:
+        return
+    trace = parent.trace
+    trace.add(trace.new_span_id(), parent.span_id, name, start, end, attributes)
+
+
+def tracing_active() -> bool:
+    """Whether the current code runs inside a recorded trace."""
+
+    return _active.get() is not None
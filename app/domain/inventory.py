@@ -1,7 +1,9 @@
 from __future__ import annotations
 
-from collections.abc import ItemsView, Mapping
+import sys
+from collections.abc import ItemsView, Iterable, Iterator, Mapping, Sequence
 from dataclasses import dataclass
+from types import MappingProxyType
 
 
 @dataclass(frozen=True, slots=True)
@@ -58,25 +60,50 @@ class InventoryItem:
         self._quantity += amount
 
 
+class _SnapshotItems(Mapping[InventoryKey, InventoryItem]):
+    """Read-only Mapping adapter that builds keys and items on access."""
+
+    __slots__ = ("_quantities",)
+
+    def __init__(self, quantities: Mapping[str, int]) -> None:
+        self._quantities = quantities
+
+    def __getitem__(self, key: InventoryKey) -> InventoryItem:
+        quantity = self._quantities[key.condition_id]
+        return InventoryItem(_key=key, _quantity=quantity)
+
+    def __iter__(self) -> Iterator[InventoryKey]:
+        return (InventoryKey(condition_id=c) for c in self._quantities)
+
+    def __len__(self) -> int:
+        return len(self._quantities)
+
+
 @dataclass(frozen=True, slots=True)
 class InventorySnapshot:
     """
     Aggregated, read-only view of warehouse inventory.
 
-    The snapshot owns a copy of the mapping structure (dict),
-    but values (InventoryItem) are not deep-copied.
+    Quantities are stored compactly as interned condition_id -> int, so a
+    row costs one dict slot instead of an InventoryKey plus an
+    InventoryItem. Keys and items are only materialized by `items()`.
     """
 
-    _items: Mapping[InventoryKey, InventoryItem]
+    _quantities: Mapping[str, int]
 
     @classmethod
     def from_items(
         cls,
-        items: dict[InventoryKey, InventoryItem],
+        items: Mapping[InventoryKey, InventoryItem],
     ) -> InventorySnapshot:
-        """Creates a snapshot with a copy of the given mapping."""
+        """Creates a snapshot from a copy of the given items' quantities."""
 
-        return cls(_items=dict(items))
+        return cls(
+            _quantities={
+                sys.intern(key.condition_id): item.quantity
+                for key, item in items.items()
+            }
+        )
 
     def get_qty(self, key: InventoryKey) -> int:
         """
@@ -87,12 +114,100 @@ class InventorySnapshot:
         data is treated as zero available quantity.
         """
 
-        item = self._items.get(key)
-        if item is None:
-            return 0
-        return item.quantity
+        return self._quantities.get(key.condition_id, 0)
+
+    def get_qty_by_id(self, condition_id: str) -> int:
+        """Same as `get_qty`, without allocating an InventoryKey."""
+
+        return self._quantities.get(condition_id, 0)
+
+    def quantities(self) -> Mapping[str, int]:
+        """Returns a read-only condition_id -> quantity view."""
+
+        return MappingProxyType(self._quantities)
 
     def items(self) -> ItemsView[InventoryKey, InventoryItem]:
-        """Returns a live view of snapshot items."""
+        """Returns a lazy view of snapshot items."""
+
+        return _SnapshotItems(self._quantities).items()
+
+    def __len__(self) -> int:
+        return len(self._quantities)
+
+
+class InventorySnapshotBuilder:
+    """
+    Accumulates warehouse rows into an InventorySnapshot.
+
+    Rows sharing a condition_id are summed. Each condition_id is interned
+    and stored once, and `build()` hands the accumulated dict over to the
+    snapshot without copying it.
+    """
+
+    __slots__ = ("_quantities",)
+
+    def __init__(self) -> None:
+        self._quantities: dict[str, int] = {}
+
+    def add(self, condition_id: str, quantity: int) -> None:
+        """Adds one row; raises ValueError on invalid data."""
+
+        if not condition_id:
+            raise ValueError("condition_id must not be empty")
+
+        if quantity < 0:
+            raise ValueError("quantity must be >= 0")
+
+        quantities = self._quantities
+        current = quantities.get(condition_id)
+        if current is None:
+            quantities[sys.intern(condition_id)] = quantity
+        else:
+            quantities[condition_id] = current + quantity
+
+    def add_many(self, rows: Iterable[tuple[str, int]]) -> None:
+        for condition_id, quantity in rows:
+            self.add(condition_id, quantity)
+
+    def add_columns(
+        self,
+        condition_ids: Sequence[str],
+        quantities: Sequence[int],
+    ) -> None:
+        """
+        Adds rows given as parallel columns; raises ValueError on invalid data.
+
+        Both columns are validated as a whole before any row is added, so
+        the per-row loop does no checks and a failed call adds nothing.
+        """
+
+        if len(condition_ids) != len(quantities):
+            raise ValueError("condition_ids and quantities must be equal length")
+
+        if "" in condition_ids:
+            row = list(condition_ids).index("")
+            raise ValueError(f"row {row}: condition_id must not be empty")
+
+        if quantities and min(quantities) < 0:
+            row = next(i for i, q in enumerate(quantities) if q < 0)
+            raise ValueError(f"row {row}: quantity must be >= 0")
+
+        totals = self._quantities
+        get = totals.get
+        intern = sys.intern
+        for condition_id, quantity in zip(condition_ids, quantities, strict=True):
+            current = get(condition_id)
+            if current is None:
+                totals[intern(condition_id)] = quantity
+            else:
+                totals[condition_id] = current + quantity
+
+    def build(self) -> InventorySnapshot:
+        """Returns the snapshot and leaves the builder empty."""
+
+        snapshot = InventorySnapshot(_quantities=self._quantities)
+        self._quantities = {}
+        return snapshot
 
-        return self._items.items()
+    def __len__(self) -> int:
+        return len(self._quantities)
@@ -1,6 +1,19 @@
 from __future__ import annotations
 
-from dataclasses import dataclass
+import math
+import sys
+from array import array
+from collections.abc import Iterable, Iterator, Sequence
+from dataclasses import dataclass, field
+from enum import StrEnum
+from typing import Any, Literal, overload
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - exercised only without numpy
+    np = None  # type: ignore[assignment]
+
+HAS_NUMPY = np is not None
 
 
 @dataclass(frozen=True, slots=True)
@@ -64,6 +77,165 @@ class Listing:
             raise ValueError("marketplace_qty must be >= 0")
 
 
+@dataclass(frozen=True, slots=True, eq=False)
+class ListingBatch(Sequence[Listing]):
+    """
+    Columnar page of marketplace listings.
+
+    Stores parallel columns instead of one Listing object per row:
+    quantities and prices live in typed arrays, condition_ids are interned
+    so repeated ids share one string. Rows are validated once per batch,
+    and indexing or iterating yields Listing objects lazily, so code that
+    expects `Sequence[Listing]` keeps working. Prices use NaN for "no price".
+    """
+
+    skus: list[str]
+    condition_ids: list[str]
+    marketplace_qtys: array[int]
+    listing_ids: list[str | None]
+    prices: array[float]
+
+    @classmethod
+    def from_columns(
+        cls,
+        skus: Iterable[str],
+        condition_ids: Iterable[str],
+        marketplace_qtys: Iterable[int],
+        listing_ids: Iterable[str | None] | None = None,
+        prices: Iterable[float | None] | None = None,
+    ) -> ListingBatch:
+        """Builds a batch from column data, validating all rows in one pass."""
+
+        sku_col = list(skus)
+        condition_col = [sys.intern(c) for c in condition_ids]
+        qty_col = array("q", marketplace_qtys)
+        n = len(sku_col)
+
+        listing_id_col: list[str | None] = (
+            [None] * n if listing_ids is None else list(listing_ids)
+        )
+        price_col = array(
+            "d",
+            [math.nan] * n
+            if prices is None
+            else (math.nan if p is None else p for p in prices),
+        )
+
+        if not (
+            len(condition_col)
+            == len(qty_col)
+            == len(listing_id_col)
+            == len(price_col)
+            == n
+        ):
+            raise ValueError("all listing columns must have the same length")
+
+        if not all(sku_col):
+            raise ValueError("sku must not be empty")
+
+        if not all(condition_col):
+            raise ValueError("condition_id must not be empty")
+
+        if n and min(qty_col) < 0:
+            raise ValueError("marketplace_qty must be >= 0")
+
+        return cls(
+            skus=sku_col,
+            condition_ids=condition_col,
+            marketplace_qtys=qty_col,
+            listing_ids=listing_id_col,
+            prices=price_col,
+        )
+
+    @classmethod
+    def from_listings(cls, listings: Iterable[Listing]) -> ListingBatch:
+        """Builds a batch from already validated Listing objects."""
+
+        rows = list(listings)
+        return cls(
+            skus=[x.sku for x in rows],
+            condition_ids=[sys.intern(x.condition_id) for x in rows],
+            marketplace_qtys=array("q", (x.marketplace_qty for x in rows)),
+            listing_ids=[x.listing_id for x in rows],
+            prices=array("d", (math.nan if x.price is None else x.price for x in rows)),
+        )
+
+    @classmethod
+    def concat(cls, pages: Iterable[Sequence[Listing]]) -> ListingBatch:
+        """Joins pages column by column into a single batch."""
+
+        skus: list[str] = []
+        condition_ids: list[str] = []
+        marketplace_qtys: array[int] = array("q")
+        listing_ids: list[str | None] = []
+        prices: array[float] = array("d")
+
+        for page in pages:
+            batch = page if isinstance(page, ListingBatch) else cls.from_listings(page)
+            skus.extend(batch.skus)
+            condition_ids.extend(batch.condition_ids)
+            marketplace_qtys.extend(batch.marketplace_qtys)
+            listing_ids.extend(batch.listing_ids)
+            prices.extend(batch.prices)
+
+        return cls(
+            skus=skus,
+            condition_ids=condition_ids,
+            marketplace_qtys=marketplace_qtys,
+            listing_ids=listing_ids,
+            prices=prices,
+        )
+
+    def __len__(self) -> int:
+        return len(self.skus)
+
+    @overload
+    def __getitem__(self, index: int) -> Listing: ...
+
+    @overload
+    def __getitem__(self, index: slice) -> ListingBatch: ...
+
+    def __getitem__(self, index: int | slice) -> Listing | ListingBatch:
+        if isinstance(index, slice):
+            return ListingBatch(
+                skus=self.skus[index],
+                condition_ids=self.condition_ids[index],
+                marketplace_qtys=self.marketplace_qtys[index],
+                listing_ids=self.listing_ids[index],
+                prices=self.prices[index],
+            )
+        return self.row(index)
+
+    def __iter__(self) -> Iterator[Listing]:
+        return (self.row(i) for i in range(len(self)))
+
+    def __eq__(self, other: object) -> bool:
+        if isinstance(other, ListingBatch):
+            return (
+                self.skus == other.skus
+                and self.condition_ids == other.condition_ids
+                and self.marketplace_qtys == other.marketplace_qtys
+                and self.listing_ids == other.listing_ids
+                and list(self.iter_prices()) == list(other.iter_prices())
+            )
+        return NotImplemented
+
+    def row(self, index: int) -> Listing:
+        """Materializes a single row as a Listing."""
+
+        price = self.prices[index]
+        return Listing(
+            sku=self.skus[index],
+            condition_id=self.condition_ids[index],
+            marketplace_qty=self.marketplace_qtys[index],
+            listing_id=self.listing_ids[index],
+            price=None if math.isnan(price) else price,
+        )
+
+    def iter_prices(self) -> Iterator[float | None]:
+        return (None if math.isnan(p) else p for p in self.prices)
+
+
 @dataclass(frozen=True, slots=True)
 class ListingQuantityUpdate:
     """Command to update a listing quantity on the marketplace."""
@@ -73,6 +245,36 @@ class ListingQuantityUpdate:
     listing_id: str | None = None
 
 
+@dataclass(frozen=True, slots=True)
+class ListingUpdateFailure:
+    """A quantity update the marketplace rejected, with its reported reason."""
+
+    sku: str
+    reason: str
+    listing_id: str | None = None
+
+
+class SkipReason(StrEnum):
+    """Why the policy left a listing's quantity alone."""
+
+    MARKETPLACE_OVER_LIMIT = "marketplace_over_limit"
+    WAREHOUSE_OVER_LIMIT = "warehouse_over_limit"
+    UNCHANGED = "unchanged"
+    BELOW_MIN_DIFFERENCE = "below_min_difference"
+
+
+@dataclass(slots=True)
+class SyncResult:
+    """Outcome of a single synchronization run."""
+
+    updates: list[ListingQuantityUpdate] = field(default_factory=list)
+    failures: list[ListingUpdateFailure] = field(default_factory=list)
+
+    # Listings the policy looked at, and those it skipped by reason
+    evaluated: int = 0
+    skipped: dict[SkipReason, int] = field(default_factory=dict)
+
+
 @dataclass
 class MarketplacePolicy:
     """
@@ -93,20 +295,32 @@ class MarketplacePolicy:
           is below the configured minimum (including exact equality).
         """
 
-        if listing.marketplace_qty > self.config.limit_qty_for_sync_in_marketplace:
-            return False
+        return self.should_sync_qty(listing.marketplace_qty, warehouse_qty)
+
+    def should_sync_qty(self, marketplace_qty: int, warehouse_qty: int) -> bool:
+        """Same decision as `should_sync`, taking the marketplace quantity directly."""
+
+        return self.skip_reason(marketplace_qty, warehouse_qty) is None
+
+    def skip_reason(
+        self, marketplace_qty: int, warehouse_qty: int
+    ) -> SkipReason | None:
+        """The first rule that skips the listing, or None if it should sync."""
+
+        if marketplace_qty > self.config.limit_qty_for_sync_in_marketplace:
+            return SkipReason.MARKETPLACE_OVER_LIMIT
 
         if warehouse_qty > self.config.limit_qty_for_sync_in_warehouse:
-            return False
+            return SkipReason.WAREHOUSE_OVER_LIMIT
 
-        if listing.marketplace_qty == warehouse_qty:
-            return False
+        if marketplace_qty == warehouse_qty:
+            return SkipReason.UNCHANGED
 
-        diff = abs(warehouse_qty - listing.marketplace_qty)
+        diff = abs(warehouse_qty - marketplace_qty)
         if diff < self.config.limit_qty_difference_for_sync:
-            return False
+            return SkipReason.BELOW_MIN_DIFFERENCE
 
-        return True
+        return None
 
     def calc_target_qty(self, warehouse_qty: int) -> int:
         """
@@ -117,3 +331,88 @@ class MarketplacePolicy:
             return self.config.limit_qty_for_marketplace
 
         return warehouse_qty
+
+    @overload
+    def evaluate_batch(
+        self,
+        marketplace_qtys: Sequence[int] | Any,
+        warehouse_qtys: Sequence[int] | Any,
+        with_skips: Literal[False] = False,
+    ) -> tuple[Any, Any]: ...
+
+    @overload
+    def evaluate_batch(
+        self,
+        marketplace_qtys: Sequence[int] | Any,
+        warehouse_qtys: Sequence[int] | Any,
+        with_skips: Literal[True],
+    ) -> tuple[Any, Any, dict[SkipReason, int]]: ...
+
+    def evaluate_batch(
+        self,
+        marketplace_qtys: Sequence[int] | Any,
+        warehouse_qtys: Sequence[int] | Any,
+        with_skips: bool = False,
+    ) -> tuple[Any, Any] | tuple[Any, Any, dict[SkipReason, int]]:
+        """
+        Vectorized `should_sync` + `calc_target_qty` over parallel arrays.
+
+        Returns a boolean mask of rows to synchronize and the capped target
+        quantity of every row (meaningful only where the mask is set). With
+        `with_skips`, the same pass also counts the skipped rows per
+        `skip_reason`, leaving out reasons that skipped no row.
+        Requires NumPy; check `HAS_NUMPY` before calling.
+        """
+        if np is None:
+            raise RuntimeError("evaluate_batch requires numpy to be installed")
+
+        cfg = self.config
+        marketplace = np.asarray(marketplace_qtys, dtype=np.int64)
+        warehouse = np.asarray(warehouse_qtys, dtype=np.int64)
+
+        if marketplace.shape != warehouse.shape:
+            raise ValueError("marketplace_qtys and warehouse_qtys must be equal length")
+
+        diff = np.abs(warehouse - marketplace)
+        # Each rule only skips rows no earlier rule already skipped.
+        rules = [
+            (
+                SkipReason.MARKETPLACE_OVER_LIMIT,
+                marketplace > cfg.limit_qty_for_sync_in_marketplace,
+            ),
+            (
+                SkipReason.WAREHOUSE_OVER_LIMIT,
+                warehouse > cfg.limit_qty_for_sync_in_warehouse,
+            ),
+            (SkipReason.UNCHANGED, diff == 0),
+            (SkipReason.BELOW_MIN_DIFFERENCE, diff < cfg.limit_qty_difference_for_sync),
+        ]
+
+        mask = np.ones(marketplace.shape, dtype=bool)
+        skips: dict[SkipReason, int] = {}
+        for reason, rows in rules:
+            if with_skips:
+                rows &= mask
+                n = int(np.count_nonzero(rows))
+                if n:
+                    skips[reason] = n
+            mask &= ~rows
+
+        targets = np.minimum(warehouse, cfg.limit_qty_for_marketplace)
+
+        if with_skips:
+            return mask, targets, skips
+        return mask, targets
+
+    def count_skips_batch(
+        self,
+        marketplace_qtys: Sequence[int] | Any,
+        warehouse_qtys: Sequence[int] | Any,
+    ) -> dict[SkipReason, int]:
+        """
+        Vectorized `skip_reason` over parallel arrays, as counts per reason.
+
+        Reasons that skipped no row are left out. Requires NumPy.
+        """
+
+        return self.evaluate_batch(marketplace_qtys, warehouse_qtys, with_skips=True)[2]
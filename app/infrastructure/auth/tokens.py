@@ -0,0 +1,210 @@
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import time
+from collections import OrderedDict
+from collections.abc import Callable
+from dataclasses import dataclass, field
+from typing import Protocol
+
+import httpx
+
+from app.infrastructure.config import EbayDeveloperCredentials
+
+EBAY_TOKEN_PATH = "/identity/v1/oauth2/token"
+EBAY_INVENTORY_SCOPE = "https://api.ebay.com/oauth/api_scope/sell.inventory"
+LWA_TOKEN_URL = "https://api.amazon.com/auth/o2/token"
+
+
+def fingerprint(*parts: str) -> str:
+    """Stable cache key for a credential set that does not retain the secrets."""
+
+    digest = hashlib.sha256()
+    for part in parts:
+        digest.update(part.encode())
+        digest.update(b"\0")
+    return digest.hexdigest()
+
+
+@dataclass(frozen=True, slots=True)
+class AccessToken:
+    """Short-lived access token with its expiry on the monotonic clock."""
+
+    value: str
+    expires_at: float
+
+
+class TokenExchange(Protocol):
+    """Exchanges long-lived account credentials for an access token."""
+
+    @property
+    def fingerprint(self) -> str: ...
+
+    async def exchange(self, http: httpx.AsyncClient) -> tuple[str, float]:
+        """Returns the access token and its lifetime in seconds."""
+        ...
+
+
+def _parse_token_response(response: httpx.Response) -> tuple[str, float]:
+    response.raise_for_status()
+    payload = response.json()
+    return payload["access_token"], float(payload.get("expires_in") or 0)
+
+
+@dataclass(frozen=True, slots=True)
+class EbayTokenExchange:
+    """eBay OAuth refresh-token grant for a seller account."""
+
+    dev_creds: EbayDeveloperCredentials
+    refresh_token: str
+    base_url: str
+    scope: str = EBAY_INVENTORY_SCOPE
+
+    @property
+    def fingerprint(self) -> str:
+        return fingerprint(
+            "ebay", self.base_url, self.dev_creds.client_id, self.refresh_token
+        )
+
+    async def exchange(self, http: httpx.AsyncClient) -> tuple[str, float]:
+        response = await http.post(
+            f"{self.base_url}{EBAY_TOKEN_PATH}",
+            auth=(self.dev_creds.client_id, self.dev_creds.client_secret),
+            data={
+                "grant_type": "refresh_token",
+                "refresh_token": self.refresh_token,
+                "scope": self.scope,
+            },
+        )
+        return _parse_token_response(response)
+
+
+@dataclass(frozen=True, slots=True)
+class LwaTokenExchange:
+    """Login with Amazon refresh-token grant for a selling partner."""
+
+    client_id: str
+    client_secret: str
+    refresh_token: str
+    token_url: str = LWA_TOKEN_URL
+
+    @property
+    def fingerprint(self) -> str:
+        return fingerprint("amazon", self.token_url, self.client_id, self.refresh_token)
+
+    async def exchange(self, http: httpx.AsyncClient) -> tuple[str, float]:
+        response = await http.post(
+            self.token_url,
+            data={
+                "grant_type": "refresh_token",
+                "refresh_token": self.refresh_token,
+                "client_id": self.client_id,
+                "client_secret": self.client_secret,
+            },
+        )
+        return _parse_token_response(response)
+
+
+@dataclass(slots=True)
+class TokenManager:
+    """
+    Process-wide cache of marketplace access tokens.
+
+    Tokens are cached per credential fingerprint until `refresh_margin_s`
+    before they expire. Concurrent requests for the same account share a
+    single in-flight exchange, and the least recently used accounts are
+    evicted once more than `max_entries` tokens are cached.
+
+    A token whose response has no `expires_in` is kept for
+    `default_lifetime_s`, and every token for at least `min_lifetime_s`,
+    so a short lifetime does not make each call exchange credentials.
+    """
+
+    http: httpx.AsyncClient
+    max_entries: int = 1024
+    refresh_margin_s: float = 60.0
+    default_lifetime_s: float = 300.0
+    min_lifetime_s: float = 30.0
+    clock: Callable[[], float] = time.monotonic
+
+    _tokens: OrderedDict[str, AccessToken] = field(
+        default_factory=OrderedDict, init=False, repr=False
+    )
+    _inflight: dict[str, asyncio.Task[AccessToken]] = field(
+        default_factory=dict, init=False, repr=False
+    )
+
+    def __post_init__(self) -> None:
+        if self.max_entries < 1:
+            raise ValueError("max_entries must be >= 1")
+
+        if self.refresh_margin_s < 0:
+            raise ValueError("refresh_margin_s must be >= 0")
+
+        if self.default_lifetime_s <= 0:
+            raise ValueError("default_lifetime_s must be > 0")
+
+        if self.min_lifetime_s < 0:
+            raise ValueError("min_lifetime_s must be >= 0")
+
+    def __len__(self) -> int:
+        return len(self._tokens)
+
+    async def get_token(self, exchange: TokenExchange) -> str:
+        """Returns a valid access token, exchanging credentials only when needed."""
+
+        key = exchange.fingerprint
+
+        cached = self._tokens.get(key)
+        if cached is not None and self.clock() < cached.expires_at:
+            self._tokens.move_to_end(key)
+            return cached.value
+
+        task = self._inflight.get(key)
+        if task is None:
+            task = asyncio.ensure_future(self._refresh(key, exchange))
+            task.add_done_callback(self._consume_exception)
+            self._inflight[key] = task
+
+        # Shielded so a cancelled caller does not cancel the exchange the
+        # other callers are waiting on.
+        token = await asyncio.shield(task)
+        return token.value
+
+    def invalidate(self, exchange: TokenExchange, rejected: str) -> None:
+        """
+        Drops the cached token if it is still `rejected`, the token the
+        marketplace refused. One that replaced it meanwhile, e.g. after a
+        concurrent call got the same 401, is kept.
+        """
+
+        key = exchange.fingerprint
+        cached = self._tokens.get(key)
+        if cached is not None and cached.value == rejected:
+            del self._tokens[key]
+
+    async def _refresh(self, key: str, exchange: TokenExchange) -> AccessToken:
+        try:
+            value, expires_in = await exchange.exchange(self.http)
+            if expires_in <= 0:
+                expires_in = self.default_lifetime_s
+            lifetime = max(expires_in - self.refresh_margin_s, self.min_lifetime_s)
+            token = AccessToken(value=value, expires_at=self.clock() + lifetime)
+            self._store(key, token)
+            return token
+        finally:
+            self._inflight.pop(key, None)
+
+    def _store(self, key: str, token: AccessToken) -> None:
+        self._tokens[key] = token
+        self._tokens.move_to_end(key)
+        while len(self._tokens) > self.max_entries:
+            self._tokens.popitem(last=False)
+
+    @staticmethod
+    def _consume_exception(task: asyncio.Task[AccessToken]) -> None:
+        # Callers re-raise the failure; this only keeps asyncio from logging
+        # "exception was never retrieved" when every caller was cancelled.
+        if not task.cancelled():
+            task.exception()
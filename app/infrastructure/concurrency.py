@@ -0,0 +1,73 @@
+from __future__ import annotations
+
+import asyncio
+from collections import deque
+from collections.abc import AsyncIterator, Awaitable, Callable, Iterable
+
+
+async def prefetch_ordered[T](
+    thunks: Iterable[Callable[[], Awaitable[T]]],
+    window: int,
+) -> AsyncIterator[T]:
+    """
+    Runs awaitables produced by `thunks` with at most `window` in flight
+    and yields their results in submission order.
+
+    A new thunk is started as soon as the oldest result is taken, before
+    it is yielded, so the consumer's work overlaps a full window. Up to
+    `window + 1` results are held in memory at a time: the one being
+    consumed and those of the `window` thunks in flight.
+    """
+    if window < 1:
+        raise ValueError("window must be >= 1")
+
+    pending: deque[asyncio.Task[T]] = deque()
+    source = iter(thunks)
+
+    def _fill() -> None:
+        while len(pending) < window:
+            thunk = next(source, None)
+            if thunk is None:
+                return
+            pending.append(asyncio.ensure_future(thunk()))
+
+    try:
+        _fill()
+        while pending:
+            result = await pending.popleft()
+            _fill()
+            yield result
+    finally:
+        for task in pending:
+            task.cancel()
+        if pending:
+            await asyncio.gather(*pending, return_exceptions=True)
+
+
+async def gather_bounded[T, R](
+    items: Iterable[T],
+    fn: Callable[[T], Awaitable[R]],
+    limit: int,
+) -> list[R]:
+    """
+    Applies `fn` to every item with at most `limit` calls in flight.
+
+    Results are returned in input order. The first exception cancels the
+    remaining calls and is re-raised.
+    """
+    if limit < 1:
+        raise ValueError("limit must be >= 1")
+
+    semaphore = asyncio.Semaphore(limit)
+
+    async def _run(item: T) -> R:
+        async with semaphore:
+            return await fn(item)
+
+    try:
+        async with asyncio.TaskGroup() as tg:
+            tasks = [tg.create_task(_run(item)) for item in items]
+    except ExceptionGroup as group:
+        raise group.exceptions[0] from None
+
+    return [task.result() for task in tasks]
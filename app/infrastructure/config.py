@@ -1,5 +1,6 @@
 import os
-from dataclasses import dataclass
+from collections.abc import Mapping
+from dataclasses import dataclass, field
 
 
 def _get_str(name: str) -> str:
@@ -10,6 +11,69 @@ def _get_str(name: str) -> str:
     return value
 
 
+def _get_int(name: str, default: int) -> int:
+    value = os.getenv(name, "")
+
+    if not value:
+        return default
+    try:
+        return int(value)
+    except ValueError:
+        raise ValueError(f"Env var {name} must be an integer, got {value!r}") from None
+
+
+def _get_float(name: str, default: float) -> float:
+    value = os.getenv(name, "")
+
+    if not value:
+        return default
+    try:
+        return float(value)
+    except ValueError:
+        raise ValueError(f"Env var {name} must be a number, got {value!r}") from None
+
+
+def _get_bool(name: str, default: bool) -> bool:
+    value = os.getenv(name, "").strip().lower()
+
+    if not value:
+        return default
+    if value in {"1", "true", "yes", "on"}:
+        return True
+    if value in {"0", "false", "no", "off"}:
+        return False
+    raise ValueError(f"Env var {name} must be a boolean, got {value!r}")
+
+
+def _get_int_map(name: str, default: Mapping[str, int]) -> dict[str, int]:
+    """Parses `key=int` pairs separated by commas, e.g. `ebay=4,amazon=2`."""
+
+    value = os.getenv(name, "")
+
+    if not value:
+        return dict(default)
+
+    result: dict[str, int] = {}
+    for pair in value.split(","):
+        key, sep, number = pair.partition("=")
+        key = key.strip().lower()
+        try:
+            if not key or not sep:
+                raise ValueError
+            result[key] = int(number)
+        except ValueError:
+            raise ValueError(
+                f"Env var {name} must look like 'name=int,...', got {value!r}"
+            ) from None
+    return result
+
+
+DEFAULT_SYNC_JOB_WORKERS: Mapping[str, int] = {"ebay": 2, "amazon": 2}
+DEFAULT_HTTP_POOL_CONNECTIONS: Mapping[str, int] = {"ebay": 40, "amazon": 20}
+# Large Amazon batches keep big syncs on a few listings feeds
+DEFAULT_SYNC_UPDATE_BATCH_SIZES: Mapping[str, int] = {"ebay": 1000, "amazon": 10_000}
+
+
 @dataclass(frozen=True, slots=True)
 class EbayDeveloperCredentials:
     """
@@ -32,17 +96,179 @@ class AppConfig:
     ebay_dev_creds: EbayDeveloperCredentials
     ebay_base_url: str
     amazon_base_url: str
+    # eBay Inventory API paging and bulk update fan-out
+    ebay_page_size: int = 100
+    ebay_prefetch_pages: int = 4
+    ebay_update_concurrency: int = 4
+
+    amazon_marketplace_id: str = "ATVPDKIKX0DER"
+    amazon_lwa_token_url: str = "https://api.amazon.com/auth/o2/token"
+
+    # Update-set size from which Amazon updates go through a listings feed
+    # instead of per-SKU PATCH calls, and the PATCH fan-out below it.
+    amazon_feed_threshold: int = 200
+    amazon_patch_concurrency: int = 5
+
+    # Access-token cache: accounts kept before LRU eviction, and how long
+    # before expiry a cached token is refreshed
+    token_cache_size: int = 1024
+    token_refresh_margin_s: int = 60
+
+    # Listings snapshot cache; a TTL of 0 disables it
+    listings_cache_ttl_s: int = 300
+    listings_cache_max_listings: int = 1_000_000
+
+    # Delta sync baselines: accounts kept, listings index lifetime, and
+    # the largest account whose listings are indexed between deltas
+    delta_max_accounts: int = 1000
+    delta_index_ttl_s: int = 300
+    delta_max_index_listings: int = 1_000_000
+
+    # Async sync jobs: SQLite queue file, workers per marketplace, and how
+    # long finished jobs stay queryable. The file holds the refresh tokens
+    # of pending jobs; point it at a private directory in production.
+    sync_job_db_path: str = "sync_jobs.sqlite3"
+    sync_job_workers: Mapping[str, int] = field(
+        default_factory=lambda: dict(DEFAULT_SYNC_JOB_WORKERS)
+    )
+    sync_job_retention_s: int = 86_400
+
+    # Outbound HTTP: request timeout, attempts per request (1 disables
+    # retries), and the per-host circuit breaker
+    http_timeout_s: int = 10
+    http_max_attempts: int = 3
+    http_breaker_failures: int = 5
+    http_breaker_reset_s: int = 30
+
+    # Outbound connection pools: max connections per marketplace host (other
+    # hosts share `http_default_connections`), idle connections kept alive
+    # per pool and for how long, and HTTP/2 multiplexing (needs `h2`)
+    http_pool_connections: Mapping[str, int] = field(
+        default_factory=lambda: dict(DEFAULT_HTTP_POOL_CONNECTIONS)
+    )
+    http_default_connections: int = 100
+    http_max_keepalive: int = 20
+    http_keepalive_expiry_s: int = 30
+    http2: bool = False
+    # Requests in flight across all hosts; 0 leaves only the pool limits
+    http_max_in_flight: int = 0
+
+    # Tracing: share of sync requests traced, traces kept in memory for the
+    # admin endpoint, and an optional JSONL file rotated at max_bytes
+    trace_sample_rate: float = 0.01
+    trace_buffer_size: int = 200
+    trace_file_path: str = ""
+    trace_file_max_bytes: int = 10_000_000
+    trace_file_backups: int = 3
+
+    # Fan-out syncs: targets run at once overall, and per marketplace
+    fan_out_max_concurrency: int = 8
+    fan_out_marketplace_concurrency: int = 4
+
+    # Sync pipeline: updates per update batch by marketplace (others use the
+    # service default), and the fetched pages and full batches queued between
+    # its stages
+    sync_update_batch_sizes: Mapping[str, int] = field(
+        default_factory=lambda: dict(DEFAULT_SYNC_UPDATE_BATCH_SIZES)
+    )
+    sync_pipeline_pages: int = 4
+    sync_pipeline_batches: int = 2
+
+    # Merge full syncs of an account requested while one runs into a single
+    # follow-up run
+    sync_coalescing: bool = True
+
+    # Scheduled syncs: JSON file of schedules (empty disables the scheduler),
+    # syncs run at once, and how much each interval varies (a fraction)
+    sync_schedules_path: str = ""
+    scheduler_max_concurrency: int = 4
+    scheduler_jitter: float = 0.1
 
     def __post_init__(self):
         if not self.ebay_base_url:
             raise ValueError("ebay_base_url must not be empty")
         if not self.amazon_base_url:
             raise ValueError("amazon_base_url must not be empty")
+        if not 1 <= self.ebay_page_size <= 200:
+            raise ValueError("ebay_page_size must be between 1 and 200")
+        if self.ebay_prefetch_pages < 1:
+            raise ValueError("ebay_prefetch_pages must be >= 1")
+        if self.ebay_update_concurrency < 1:
+            raise ValueError("ebay_update_concurrency must be >= 1")
+        if not self.amazon_marketplace_id:
+            raise ValueError("amazon_marketplace_id must not be empty")
+        if self.amazon_feed_threshold < 1:
+            raise ValueError("amazon_feed_threshold must be >= 1")
+        if self.amazon_patch_concurrency < 1:
+            raise ValueError("amazon_patch_concurrency must be >= 1")
+        if self.token_cache_size < 1:
+            raise ValueError("token_cache_size must be >= 1")
+        if self.token_refresh_margin_s < 0:
+            raise ValueError("token_refresh_margin_s must be >= 0")
+        if self.listings_cache_ttl_s < 0:
+            raise ValueError("listings_cache_ttl_s must be >= 0")
+        if self.listings_cache_max_listings < 1:
+            raise ValueError("listings_cache_max_listings must be >= 1")
+        if self.delta_max_accounts < 1:
+            raise ValueError("delta_max_accounts must be >= 1")
+        if self.delta_index_ttl_s < 1:
+            raise ValueError("delta_index_ttl_s must be >= 1")
+        if self.delta_max_index_listings < 1:
+            raise ValueError("delta_max_index_listings must be >= 1")
+        if not self.sync_job_db_path:
+            raise ValueError("sync_job_db_path must not be empty")
+        for marketplace, workers in self.sync_job_workers.items():
+            if workers < 1:
+                raise ValueError(f"sync_job_workers[{marketplace}] must be >= 1")
+        if self.sync_job_retention_s < 1:
+            raise ValueError("sync_job_retention_s must be >= 1")
+        if self.http_timeout_s < 1:
+            raise ValueError("http_timeout_s must be >= 1")
+        if self.http_max_attempts < 1:
+            raise ValueError("http_max_attempts must be >= 1")
+        if self.http_breaker_failures < 1:
+            raise ValueError("http_breaker_failures must be >= 1")
+        if self.http_breaker_reset_s < 1:
+            raise ValueError("http_breaker_reset_s must be >= 1")
+        for marketplace, connections in self.http_pool_connections.items():
+            if connections < 1:
+                raise ValueError(f"http_pool_connections[{marketplace}] must be >= 1")
+        if self.http_default_connections < 1:
+            raise ValueError("http_default_connections must be >= 1")
+        if self.http_max_keepalive < 0:
+            raise ValueError("http_max_keepalive must be >= 0")
+        if self.http_keepalive_expiry_s < 0:
+            raise ValueError("http_keepalive_expiry_s must be >= 0")
+        if self.http_max_in_flight < 0:
+            raise ValueError("http_max_in_flight must be >= 0")
+        if not 0.0 <= self.trace_sample_rate <= 1.0:
+            raise ValueError("trace_sample_rate must be between 0 and 1")
+        if self.trace_buffer_size < 1:
+            raise ValueError("trace_buffer_size must be >= 1")
+        if self.trace_file_max_bytes < 1:
+            raise ValueError("trace_file_max_bytes must be >= 1")
+        if self.trace_file_backups < 0:
+            raise ValueError("trace_file_backups must be >= 0")
+        if self.fan_out_max_concurrency < 1:
+            raise ValueError("fan_out_max_concurrency must be >= 1")
+        if self.fan_out_marketplace_concurrency < 1:
+            raise ValueError("fan_out_marketplace_concurrency must be >= 1")
+        for marketplace, size in self.sync_update_batch_sizes.items():
+            if size < 1:
+                raise ValueError(f"sync_update_batch_sizes[{marketplace}] must be >= 1")
+        if self.sync_pipeline_pages < 1:
+            raise ValueError("sync_pipeline_pages must be >= 1")
+        if self.sync_pipeline_batches < 1:
+            raise ValueError("sync_pipeline_batches must be >= 1")
+        if self.scheduler_max_concurrency < 1:
+            raise ValueError("scheduler_max_concurrency must be >= 1")
+        if not 0.0 <= self.scheduler_jitter < 1.0:
+            raise ValueError("scheduler_jitter must be >= 0 and < 1")
 
 
 def load_config(
-    ebay_base_url: str = "https://api.ebay.com",
-    amazon_base_url: str = "https://sellingpartnerapi-na.amazon.com",
+    ebay_base_url: str | None = None,
+    amazon_base_url: str | None = None,
 ) -> AppConfig:
     ebay_dev_creds = EbayDeveloperCredentials(
         client_id=_get_str("EBAY_CLIENT_ID"),
@@ -51,6 +277,56 @@ def load_config(
 
     return AppConfig(
         ebay_dev_creds=ebay_dev_creds,
-        ebay_base_url=ebay_base_url,
-        amazon_base_url=amazon_base_url,
+        ebay_base_url=ebay_base_url
+        or os.getenv("EBAY_BASE_URL")
+        or "https://api.ebay.com",
+        amazon_base_url=amazon_base_url
+        or os.getenv("AMAZON_BASE_URL")
+        or "https://sellingpartnerapi-na.amazon.com",
+        ebay_page_size=_get_int("EBAY_PAGE_SIZE", 100),
+        ebay_prefetch_pages=_get_int("EBAY_PREFETCH_PAGES", 4),
+        ebay_update_concurrency=_get_int("EBAY_UPDATE_CONCURRENCY", 4),
+        amazon_marketplace_id=os.getenv("AMAZON_MARKETPLACE_ID") or "ATVPDKIKX0DER",
+        amazon_lwa_token_url=os.getenv("AMAZON_LWA_TOKEN_URL")
+        or "https://api.amazon.com/auth/o2/token",
+        amazon_feed_threshold=_get_int("AMAZON_FEED_THRESHOLD", 200),
+        amazon_patch_concurrency=_get_int("AMAZON_PATCH_CONCURRENCY", 5),
+        token_cache_size=_get_int("TOKEN_CACHE_SIZE", 1024),
+        token_refresh_margin_s=_get_int("TOKEN_REFRESH_MARGIN_S", 60),
+        listings_cache_ttl_s=_get_int("LISTINGS_CACHE_TTL_S", 300),
+        listings_cache_max_listings=_get_int("LISTINGS_CACHE_MAX_LISTINGS", 1_000_000),
+        delta_max_accounts=_get_int("DELTA_MAX_ACCOUNTS", 1000),
+        delta_index_ttl_s=_get_int("DELTA_INDEX_TTL_S", 300),
+        delta_max_index_listings=_get_int("DELTA_MAX_INDEX_LISTINGS", 1_000_000),
+        sync_job_db_path=os.getenv("SYNC_JOB_DB_PATH") or "sync_jobs.sqlite3",
+        sync_job_workers=_get_int_map("SYNC_JOB_WORKERS", DEFAULT_SYNC_JOB_WORKERS),
+        sync_job_retention_s=_get_int("SYNC_JOB_RETENTION_S", 86_400),
+        http_timeout_s=_get_int("HTTP_TIMEOUT_S", 10),
+        http_max_attempts=_get_int("HTTP_MAX_ATTEMPTS", 3),
+        http_breaker_failures=_get_int("HTTP_BREAKER_FAILURES", 5),
+        http_breaker_reset_s=_get_int("HTTP_BREAKER_RESET_S", 30),
+        http_pool_connections=_get_int_map(
+            "HTTP_POOL_CONNECTIONS", DEFAULT_HTTP_POOL_CONNECTIONS
+        ),
+        http_default_connections=_get_int("HTTP_DEFAULT_CONNECTIONS", 100),
+        http_max_keepalive=_get_int("HTTP_MAX_KEEPALIVE", 20),
+        http_keepalive_expiry_s=_get_int("HTTP_KEEPALIVE_EXPIRY_S", 30),
+        http2=_get_bool("HTTP2", False),
+        http_max_in_flight=_get_int("HTTP_MAX_IN_FLIGHT", 0),
+        trace_sample_rate=_get_float("TRACE_SAMPLE_RATE", 0.01),
+        trace_buffer_size=_get_int("TRACE_BUFFER_SIZE", 200),
+        trace_file_path=os.getenv("TRACE_FILE_PATH") or "",
+        trace_file_max_bytes=_get_int("TRACE_FILE_MAX_BYTES", 10_000_000),
+        trace_file_backups=_get_int("TRACE_FILE_BACKUPS", 3),
+        fan_out_max_concurrency=_get_int("FAN_OUT_MAX_CONCURRENCY", 8),
+        fan_out_marketplace_concurrency=_get_int("FAN_OUT_MARKETPLACE_CONCURRENCY", 4),
+        sync_update_batch_sizes=_get_int_map(
+            "SYNC_UPDATE_BATCH_SIZES", DEFAULT_SYNC_UPDATE_BATCH_SIZES
+        ),
+        sync_pipeline_pages=_get_int("SYNC_PIPELINE_PAGES", 4),
+        sync_pipeline_batches=_get_int("SYNC_PIPELINE_BATCHES", 2),
+        sync_coalescing=_get_bool("SYNC_COALESCING", True),
+        sync_schedules_path=os.getenv("SYNC_SCHEDULES_PATH") or "",
+        scheduler_max_concurrency=_get_int("SCHEDULER_MAX_CONCURRENCY", 4),
+        scheduler_jitter=_get_float("SCHEDULER_JITTER", 0.1),
     )
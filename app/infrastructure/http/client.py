@@ -1,18 +1,91 @@
 from __future__ import annotations
 
+import asyncio
+from collections.abc import Mapping
+from dataclasses import dataclass
+
 import httpx
 
+from app.infrastructure.http.pools import PoolMonitor, PoolSettings
+from app.infrastructure.http.resilience import ResilientTransport, RetryPolicy
+
+DEFAULT_POOL = "default"
+
+
+@dataclass(slots=True)
+class InFlightLimitTransport(httpx.AsyncBaseTransport):
+    """
+    Holds each request until one of the `limit` slots it shares with other
+    transports is free, so the cap spans every host.
+
+    A slot is taken per attempt, until the response headers arrive; retry
+    backoff does not hold one.
+    """
+
+    inner: httpx.AsyncBaseTransport
+    limit: asyncio.Semaphore
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        async with self.limit:
+            return await self.inner.handle_async_request(request)
+
+    async def aclose(self) -> None:
+        await self.inner.aclose()
+
 
 def build_httpx_client(
     timeout_s: float = 10.0,
     headers: dict[str, str] | None = None,
+    retry: RetryPolicy | None = None,
+    breaker_failures: int = 5,
+    breaker_reset_s: float = 30.0,
+    default_pool: PoolSettings | None = None,
+    host_pools: Mapping[str, PoolSettings] | None = None,
+    monitor: PoolMonitor | None = None,
+    max_in_flight: int | None = None,
 ) -> httpx.AsyncClient:
     """
     Factory for a shared httpx.AsyncClient instance.
 
+    Requests go through a ResilientTransport, which retries transient
+    failures and fails fast while a host's circuit breaker is open.
+
+    `host_pools` maps base URLs (e.g. `https://api.ebay.com`) to their own
+    connection pool, so one busy marketplace cannot exhaust connections of
+    another; other hosts share `default_pool`. With a `monitor`, every
+    pool reports its usage and connection-acquire latency to it.
+    `max_in_flight` caps the requests in flight across all hosts.
+
     Created at application startup and closed on shutdown.
     """
+
+    limit = None if max_in_flight is None else asyncio.Semaphore(max_in_flight)
+
+    def transport(name: str, settings: PoolSettings) -> ResilientTransport:
+        inner: httpx.AsyncBaseTransport = (
+            settings.build_transport()
+            if monitor is None
+            else monitor.instrument(name, settings)
+        )
+        if limit is not None:
+            inner = InFlightLimitTransport(inner, limit)
+        return ResilientTransport(
+            inner=inner,
+            retry=retry or RetryPolicy(),
+            failure_threshold=breaker_failures,
+            reset_timeout_s=breaker_reset_s,
+        )
+
+    mounts: dict[str, httpx.AsyncBaseTransport | None] = {}
+    for base_url, settings in (host_pools or {}).items():
+        url = httpx.URL(base_url)
+        mounts[f"{url.scheme}://{url.netloc.decode('ascii')}"] = transport(
+            url.host, settings
+        )
+
     return httpx.AsyncClient(
         headers=headers,
         timeout=httpx.Timeout(timeout_s),
+        transport=transport(DEFAULT_POOL, default_pool or PoolSettings()),
+        mounts=mounts,
     )
@@ -0,0 +1,223 @@
+from __future__ import annotations
+
+import importlib.util
+import logging
+import time
+from collections.abc import Callable
+from dataclasses import dataclass, field
+from typing import Any
+
+import httpx
+
+logger = logging.getLogger(__name__)
+
+HAS_HTTP2 = importlib.util.find_spec("h2") is not None
+
+# Called with (pool name, seconds spent waiting for a connection)
+AcquireListener = Callable[[str, float], None]
+
+# Called with (pool name, method, status code or "error", seconds until the
+# response headers arrived)
+RequestListener = Callable[[str, str, str, float], None]
+
+# httpcore trace events marking the moment a connection was assigned
+_SENDING_EVENTS = frozenset(
+    {"http11.send_request_headers.started", "http2.send_request_headers.started"}
+)
+
+
+@dataclass(frozen=True, slots=True)
+class PoolSettings:
+    """Size and protocol settings of one connection pool."""
+
+    max_connections: int = 100
+    # idle connections kept open; capped at max_connections
+    max_keepalive_connections: int = 20
+    keepalive_expiry_s: float = 30.0
+
+    # Multiplex requests over HTTP/2 connections; needs the optional `h2`
+    # package and falls back to HTTP/1.1 without it.
+    http2: bool = False
+
+    def __post_init__(self) -> None:
+        if self.max_connections < 1:
+            raise ValueError("max_connections must be >= 1")
+
+        if self.max_keepalive_connections < 0:
+            raise ValueError("max_keepalive_connections must be >= 0")
+
+        if self.keepalive_expiry_s < 0:
+            raise ValueError("keepalive_expiry_s must be >= 0")
+
+    def build_transport(self) -> httpx.AsyncHTTPTransport:
+        http2 = self.http2 and HAS_HTTP2
+        if self.http2 and not HAS_HTTP2:
+            logger.warning("HTTP/2 requested but h2 is not installed; using HTTP/1.1")
+
+        return httpx.AsyncHTTPTransport(
+            http2=http2,
+            limits=httpx.Limits(
+                max_connections=self.max_connections,
+                max_keepalive_connections=self.max_keepalive_connections,
+                keepalive_expiry=self.keepalive_expiry_s,
+            ),
+        )
+
+
+@dataclass(frozen=True, slots=True)
+class PoolStats:
+    pool: str
+    max_connections: int
+    http2: bool
+
+    # open connections, split into idle and serving requests
+    connections: int
+    idle: int
+    active: int
+
+    # requests waiting for a connection right now
+    waiting: int
+
+    acquired: int
+    total_acquire_s: float
+    max_acquire_s: float
+
+
+@dataclass(slots=True)
+class InstrumentedTransport(httpx.AsyncBaseTransport):
+    """
+    Wraps a pool transport to measure how long requests wait for a
+    connection.
+
+    Uses httpcore's `trace` request extension: the wait ends when the
+    request headers start being sent on an assigned connection.
+    """
+
+    name: str
+    inner: httpx.AsyncBaseTransport
+    settings: PoolSettings
+    listeners: list[AcquireListener] = field(default_factory=list)
+    request_listeners: list[RequestListener] = field(default_factory=list)
+    clock: Callable[[], float] = time.perf_counter
+
+    waiting: int = field(default=0, init=False)
+    acquired: int = field(default=0, init=False)
+    total_acquire_s: float = field(default=0.0, init=False)
+    max_acquire_s: float = field(default=0.0, init=False)
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        started = self.clock()
+        outer_trace = request.extensions.get("trace")
+        pending = True
+
+        def assigned() -> None:
+            nonlocal pending
+            if not pending:
+                return
+            pending = False
+            self.waiting -= 1
+            self._record(self.clock() - started)
+
+        async def trace(event_name: str, info: dict[str, Any]) -> None:
+            if event_name in _SENDING_EVENTS:
+                assigned()
+            if outer_trace is not None:
+                await outer_trace(event_name, info)
+
+        request.extensions["trace"] = trace
+        self.waiting += 1
+        status = "error"
+        try:
+            response = await self.inner.handle_async_request(request)
+            status = str(response.status_code)
+            return response
+        finally:
+            # Retries resend the same request: restore the caller's hook so
+            # the next attempt wraps it, not this attempt's wrapper.
+            if outer_trace is None:
+                request.extensions.pop("trace", None)
+            else:
+                request.extensions["trace"] = outer_trace
+
+            # Transports that do not emit trace events (or failed requests)
+            # still leave the waiting count.
+            if pending:
+                pending = False
+                self.waiting -= 1
+
+            elapsed = self.clock() - started
+            for request_listener in self.request_listeners:
+                request_listener(self.name, request.method, status, elapsed)
+
+    async def aclose(self) -> None:
+        await self.inner.aclose()
+
+    def stats(self) -> PoolStats:
+        connections = _pool_connections(self.inner)
+        idle = sum(1 for c in connections if c.is_idle())
+        return PoolStats(
+            pool=self.name,
+            max_connections=self.settings.max_connections,
+            http2=self.settings.http2 and HAS_HTTP2,
+            connections=len(connections),
+            idle=idle,
+            active=len(connections) - idle,
+            waiting=self.waiting,
+            acquired=self.acquired,
+            total_acquire_s=self.total_acquire_s,
+            max_acquire_s=self.max_acquire_s,
+        )
+
+    def _record(self, wait_s: float) -> None:
+        self.acquired += 1
+        self.total_acquire_s += wait_s
+        self.max_acquire_s = max(self.max_acquire_s, wait_s)
+        for listener in self.listeners:
+            listener(self.name, wait_s)
+
+
+def _pool_connections(transport: httpx.AsyncBaseTransport) -> list[Any]:
+    # httpx keeps its httpcore pool private; degrade to "no connections"
+    # for transports without one (e.g. test doubles).
+    pool = getattr(transport, "_pool", None)
+    return list(getattr(pool, "connections", ()))
+
+
+@dataclass(slots=True)
+class PoolMonitor:
+    """
+    Registry of instrumented pools, and the instrumentation hook:
+    `listeners` are called after every connection acquisition and
+    `request_listeners` after every request sent through a pool.
+    """
+
+    listeners: list[AcquireListener] = field(default_factory=list)
+    request_listeners: list[RequestListener] = field(default_factory=list)
+    _pools: dict[str, InstrumentedTransport] = field(
+        default_factory=dict, init=False, repr=False
+    )
+
+    def instrument(
+        self,
+        name: str,
+        settings: PoolSettings,
+        inner: httpx.AsyncBaseTransport | None = None,
+    ) -> InstrumentedTransport:
+        transport = InstrumentedTransport(
+            name=name,
+            inner=inner or settings.build_transport(),
+            settings=settings,
+            listeners=self.listeners,
+            request_listeners=self.request_listeners,
+        )
+        self._pools[name] = transport
+        return transport
+
+    def add_listener(self, listener: AcquireListener) -> None:
+        self.listeners.append(listener)
+
+    def add_request_listener(self, listener: RequestListener) -> None:
+        self.request_listeners.append(listener)
+
+    def stats(self) -> list[PoolStats]:
+        return [transport.stats() for transport in self._pools.values()]
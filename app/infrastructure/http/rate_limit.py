@@ -0,0 +1,283 @@
+from __future__ import annotations
+
+import asyncio
+import time
+from collections import OrderedDict
+from collections.abc import Callable, Mapping
+from dataclasses import dataclass, field
+from typing import Any
+
+import httpx
+
+from app.infrastructure.http.resilience import RETRY_THROTTLED, parse_retry_after
+
+# (marketplace, account, API operation)
+RateLimitKey = tuple[str, str, str]
+
+
+@dataclass(frozen=True, slots=True)
+class RateLimit:
+    """Token bucket parameters: sustained requests per second and burst."""
+
+    rate: float
+    burst: int
+
+    def __post_init__(self) -> None:
+        if self.rate <= 0:
+            raise ValueError("rate must be > 0")
+
+        if self.burst < 1:
+            raise ValueError("burst must be >= 1")
+
+
+# Published per-seller limits. SP-API documents a rate and burst per
+# operation; eBay only publishes a daily call quota (2M/day for the
+# Inventory API), spread here over a conservative per-second rate.
+DEFAULT_RATE_LIMITS: Mapping[tuple[str, str], RateLimit] = {
+    ("amazon", "listings_items.patch"): RateLimit(rate=5.0, burst=10),
+    ("amazon", "feeds.create_feed_document"): RateLimit(rate=0.5, burst=15),
+    ("amazon", "feeds.create_feed"): RateLimit(rate=0.0083, burst=15),
+    ("ebay", "inventory.get_inventory_items"): RateLimit(rate=20.0, burst=40),
+    ("ebay", "inventory.bulk_update_price_quantity"): RateLimit(rate=20.0, burst=40),
+}
+
+FALLBACK_RATE_LIMIT = RateLimit(rate=10.0, burst=20)
+
+AMAZON_RATE_LIMIT_HEADER = "x-amzn-RateLimit-Limit"
+
+
+@dataclass(frozen=True, slots=True)
+class RateLimitStats:
+    marketplace: str
+    account: str
+    operation: str
+    rate: float
+    burst: int
+    tokens: float
+    waiting: int
+    acquired: int
+    throttled: int
+    total_wait_s: float
+    max_wait_s: float
+
+
+@dataclass(slots=True)
+class _Bucket:
+    base: RateLimit
+    rate: float
+    tokens: float
+    updated_at: float
+    blocked_until: float = 0.0
+    lock: asyncio.Lock = field(default_factory=asyncio.Lock)
+
+    # instrumentation
+    waiting: int = 0
+    acquired: int = 0
+    throttled: int = 0
+    total_wait_s: float = 0.0
+    max_wait_s: float = 0.0
+
+    def refill(self, now: float) -> None:
+        elapsed = max(0.0, now - self.updated_at)
+        self.tokens = min(float(self.base.burst), self.tokens + elapsed * self.rate)
+        self.updated_at = now
+
+    def reserve(self, now: float) -> float:
+        """Takes a token if one is available; otherwise returns the delay."""
+
+        if now < self.blocked_until:
+            return self.blocked_until - now
+
+        self.refill(now)
+        if self.tokens >= 1.0:
+            self.tokens -= 1.0
+            return 0.0
+        return (1.0 - self.tokens) / self.rate
+
+
+@dataclass(slots=True)
+class RateLimiter:
+    """
+    Token-bucket rate limiter shared by all marketplace adapters.
+
+    Buckets are keyed by (marketplace, account, operation) and start from
+    the published limits in `limits`. `acquire` waits asynchronously, in
+    FIFO order per bucket, until a request may be sent. `observe` adapts a
+    bucket to the response: SP-API's `x-amzn-RateLimit-Limit` header sets
+    the rate directly, and a 429 halves the rate and pauses the bucket for
+    `Retry-After` (or one token interval). Successful responses move the
+    rate back towards the published limit.
+
+    At most `max_keys` idle buckets are kept; the least recently used are
+    dropped first.
+
+    `send_limited` sends a throttled request again, up to
+    `throttled_attempts` attempts in all, through the slowed-down bucket,
+    unless `Retry-After` asks for more than `max_retry_after_s`.
+    """
+
+    limits: Mapping[tuple[str, str], RateLimit] = field(
+        default_factory=lambda: dict(DEFAULT_RATE_LIMITS)
+    )
+    fallback: RateLimit = FALLBACK_RATE_LIMIT
+    max_keys: int = 10_000
+    throttled_attempts: int = 3
+    max_retry_after_s: float = 10.0
+    clock: Callable[[], float] = time.monotonic
+    sleep: Callable[[float], Any] = asyncio.sleep
+
+    _buckets: OrderedDict[RateLimitKey, _Bucket] = field(
+        default_factory=OrderedDict, init=False, repr=False
+    )
+
+    def __post_init__(self) -> None:
+        if self.max_keys < 1:
+            raise ValueError("max_keys must be >= 1")
+
+        if self.throttled_attempts < 1:
+            raise ValueError("throttled_attempts must be >= 1")
+
+        if self.max_retry_after_s < 0:
+            raise ValueError("max_retry_after_s must be >= 0")
+
+    async def acquire(self, key: RateLimitKey) -> float:
+        """Waits for a token of `key`'s bucket; returns the time waited."""
+
+        bucket = self._bucket(key)
+        started = self.clock()
+        bucket.waiting += 1
+        try:
+            async with bucket.lock:
+                while (delay := bucket.reserve(self.clock())) > 0:
+                    await self.sleep(delay)
+        finally:
+            bucket.waiting -= 1
+
+        waited = self.clock() - started
+        bucket.acquired += 1
+        bucket.total_wait_s += waited
+        bucket.max_wait_s = max(bucket.max_wait_s, waited)
+        return waited
+
+    def observe(
+        self,
+        key: RateLimitKey,
+        status_code: int,
+        headers: Mapping[str, str],
+    ) -> None:
+        """Adapts `key`'s bucket to a marketplace response."""
+
+        bucket = self._bucket(key)
+        now = self.clock()
+        bucket.refill(now)
+
+        advertised = _parse_float(headers.get(AMAZON_RATE_LIMIT_HEADER))
+        if advertised is not None and advertised > 0:
+            bucket.rate = advertised
+
+        if status_code == 429:
+            bucket.throttled += 1
+            bucket.rate = max(bucket.rate / 2, bucket.base.rate / 64)
+            bucket.tokens = 0.0
+            retry_after = _parse_float(headers.get("retry-after"))
+            pause = retry_after if retry_after is not None else 1.0 / bucket.rate
+            bucket.blocked_until = max(bucket.blocked_until, now + pause)
+        elif advertised is None and bucket.rate < bucket.base.rate:
+            bucket.rate = min(bucket.base.rate, bucket.rate * 1.1)
+
+    def stats(self) -> list[RateLimitStats]:
+        now = self.clock()
+        result: list[RateLimitStats] = []
+        for (marketplace, account, operation), bucket in self._buckets.items():
+            bucket.refill(now)
+            result.append(
+                RateLimitStats(
+                    marketplace=marketplace,
+                    account=account,
+                    operation=operation,
+                    rate=bucket.rate,
+                    burst=bucket.base.burst,
+                    tokens=bucket.tokens,
+                    waiting=bucket.waiting,
+                    acquired=bucket.acquired,
+                    throttled=bucket.throttled,
+                    total_wait_s=bucket.total_wait_s,
+                    max_wait_s=bucket.max_wait_s,
+                )
+            )
+        return result
+
+    def _bucket(self, key: RateLimitKey) -> _Bucket:
+        bucket = self._buckets.get(key)
+        if bucket is not None:
+            self._buckets.move_to_end(key)
+            return bucket
+
+        limit = self.limits.get((key[0], key[2]), self.fallback)
+        bucket = _Bucket(
+            base=limit,
+            rate=limit.rate,
+            tokens=float(limit.burst),
+            updated_at=self.clock(),
+        )
+        self._buckets[key] = bucket
+        self._evict_idle()
+        return bucket
+
+    def _evict_idle(self) -> None:
+        excess = len(self._buckets) - self.max_keys
+        if excess <= 0:
+            return
+
+        # The newest bucket is about to be used by the caller.
+        for key in list(self._buckets)[:-1]:
+            bucket = self._buckets[key]
+            if bucket.waiting == 0 and not bucket.lock.locked():
+                del self._buckets[key]
+                excess -= 1
+                if excess == 0:
+                    return
+
+
+def _parse_float(value: str | None) -> float | None:
+    if value is None:
+        return None
+    try:
+        return float(value)
+    except ValueError:
+        return None
+
+
+async def send_limited(
+    http: httpx.AsyncClient,
+    limiter: RateLimiter | None,
+    key: RateLimitKey,
+    method: str,
+    url: str,
+    **kwargs: Any,
+) -> httpx.Response:
+    """
+    Sends one request through `limiter` (when set) and reports back.
+
+    With a limiter, 429 responses are retried here rather than by the
+    transport, so every attempt takes a token and the limiter sees each
+    throttled response.
+    """
+
+    if limiter is None:
+        return await http.request(method, url, **kwargs)
+
+    kwargs["extensions"] = {**kwargs.get("extensions", {}), RETRY_THROTTLED: False}
+    attempt = 0
+    while True:
+        attempt += 1
+        await limiter.acquire(key)
+        response = await http.request(method, url, **kwargs)
+        limiter.observe(key, response.status_code, response.headers)
+        if response.status_code != 429 or attempt >= limiter.throttled_attempts:
+            return response
+
+        retry_after = parse_retry_after(response.headers.get("retry-after"))
+        if retry_after is not None and retry_after > limiter.max_retry_after_s:
+            return response
+        await response.aclose()
@@ -0,0 +1,267 @@
+from __future__ import annotations
+
+import asyncio
+import email.utils
+import random
+import time
+from collections.abc import Callable
+from dataclasses import dataclass, field
+from enum import StrEnum
+from typing import Any
+
+import httpx
+
+from app.application.service.tracing import TraceSpan, span
+
+# Methods that may be repeated without changing the result. Requests can
+# opt in individually with `extensions={"idempotent": True}`, e.g. a POST
+# that sets absolute quantities.
+IDEMPOTENT_METHODS = frozenset({"GET", "HEAD", "OPTIONS", "PUT", "DELETE"})
+
+# Request extension: False hands 429 responses back to the caller instead
+# of retrying them, for callers that pace requests with a rate limiter.
+RETRY_THROTTLED = "retry_throttled"
+
+RETRY_STATUSES = frozenset({429, 500, 502, 503, 504})
+
+
+class CircuitOpenError(httpx.TransportError):
+    """Raised without sending the request while a host's circuit is open."""
+
+
+@dataclass(frozen=True, slots=True)
+class RetryPolicy:
+    """
+    When and how long to wait before repeating a request.
+
+    Throttled (429) responses and connection failures are retried for any
+    method, since the server did not process the request. 5xx responses
+    and read errors are only retried for idempotent requests. Delays grow
+    exponentially with full jitter, and `Retry-After` takes precedence;
+    a `Retry-After` longer than `backoff_max_s` is not waited for.
+    """
+
+    max_attempts: int = 3
+    backoff_base_s: float = 0.2
+    backoff_max_s: float = 10.0
+
+    def __post_init__(self) -> None:
+        if self.max_attempts < 1:
+            raise ValueError("max_attempts must be >= 1")
+
+        if self.backoff_base_s < 0:
+            raise ValueError("backoff_base_s must be >= 0")
+
+        if self.backoff_max_s < self.backoff_base_s:
+            raise ValueError("backoff_max_s must be >= backoff_base_s")
+
+    def backoff(self, attempt: int, rng: random.Random) -> float:
+        """Jittered delay before retry number `attempt` (1-based)."""
+
+        ceiling = min(self.backoff_max_s, self.backoff_base_s * 2 ** (attempt - 1))
+        return rng.uniform(0, ceiling)
+
+
+class CircuitState(StrEnum):
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+
+@dataclass(slots=True)
+class CircuitBreaker:
+    """
+    Per-host breaker: after `failure_threshold` consecutive failures the
+    host is considered down and requests fail fast for `reset_timeout_s`.
+    Then a single probe request is let through; its outcome closes or
+    re-opens the circuit.
+    """
+
+    failure_threshold: int = 5
+    reset_timeout_s: float = 30.0
+    clock: Callable[[], float] = time.monotonic
+
+    state: CircuitState = field(default=CircuitState.CLOSED, init=False)
+    _failures: int = field(default=0, init=False, repr=False)
+    _opened_at: float = field(default=0.0, init=False, repr=False)
+    _probing: bool = field(default=False, init=False, repr=False)
+
+    def __post_init__(self) -> None:
+        if self.failure_threshold < 1:
+            raise ValueError("failure_threshold must be >= 1")
+
+        if self.reset_timeout_s <= 0:
+            raise ValueError("reset_timeout_s must be > 0")
+
+    def allow(self) -> bool:
+        if self.state is CircuitState.CLOSED:
+            return True
+
+        if self.state is CircuitState.OPEN:
+            if self.clock() - self._opened_at < self.reset_timeout_s:
+                return False
+            self.state = CircuitState.HALF_OPEN
+
+        if self._probing:
+            return False
+        self._probing = True
+        return True
+
+    def record_success(self) -> None:
+        self.state = CircuitState.CLOSED
+        self._failures = 0
+        self._probing = False
+
+    def release(self) -> None:
+        """Gives up a probe slot whose request never completed."""
+        self._probing = False
+
+    def record_failure(self) -> None:
+        self._failures += 1
+        self._probing = False
+        if (
+            self.state is CircuitState.HALF_OPEN
+            or self._failures >= self.failure_threshold
+        ):
+            self.state = CircuitState.OPEN
+            self._opened_at = self.clock()
+
+
+@dataclass(slots=True)
+class ResilientTransport(httpx.AsyncBaseTransport):
+    """
+    httpx transport that adds retries and per-host circuit breakers on top
+    of another transport.
+    """
+
+    inner: httpx.AsyncBaseTransport = field(default_factory=httpx.AsyncHTTPTransport)
+    retry: RetryPolicy = field(default_factory=RetryPolicy)
+    failure_threshold: int = 5
+    reset_timeout_s: float = 30.0
+    clock: Callable[[], float] = time.monotonic
+    sleep: Callable[[float], Any] = asyncio.sleep
+    rng: random.Random = field(default_factory=random.Random)
+
+    _breakers: dict[str, CircuitBreaker] = field(
+        default_factory=dict, init=False, repr=False
+    )
+
+    def breaker(self, host: str) -> CircuitBreaker:
+        breaker = self._breakers.get(host)
+        if breaker is None:
+            breaker = CircuitBreaker(
+                failure_threshold=self.failure_threshold,
+                reset_timeout_s=self.reset_timeout_s,
+                clock=self.clock,
+            )
+            self._breakers[host] = breaker
+        return breaker
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        with span(
+            "http",
+            method=request.method,
+            host=request.url.host,
+            path=request.url.path,
+        ) as http_span:
+            response = await self._send(request, http_span)
+            http_span.set("status", response.status_code)
+            length = response.headers.get("content-length")
+            if length is not None and length.isdigit():
+                http_span.set("response_bytes", int(length))
+            return response
+
+    async def _send(
+        self,
+        request: httpx.Request,
+        http_span: TraceSpan,
+    ) -> httpx.Response:
+        breaker = self.breaker(request.url.host)
+        idempotent = request.method in IDEMPOTENT_METHODS or bool(
+            request.extensions.get("idempotent")
+        )
+
+        # Buffer the body so it can be sent again.
+        await request.aread()
+        http_span.set("request_bytes", len(request.content))
+
+        attempt = 0
+        while True:
+            attempt += 1
+            if attempt > 1:
+                http_span.set("retries", attempt - 1)
+            if not breaker.allow():
+                raise CircuitOpenError(
+                    f"Circuit open for {request.url.host}", request=request
+                )
+
+            try:
+                response = await self.inner.handle_async_request(request)
+            except asyncio.CancelledError:
+                breaker.release()
+                raise
+            except httpx.TransportError as exc:
+                breaker.record_failure()
+                not_sent = isinstance(exc, httpx.ConnectError | httpx.ConnectTimeout)
+                if attempt >= self.retry.max_attempts or not (idempotent or not_sent):
+                    raise
+                await self.sleep(self.retry.backoff(attempt, self.rng))
+                continue
+
+            if response.status_code >= 500:
+                breaker.record_failure()
+            else:
+                breaker.record_success()
+
+            delay = self._retry_delay(request, response, attempt, idempotent)
+            if delay is None:
+                return response
+
+            await response.aclose()
+            await self.sleep(delay)
+
+    async def aclose(self) -> None:
+        await self.inner.aclose()
+
+    def _retry_delay(
+        self,
+        request: httpx.Request,
+        response: httpx.Response,
+        attempt: int,
+        idempotent: bool,
+    ) -> float | None:
+        status = response.status_code
+        if status not in RETRY_STATUSES or attempt >= self.retry.max_attempts:
+            return None
+
+        if status != 429 and not idempotent:
+            return None
+
+        if status == 429 and not request.extensions.get(RETRY_THROTTLED, True):
+            return None
+
+        retry_after = parse_retry_after(response.headers.get("retry-after"))
+        if retry_after is None:
+            return self.retry.backoff(attempt, self.rng)
+
+        if retry_after > self.retry.backoff_max_s:
+            return None
+        return retry_after
+
+
+def parse_retry_after(value: str | None) -> float | None:
+    """Parses `Retry-After` as delta-seconds or an HTTP date."""
+
+    if not value:
+        return None
+
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+
+    try:
+        when = email.utils.parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    return max(0.0, when.timestamp() - time.time())
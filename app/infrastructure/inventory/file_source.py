@@ -0,0 +1,210 @@
+from __future__ import annotations
+
+import asyncio
+import codecs
+import csv
+import hashlib
+import mmap
+import os
+from dataclasses import dataclass, field
+
+from app.application.service.tracing import span
+from app.domain.inventory import InventorySnapshot, InventorySnapshotBuilder
+
+DEFAULT_CHUNK_BYTES = 8 * 2**20
+
+# (st_mtime_ns, st_size)
+FileVersion = tuple[int, int]
+
+
+@dataclass(frozen=True, slots=True)
+class _Parsed:
+    version: FileVersion
+    digest: bytes | None
+    snapshot: InventorySnapshot
+
+
+@dataclass(slots=True)
+class FileInventorySource:
+    """
+    WarehouseInventoryPort reading a local CSV or TSV inventory export.
+
+    The file is memory-mapped and parsed `chunk_bytes` at a time, each chunk
+    cut at a line end, so a large export is never held in memory as text.
+    The header row names the columns; other columns are ignored, values
+    are stripped of surrounding whitespace, and rows sharing a condition_id
+    are summed. A file with quoted fields, which may hold the delimiter or
+    a line break, is read row by row with the csv module instead.
+
+    The parsed snapshot is reused while the file's mtime and size are
+    unchanged, and with `verify_hash` also when a rewritten file has the
+    same content. Parsing runs in a worker thread.
+    """
+
+    path: str
+    # by extension when not set: tab for .tsv and .tab, comma otherwise
+    delimiter: str | None = None
+    condition_id_column: str = "condition_id"
+    quantity_column: str = "quantity"
+    chunk_bytes: int = DEFAULT_CHUNK_BYTES
+    verify_hash: bool = True
+
+    _parsed: _Parsed | None = field(default=None, init=False, repr=False)
+    _lock: asyncio.Lock = field(default_factory=asyncio.Lock, init=False, repr=False)
+
+    def __post_init__(self) -> None:
+        if not self.path:
+            raise ValueError("path must not be empty")
+
+        if self.delimiter is not None and len(self.delimiter) != 1:
+            raise ValueError("delimiter must be one character")
+
+        if self.chunk_bytes < 1:
+            raise ValueError("chunk_bytes must be >= 1")
+
+    async def load_snapshot(self) -> InventorySnapshot:
+        # one load at a time, so concurrent callers share a parse
+        async with self._lock:
+            with span("load_inventory", source="file") as load_span:
+                snapshot, cached = await asyncio.to_thread(self._load)
+                load_span.set("cached", cached)
+                load_span.set("rows", len(snapshot))
+                return snapshot
+
+    def _load(self) -> tuple[InventorySnapshot, bool]:
+        parsed = self._parsed
+        with open(self.path, "rb") as f:
+            st = os.fstat(f.fileno())
+            version = (st.st_mtime_ns, st.st_size)
+            if parsed is not None and parsed.version == version:
+                return parsed.snapshot, True
+
+            if st.st_size == 0:
+                raise ValueError(f"{self.path}: inventory file is empty")
+
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data:
+                digest = None
+                if self.verify_hash:
+                    digest = hashlib.blake2b(data, digest_size=16).digest()
+                    if parsed is not None and parsed.digest == digest:
+                        self._parsed = _Parsed(version, digest, parsed.snapshot)
+                        return parsed.snapshot, True
+
+                snapshot = self._parse(data)
+
+        self._parsed = _Parsed(version, digest, snapshot)
+        return snapshot, False
+
+    def _parse(self, data: mmap.mmap) -> InventorySnapshot:
+        delimiter = self.delimiter or (
+            "\t" if self.path.endswith((".tsv", ".tab")) else ","
+        )
+        size = len(data)
+
+        header_end = data.find(b"\n")
+        if header_end == -1:
+            header_end = size
+        header = data[:header_end].decode("utf-8-sig").rstrip("\r")
+        columns = [c.strip() for c in next(csv.reader([header], delimiter=delimiter))]
+        try:
+            id_col = columns.index(self.condition_id_column)
+            qty_col = columns.index(self.quantity_column)
+        except ValueError:
+            raise ValueError(
+                f"{self.path}: header must have {self.condition_id_column!r} and "
+                f"{self.quantity_column!r} columns, got {columns!r}"
+            ) from None
+
+        if data.find(b'"') != -1:
+            return self._parse_quoted(data, delimiter, id_col, qty_col)
+
+        builder = InventorySnapshotBuilder()
+        pos = header_end + 1
+        line_no = 2
+        while pos < size:
+            end = size
+            if pos + self.chunk_bytes < size:
+                end = data.rfind(b"\n", pos, pos + self.chunk_bytes)
+                if end == -1:
+                    # a line longer than a chunk
+                    end = data.find(b"\n", pos + self.chunk_bytes)
+                    end = size if end == -1 else end
+
+            text = data[pos:end].decode("utf-8")
+            try:
+                ids, qtys = _parse_rows(text, delimiter, id_col, qty_col)
+                builder.add_columns(ids, qtys)
+            except (IndexError, ValueError):
+                self._raise_row_error(text, delimiter, id_col, qty_col, line_no)
+                raise
+
+            line_no += text.count("\n") + 1
+            pos = end + 1
+
+        return builder.build()
+
+    def _parse_quoted(
+        self,
+        data: mmap.mmap,
+        delimiter: str,
+        id_col: int,
+        qty_col: int,
+    ) -> InventorySnapshot:
+        data.seek(0)
+        lines = codecs.iterdecode(iter(data.readline, b""), "utf-8-sig")
+        reader = csv.reader(lines, delimiter=delimiter)
+        next(reader)  # the header
+
+        builder = InventorySnapshotBuilder()
+        for row in reader:
+            if not row:
+                continue
+            try:
+                builder.add(row[id_col].strip(), int(row[qty_col]))
+            except IndexError:
+                raise ValueError(
+                    f"{self.path}:{reader.line_num}: missing columns"
+                ) from None
+            except ValueError as e:
+                raise ValueError(f"{self.path}:{reader.line_num}: {e}") from None
+
+        return builder.build()
+
+    def _raise_row_error(
+        self,
+        text: str,
+        delimiter: str,
+        id_col: int,
+        qty_col: int,
+        first_line_no: int,
+    ) -> None:
+        """Finds the line a chunk failed on, to report it by number."""
+
+        for line_no, line in enumerate(text.split("\n"), first_line_no):
+            try:
+                ids, qtys = _parse_rows(line, delimiter, id_col, qty_col)
+                InventorySnapshotBuilder().add_columns(ids, qtys)
+            except IndexError:
+                raise ValueError(f"{self.path}:{line_no}: missing columns") from None
+            except ValueError as e:
+                message = str(e).removeprefix("row 0: ")
+                raise ValueError(f"{self.path}:{line_no}: {message}") from None
+
+
+def _parse_rows(
+    text: str,
+    delimiter: str,
+    id_col: int,
+    qty_col: int,
+) -> tuple[list[str], list[int]]:
+    """
+    Splits unquoted lines into the condition_id and quantity columns,
+    skipping blanks.
+    """
+
+    if "\r" in text:
+        text = text.replace("\r", "")
+    rows = [line.split(delimiter) for line in text.split("\n") if line]
+
+    # int() itself ignores surrounding whitespace
+    return [row[id_col].strip() for row in rows], [int(row[qty_col]) for row in rows]
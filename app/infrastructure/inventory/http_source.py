@@ -0,0 +1,44 @@
+from __future__ import annotations
+
+from collections.abc import Mapping
+from dataclasses import dataclass, field
+
+import httpx
+
+from app.application.service.tracing import span
+from app.domain.inventory import InventorySnapshot, InventorySnapshotBuilder
+
+
+@dataclass(frozen=True, slots=True)
+class HttpInventorySource:
+    """
+    WarehouseInventoryPort reading an inventory export over HTTP.
+
+    The export holds the inventory rows of a sync request, either as a bare
+    JSON list or under an `inventory` key:
+    `[{"condition_id": "NEW-1", "quantity": 4}, ...]`.
+    """
+
+    http: httpx.AsyncClient
+    url: str
+    headers: Mapping[str, str] = field(default_factory=dict)
+
+    async def load_snapshot(self) -> InventorySnapshot:
+        with span("load_inventory", source="http") as load_span:
+            response = await self.http.get(self.url, headers=dict(self.headers))
+            response.raise_for_status()
+            payload = response.json()
+
+            rows = payload.get("inventory") if isinstance(payload, dict) else payload
+            if not isinstance(rows, list):
+                raise ValueError("inventory export must be a list of rows")
+
+            builder = InventorySnapshotBuilder()
+            for i, row in enumerate(rows):
+                try:
+                    builder.add(row["condition_id"], int(row["quantity"]))
+                except (KeyError, TypeError, ValueError) as e:
+                    raise ValueError(f"row {i}: invalid inventory row: {e}") from None
+
+            load_span.set("rows", len(rows))
+            return builder.build()
@@ -0,0 +1,219 @@
+from __future__ import annotations
+
+import asyncio
+import json
+import os
+import sqlite3
+import threading
+import time
+import uuid
+from collections.abc import Callable
+from dataclasses import asdict, dataclass, field
+from typing import Any
+
+from app.application.ports.jobs import JobStatus, SyncJob
+from app.domain.marketplace import (
+    ListingQuantityUpdate,
+    ListingUpdateFailure,
+    SkipReason,
+    SyncResult,
+)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS sync_jobs (
+    id          TEXT PRIMARY KEY,
+    marketplace TEXT NOT NULL,
+    status      TEXT NOT NULL,
+    payload     TEXT NOT NULL,
+    result      TEXT,
+    error       TEXT,
+    created_at  REAL NOT NULL,
+    updated_at  REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS sync_jobs_queue
+    ON sync_jobs (marketplace, status, created_at);
+CREATE INDEX IF NOT EXISTS sync_jobs_finished
+    ON sync_jobs (status, updated_at);
+"""
+
+
+def _dump_result(result: SyncResult) -> str:
+    return json.dumps(asdict(result))
+
+
+def _load_result(raw: str | None) -> SyncResult | None:
+    if raw is None:
+        return None
+    data = json.loads(raw)
+    return SyncResult(
+        updates=[ListingQuantityUpdate(**u) for u in data["updates"]],
+        failures=[ListingUpdateFailure(**f) for f in data["failures"]],
+        # absent from results stored before they were recorded
+        evaluated=data.get("evaluated", 0),
+        skipped={SkipReason(k): v for k, v in data.get("skipped", {}).items()},
+    )
+
+
+def _to_job(row: sqlite3.Row) -> SyncJob:
+    return SyncJob(
+        id=row["id"],
+        marketplace=row["marketplace"],
+        status=JobStatus(row["status"]),
+        payload=json.loads(row["payload"]),
+        result=_load_result(row["result"]),
+        error=row["error"],
+        created_at=row["created_at"],
+        updated_at=row["updated_at"],
+    )
+
+
+@dataclass(slots=True)
+class SqliteJobQueue:
+    """
+    SyncJobQueue stored in a local SQLite file, so queued jobs survive a
+    restart of the process.
+
+    Calls run in a worker thread over a single connection; `retention_s`
+    bounds how long finished jobs are kept.
+
+    Payloads of pending jobs hold the account's refresh token in plain
+    text until the job finishes. The file is therefore created readable
+    by its owner only (SQLite gives its WAL files the same mode), and an
+    existing file is narrowed to that on open.
+    """
+
+    path: str
+    retention_s: float = 86_400.0
+    clock: Callable[[], float] = time.time
+
+    _conn: sqlite3.Connection = field(init=False, repr=False)
+    _lock: threading.Lock = field(default_factory=threading.Lock, init=False)
+
+    def __post_init__(self) -> None:
+        if not self.path:
+            raise ValueError("path must not be empty")
+
+        if self.retention_s <= 0:
+            raise ValueError("retention_s must be > 0")
+
+        os.close(os.open(self.path, os.O_RDWR | os.O_CREAT, 0o600))
+        os.chmod(self.path, 0o600)
+        self._conn = sqlite3.connect(
+            self.path, check_same_thread=False, isolation_level=None
+        )
+        self._conn.row_factory = sqlite3.Row
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.executescript(_SCHEMA)
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+    async def enqueue(self, marketplace: str, payload: dict[str, Any]) -> SyncJob:
+        now = self.clock()
+        job = SyncJob(
+            id=uuid.uuid4().hex,
+            marketplace=marketplace,
+            status=JobStatus.QUEUED,
+            payload=payload,
+            created_at=now,
+            updated_at=now,
+        )
+
+        def insert(conn: sqlite3.Connection) -> None:
+            conn.execute(
+                "INSERT INTO sync_jobs"
+                " (id, marketplace, status, payload, created_at, updated_at)"
+                " VALUES (?, ?, ?, ?, ?, ?)",
+                (
+                    job.id,
+                    marketplace,
+                    job.status,
+                    json.dumps(payload),
+                    now,
+                    now,
+                ),
+            )
+
+        await self._call(insert)
+        return job
+
+    async def claim(self, marketplace: str) -> SyncJob | None:
+        now = self.clock()
+
+        def claim_next(conn: sqlite3.Connection) -> SyncJob | None:
+            row = conn.execute(
+                "UPDATE sync_jobs SET status = ?, updated_at = ?"
+                " WHERE id = ("
+                "   SELECT id FROM sync_jobs"
+                "   WHERE marketplace = ? AND status = ?"
+                "   ORDER BY created_at LIMIT 1"
+                " ) RETURNING *",
+                (JobStatus.RUNNING, now, marketplace, JobStatus.QUEUED),
+            ).fetchone()
+            return None if row is None else _to_job(row)
+
+        return await self._call(claim_next)
+
+    async def complete(self, job_id: str, result: SyncResult) -> None:
+        await self._finish(job_id, JobStatus.SUCCEEDED, _dump_result(result), None)
+
+    async def fail(self, job_id: str, error: str) -> None:
+        await self._finish(job_id, JobStatus.FAILED, None, error)
+
+    async def get(self, job_id: str) -> SyncJob | None:
+        def select(conn: sqlite3.Connection) -> SyncJob | None:
+            row = conn.execute(
+                "SELECT * FROM sync_jobs WHERE id = ?", (job_id,)
+            ).fetchone()
+            return None if row is None else _to_job(row)
+
+        return await self._call(select)
+
+    async def requeue_running(self) -> int:
+        now = self.clock()
+
+        def requeue(conn: sqlite3.Connection) -> int:
+            cursor = conn.execute(
+                "UPDATE sync_jobs SET status = ?, updated_at = ? WHERE status = ?",
+                (JobStatus.QUEUED, now, JobStatus.RUNNING),
+            )
+            return cursor.rowcount
+
+        return await self._call(requeue)
+
+    async def _finish(
+        self,
+        job_id: str,
+        status: JobStatus,
+        result: str | None,
+        error: str | None,
+    ) -> None:
+        now = self.clock()
+
+        def finish(conn: sqlite3.Connection) -> None:
+            # The payload (inventory and refresh token) is not needed once
+            # the job has finished.
+            conn.execute(
+                "UPDATE sync_jobs SET status = ?, result = ?, error = ?,"
+                " payload = '{}', updated_at = ? WHERE id = ?",
+                (status, result, error, now, job_id),
+            )
+            # Finished jobs only need to outlive the clients polling them.
+            conn.execute(
+                "DELETE FROM sync_jobs WHERE status IN (?, ?) AND updated_at < ?",
+                (
+                    JobStatus.SUCCEEDED,
+                    JobStatus.FAILED,
+                    now - self.retention_s,
+                ),
+            )
+
+        await self._call(finish)
+
+    async def _call[T](self, fn: Callable[[sqlite3.Connection], T]) -> T:
+        def locked() -> T:
+            with self._lock:
+                return fn(self._conn)
+
+        return await asyncio.to_thread(locked)
@@ -1,11 +1,33 @@
 from __future__ import annotations
 
-from collections.abc import Iterable
+import json
+from collections.abc import AsyncIterator, Iterable, Sequence
 from dataclasses import dataclass
+from typing import Any
+from urllib.parse import quote
 
 import httpx
 
-from app.domain.marketplace import Listing, ListingQuantityUpdate
+from app.application.service.tracing import span
+from app.domain.marketplace import (
+    Listing,
+    ListingQuantityUpdate,
+    ListingUpdateFailure,
+)
+from app.infrastructure.auth.tokens import (
+    LWA_TOKEN_URL,
+    LwaTokenExchange,
+    TokenManager,
+)
+from app.infrastructure.concurrency import gather_bounded
+from app.infrastructure.http.rate_limit import RateLimiter, send_limited
+
+LISTINGS_ITEMS_PATH = "/listings/2021-08-01/items"
+FEED_DOCUMENTS_PATH = "/feeds/2021-06-30/documents"
+FEEDS_PATH = "/feeds/2021-06-30/feeds"
+
+LISTINGS_FEED_TYPE = "JSON_LISTINGS_FEED"
+LISTINGS_FEED_CONTENT_TYPE = "application/json; charset=UTF-8"
 
 
 class AmazonMapper:
@@ -13,6 +35,65 @@ class AmazonMapper:
     def map_listings(payload) -> list[Listing]:
         return []
 
+    @staticmethod
+    def quantity_patches(qty: int) -> list[dict[str, Any]]:
+        """Listings Items JSON patch that sets the DEFAULT (MFN) quantity."""
+
+        return [
+            {
+                "op": "replace",
+                "path": "/attributes/fulfillment_availability",
+                "value": [{"fulfillment_channel_code": "DEFAULT", "quantity": qty}],
+            }
+        ]
+
+    @staticmethod
+    def listings_feed(
+        seller_id: str,
+        updates: Sequence[ListingQuantityUpdate],
+    ) -> bytes:
+        """Serializes quantity updates into a JSON_LISTINGS_FEED document."""
+
+        document = {
+            "header": {
+                "sellerId": seller_id,
+                "version": "2.0",
+                "issueLocale": "en_US",
+            },
+            "messages": [
+                {
+                    "messageId": message_id,
+                    "sku": u.sku,
+                    "operationType": "PATCH",
+                    "productType": "PRODUCT",
+                    "patches": AmazonMapper.quantity_patches(u.qty),
+                }
+                for message_id, u in enumerate(updates, start=1)
+            ],
+        }
+        return json.dumps(document, separators=(",", ":")).encode()
+
+    @staticmethod
+    def map_patch_failure(
+        payload: dict[str, Any],
+        update: ListingQuantityUpdate,
+    ) -> ListingUpdateFailure | None:
+        """Returns a failure when a Listings Items PATCH was not accepted."""
+
+        if payload.get("status") == "ACCEPTED":
+            return None
+
+        errors = [
+            issue.get("message") or issue.get("code") or ""
+            for issue in payload.get("issues") or []
+            if issue.get("severity") == "ERROR"
+        ]
+        return ListingUpdateFailure(
+            sku=update.sku,
+            listing_id=update.listing_id,
+            reason="; ".join(errors) or f"status {payload.get('status')}",
+        )
+
 
 @dataclass(slots=True, frozen=True)
 class AmazonUserCredentials:
@@ -45,6 +126,29 @@ class AmazonAdapter:
     http: httpx.AsyncClient
     credentials: AmazonUserCredentials
     base_url: str
+    marketplace_id: str = "ATVPDKIKX0DER"
+
+    # Exchanges the LWA refresh token for a cached access token; without
+    # one, `credentials.refresh_token` is sent as the access token as-is.
+    tokens: TokenManager | None = None
+    lwa_token_url: str = LWA_TOKEN_URL
+
+    # Update sets of at least `feed_threshold` items go through a single
+    # JSON_LISTINGS_FEED; smaller ones are patched per SKU, which is faster
+    # end-to-end but costs one rate-limited call per update.
+    feed_threshold: int = 200
+    patch_concurrency: int = 5
+
+    # Shared limiter; calls are keyed by (marketplace, `account`, operation)
+    limiter: RateLimiter | None = None
+    account: str = ""
+
+    def __post_init__(self) -> None:
+        if self.feed_threshold < 1:
+            raise ValueError("feed_threshold must be >= 1")
+
+        if self.patch_concurrency < 1:
+            raise ValueError("patch_concurrency must be >= 1")
 
     async def fetch_listings(self) -> list[Listing]:
         """
@@ -55,14 +159,186 @@ class AmazonAdapter:
 
         return []
 
+    async def iter_listings(self) -> AsyncIterator[Sequence[Listing]]:
+        """Yields marketplace listings page by page."""
+
+        listings = await self.fetch_listings()
+        if listings:
+            yield listings
+
     async def update_inventory(
         self,
         updates: Iterable[ListingQuantityUpdate],
-    ) -> None:
+    ) -> list[ListingUpdateFailure]:
         """
         Applies quantity updates for marketplace listings.
 
-        Stub implementation.
+        Chooses per-SKU Listings Items PATCH calls for small update sets and
+        a single JSON_LISTINGS_FEED submission for large ones. Feeds are
+        processed asynchronously by Amazon, so only PATCH rejections are
+        reported back as failures.
+        """
+
+        batch = list(updates)
+        if not batch:
+            return []
+
+        if len(batch) >= self.feed_threshold:
+            with span("amazon.listings_feed", skus=len(batch)):
+                await self.submit_listings_feed(batch)
+            return []
+
+        results = await gather_bounded(
+            batch,
+            self.patch_listing,
+            self.patch_concurrency,
+        )
+        return [failure for failure in results if failure is not None]
+
+    async def patch_listing(
+        self,
+        update: ListingQuantityUpdate,
+    ) -> ListingUpdateFailure | None:
+        """
+        Sets the quantity of a single SKU via the Listings Items API.
+
+        Returns a failure instead of raising, so one rejected SKU does not
+        abort the rest of the update set.
+        """
+
+        seller_id = quote(self.credentials.seller_partner_id, safe="")
+        sku = quote(update.sku, safe="")
+
+        try:
+            response = await self._send(
+                "listings_items.patch",
+                "PATCH",
+                f"{self.base_url}{LISTINGS_ITEMS_PATH}/{seller_id}/{sku}",
+                params={"marketplaceIds": self.marketplace_id},
+                json={
+                    "productType": "PRODUCT",
+                    "patches": AmazonMapper.quantity_patches(update.qty),
+                },
+                # a `replace` patch, so a repeat is harmless
+                extensions={"idempotent": True},
+            )
+            response.raise_for_status()
+            payload = response.json()
+        except (httpx.HTTPError, ValueError) as exc:
+            # ValueError: a success status with a body that is not JSON
+            return ListingUpdateFailure(
+                sku=update.sku,
+                listing_id=update.listing_id,
+                reason=str(exc),
+            )
+
+        return AmazonMapper.map_patch_failure(payload, update)
+
+    async def submit_listings_feed(
+        self,
+        updates: Sequence[ListingQuantityUpdate],
+    ) -> str:
+        """
+        Uploads all updates as one JSON_LISTINGS_FEED document and submits it.
+
+        Returns the feed id reported by the Feeds API.
+        """
+
+        content = AmazonMapper.listings_feed(
+            seller_id=self.credentials.seller_partner_id,
+            updates=updates,
+        )
+
+        document = await self._post_json(
+            "feeds.create_feed_document",
+            FEED_DOCUMENTS_PATH,
+            {"contentType": LISTINGS_FEED_CONTENT_TYPE},
+        )
+
+        # The upload URL is pre-signed and must not carry SP-API auth headers.
+        upload = await self.http.put(
+            document["url"],
+            content=content,
+            headers={"Content-Type": LISTINGS_FEED_CONTENT_TYPE},
+        )
+        upload.raise_for_status()
+
+        feed = await self._post_json(
+            "feeds.create_feed",
+            FEEDS_PATH,
+            {
+                "feedType": LISTINGS_FEED_TYPE,
+                "marketplaceIds": [self.marketplace_id],
+                "inputFeedDocumentId": document["feedDocumentId"],
+            },
+        )
+        return str(feed["feedId"])
+
+    async def _post_json(
+        self, operation: str, path: str, body: dict[str, Any]
+    ) -> dict[str, Any]:
+        response = await self._send(
+            operation,
+            "POST",
+            f"{self.base_url}{path}",
+            json=body,
+        )
+        response.raise_for_status()
+        return response.json()
+
+    async def _send(
+        self, operation: str, method: str, url: str, **kwargs: Any
+    ) -> httpx.Response:
+        """
+        Sends an authorized API call.
+
+        A 401 means the cached access token was revoked before it expired:
+        it is dropped and the call is sent once more with a fresh one.
         """
 
-        return None
+        key = ("amazon", self.account, operation)
+        token = await self._access_token()
+        response = await send_limited(
+            self.http,
+            self.limiter,
+            key,
+            method,
+            url,
+            headers=self._headers(token),
+            **kwargs,
+        )
+        if response.status_code != 401 or self.tokens is None:
+            return response
+
+        await response.aclose()
+        self.tokens.invalidate(self._token_exchange(), token)
+        return await send_limited(
+            self.http,
+            self.limiter,
+            key,
+            method,
+            url,
+            headers=self._headers(await self._access_token()),
+            **kwargs,
+        )
+
+    @staticmethod
+    def _headers(token: str) -> dict[str, str]:
+        return {
+            "x-amz-access-token": token,
+            "Accept": "application/json",
+        }
+
+    async def _access_token(self) -> str:
+        if self.tokens is None:
+            return self.credentials.refresh_token
+
+        return await self.tokens.get_token(self._token_exchange())
+
+    def _token_exchange(self) -> LwaTokenExchange:
+        return LwaTokenExchange(
+            client_id=self.credentials.lwa_client_id,
+            client_secret=self.credentials.lwa_client_secret,
+            refresh_token=self.credentials.refresh_token,
+            token_url=self.lwa_token_url,
+        )
@@ -1,18 +1,119 @@
 from __future__ import annotations
 
-from collections.abc import Iterable
+from collections.abc import AsyncIterator, Iterable, Sequence
 from dataclasses import dataclass
+from functools import partial
+from itertools import batched
+from typing import Any
 
 import httpx
 
-from app.domain.marketplace import Listing, ListingQuantityUpdate
+from app.application.service.tracing import span
+from app.domain.marketplace import (
+    Listing,
+    ListingBatch,
+    ListingQuantityUpdate,
+    ListingUpdateFailure,
+)
+from app.infrastructure.auth.tokens import EbayTokenExchange, TokenManager
+from app.infrastructure.concurrency import gather_bounded, prefetch_ordered
 from app.infrastructure.config import EbayDeveloperCredentials
+from app.infrastructure.http.rate_limit import RateLimiter, send_limited
+
+INVENTORY_ITEMS_PATH = "/sell/inventory/v1/inventory_item"
+BULK_UPDATE_PATH = "/sell/inventory/v1/bulk_update_price_quantity"
+
+# bulk_update_price_quantity accepts at most 25 SKUs per call
+BULK_UPDATE_MAX_SKUS = 25
 
 
 class EbayMapper:
     @staticmethod
-    def map_listings(payload) -> list[Listing]:
-        return []
+    def map_listings(payload: dict[str, Any]) -> list[Listing]:
+        """Maps an Inventory API `getInventoryItems` page to domain listings."""
+        return list(EbayMapper.map_listing_batch(payload))
+
+    @staticmethod
+    def map_listing_batch(payload: dict[str, Any]) -> ListingBatch:
+        """
+        Maps an Inventory API `getInventoryItems` page to a ListingBatch.
+
+        Columns are filled straight from the payload, without building a
+        Listing per item. Items without a SKU or condition cannot be matched
+        against warehouse inventory and are skipped.
+        """
+        skus: list[str] = []
+        condition_ids: list[str] = []
+        quantities: list[int] = []
+
+        for item in payload.get("inventoryItems") or []:
+            sku = item.get("sku")
+            condition_id = item.get("condition")
+            if not sku or not condition_id:
+                continue
+
+            availability = item.get("availability") or {}
+            ship_to = availability.get("shipToLocationAvailability") or {}
+
+            skus.append(sku)
+            condition_ids.append(condition_id)
+            quantities.append(int(ship_to.get("quantity") or 0))
+
+        return ListingBatch.from_columns(
+            skus=skus,
+            condition_ids=condition_ids,
+            marketplace_qtys=quantities,
+        )
+
+    @staticmethod
+    def bulk_update_request(
+        updates: Iterable[ListingQuantityUpdate],
+    ) -> dict[str, Any]:
+        """Builds a `bulk_update_price_quantity` body for one batch."""
+
+        requests: list[dict[str, Any]] = []
+        for u in updates:
+            request: dict[str, Any] = {
+                "sku": u.sku,
+                "shipToLocationAvailability": {"quantity": u.qty},
+            }
+            if u.listing_id:
+                request["offers"] = [
+                    {"offerId": u.listing_id, "availableQuantity": u.qty}
+                ]
+            requests.append(request)
+
+        return {"requests": requests}
+
+    @staticmethod
+    def map_bulk_update_failures(
+        payload: dict[str, Any],
+        batch: Sequence[ListingQuantityUpdate],
+    ) -> list[ListingUpdateFailure]:
+        """Extracts per-SKU failures from a `bulk_update_price_quantity` response."""
+
+        listing_ids = {u.sku: u.listing_id for u in batch}
+        failures: list[ListingUpdateFailure] = []
+
+        for response in payload.get("responses") or []:
+            status = int(response.get("statusCode") or 0)
+            errors = response.get("errors") or []
+            if 200 <= status < 300 and not errors:
+                continue
+
+            sku = response.get("sku") or ""
+            reason = "; ".join(
+                e.get("message") or str(e.get("errorId")) for e in errors
+            )
+            failures.append(
+                ListingUpdateFailure(
+                    sku=sku,
+                    listing_id=response.get("offerId") or listing_ids.get(sku),
+                    reason=reason or f"HTTP {status}",
+                )
+            )
+
+        return failures
 
 
 @dataclass(frozen=True, slots=True)
@@ -36,23 +137,198 @@ class EbayAdapter:
     dev_creds: EbayDeveloperCredentials
     base_url: str
 
+    # Exchanges the user's refresh token for a cached access token; without
+    # one, `credentials.token` is sent as the access token as-is.
+    tokens: TokenManager | None = None
+
+    # Inventory API pagination: items per page and pages fetched concurrently
+    page_size: int = 100
+    prefetch_pages: int = 4
+
+    # bulk_update_price_quantity batches sent concurrently
+    update_concurrency: int = 4
+
+    # Shared limiter; calls are keyed by (marketplace, `account`, operation)
+    limiter: RateLimiter | None = None
+    account: str = ""
+
+    def __post_init__(self) -> None:
+        if self.page_size < 1:
+            raise ValueError("page_size must be >= 1")
+
+        if self.prefetch_pages < 1:
+            raise ValueError("prefetch_pages must be >= 1")
+
+        if self.update_concurrency < 1:
+            raise ValueError("update_concurrency must be >= 1")
+
     async def fetch_listings(self) -> list[Listing]:
+        """Returns current marketplace listings snapshot."""
+
+        listings: list[Listing] = []
+        async for page in self.iter_listings():
+            listings.extend(page)
+        return listings
+
+    async def iter_listings(self) -> AsyncIterator[ListingBatch]:
         """
-        Returns current marketplace listings snapshot.
+        Yields marketplace listings page by page, as columnar batches.
 
-        Stub implementation.
+        The first page is fetched alone to learn the total item count;
+        the remaining offsets are then fetched `prefetch_pages` at a time
+        and yielded in order.
         """
 
-        return []
+        first = await self._get_inventory_page(offset=0)
+        yield EbayMapper.map_listing_batch(first)
+
+        total = first.get("total")
+        if total is None:
+            async for payload in self._follow_next_pages(first):
+                yield EbayMapper.map_listing_batch(payload)
+            return
+
+        offsets = range(self.page_size, int(total), self.page_size)
+        thunks = (partial(self._get_inventory_page, offset=o) for o in offsets)
+
+        async for payload in prefetch_ordered(thunks, window=self.prefetch_pages):
+            yield EbayMapper.map_listing_batch(payload)
 
     async def update_inventory(
         self,
         updates: Iterable[ListingQuantityUpdate],
-    ) -> None:
+    ) -> list[ListingUpdateFailure]:
         """
         Applies quantity updates for marketplace listings.
 
-        Stub implementation.
+        Updates are chunked into `bulk_update_price_quantity` batches of up
+        to 25 SKUs, sent `update_concurrency` at a time. Returns the SKUs
+        eBay rejected, collected across all batches.
         """
 
-        return None
+        batches = list(batched(updates, BULK_UPDATE_MAX_SKUS))
+        results = await gather_bounded(
+            batches,
+            self._send_bulk_update,
+            self.update_concurrency,
+        )
+        return [failure for failures in results for failure in failures]
+
+    async def _send_bulk_update(
+        self,
+        batch: Sequence[ListingQuantityUpdate],
+    ) -> list[ListingUpdateFailure]:
+        """
+        Sends one batch and returns its failed SKUs.
+
+        A failed call fails the whole batch without aborting the others.
+        """
+
+        with span("ebay.bulk_update", skus=len(batch)) as batch_span:
+            failures = await self._bulk_update(batch)
+            batch_span.set("failures", len(failures))
+            return failures
+
+    async def _bulk_update(
+        self,
+        batch: Sequence[ListingQuantityUpdate],
+    ) -> list[ListingUpdateFailure]:
+        try:
+            response = await self._send(
+                "inventory.bulk_update_price_quantity",
+                "POST",
+                f"{self.base_url}{BULK_UPDATE_PATH}",
+                json=EbayMapper.bulk_update_request(batch),
+                # sets absolute quantities, so a repeat is harmless
+                extensions={"idempotent": True},
+            )
+            response.raise_for_status()
+            payload = response.json()
+        except (httpx.HTTPError, ValueError) as exc:
+            # ValueError: a success status with a body that is not JSON
+            return [
+                ListingUpdateFailure(
+                    sku=u.sku, listing_id=u.listing_id, reason=str(exc)
+                )
+                for u in batch
+            ]
+
+        return EbayMapper.map_bulk_update_failures(payload, batch)
+
+    async def _follow_next_pages(
+        self,
+        payload: dict[str, Any],
+    ) -> AsyncIterator[dict[str, Any]]:
+        """Sequentially follows `next` links when the total is not reported."""
+
+        offset = int(payload.get("offset") or 0)
+        while payload.get("next") and payload.get("inventoryItems"):
+            offset += self.page_size
+            payload = await self._get_inventory_page(offset=offset)
+            yield payload
+
+    async def _get_inventory_page(self, offset: int) -> dict[str, Any]:
+        response = await self._send(
+            "inventory.get_inventory_items",
+            "GET",
+            f"{self.base_url}{INVENTORY_ITEMS_PATH}",
+            params={"limit": self.page_size, "offset": offset},
+        )
+        response.raise_for_status()
+        return response.json()
+
+    async def _send(
+        self, operation: str, method: str, url: str, **kwargs: Any
+    ) -> httpx.Response:
+        """
+        Sends an authorized API call.
+
+        A 401 means the cached access token was revoked before it expired:
+        it is dropped and the call is sent once more with a fresh one.
+        """
+
+        key = ("ebay", self.account, operation)
+        token = await self._access_token()
+        response = await send_limited(
+            self.http,
+            self.limiter,
+            key,
+            method,
+            url,
+            headers=self._headers(token),
+            **kwargs,
+        )
+        if response.status_code != 401 or self.tokens is None:
+            return response
+
+        await response.aclose()
+        self.tokens.invalidate(self._token_exchange(), token)
+        return await send_limited(
+            self.http,
+            self.limiter,
+            key,
+            method,
+            url,
+            headers=self._headers(await self._access_token()),
+            **kwargs,
+        )
+
+    @staticmethod
+    def _headers(token: str) -> dict[str, str]:
+        return {
+            "Authorization": f"Bearer {token}",
+            "Accept": "application/json",
+        }
+
+    async def _access_token(self) -> str:
+        if self.tokens is None:
+            return self.credentials.token
+
+        return await self.tokens.get_token(self._token_exchange())
+
+    def _token_exchange(self) -> EbayTokenExchange:
+        return EbayTokenExchange(
+            dev_creds=self.dev_creds,
+            refresh_token=self.credentials.token,
+            base_url=self.base_url,
+        )
@@ -4,7 +4,10 @@ import httpx
 
 from app.application.ports.marketplaces import MarketplacePort
 from app.domain.marketplace import MarketplaceConfig
+from app.infrastructure.auth.tokens import TokenManager
 from app.infrastructure.config import AppConfig
+from app.infrastructure.http.pools import PoolSettings
+from app.infrastructure.http.rate_limit import RateLimiter
 from app.infrastructure.marketplaces.amazon_client import (
     AmazonAdapter,
     AmazonUserCredentials,
@@ -16,6 +19,29 @@ from app.infrastructure.marketplaces.ebay_client import EbayAdapter, EbayUserCre
 class MarketplaceAdapterFactory:
     http: httpx.AsyncClient
     app_config: AppConfig
+    token_manager: TokenManager | None = None
+    rate_limiter: RateLimiter | None = None
+
+    @staticmethod
+    def host_pools(app_config: AppConfig) -> dict[str, PoolSettings]:
+        """Connection pool of each marketplace's API host, by base URL."""
+
+        base_urls = {
+            "ebay": app_config.ebay_base_url,
+            "amazon": app_config.amazon_base_url,
+        }
+        pools: dict[str, PoolSettings] = {}
+        for market, base_url in base_urls.items():
+            max_connections = app_config.http_pool_connections.get(
+                market, app_config.http_default_connections
+            )
+            pools[base_url] = PoolSettings(
+                max_connections=max_connections,
+                max_keepalive_connections=app_config.http_max_keepalive,
+                keepalive_expiry_s=app_config.http_keepalive_expiry_s,
+                http2=app_config.http2,
+            )
+        return pools
 
     def build(self, config: MarketplaceConfig) -> MarketplacePort:
         market = config.marketplace
@@ -28,6 +54,12 @@ class MarketplaceAdapterFactory:
                     credentials=ebay_creds,
                     dev_creds=self.app_config.ebay_dev_creds,
                     base_url=self.app_config.ebay_base_url,
+                    tokens=self.token_manager,
+                    page_size=self.app_config.ebay_page_size,
+                    prefetch_pages=self.app_config.ebay_prefetch_pages,
+                    update_concurrency=self.app_config.ebay_update_concurrency,
+                    limiter=self.rate_limiter,
+                    account=config.account,
                 )
             case "amazon":
                 amazon_creds = AmazonUserCredentials(
@@ -40,6 +72,13 @@ class MarketplaceAdapterFactory:
                     http=self.http,
                     credentials=amazon_creds,
                     base_url=self.app_config.amazon_base_url,
+                    marketplace_id=self.app_config.amazon_marketplace_id,
+                    tokens=self.token_manager,
+                    lwa_token_url=self.app_config.amazon_lwa_token_url,
+                    feed_threshold=self.app_config.amazon_feed_threshold,
+                    patch_concurrency=self.app_config.amazon_patch_concurrency,
+                    limiter=self.rate_limiter,
+                    account=config.account,
                 )
 
         raise ValueError(f"Unsupported marketplace: {config.marketplace}")
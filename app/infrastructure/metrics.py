@@ -0,0 +1,316 @@
+from __future__ import annotations
+
+import math
+from bisect import bisect_left
+from collections.abc import Callable, Iterable, Iterator, Sequence
+from dataclasses import dataclass, field
+
+from app.application.ports.metrics import SyncPhase
+from app.infrastructure.http.pools import PoolMonitor
+
+PROMETHEUS_MEDIA_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+# Seconds; spans sub-millisecond policy evaluation up to multi-minute
+# fetches of large accounts.
+DEFAULT_BUCKETS: tuple[float, ...] = (
+    0.001,
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+    10.0,
+    30.0,
+    60.0,
+    300.0,
+)
+
+LabelValues = tuple[str, ...]
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format_labels(names: Sequence[str], values: Sequence[str]) -> str:
+    if not names:
+        return ""
+    pairs = ",".join(
+        f'{name}="{_escape(value)}"' for name, value in zip(names, values, strict=True)
+    )
+    return "{" + pairs + "}"
+
+
+def _format_value(value: float) -> str:
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+class _CounterChild:
+    __slots__ = ("value",)
+
+    def __init__(self) -> None:
+        self.value = 0.0
+
+    def inc(self, amount: float = 1.0) -> None:
+        self.value += amount
+
+
+class _HistogramChild:
+    __slots__ = ("bounds", "counts", "sum")
+
+    def __init__(self, bounds: tuple[float, ...]) -> None:
+        self.bounds = bounds
+        # one slot per bucket plus +Inf; made cumulative when rendered
+        self.counts = [0] * (len(bounds) + 1)
+        self.sum = 0.0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect_left(self.bounds, value)] += 1
+        self.sum += value
+
+
+@dataclass(slots=True)
+class Counter:
+    name: str
+    description: str
+    labelnames: tuple[str, ...] = ()
+
+    _children: dict[LabelValues, _CounterChild] = field(
+        default_factory=dict, init=False, repr=False
+    )
+
+    def labels(self, *values: str) -> _CounterChild:
+        child = self._children.get(values)
+        if child is None:
+            child = self._children.setdefault(values, _CounterChild())
+        return child
+
+    def render(self) -> Iterator[str]:
+        yield f"# HELP {self.name} {self.description}"
+        yield f"# TYPE {self.name} counter"
+        for values, child in list(self._children.items()):
+            labels = _format_labels(self.labelnames, values)
+            yield f"{self.name}{labels} {_format_value(child.value)}"
+
+
+@dataclass(slots=True)
+class Histogram:
+    name: str
+    description: str
+    labelnames: tuple[str, ...] = ()
+    buckets: tuple[float, ...] = DEFAULT_BUCKETS
+
+    _children: dict[LabelValues, _HistogramChild] = field(
+        default_factory=dict, init=False, repr=False
+    )
+
+    def __post_init__(self) -> None:
+        if list(self.buckets) != sorted(set(self.buckets)):
+            raise ValueError("buckets must be strictly increasing")
+
+    def labels(self, *values: str) -> _HistogramChild:
+        child = self._children.get(values)
+        if child is None:
+            child = self._children.setdefault(values, _HistogramChild(self.buckets))
+        return child
+
+    def render(self) -> Iterator[str]:
+        yield f"# HELP {self.name} {self.description}"
+        yield f"# TYPE {self.name} histogram"
+        bucket_names = (*self.labelnames, "le")
+        for values, child in list(self._children.items()):
+            counts = list(child.counts)
+            cumulative = 0
+            for bound, count in zip((*self.buckets, math.inf), counts, strict=True):
+                cumulative += count
+                labels = _format_labels(bucket_names, (*values, _format_value(bound)))
+                yield f"{self.name}_bucket{labels} {cumulative}"
+
+            labels = _format_labels(self.labelnames, values)
+            yield f"{self.name}_sum{labels} {_format_value(child.sum)}"
+            yield f"{self.name}_count{labels} {cumulative}"
+
+
+@dataclass(slots=True)
+class GaugeCallback:
+    """Gauge whose samples are read from `collect` at scrape time."""
+
+    name: str
+    description: str
+    labelnames: tuple[str, ...]
+    collect: Callable[[], Iterable[tuple[LabelValues, float]]]
+
+    def render(self) -> Iterator[str]:
+        yield f"# HELP {self.name} {self.description}"
+        yield f"# TYPE {self.name} gauge"
+        for values, value in self.collect():
+            labels = _format_labels(self.labelnames, values)
+            yield f"{self.name}{labels} {_format_value(value)}"
+
+
+Metric = Counter | Histogram | GaugeCallback
+
+
+@dataclass(slots=True)
+class MetricsRegistry:
+    """
+    In-process metrics rendered in the Prometheus text format.
+
+    Recording takes no locks: samples are only written from the event
+    loop thread, and a scrape copies each metric's children before
+    rendering them.
+    """
+
+    _metrics: dict[str, Metric] = field(default_factory=dict, init=False)
+
+    def counter(
+        self, name: str, description: str, labelnames: Sequence[str] = ()
+    ) -> Counter:
+        return self._register(Counter(name, description, tuple(labelnames)))
+
+    def histogram(
+        self,
+        name: str,
+        description: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = DEFAULT_BUCKETS,
+    ) -> Histogram:
+        return self._register(
+            Histogram(name, description, tuple(labelnames), tuple(buckets))
+        )
+
+    def gauge_callback(
+        self,
+        name: str,
+        description: str,
+        labelnames: Sequence[str],
+        collect: Callable[[], Iterable[tuple[LabelValues, float]]],
+    ) -> GaugeCallback:
+        return self._register(
+            GaugeCallback(name, description, tuple(labelnames), collect)
+        )
+
+    def render(self) -> str:
+        lines: list[str] = []
+        for metric in self._metrics.values():
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+    def _register[M: Metric](self, metric: M) -> M:
+        if metric.name in self._metrics:
+            raise ValueError(f"Metric already registered: {metric.name}")
+        self._metrics[metric.name] = metric
+        return metric
+
+
+@dataclass(slots=True)
+class PrometheusMetrics:
+    """
+    SyncMetrics adapter, also recording outbound HTTP requests and pool
+    usage once attached to a PoolMonitor with `watch_pools`.
+    """
+
+    registry: MetricsRegistry = field(default_factory=MetricsRegistry)
+
+    phase_seconds: Histogram = field(init=False)
+    phase_rows: Counter = field(init=False)
+    updates: Counter = field(init=False)
+    sync_requests: Counter = field(init=False)
+    http_seconds: Histogram = field(init=False)
+    http_requests: Counter = field(init=False)
+    acquire_seconds: Histogram = field(init=False)
+
+    def __post_init__(self) -> None:
+        r = self.registry
+        self.phase_seconds = r.histogram(
+            "sync_phase_duration_seconds",
+            "Time spent in each phase of a sync run.",
+            ("marketplace", "phase"),
+        )
+        self.phase_rows = r.counter(
+            "sync_phase_rows_total",
+            "Rows handled by each phase of sync runs.",
+            ("marketplace", "phase"),
+        )
+        self.updates = r.counter(
+            "sync_updates_total",
+            "Quantity updates sent to marketplaces, by outcome.",
+            ("marketplace", "outcome"),
+        )
+        self.sync_requests = r.counter(
+            "sync_requests_total",
+            "Full sync requests, by whether they ran or were coalesced.",
+            ("marketplace", "outcome"),
+        )
+        self.http_seconds = r.histogram(
+            "http_client_request_duration_seconds",
+            "Outbound HTTP request latency until response headers.",
+            ("pool", "method"),
+        )
+        self.http_requests = r.counter(
+            "http_client_requests_total",
+            "Outbound HTTP requests by response status.",
+            ("pool", "method", "status"),
+        )
+        self.acquire_seconds = r.histogram(
+            "http_pool_acquire_duration_seconds",
+            "Time requests waited for a pooled connection.",
+            ("pool",),
+        )
+
+    def observe_phase(
+        self,
+        marketplace: str,
+        phase: SyncPhase,
+        seconds: float,
+        rows: int,
+    ) -> None:
+        self.phase_seconds.labels(marketplace, phase).observe(seconds)
+        self.phase_rows.labels(marketplace, phase).inc(rows)
+
+    def count_updates(self, marketplace: str, sent: int, failed: int) -> None:
+        self.updates.labels(marketplace, "accepted").inc(sent - failed)
+        self.updates.labels(marketplace, "rejected").inc(failed)
+
+    def count_sync_request(self, marketplace: str, coalesced: bool) -> None:
+        outcome = "coalesced" if coalesced else "ran"
+        self.sync_requests.labels(marketplace, outcome).inc()
+
+    def observe_http_request(
+        self,
+        pool: str,
+        method: str,
+        status: str,
+        seconds: float,
+    ) -> None:
+        self.http_seconds.labels(pool, method).observe(seconds)
+        self.http_requests.labels(pool, method, status).inc()
+
+    def observe_pool_acquire(self, pool: str, seconds: float) -> None:
+        self.acquire_seconds.labels(pool).observe(seconds)
+
+    def watch_pools(self, monitor: PoolMonitor) -> None:
+        monitor.add_listener(self.observe_pool_acquire)
+        monitor.add_request_listener(self.observe_http_request)
+
+        def collect() -> Iterator[tuple[LabelValues, float]]:
+            for stats in monitor.stats():
+                yield (stats.pool, "active"), stats.active
+                yield (stats.pool, "idle"), stats.idle
+                yield (stats.pool, "waiting"), stats.waiting
+
+        self.registry.gauge_callback(
+            "http_pool_connections",
+            "Pooled connections by state, and requests waiting for one.",
+            ("pool", "state"),
+            collect,
+        )
@@ -0,0 +1,169 @@
+from __future__ import annotations
+
+import asyncio
+import json
+import logging
+import os
+from collections import deque
+from collections.abc import Sequence
+from dataclasses import asdict, dataclass, field
+from typing import Any
+
+from app.application.ports.tracing import Span
+
+logger = logging.getLogger(__name__)
+
+
+def span_tree(spans: Sequence[Span]) -> dict[str, Any]:
+    """
+    Nests the spans of one trace under their parents, root first.
+
+    Spans whose parent is missing (e.g. from tasks that outlived their
+    parent span) are attached to the root.
+    """
+
+    nodes = {s.span_id: {**asdict(s), "children": []} for s in spans}
+    root = nodes[spans[0].span_id]
+    for s in spans[1:]:
+        parent = nodes.get(s.parent_id or "", root)
+        parent["children"].append(nodes[s.span_id])
+
+    for node in nodes.values():
+        node["children"].sort(key=lambda child: child["start_time"])
+    return root
+
+
+@dataclass(slots=True)
+class RingBufferExporter:
+    """Keeps the spans of the `max_traces` most recent traces in memory."""
+
+    max_traces: int = 200
+
+    _traces: deque[Sequence[Span]] = field(init=False, repr=False)
+
+    def __post_init__(self) -> None:
+        if self.max_traces < 1:
+            raise ValueError("max_traces must be >= 1")
+        self._traces = deque(maxlen=self.max_traces)
+
+    def export(self, spans: Sequence[Span]) -> None:
+        self._traces.append(spans)
+
+    def recent(self, limit: int | None = None) -> list[Sequence[Span]]:
+        """Traces newest first."""
+
+        traces = list(reversed(self._traces))
+        return traces if limit is None else traces[:limit]
+
+    def get(self, trace_id: str) -> Sequence[Span] | None:
+        for spans in self._traces:
+            if spans[0].trace_id == trace_id:
+                return spans
+        return None
+
+
+@dataclass(slots=True)
+class JsonlFileExporter:
+    """
+    Appends one span tree per line to `path`.
+
+    `export` only buffers the finished spans; a background writer started
+    by `start` serializes and appends buffered traces from a worker thread,
+    so neither JSON encoding nor file I/O runs on the event loop. At most
+    `max_pending` traces are buffered, further ones are dropped and
+    counted in `dropped`.
+
+    Once the file exceeds `max_bytes` it is rotated to `path.1` (and older
+    files shifted up to `path.<backups>`), like logging's
+    RotatingFileHandler.
+    """
+
+    path: str
+    max_bytes: int = 10_000_000
+    backups: int = 3
+    max_pending: int = 10_000
+
+    dropped: int = field(default=0, init=False)
+
+    _pending: list[Sequence[Span]] = field(default_factory=list, init=False, repr=False)
+    _wakeup: asyncio.Event = field(
+        default_factory=asyncio.Event, init=False, repr=False
+    )
+    _stopping: bool = field(default=False, init=False, repr=False)
+    _task: asyncio.Task[None] | None = field(default=None, init=False, repr=False)
+
+    def __post_init__(self) -> None:
+        if not self.path:
+            raise ValueError("path must not be empty")
+
+        if self.max_bytes < 1:
+            raise ValueError("max_bytes must be >= 1")
+
+        if self.backups < 0:
+            raise ValueError("backups must be >= 0")
+
+        if self.max_pending < 1:
+            raise ValueError("max_pending must be >= 1")
+
+    def export(self, spans: Sequence[Span]) -> None:
+        if len(self._pending) >= self.max_pending:
+            self.dropped += 1
+            return
+
+        self._pending.append(spans)
+        self._wakeup.set()
+
+    async def start(self) -> None:
+        self._stopping = False
+        self._task = asyncio.create_task(self._run(), name="trace-file-writer")
+
+    async def stop(self) -> None:
+        """Stops the writer once the traces still buffered are written."""
+
+        if self._task is not None:
+            # Not cancelled: a write already handed to a thread would keep
+            # running next to the final flush.
+            self._stopping = True
+            self._wakeup.set()
+            await self._task
+            self._task = None
+        else:
+            await self._flush()
+
+    async def _run(self) -> None:
+        while not self._stopping:
+            await self._wakeup.wait()
+            self._wakeup.clear()
+            try:
+                await self._flush()
+            except OSError:
+                logger.exception("Writing traces to %s failed", self.path)
+        await self._flush()
+
+    async def _flush(self) -> None:
+        traces, self._pending = self._pending, []
+        if traces:
+            await asyncio.to_thread(self._write, traces)
+
+    def _write(self, traces: list[Sequence[Span]]) -> None:
+        lines = [json.dumps(span_tree(spans), default=str) + "\n" for spans in traces]
+        i = 0
+        while i < len(lines):
+            with open(self.path, "a", encoding="utf-8") as f:
+                while i < len(lines) and f.tell() < self.max_bytes:
+                    f.write(lines[i])
+                    i += 1
+                full = f.tell() >= self.max_bytes
+            if full:
+                self._rotate()
+
+    def _rotate(self) -> None:
+        if self.backups == 0:
+            os.remove(self.path)
+            return
+
+        for i in range(self.backups - 1, 0, -1):
+            older = f"{self.path}.{i}"
+            if os.path.exists(older):
+                os.replace(older, f"{self.path}.{i + 1}")
+        os.replace(self.path, f"{self.path}.1")
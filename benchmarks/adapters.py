@@ -0,0 +1,280 @@
+"""
+Measures marketplace adapter throughput and tail latency against the simulator.
+
+    python -m benchmarks.adapters --listings 100000 --latency-ms 40 --latency-p99-ms 400
+    python -m benchmarks.adapters --url http://127.0.0.1:8081 --updates 5000
+
+Without `--url` the simulator runs in-process behind `httpx.ASGITransport`,
+which measures the adapters and the client stack but no sockets; with
+`--url` the adapters talk to a `python -m simulator` over localhost through
+the same pooled client the service builds. Every phase reports its items
+per second and the latency percentiles and status codes of the HTTP
+requests it sent, retries included.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import statistics
+import time
+from collections import Counter
+from collections.abc import Awaitable, Callable
+from dataclasses import asdict, dataclass, field
+
+import httpx
+
+from app.domain.marketplace import ListingQuantityUpdate
+from app.infrastructure.auth.tokens import TokenManager
+from app.infrastructure.config import EbayDeveloperCredentials
+from app.infrastructure.http.client import build_httpx_client
+from app.infrastructure.http.pools import PoolMonitor, PoolSettings
+from app.infrastructure.http.rate_limit import RateLimiter
+from app.infrastructure.http.resilience import ResilientTransport, RetryPolicy
+from app.infrastructure.marketplaces.amazon_client import (
+    AmazonAdapter,
+    AmazonUserCredentials,
+)
+from app.infrastructure.marketplaces.ebay_client import EbayAdapter, EbayUserCredentials
+from simulator import Latency, SimulatorConfig, create_app
+from simulator.app import AMAZON_TOKEN_PATH
+from simulator.catalog import SimulatedCatalog
+
+IN_PROCESS_URL = "http://simulator"
+
+
+@dataclass(frozen=True, slots=True)
+class PhaseResult:
+    name: str
+    items: int
+    elapsed_s: float
+    items_per_s: float
+    requests: int
+    p50_ms: float
+    p95_ms: float
+    p99_ms: float
+    max_ms: float
+    statuses: dict[str, int]
+
+    # Set when the phase aborted; its items then count as 0
+    error: str | None = None
+
+
+@dataclass(slots=True)
+class RequestRecorder:
+    """Pool request listener collecting the latency of every HTTP request."""
+
+    durations: list[float] = field(default_factory=list)
+    statuses: Counter[str] = field(default_factory=Counter)
+
+    def __call__(self, pool: str, method: str, status: str, seconds: float) -> None:
+        self.durations.append(seconds)
+        self.statuses[status] += 1
+
+    def reset(self) -> None:
+        self.durations.clear()
+        self.statuses.clear()
+
+
+def percentile(values: list[float], q: int) -> float:
+    """The q-th percentile (1-99), or the only value of a single sample."""
+
+    if len(values) < 2:
+        return values[0] if values else 0.0
+    return statistics.quantiles(values, n=100, method="inclusive")[q - 1]
+
+
+async def measure_phase(
+    name: str,
+    recorder: RequestRecorder,
+    run: Callable[[], Awaitable[int]],
+) -> PhaseResult:
+    recorder.reset()
+    error = None
+    started = time.perf_counter()
+    try:
+        items = await run()
+    except httpx.HTTPError as exc:
+        # e.g. retries exhausted on 429s, or a 5xx on a non-idempotent call
+        items, error = 0, f"{type(exc).__name__}: {exc}"
+    elapsed = time.perf_counter() - started
+
+    durations = recorder.durations
+    return PhaseResult(
+        name=name,
+        items=items,
+        elapsed_s=elapsed,
+        items_per_s=items / elapsed if elapsed > 0 else float("inf"),
+        requests=len(durations),
+        p50_ms=percentile(durations, 50) * 1000,
+        p95_ms=percentile(durations, 95) * 1000,
+        p99_ms=percentile(durations, 99) * 1000,
+        max_ms=max(durations, default=0.0) * 1000,
+        statuses=dict(sorted(recorder.statuses.items())),
+        error=error,
+    )
+
+
+def build_client(
+    url: str | None,
+    config: SimulatorConfig,
+    monitor: PoolMonitor,
+    pool: PoolSettings,
+    retry: RetryPolicy,
+) -> httpx.AsyncClient:
+    if url is not None:
+        return build_httpx_client(retry=retry, host_pools={url: pool}, monitor=monitor)
+
+    inner = monitor.instrument(
+        "simulator", pool, inner=httpx.ASGITransport(app=create_app(config))
+    )
+    return httpx.AsyncClient(transport=ResilientTransport(inner=inner, retry=retry))
+
+
+def quantity_updates(listings: int, count: int) -> list[ListingQuantityUpdate]:
+    step = max(1, listings // max(count, 1))
+    return [
+        ListingQuantityUpdate(sku=SimulatedCatalog.sku(i), qty=i % 50)
+        for i in range(0, listings, step)[:count]
+    ]
+
+
+async def run_benchmark(
+    config: SimulatorConfig,
+    url: str | None = None,
+    updates: int = 1_000,
+    page_size: int = 200,
+    prefetch_pages: int = 4,
+    update_concurrency: int = 4,
+    patches: int = 100,
+    pool: PoolSettings | None = None,
+    retry: RetryPolicy | None = None,
+) -> list[PhaseResult]:
+    monitor = PoolMonitor()
+    recorder = RequestRecorder()
+    monitor.add_request_listener(recorder)
+
+    base_url = url or IN_PROCESS_URL
+    http = build_client(
+        url, config, monitor, pool or PoolSettings(), retry or RetryPolicy()
+    )
+    tokens = TokenManager(http=http)
+    limiter = RateLimiter()
+
+    ebay = EbayAdapter(
+        http=http,
+        credentials=EbayUserCredentials(token="bench-refresh-token"),
+        dev_creds=EbayDeveloperCredentials(client_id="bench", client_secret="bench"),
+        base_url=base_url,
+        tokens=tokens,
+        page_size=page_size,
+        prefetch_pages=prefetch_pages,
+        update_concurrency=update_concurrency,
+        limiter=limiter,
+        account="bench",
+    )
+    amazon = AmazonAdapter(
+        http=http,
+        credentials=AmazonUserCredentials(
+            seller_partner_id="BENCH",
+            lwa_client_id="bench",
+            lwa_client_secret="bench",
+            refresh_token="bench-refresh-token",
+        ),
+        base_url=base_url,
+        tokens=tokens,
+        lwa_token_url=f"{base_url}{AMAZON_TOKEN_PATH}",
+        feed_threshold=max(patches + 1, 1),
+        limiter=limiter,
+        account="bench",
+    )
+
+    async def fetch() -> int:
+        return sum([len(page) async for page in ebay.iter_listings()])
+
+    async def ebay_update() -> int:
+        batch = quantity_updates(config.listings, updates)
+        failures = await ebay.update_inventory(batch)
+        return len(batch) - len(failures)
+
+    async def amazon_patch() -> int:
+        batch = quantity_updates(config.listings, patches)
+        failures = await amazon.update_inventory(batch)
+        return len(batch) - len(failures)
+
+    async def amazon_feed() -> int:
+        batch = quantity_updates(config.listings, updates)
+        await amazon.submit_listings_feed(batch)
+        return len(batch)
+
+    try:
+        return [
+            await measure_phase("ebay.iter_listings", recorder, fetch),
+            await measure_phase("ebay.update_inventory", recorder, ebay_update),
+            await measure_phase("amazon.patch_listings", recorder, amazon_patch),
+            await measure_phase("amazon.listings_feed", recorder, amazon_feed),
+        ]
+    finally:
+        await http.aclose()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--url", default=None, help="a running simulator")
+    parser.add_argument("--listings", type=int, default=10_000)
+    parser.add_argument("--latency-ms", type=float, default=0.0)
+    parser.add_argument("--latency-p99-ms", type=float, default=0.0)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--no-limits", action="store_true")
+    parser.add_argument("--updates", type=int, default=1_000)
+    parser.add_argument("--patches", type=int, default=100)
+    parser.add_argument("--page-size", type=int, default=200)
+    parser.add_argument("--prefetch-pages", type=int, default=4)
+    parser.add_argument("--update-concurrency", type=int, default=4)
+    parser.add_argument("--max-connections", type=int, default=100)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", default=None)
+    args = parser.parse_args()
+
+    # Only used in-process; a simulator at --url runs with its own settings.
+    config = SimulatorConfig(
+        listings=args.listings,
+        latency=Latency(args.latency_ms / 1000, args.latency_p99_ms / 1000),
+        error_rate=args.error_rate,
+        seed=args.seed,
+        **({"limits": {}} if args.no_limits else {}),
+    )
+    results = asyncio.run(
+        run_benchmark(
+            config,
+            url=args.url,
+            updates=args.updates,
+            page_size=args.page_size,
+            prefetch_pages=args.prefetch_pages,
+            update_concurrency=args.update_concurrency,
+            patches=args.patches,
+            pool=PoolSettings(max_connections=args.max_connections),
+        )
+    )
+
+    for r in results:
+        statuses = " ".join(f"{s}:{n}" for s, n in r.statuses.items())
+        print(
+            f"{r.name:>24}: {r.items:>8} items {r.elapsed_s:8.2f} s"
+            f" {r.items_per_s:10.0f}/s  {r.requests:>6} requests"
+            f"  p50 {r.p50_ms:7.1f}  p95 {r.p95_ms:7.1f}  p99 {r.p99_ms:7.1f}"
+            f"  max {r.max_ms:7.1f} ms  [{statuses}]"
+        )
+        if r.error:
+            print(f"{'':>24}  aborted: {r.error.splitlines()[0]}")
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump([asdict(r) for r in results], f, indent=2)
+            f.write("\n")
+        print(f"results written to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
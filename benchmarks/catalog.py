@@ -0,0 +1,80 @@
+"""
+Synthetic catalogs for the benchmark suite.
+
+A catalog is a warehouse inventory upload plus the marketplace listings it
+is synced against, shaped by a CatalogSpec.
+"""
+
+from __future__ import annotations
+
+import random
+from dataclasses import dataclass
+
+from app.domain.marketplace import ListingBatch
+
+
+@dataclass(frozen=True, slots=True)
+class CatalogSpec:
+    listings: int = 100_000
+
+    # Share of listings whose condition_id is in the inventory
+    match_ratio: float = 0.8
+
+    # Extra inventory rows repeating an earlier condition_id, as a share of
+    # distinct condition_ids; their quantities are summed by the snapshot
+    duplicate_ratio: float = 0.1
+
+    # Pareto shape of quantities: lower is more skewed (mostly 0 and 1
+    # with a long tail), capped at max_qty
+    skew: float = 1.2
+    max_qty: int = 10_000
+
+    seed: int = 0
+
+    def __post_init__(self) -> None:
+        if self.listings < 1:
+            raise ValueError("listings must be >= 1")
+
+        if not 0.0 <= self.match_ratio <= 1.0:
+            raise ValueError("match_ratio must be between 0 and 1")
+
+        if self.duplicate_ratio < 0:
+            raise ValueError("duplicate_ratio must be >= 0")
+
+        if self.skew <= 0:
+            raise ValueError("skew must be > 0")
+
+
+@dataclass(frozen=True, slots=True)
+class Catalog:
+    spec: CatalogSpec
+    inventory_rows: list[tuple[str, int]]
+    listings: ListingBatch
+
+
+def generate_catalog(spec: CatalogSpec) -> Catalog:
+    rng = random.Random(spec.seed)
+
+    def qty() -> int:
+        return min(spec.max_qty, int(rng.paretovariate(spec.skew)) - 1)
+
+    # Listings share condition_ids, as variations of one product do.
+    stocked = [f"COND-{i:08d}" for i in range(max(1, spec.listings // 2))]
+    inventory_rows = [(cid, qty()) for cid in stocked]
+    inventory_rows += [
+        (rng.choice(stocked), qty())
+        for _ in range(int(len(stocked) * spec.duplicate_ratio))
+    ]
+    rng.shuffle(inventory_rows)
+
+    condition_ids = [
+        rng.choice(stocked) if rng.random() < spec.match_ratio else f"MISS-{i:08d}"
+        for i in range(spec.listings)
+    ]
+    listings = ListingBatch.from_columns(
+        skus=[f"SKU-{i:08d}" for i in range(spec.listings)],
+        condition_ids=condition_ids,
+        marketplace_qtys=[qty() for _ in range(spec.listings)],
+        listing_ids=[f"L{i}" for i in range(spec.listings)],
+    )
+    return Catalog(spec=spec, inventory_rows=inventory_rows, listings=listings)
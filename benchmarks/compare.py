@@ -0,0 +1,114 @@
+"""
+Compares two benchmark suite result files.
+
+    python -m benchmarks.compare base.json new.json --threshold 0.1
+
+Cases are matched by name and catalog size. A case regresses when its best
+time or its peak memory grew by more than `--threshold` (a fraction); the
+exit status is 1 if any case regressed, so the script can gate CI.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import sys
+from collections.abc import Sequence
+from dataclasses import dataclass
+from typing import Any
+
+CaseKey = tuple[str, int]
+
+
+@dataclass(frozen=True, slots=True)
+class Comparison:
+    name: str
+    size: int
+    base_s: float
+    new_s: float
+    base_peak: int
+    new_peak: int
+    threshold: float
+
+    @property
+    def time_change(self) -> float:
+        return _change(self.base_s, self.new_s)
+
+    @property
+    def memory_change(self) -> float:
+        return _change(self.base_peak, self.new_peak)
+
+    @property
+    def regressed(self) -> bool:
+        return self.time_change > self.threshold or self.memory_change > self.threshold
+
+
+def _change(base: float, new: float) -> float:
+    if base == 0:
+        return 0.0 if new == 0 else float("inf")
+    return (new - base) / base
+
+
+def load_results(path: str) -> dict[CaseKey, dict[str, Any]]:
+    with open(path, encoding="utf-8") as f:
+        document = json.load(f)
+    return {(r["name"], r["size"]): r for r in document["results"]}
+
+
+def compare(
+    base: dict[CaseKey, dict[str, Any]],
+    new: dict[CaseKey, dict[str, Any]],
+    threshold: float = 0.1,
+) -> list[Comparison]:
+    """Compares the cases present in both runs, in the order of `new`."""
+
+    return [
+        Comparison(
+            name=name,
+            size=size,
+            base_s=base[name, size]["best_s"],
+            new_s=result["best_s"],
+            base_peak=base[name, size]["peak_bytes"],
+            new_peak=result["peak_bytes"],
+            threshold=threshold,
+        )
+        for (name, size), result in new.items()
+        if (name, size) in base
+    ]
+
+
+def format_table(comparisons: Sequence[Comparison]) -> str:
+    lines = [
+        f"{'case':>24} {'size':>9} {'base ms':>10} {'new ms':>10} {'time':>8}"
+        f" {'memory':>8}"
+    ]
+    for c in comparisons:
+        flag = "  REGRESSION" if c.regressed else ""
+        lines.append(
+            f"{c.name:>24} {c.size:>9} {c.base_s * 1000:10.1f} {c.new_s * 1000:10.1f}"
+            f" {c.time_change:+8.1%} {c.memory_change:+8.1%}{flag}"
+        )
+    return "\n".join(lines)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("base")
+    parser.add_argument("new")
+    parser.add_argument("--threshold", type=float, default=0.1)
+    args = parser.parse_args()
+
+    base, new = load_results(args.base), load_results(args.new)
+    comparisons = compare(base, new, args.threshold)
+    print(format_table(comparisons))
+
+    for name, size in sorted(base.keys() ^ new.keys()):
+        where = args.base if (name, size) in base else args.new
+        print(f"only in {where}: {name} size={size}")
+
+    if any(c.regressed for c in comparisons):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,86 @@
+"""
+Compares InventorySnapshot construction strategies.
+
+    python -m benchmarks.snapshot_build --rows 1000000 --distinct 200000
+
+`items-dict` is the previous route code: an InventoryKey and an
+InventoryItem per row, collected into a dict and copied by `from_items`.
+`builder` is InventorySnapshotBuilder. Both report wall time and the peak
+memory traced while building.
+"""
+
+from __future__ import annotations
+
+import argparse
+import gc
+import random
+import time
+import tracemalloc
+from collections.abc import Callable
+
+from app.domain.inventory import (
+    InventoryItem,
+    InventoryKey,
+    InventorySnapshot,
+    InventorySnapshotBuilder,
+)
+
+Rows = list[tuple[str, int]]
+
+
+def make_rows(rows: int, distinct: int, seed: int = 0) -> Rows:
+    rng = random.Random(seed)
+    return [
+        (f"COND-{rng.randrange(distinct):08d}", rng.randrange(100)) for _ in range(rows)
+    ]
+
+
+def build_items_dict(rows: Rows) -> InventorySnapshot:
+    items = {}
+    for condition_id, quantity in rows:
+        key = InventoryKey(condition_id=condition_id)
+        items[key] = InventoryItem.create(condition_id=condition_id, quantity=quantity)
+    return InventorySnapshot.from_items(items)
+
+
+def build_with_builder(rows: Rows) -> InventorySnapshot:
+    builder = InventorySnapshotBuilder()
+    for condition_id, quantity in rows:
+        builder.add(condition_id, quantity)
+    return builder.build()
+
+
+def measure(
+    build: Callable[[Rows], InventorySnapshot], rows: Rows
+) -> tuple[float, int]:
+    gc.collect()
+    tracemalloc.start()
+    started = time.perf_counter()
+    snapshot = build(rows)
+    elapsed = time.perf_counter() - started
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del snapshot
+    return elapsed, peak
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--distinct", type=int, default=200_000)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    rows = make_rows(args.rows, args.distinct)
+    strategies = {"items-dict": build_items_dict, "builder": build_with_builder}
+
+    print(f"rows={args.rows} distinct={args.distinct}")
+    for name, build in strategies.items():
+        runs = [measure(build, rows) for _ in range(args.repeat)]
+        best = min(elapsed for elapsed, _ in runs)
+        peak = max(peak for _, peak in runs)
+        print(f"{name:>12}: {best * 1000:9.1f} ms  peak {peak / 2**20:8.1f} MiB")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,267 @@
+"""
+Times the domain and service hot paths on synthetic catalogs.
+
+    python -m benchmarks.suite --sizes 10000,100000,1000000 --output base.json
+
+Every case runs `--repeat` times; the best and median wall times and the
+throughput (rows per second of the best run) are reported, plus the peak
+memory traced by tracemalloc during one extra run. Results go to a JSON
+file that `python -m benchmarks.compare` diffs against another run.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import gc
+import json
+import platform
+import statistics
+import sys
+import time
+import tracemalloc
+from collections.abc import AsyncIterator, Callable, Iterable, Sequence
+from dataclasses import asdict, dataclass, replace
+from typing import Any
+
+from app.api.routes.inventory import to_domain_snapshot
+from app.api.schemas.inventory import InventoryItemIn, SyncInventoryRequest
+from app.application.service.sync_inventory import SyncInventoryService
+from app.domain.inventory import InventoryKey
+from app.domain.marketplace import (
+    HAS_NUMPY,
+    Listing,
+    ListingBatch,
+    ListingQuantityUpdate,
+    ListingUpdateFailure,
+    MarketplaceConfig,
+    MarketplacePolicy,
+)
+from benchmarks.catalog import Catalog, CatalogSpec, generate_catalog
+
+PAGE_SIZE = 200
+
+
+@dataclass(frozen=True, slots=True)
+class CaseResult:
+    name: str
+    size: int
+    rows: int
+    best_s: float
+    median_s: float
+    rows_per_s: float
+    peak_bytes: int
+
+
+@dataclass(frozen=True, slots=True)
+class Case:
+    name: str
+    rows: int
+    run: Callable[[], object]
+
+
+class InMemoryMarketplacePort:
+    """MarketplacePort serving prebuilt listing pages and accepting all updates."""
+
+    def __init__(self, pages: Sequence[ListingBatch]) -> None:
+        self.pages = pages
+
+    async def fetch_listings(self) -> list[Listing]:
+        return [listing for page in self.pages for listing in page]
+
+    async def iter_listings(self) -> AsyncIterator[Sequence[Listing]]:
+        for page in self.pages:
+            yield page
+
+    async def update_inventory(
+        self, updates: Iterable[ListingQuantityUpdate]
+    ) -> list[ListingUpdateFailure]:
+        return []
+
+
+class InMemoryMarketplacePortFactory:
+    def __init__(self, port: InMemoryMarketplacePort) -> None:
+        self.port = port
+
+    def build(self, config: MarketplaceConfig) -> InMemoryMarketplacePort:
+        return self.port
+
+
+def build_cases(catalog: Catalog) -> list[Case]:
+    listings = catalog.listings
+    n = len(listings)
+
+    request = SyncInventoryRequest.model_construct(
+        account="bench",
+        refresh_token="bench",
+        inventory=[
+            InventoryItemIn.model_construct(condition_id=c, quantity=q)
+            for c, q in catalog.inventory_rows
+        ],
+    )
+    snapshot = to_domain_snapshot(request)
+    keys = [InventoryKey(condition_id=c) for c in listings.condition_ids]
+    warehouse_qtys = [snapshot.get_qty_by_id(c) for c in listings.condition_ids]
+
+    config = MarketplaceConfig(
+        marketplace="bench",
+        account="bench",
+        refresh_token="bench",
+        limit_qty_for_sync_in_marketplace=5_000,
+        limit_qty_for_sync_in_warehouse=5_000,
+        limit_qty_difference_for_sync=1,
+        limit_qty_for_marketplace=1_000,
+    )
+    policy = MarketplacePolicy(config=config)
+    port = InMemoryMarketplacePort(
+        [listings[i : i + PAGE_SIZE] for i in range(0, n, PAGE_SIZE)]
+    )
+
+    def get_qty() -> None:
+        for key in keys:
+            snapshot.get_qty(key)
+
+    def get_qty_by_id() -> None:
+        for condition_id in listings.condition_ids:
+            snapshot.get_qty_by_id(condition_id)
+
+    def policy_scalar() -> None:
+        rows = zip(listings.marketplace_qtys, warehouse_qtys, strict=True)
+        for marketplace_qty, warehouse_qty in rows:
+            if policy.should_sync_qty(marketplace_qty, warehouse_qty):
+                policy.calc_target_qty(warehouse_qty)
+
+    def policy_batch() -> None:
+        policy.evaluate_batch(listings.marketplace_qtys, warehouse_qtys)
+
+    def sync(batch_evaluation: bool) -> Callable[[], object]:
+        service = SyncInventoryService(
+            marketplace_factory=InMemoryMarketplacePortFactory(port),
+            config=config,
+            policy=policy,
+            batch_evaluation=batch_evaluation,
+        )
+        return lambda: asyncio.run(service.sync(snapshot))
+
+    rows = len(catalog.inventory_rows)
+    cases = [
+        Case("to_domain_snapshot", rows, lambda: to_domain_snapshot(request)),
+        Case("snapshot.get_qty", n, get_qty),
+        Case("snapshot.get_qty_by_id", n, get_qty_by_id),
+        Case("policy.scalar", n, policy_scalar),
+        Case("service.sync.scalar", n, sync(batch_evaluation=False)),
+    ]
+    if HAS_NUMPY:
+        cases.insert(4, Case("policy.batch", n, policy_batch))
+        cases.append(Case("service.sync.batch", n, sync(batch_evaluation=True)))
+    return cases
+
+
+def measure(case: Case, size: int, repeat: int) -> CaseResult:
+    timings: list[float] = []
+    for _ in range(repeat):
+        gc.collect()
+        started = time.perf_counter()
+        case.run()
+        timings.append(time.perf_counter() - started)
+
+    # Tracing allocations slows the code down, so memory gets its own run.
+    gc.collect()
+    tracemalloc.start()
+    case.run()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    best = min(timings)
+    return CaseResult(
+        name=case.name,
+        size=size,
+        rows=case.rows,
+        best_s=best,
+        median_s=statistics.median(timings),
+        rows_per_s=case.rows / best if best > 0 else float("inf"),
+        peak_bytes=peak,
+    )
+
+
+def run_suite(
+    sizes: Iterable[int],
+    repeat: int = 3,
+    spec: CatalogSpec | None = None,
+    only: Sequence[str] = (),
+) -> list[CaseResult]:
+    base = spec or CatalogSpec()
+    results: list[CaseResult] = []
+    for size in sizes:
+        catalog = generate_catalog(replace(base, listings=size))
+        for case in build_cases(catalog):
+            if only and case.name not in only:
+                continue
+            results.append(measure(case, size, repeat))
+    return results
+
+
+def environment() -> dict[str, Any]:
+    return {
+        "python": sys.version.split()[0],
+        "implementation": platform.python_implementation(),
+        "platform": platform.platform(),
+        "machine": platform.machine(),
+        "numpy": HAS_NUMPY,
+        "timestamp": time.time(),
+    }
+
+
+def write_results(
+    path: str,
+    results: Sequence[CaseResult],
+    spec: CatalogSpec,
+    repeat: int,
+) -> None:
+    # catalog sizes are per result
+    catalog = {k: v for k, v in asdict(spec).items() if k != "listings"}
+    document = {
+        "environment": environment(),
+        "catalog": catalog,
+        "repeat": repeat,
+        "results": [asdict(r) for r in results],
+    }
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(document, f, indent=2)
+        f.write("\n")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--sizes", default="10000,100000")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--match-ratio", type=float, default=0.8)
+    parser.add_argument("--duplicate-ratio", type=float, default=0.1)
+    parser.add_argument("--skew", type=float, default=1.2)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--case", action="append", default=[], dest="cases")
+    parser.add_argument("--output", default="benchmark-results.json")
+    args = parser.parse_args()
+
+    spec = CatalogSpec(
+        match_ratio=args.match_ratio,
+        duplicate_ratio=args.duplicate_ratio,
+        skew=args.skew,
+        seed=args.seed,
+    )
+    sizes = [int(s) for s in args.sizes.split(",")]
+
+    results = run_suite(sizes, repeat=args.repeat, spec=spec, only=args.cases)
+    for r in results:
+        print(
+            f"{r.name:>24} {r.size:>9}: {r.best_s * 1000:9.1f} ms"
+            f"  {r.rows_per_s / 1e6:7.2f} Mrows/s"
+            f"  peak {r.peak_bytes / 2**20:8.1f} MiB"
+        )
+
+    write_results(args.output, results, spec, args.repeat)
+    print(f"results written to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,148 @@
+"""
+Compares inventory upload formats by payload size and decode time.
+
+    python -m benchmarks.wire_formats --sizes 100000,1000000 --output wire.json
+
+Each format is decoded from its encoded body into an InventorySnapshot the
+way its route does it: the row-object JSON of the sync route through
+SyncInventoryRequest, and the columnar JSON, msgpack and binary layouts
+through `app.api.columnar`. The results file has the suite's layout, so
+`python -m benchmarks.compare` diffs two runs.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+from collections.abc import Callable, Iterable, Sequence
+from dataclasses import asdict, dataclass, replace
+
+from app.api.columnar import (
+    HAS_MSGPACK,
+    decode_columnar_json,
+    decode_columnar_msgpack,
+    decode_columns,
+    encode_columns,
+)
+from app.api.routes.inventory import to_domain_snapshot
+from app.api.schemas.inventory import SyncInventoryRequest, SyncSettingsIn
+from app.domain.inventory import InventorySnapshot
+from benchmarks.catalog import CatalogSpec, generate_catalog
+from benchmarks.suite import Case, CaseResult, environment, measure
+
+SETTINGS = {"account": "bench", "refresh_token": "bench"}
+
+
+@dataclass(frozen=True, slots=True)
+class WireFormat:
+    name: str
+    body: bytes
+    decode: Callable[[bytes], tuple[SyncSettingsIn, InventorySnapshot]]
+
+
+@dataclass(frozen=True, slots=True)
+class FormatResult:
+    result: CaseResult
+    payload_bytes: int
+
+
+def decode_rows_json(body: bytes) -> tuple[SyncSettingsIn, InventorySnapshot]:
+    request = SyncInventoryRequest.model_validate_json(body)
+    return request, to_domain_snapshot(request)
+
+
+def build_formats(rows: Sequence[tuple[str, int]]) -> list[WireFormat]:
+    condition_ids = [c for c, _ in rows]
+    quantities = [q for _, q in rows]
+
+    row_objects = [{"condition_id": c, "quantity": q} for c, q in rows]
+    columns = {**SETTINGS, "condition_ids": condition_ids, "quantities": quantities}
+
+    formats = [
+        WireFormat(
+            "json.rows",
+            json.dumps({**SETTINGS, "inventory": row_objects}).encode(),
+            decode_rows_json,
+        ),
+        WireFormat("json.columns", json.dumps(columns).encode(), decode_columnar_json),
+    ]
+    if HAS_MSGPACK:
+        import msgpack
+
+        formats.append(
+            WireFormat(
+                "msgpack.columns", msgpack.packb(columns), decode_columnar_msgpack
+            )
+        )
+    formats.append(
+        WireFormat(
+            "binary.columns",
+            encode_columns(SyncSettingsIn(**SETTINGS), condition_ids, quantities),
+            decode_columns,
+        )
+    )
+    return formats
+
+
+def run_formats(
+    sizes: Iterable[int],
+    repeat: int = 3,
+    spec: CatalogSpec | None = None,
+) -> list[FormatResult]:
+    base = spec or CatalogSpec()
+    results: list[FormatResult] = []
+    for size in sizes:
+        # inventory rows are about half the listings of a catalog
+        rows = generate_catalog(replace(base, listings=size * 2)).inventory_rows[:size]
+        for wire in build_formats(rows):
+            case = Case(
+                f"decode.{wire.name}", len(rows), lambda w=wire: w.decode(w.body)
+            )
+            results.append(
+                FormatResult(measure(case, size, repeat), payload_bytes=len(wire.body))
+            )
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--sizes", default="100000,1000000")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", default=None)
+    args = parser.parse_args()
+
+    sizes = [int(s) for s in args.sizes.split(",")]
+    results = run_formats(sizes, args.repeat, CatalogSpec(seed=args.seed))
+
+    baselines = {
+        r.result.size: r for r in results if r.result.name == "decode.json.rows"
+    }
+    for r in results:
+        base = baselines[r.result.size]
+        print(
+            f"{r.result.name:>24} {r.result.size:>9}:"
+            f" {r.result.best_s * 1000:9.1f} ms"
+            f" ({r.result.best_s / base.result.best_s:5.2f}x)"
+            f"  {r.payload_bytes / 2**20:8.1f} MiB"
+            f" ({r.payload_bytes / base.payload_bytes:5.2f}x)"
+            f"  peak {r.result.peak_bytes / 2**20:8.1f} MiB"
+        )
+
+    if args.output:
+        document = {
+            "environment": environment(),
+            "catalog": {"seed": args.seed},
+            "repeat": args.repeat,
+            "results": [
+                {**asdict(r.result), "payload_bytes": r.payload_bytes} for r in results
+            ],
+        }
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(document, f, indent=2)
+            f.write("\n")
+        print(f"results written to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
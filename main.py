@@ -2,28 +2,161 @@ from contextlib import asynccontextmanager
 
 from fastapi import FastAPI
 
-from app.api import inventory_router
+from app.api import admin_router, inventory_router, jobs_router, metrics_router
+from app.api.deps import (
+    build_scheduled_sync,
+    build_sync_job_runner,
+    read_sync_schedules,
+)
+from app.api.tracing import TracingMiddleware
+from app.application.ports.tracing import SpanExporter
+from app.application.ports.warehouse import WarehouseInventoryPort
+from app.application.service.coalescing import SyncCoalescer
+from app.application.service.delta_sync import InventoryBaselineStore
+from app.application.service.listings_cache import ListingsCache
+from app.application.service.scheduler import SyncScheduler
+from app.application.service.sync_jobs import SyncJobWorkerPool
+from app.application.service.tracing import Tracer
+from app.infrastructure.auth.tokens import TokenManager
 from app.infrastructure.config import load_config
 from app.infrastructure.http.client import build_httpx_client
+from app.infrastructure.http.pools import PoolMonitor, PoolSettings
+from app.infrastructure.http.rate_limit import RateLimiter
+from app.infrastructure.http.resilience import RetryPolicy
+from app.infrastructure.inventory.file_source import FileInventorySource
+from app.infrastructure.inventory.http_source import HttpInventorySource
+from app.infrastructure.jobs.sqlite_queue import SqliteJobQueue
 from app.infrastructure.marketplaces.factory import MarketplaceAdapterFactory
+from app.infrastructure.metrics import PrometheusMetrics
+from app.infrastructure.tracing import JsonlFileExporter, RingBufferExporter
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     app.state.config = load_config()
-    app.state.http = build_httpx_client()
+    app.state.http_pools = PoolMonitor()
+    app.state.metrics = PrometheusMetrics()
+    app.state.metrics.watch_pools(app.state.http_pools)
+    app.state.http = build_httpx_client(
+        timeout_s=app.state.config.http_timeout_s,
+        retry=RetryPolicy(max_attempts=app.state.config.http_max_attempts),
+        breaker_failures=app.state.config.http_breaker_failures,
+        breaker_reset_s=app.state.config.http_breaker_reset_s,
+        default_pool=PoolSettings(
+            max_connections=app.state.config.http_default_connections,
+            max_keepalive_connections=app.state.config.http_max_keepalive,
+            keepalive_expiry_s=app.state.config.http_keepalive_expiry_s,
+            http2=app.state.config.http2,
+        ),
+        host_pools=MarketplaceAdapterFactory.host_pools(app.state.config),
+        monitor=app.state.http_pools,
+        max_in_flight=app.state.config.http_max_in_flight or None,
+    )
+
+    app.state.trace_buffer = RingBufferExporter(
+        max_traces=app.state.config.trace_buffer_size
+    )
+    exporters: list[SpanExporter] = [app.state.trace_buffer]
+    trace_file = None
+    if app.state.config.trace_file_path:
+        trace_file = JsonlFileExporter(
+            path=app.state.config.trace_file_path,
+            max_bytes=app.state.config.trace_file_max_bytes,
+            backups=app.state.config.trace_file_backups,
+        )
+        exporters.append(trace_file)
+        await trace_file.start()
+    app.state.tracer = Tracer(
+        exporters=exporters,
+        sample_rate=app.state.config.trace_sample_rate,
+    )
+
+    app.state.token_manager = TokenManager(
+        http=app.state.http,
+        max_entries=app.state.config.token_cache_size,
+        refresh_margin_s=app.state.config.token_refresh_margin_s,
+    )
+
+    app.state.rate_limiter = RateLimiter()
 
     app.state.marketplace_factory = MarketplaceAdapterFactory(
         http=app.state.http,
         app_config=app.state.config,
+        token_manager=app.state.token_manager,
+        rate_limiter=app.state.rate_limiter,
     )
 
+    app.state.listings_cache = None
+    if app.state.config.listings_cache_ttl_s > 0:
+        app.state.listings_cache = ListingsCache(
+            ttl_s=app.state.config.listings_cache_ttl_s,
+            max_listings=app.state.config.listings_cache_max_listings,
+        )
+
+    app.state.inventory_baselines = InventoryBaselineStore(
+        max_accounts=app.state.config.delta_max_accounts,
+        index_ttl_s=app.state.config.delta_index_ttl_s,
+        max_index_listings=app.state.config.delta_max_index_listings,
+    )
+
+    app.state.sync_coalescer = None
+    if app.state.config.sync_coalescing:
+        app.state.sync_coalescer = SyncCoalescer(metrics=app.state.metrics)
+
+    app.state.job_queue = SqliteJobQueue(
+        path=app.state.config.sync_job_db_path,
+        retention_s=app.state.config.sync_job_retention_s,
+    )
+    app.state.job_workers = SyncJobWorkerPool(
+        queue=app.state.job_queue,
+        runner=build_sync_job_runner(app.state),
+        concurrency=app.state.config.sync_job_workers,
+    )
+    await app.state.job_workers.start()
+
+    app.state.scheduler = None
+    if app.state.config.sync_schedules_path:
+        app.state.scheduler = SyncScheduler(
+            max_concurrency=app.state.config.scheduler_max_concurrency,
+            jitter=app.state.config.scheduler_jitter,
+        )
+        # schedules reading the same file share its cached snapshot
+        files: dict[str, FileInventorySource] = {}
+        for entry in read_sync_schedules(app.state.config.sync_schedules_path):
+            source: WarehouseInventoryPort
+            if entry.inventory_path is not None:
+                if entry.inventory_path not in files:
+                    files[entry.inventory_path] = FileInventorySource(
+                        entry.inventory_path
+                    )
+                source = files[entry.inventory_path]
+            elif entry.inventory_url is not None:
+                source = HttpInventorySource(
+                    http=app.state.http,
+                    url=entry.inventory_url,
+                    headers=entry.inventory_headers,
+                )
+            app.state.scheduler.register(build_scheduled_sync(app.state, entry, source))
+        await app.state.scheduler.start()
+
     try:
         yield
     finally:
+        if app.state.scheduler is not None:
+            await app.state.scheduler.stop()
+        await app.state.job_workers.stop()
+        if app.state.sync_coalescer is not None:
+            await app.state.sync_coalescer.close()
+        app.state.job_queue.close()
         await app.state.http.aclose()
+        if trace_file is not None:
+            await trace_file.stop()
 
 
 app = FastAPI(lifespan=lifespan)
+app.add_middleware(TracingMiddleware)
 
 app.include_router(inventory_router)
+app.include_router(jobs_router)
+app.include_router(admin_router)
+app.include_router(metrics_router)
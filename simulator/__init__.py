@@ -0,0 +1,19 @@
+"""
+Local stand-in for the marketplace APIs, for benchmarking the adapters.
+
+Point `AppConfig.ebay_base_url`, `amazon_base_url` and
+`amazon_lwa_token_url` (`<url>/auth/o2/token`) at a running simulator.
+"""
+
+from simulator.app import SimulatorState, create_app
+from simulator.catalog import SimulatedCatalog
+from simulator.config import Latency, OperationLimit, SimulatorConfig
+
+__all__ = [
+    "Latency",
+    "OperationLimit",
+    "SimulatedCatalog",
+    "SimulatorConfig",
+    "SimulatorState",
+    "create_app",
+]
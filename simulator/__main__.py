@@ -0,0 +1,66 @@
+"""
+Serves the marketplace simulator on localhost.
+
+    python -m simulator --port 8081 --listings 100000 --latency-ms 40 \\
+        --latency-p99-ms 400 --error-rate 0.01 --limit ebay.bulk_update_price_quantity=10:20
+
+Then run the service with EBAY_BASE_URL=http://127.0.0.1:8081,
+AMAZON_BASE_URL=http://127.0.0.1:8081 and
+AMAZON_LWA_TOKEN_URL=http://127.0.0.1:8081/auth/o2/token.
+"""
+
+from __future__ import annotations
+
+import argparse
+
+import uvicorn
+
+from simulator.app import create_app
+from simulator.config import DEFAULT_LIMITS, Latency, OperationLimit, SimulatorConfig
+
+
+def parse_limit(value: str) -> tuple[str, OperationLimit]:
+    """Parses `operation=rate:burst`."""
+
+    operation, _, limit = value.partition("=")
+    rate, _, burst = limit.partition(":")
+    try:
+        return operation, OperationLimit(float(rate), int(burst or 1))
+    except ValueError as exc:
+        raise argparse.ArgumentTypeError(f"invalid limit {value!r}: {exc}") from exc
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8081)
+    parser.add_argument("--listings", type=int, default=10_000)
+    parser.add_argument("--conditions", type=int, default=2_000)
+    parser.add_argument("--max-page-size", type=int, default=200)
+    parser.add_argument("--latency-ms", type=float, default=0.0)
+    parser.add_argument("--latency-p99-ms", type=float, default=0.0)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--limit", type=parse_limit, action="append", default=[])
+    parser.add_argument(
+        "--no-limits", action="store_true", help="disable the default rate limits"
+    )
+    parser.add_argument("--seed", type=int, default=None)
+    args = parser.parse_args()
+
+    limits = {} if args.no_limits else dict(DEFAULT_LIMITS)
+    limits.update(args.limit)
+
+    config = SimulatorConfig(
+        listings=args.listings,
+        conditions=args.conditions,
+        latency=Latency(args.latency_ms / 1000, args.latency_p99_ms / 1000),
+        limits=limits,
+        error_rate=args.error_rate,
+        max_page_size=args.max_page_size,
+        seed=args.seed,
+    )
+    uvicorn.run(create_app(config), host=args.host, port=args.port, log_level="warning")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,367 @@
+"""
+ASGI app simulating the eBay Inventory API and Amazon SP-API endpoints the
+marketplace adapters call, with configurable latency, rate limits and
+server errors.
+
+Run it on localhost with `python -m simulator`, or mount it in-process:
+
+    httpx.AsyncClient(transport=httpx.ASGITransport(app=create_app()))
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import random
+import time
+from collections import Counter
+from collections.abc import Awaitable, Callable, Mapping
+from dataclasses import dataclass, field
+from itertools import count
+from typing import Any
+from urllib.parse import parse_qsl
+
+from starlette.applications import Starlette
+from starlette.requests import Request
+from starlette.responses import JSONResponse, Response
+from starlette.routing import Route
+
+from simulator.catalog import SimulatedCatalog
+from simulator.config import (
+    AMAZON_CREATE_FEED,
+    AMAZON_CREATE_FEED_DOCUMENT,
+    AMAZON_PATCH_LISTING,
+    AMAZON_TOKEN,
+    AMAZON_UPLOAD_FEED,
+    EBAY_BULK_UPDATE,
+    EBAY_GET_INVENTORY_ITEMS,
+    EBAY_TOKEN,
+    OperationLimit,
+    SimulatorConfig,
+)
+
+# Paths as called by the adapters, relative to the configured base URLs
+EBAY_TOKEN_PATH = "/identity/v1/oauth2/token"
+EBAY_INVENTORY_ITEMS_PATH = "/sell/inventory/v1/inventory_item"
+EBAY_BULK_UPDATE_PATH = "/sell/inventory/v1/bulk_update_price_quantity"
+AMAZON_TOKEN_PATH = "/auth/o2/token"
+AMAZON_LISTINGS_ITEMS_PATH = "/listings/2021-08-01/items/{seller_id}/{sku}"
+AMAZON_FEED_DOCUMENTS_PATH = "/feeds/2021-06-30/documents"
+AMAZON_FEEDS_PATH = "/feeds/2021-06-30/feeds"
+UPLOADS_PATH = "/uploads/{document_id}"
+STATS_PATH = "/_simulator/stats"
+
+BULK_UPDATE_MAX_SKUS = 25
+AMAZON_RATE_LIMIT_HEADER = "x-amzn-RateLimit-Limit"
+TOKEN_LIFETIME_S = 7200
+
+Handler = Callable[[Request], Awaitable[Response]]
+
+
+@dataclass(slots=True)
+class _Bucket:
+    limit: OperationLimit
+    tokens: float
+    updated: float
+
+    def take(self, now: float) -> float:
+        """Takes a token; returns 0, or the seconds until one is available."""
+
+        self.tokens = min(
+            self.limit.burst,
+            self.tokens + (now - self.updated) * self.limit.rate,
+        )
+        self.updated = now
+        if self.tokens >= 1:
+            self.tokens -= 1
+            return 0.0
+        return (1 - self.tokens) / self.limit.rate
+
+
+@dataclass(slots=True)
+class SimulatorState:
+    config: SimulatorConfig
+    catalog: SimulatedCatalog
+    rng: random.Random
+    clock: Callable[[], float] = time.monotonic
+
+    # Responses by (operation, status code)
+    responses: Counter[tuple[str, int]] = field(default_factory=Counter)
+    feeds: dict[str, bytes | None] = field(default_factory=dict)
+
+    _buckets: dict[tuple[str, str], _Bucket] = field(default_factory=dict)
+    _ids: count[int] = field(default_factory=count)
+
+    def next_id(self) -> str:
+        return str(next(self._ids))
+
+    def throttle(self, operation: str, account: str) -> float:
+        limit = self.config.limits.get(operation)
+        if limit is None:
+            return 0.0
+
+        now = self.clock()
+        bucket = self._buckets.get((operation, account))
+        if bucket is None:
+            bucket = _Bucket(limit, float(limit.burst), now)
+            self._buckets[operation, account] = bucket
+        return bucket.take(now)
+
+    def stats(self) -> dict[str, Any]:
+        by_operation: dict[str, dict[str, int]] = {}
+        for (operation, status), n in sorted(self.responses.items()):
+            by_operation.setdefault(operation, {})[str(status)] = n
+        return {
+            "listings": self.catalog.listings,
+            "updates": self.catalog.updates,
+            "rejected": self.catalog.rejected,
+            "feeds": len(self.feeds),
+            "responses": by_operation,
+        }
+
+
+def _account(request: Request) -> str:
+    return (
+        request.headers.get("authorization")
+        or request.headers.get("x-amz-access-token")
+        or ""
+    )
+
+
+def _simulated(state: SimulatorState, operation: str, handler: Handler) -> Handler:
+    """
+    Wraps a handler with the configured behaviour of its operation.
+
+    Calls are counted against the rate limit on arrival and answered after
+    a latency sample: with 429 and `Retry-After` when over the limit, with
+    a random 5xx (and no effect on the catalog) for a share of
+    `error_rate`, and by the handler otherwise.
+    """
+
+    config = state.config
+    latency = config.latency_of(operation)
+    limit = config.limits.get(operation)
+    amazon = operation.startswith("amazon.")
+
+    async def endpoint(request: Request) -> Response:
+        wait = state.throttle(operation, _account(request))
+        delay = latency.sample(state.rng)
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+        if wait > 0:
+            response: Response = JSONResponse(
+                {"errors": [{"code": "QuotaExceeded", "message": "Too many requests"}]},
+                status_code=429,
+                headers={"Retry-After": f"{wait:.3f}"},
+            )
+        elif config.error_rate and state.rng.random() < config.error_rate:
+            status = state.rng.choice((500, 502, 503))
+            response = JSONResponse(
+                {"errors": [{"code": "InternalFailure", "message": "Simulated"}]},
+                status_code=status,
+            )
+        else:
+            response = await handler(request)
+
+        if amazon and limit is not None:
+            response.headers[AMAZON_RATE_LIMIT_HEADER] = str(limit.rate)
+        state.responses[operation, response.status_code] += 1
+        return response
+
+    return endpoint
+
+
+def _errors(message: str, status_code: int = 400) -> JSONResponse:
+    return JSONResponse(
+        {"errors": [{"errorId": status_code, "message": message}]},
+        status_code=status_code,
+    )
+
+
+def _int_param(params: Mapping[str, str], name: str, default: int) -> int | None:
+    value = params.get(name)
+    if value is None:
+        return default
+    try:
+        parsed = int(value)
+    except ValueError:
+        return None
+    return parsed if parsed >= 0 else None
+
+
+def _routes(state: SimulatorState) -> list[Route]:
+    catalog = state.catalog
+
+    async def token(request: Request) -> Response:
+        # urlencoded by hand: form() would need python-multipart
+        form = dict(parse_qsl((await request.body()).decode()))
+        if form.get("grant_type") != "refresh_token" or not form.get("refresh_token"):
+            return JSONResponse({"error": "invalid_grant"}, status_code=400)
+
+        return JSONResponse(
+            {
+                "access_token": f"sim-{form['refresh_token']}",
+                "token_type": "bearer",
+                "expires_in": TOKEN_LIFETIME_S,
+            }
+        )
+
+    async def get_inventory_items(request: Request) -> Response:
+        limit = _int_param(request.query_params, "limit", 25)
+        offset = _int_param(request.query_params, "offset", 0)
+        if (
+            limit is None
+            or offset is None
+            or not 1 <= limit <= state.config.max_page_size
+        ):
+            return _errors("Invalid limit or offset")
+
+        payload: dict[str, Any] = {
+            "total": catalog.listings,
+            "size": 0,
+            "limit": limit,
+            "offset": offset,
+            "inventoryItems": catalog.ebay_page(offset, limit),
+        }
+        payload["size"] = len(payload["inventoryItems"])
+        if offset + limit < catalog.listings:
+            payload["next"] = (
+                f"{EBAY_INVENTORY_ITEMS_PATH}?limit={limit}&offset={offset + limit}"
+            )
+        return JSONResponse(payload)
+
+    async def bulk_update(request: Request) -> Response:
+        body = await request.json()
+        requests = body.get("requests") or []
+        if not 1 <= len(requests) <= BULK_UPDATE_MAX_SKUS:
+            return _errors(f"Between 1 and {BULK_UPDATE_MAX_SKUS} requests expected")
+
+        responses = []
+        for r in requests:
+            sku = r.get("sku") or ""
+            qty = int((r.get("shipToLocationAvailability") or {}).get("quantity", -1))
+            response: dict[str, Any] = {"sku": sku, "statusCode": 200}
+            if not catalog.set_quantity(sku, qty):
+                response["statusCode"] = 404
+                response["errors"] = [
+                    {"errorId": 25702, "message": f"SKU {sku} is not available"}
+                ]
+            for offer in r.get("offers") or []:
+                response["offerId"] = offer.get("offerId")
+            responses.append(response)
+        return JSONResponse({"responses": responses})
+
+    async def patch_listings_item(request: Request) -> Response:
+        sku = request.path_params["sku"]
+        body = await request.json()
+        qty = _patched_quantity(body.get("patches") or [])
+        payload: dict[str, Any] = {
+            "sku": sku,
+            "status": "ACCEPTED",
+            "submissionId": state.next_id(),
+            "issues": [],
+        }
+        if qty is None or not catalog.set_quantity(sku, qty):
+            payload["status"] = "INVALID"
+            payload["issues"] = [
+                {
+                    "code": "4000001",
+                    "message": f"SKU {sku} cannot be patched",
+                    "severity": "ERROR",
+                }
+            ]
+        return JSONResponse(payload)
+
+    async def create_feed_document(request: Request) -> Response:
+        document_id = f"amzn1.tortuga.sim.{state.next_id()}"
+        state.feeds[document_id] = None
+        url = request.url_for("upload_feed_document", document_id=document_id)
+        return JSONResponse(
+            {"feedDocumentId": document_id, "url": str(url)}, status_code=201
+        )
+
+    async def upload_feed_document(request: Request) -> Response:
+        document_id = request.path_params["document_id"]
+        if document_id not in state.feeds:
+            return Response(status_code=404)
+        state.feeds[document_id] = await request.body()
+        return Response(status_code=200)
+
+    async def create_feed(request: Request) -> Response:
+        body = await request.json()
+        content = state.feeds.get(body.get("inputFeedDocumentId") or "")
+        if content is None:
+            return _errors("Unknown or empty inputFeedDocumentId")
+
+        # Feeds are processed on submission rather than asynchronously.
+        for message in json.loads(content).get("messages") or []:
+            qty = _patched_quantity(message.get("patches") or [])
+            catalog.set_quantity(message.get("sku") or "", -1 if qty is None else qty)
+        return JSONResponse({"feedId": state.next_id()}, status_code=202)
+
+    async def stats(request: Request) -> Response:
+        return JSONResponse(state.stats())
+
+    def route(path: str, operation: str, handler: Handler, method: str) -> Route:
+        return Route(
+            path,
+            _simulated(state, operation, handler),
+            methods=[method],
+            name=handler.__name__,
+        )
+
+    return [
+        route(EBAY_TOKEN_PATH, EBAY_TOKEN, token, "POST"),
+        route(
+            EBAY_INVENTORY_ITEMS_PATH,
+            EBAY_GET_INVENTORY_ITEMS,
+            get_inventory_items,
+            "GET",
+        ),
+        route(EBAY_BULK_UPDATE_PATH, EBAY_BULK_UPDATE, bulk_update, "POST"),
+        route(AMAZON_TOKEN_PATH, AMAZON_TOKEN, token, "POST"),
+        route(
+            AMAZON_LISTINGS_ITEMS_PATH,
+            AMAZON_PATCH_LISTING,
+            patch_listings_item,
+            "PATCH",
+        ),
+        route(
+            AMAZON_FEED_DOCUMENTS_PATH,
+            AMAZON_CREATE_FEED_DOCUMENT,
+            create_feed_document,
+            "POST",
+        ),
+        route(UPLOADS_PATH, AMAZON_UPLOAD_FEED, upload_feed_document, "PUT"),
+        route(AMAZON_FEEDS_PATH, AMAZON_CREATE_FEED, create_feed, "POST"),
+        Route(STATS_PATH, stats, methods=["GET"]),
+    ]
+
+
+def _patched_quantity(patches: list[dict[str, Any]]) -> int | None:
+    """Quantity set by a `fulfillment_availability` replace patch."""
+
+    for patch in patches:
+        if patch.get("path") != "/attributes/fulfillment_availability":
+            continue
+        for value in patch.get("value") or []:
+            if "quantity" in value:
+                return int(value["quantity"])
+    return None
+
+
+def create_app(config: SimulatorConfig | None = None) -> Starlette:
+    """Builds a simulator; its state is available as `app.state.simulator`."""
+
+    config = config or SimulatorConfig()
+    rng = random.Random(config.seed)
+    state = SimulatorState(
+        config=config,
+        catalog=SimulatedCatalog(config.listings, config.conditions, rng),
+        rng=rng,
+    )
+
+    app = Starlette(routes=_routes(state))
+    app.state.simulator = state
+    return app
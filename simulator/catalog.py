@@ -0,0 +1,65 @@
+from __future__ import annotations
+
+import random
+from dataclasses import dataclass, field
+from typing import Any
+
+
+@dataclass(slots=True)
+class SimulatedCatalog:
+    """
+    Listings served by the simulator, shared by every account.
+
+    SKU `i` is `SKU-<i>` in condition `COND-<i mod conditions>`, so the
+    condition_ids of a catalog are predictable from its size alone.
+    """
+
+    listings: int
+    conditions: int
+    rng: random.Random = field(default_factory=random.Random)
+
+    quantities: list[int] = field(init=False, repr=False)
+    # Updates applied per SKU, for checking what a sync actually changed
+    updates: int = field(default=0, init=False)
+    rejected: int = field(default=0, init=False)
+
+    def __post_init__(self) -> None:
+        self.quantities = [self.rng.randint(0, 100) for _ in range(self.listings)]
+
+    @staticmethod
+    def sku(index: int) -> str:
+        return f"SKU-{index:08d}"
+
+    def condition_id(self, index: int) -> str:
+        return f"COND-{index % self.conditions:08d}"
+
+    def index_of(self, sku: str) -> int | None:
+        prefix, _, number = sku.partition("-")
+        if prefix != "SKU" or not number.isdigit():
+            return None
+        index = int(number)
+        return index if index < self.listings else None
+
+    def ebay_page(self, offset: int, limit: int) -> list[dict[str, Any]]:
+        return [
+            {
+                "sku": self.sku(i),
+                "condition": self.condition_id(i),
+                "availability": {
+                    "shipToLocationAvailability": {"quantity": self.quantities[i]}
+                },
+            }
+            for i in range(offset, min(offset + limit, self.listings))
+        ]
+
+    def set_quantity(self, sku: str, qty: int) -> bool:
+        """Applies one update; False when the SKU is unknown."""
+
+        index = self.index_of(sku)
+        if index is None or qty < 0:
+            self.rejected += 1
+            return False
+
+        self.quantities[index] = qty
+        self.updates += 1
+        return True
@@ -0,0 +1,125 @@
+from __future__ import annotations
+
+import math
+import random
+from collections.abc import Mapping
+from dataclasses import dataclass, field
+
+# Operations the simulator can delay, throttle and fail individually
+EBAY_TOKEN = "ebay.token"
+EBAY_GET_INVENTORY_ITEMS = "ebay.get_inventory_items"
+EBAY_BULK_UPDATE = "ebay.bulk_update_price_quantity"
+AMAZON_TOKEN = "amazon.token"
+AMAZON_PATCH_LISTING = "amazon.patch_listings_item"
+AMAZON_CREATE_FEED_DOCUMENT = "amazon.create_feed_document"
+AMAZON_UPLOAD_FEED = "amazon.upload_feed_document"
+AMAZON_CREATE_FEED = "amazon.create_feed"
+
+OPERATIONS = (
+    EBAY_TOKEN,
+    EBAY_GET_INVENTORY_ITEMS,
+    EBAY_BULK_UPDATE,
+    AMAZON_TOKEN,
+    AMAZON_PATCH_LISTING,
+    AMAZON_CREATE_FEED_DOCUMENT,
+    AMAZON_UPLOAD_FEED,
+    AMAZON_CREATE_FEED,
+)
+
+# z-score of the 99th percentile of a standard normal distribution
+_Z99 = 2.3263
+
+
+@dataclass(frozen=True, slots=True)
+class Latency:
+    """
+    Log-normal response latency given by its median and 99th percentile.
+
+    A p99 at or below the median gives a constant latency; a zero median
+    answers immediately.
+    """
+
+    median_s: float = 0.0
+    p99_s: float = 0.0
+
+    def __post_init__(self) -> None:
+        if self.median_s < 0 or self.p99_s < 0:
+            raise ValueError("latency must be >= 0")
+
+    def sample(self, rng: random.Random) -> float:
+        if self.median_s == 0:
+            return 0.0
+        if self.p99_s <= self.median_s:
+            return self.median_s
+
+        sigma = (math.log(self.p99_s) - math.log(self.median_s)) / _Z99
+        return rng.lognormvariate(math.log(self.median_s), sigma)
+
+
+@dataclass(frozen=True, slots=True)
+class OperationLimit:
+    """Token bucket enforced per operation and account; excess calls get 429."""
+
+    rate: float
+    burst: int
+
+    def __post_init__(self) -> None:
+        if self.rate <= 0:
+            raise ValueError("rate must be > 0")
+
+        if self.burst < 1:
+            raise ValueError("burst must be >= 1")
+
+
+# Published per-seller limits of the simulated APIs
+DEFAULT_LIMITS: Mapping[str, OperationLimit] = {
+    EBAY_GET_INVENTORY_ITEMS: OperationLimit(rate=20.0, burst=40),
+    EBAY_BULK_UPDATE: OperationLimit(rate=20.0, burst=40),
+    AMAZON_PATCH_LISTING: OperationLimit(rate=5.0, burst=10),
+    AMAZON_CREATE_FEED_DOCUMENT: OperationLimit(rate=0.5, burst=15),
+    AMAZON_CREATE_FEED: OperationLimit(rate=0.0083, burst=15),
+}
+
+
+@dataclass(frozen=True, slots=True)
+class SimulatorConfig:
+    # Catalog: listings per account and the condition_ids they spread over
+    listings: int = 10_000
+    conditions: int = 2_000
+
+    # Latency of every operation, unless overridden per operation
+    latency: Latency = field(default_factory=Latency)
+    operation_latency: Mapping[str, Latency] = field(default_factory=dict)
+
+    # Rate limits by operation; operations without one are unlimited
+    limits: Mapping[str, OperationLimit] = field(
+        default_factory=lambda: dict(DEFAULT_LIMITS)
+    )
+
+    # Share of calls answered with a random 500/502/503 before any effect
+    error_rate: float = 0.0
+
+    # Largest getInventoryItems page eBay serves
+    max_page_size: int = 200
+
+    seed: int | None = None
+
+    def __post_init__(self) -> None:
+        if self.listings < 0:
+            raise ValueError("listings must be >= 0")
+
+        if self.conditions < 1:
+            raise ValueError("conditions must be >= 1")
+
+        if not 0.0 <= self.error_rate <= 1.0:
+            raise ValueError("error_rate must be between 0 and 1")
+
+        if self.max_page_size < 1:
+            raise ValueError("max_page_size must be >= 1")
+
+        unknown = (set(self.operation_latency) | set(self.limits)) - set(OPERATIONS)
+        if unknown:
+            raise ValueError(f"Unknown operations: {', '.join(sorted(unknown))}")
+
+    def latency_of(self, operation: str) -> Latency:
+        return self.operation_latency.get(operation, self.latency)
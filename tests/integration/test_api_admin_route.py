@@ -0,0 +1,137 @@
+import pytest
+from fastapi import FastAPI
+from httpx import ASGITransport, AsyncClient
+
+from app.api.routes.admin import router as admin_router
+from app.application.service.coalescing import SyncCoalescer
+from app.application.service.scheduler import SyncSchedule, SyncScheduler
+from app.domain.marketplace import SyncResult
+from app.infrastructure.http.pools import PoolMonitor, PoolSettings
+from app.infrastructure.http.rate_limit import RateLimiter
+
+
+@pytest.mark.asyncio
+async def test_rate_limits_route_reports_bucket_stats():
+    app = FastAPI()
+    app.include_router(admin_router)
+    app.state.rate_limiter = RateLimiter()
+    await app.state.rate_limiter.acquire(("ebay", "acc-1", "op"))
+
+    transport = ASGITransport(app=app)
+
+    async with AsyncClient(transport=transport, base_url="http://test") as client:
+        response = await client.get("/v1/admin/rate-limits")
+
+    assert response.status_code == 200
+    (bucket,) = response.json()["buckets"]
+    assert bucket["marketplace"] == "ebay"
+    assert bucket["account"] == "acc-1"
+    assert bucket["acquired"] == 1
+    assert bucket["waiting"] == 0
+
+
+@pytest.mark.asyncio
+async def test_rate_limits_route_is_404_without_limiter():
+    app = FastAPI()
+    app.include_router(admin_router)
+
+    transport = ASGITransport(app=app)
+
+    async with AsyncClient(transport=transport, base_url="http://test") as client:
+        response = await client.get("/v1/admin/rate-limits")
+
+    assert response.status_code == 404
+
+
+@pytest.mark.asyncio
+async def test_http_pools_route_reports_pool_stats():
+    app = FastAPI()
+    app.include_router(admin_router)
+    app.state.http_pools = PoolMonitor()
+    app.state.http_pools.instrument("api.ebay.com", PoolSettings(max_connections=4))
+
+    transport = ASGITransport(app=app)
+
+    async with AsyncClient(transport=transport, base_url="http://test") as client:
+        response = await client.get("/v1/admin/http-pools")
+
+    assert response.status_code == 200
+    (pool,) = response.json()["pools"]
+    assert pool["pool"] == "api.ebay.com"
+    assert pool["max_connections"] == 4
+    assert pool["connections"] == 0
+    assert pool["waiting"] == 0
+
+
+@pytest.mark.asyncio
+async def test_sync_coalescing_route_reports_counters():
+    app = FastAPI()
+    app.include_router(admin_router)
+    app.state.sync_coalescer = SyncCoalescer()
+
+    async def sync() -> SyncResult:
+        return SyncResult()
+
+    await app.state.sync_coalescer.run(("ebay", "acc-1"), sync)
+
+    transport = ASGITransport(app=app)
+
+    async with AsyncClient(transport=transport, base_url="http://test") as client:
+        response = await client.get("/v1/admin/sync-coalescing")
+        disabled = await client.get("/v1/admin/rate-limits")
+
+    assert response.status_code == 200
+    assert response.json()["marketplaces"] == [
+        {"marketplace": "ebay", "requests": 1, "runs": 1, "coalesced": 0, "running": 0}
+    ]
+    assert disabled.status_code == 404
+
+
+@pytest.mark.asyncio
+async def test_schedules_routes_list_pause_resume_and_trigger():
+    app = FastAPI()
+    app.include_router(admin_router)
+    app.state.scheduler = SyncScheduler()
+
+    async def sync() -> SyncResult:
+        return SyncResult()
+
+    app.state.scheduler.register(
+        SyncSchedule(marketplace="ebay", account="acc-1", interval_s=60, sync=sync)
+    )
+
+    transport = ASGITransport(app=app)
+
+    async with AsyncClient(transport=transport, base_url="http://test") as client:
+        listed = await client.get("/v1/admin/schedules")
+        paused = await client.post("/v1/admin/schedules/EBAY/acc-1/pause")
+        triggered = await client.post("/v1/admin/schedules/ebay/acc-1/trigger")
+        resumed = await client.post("/v1/admin/schedules/ebay/acc-1/resume")
+        missing = await client.post("/v1/admin/schedules/ebay/acc-2/trigger")
+
+    assert listed.status_code == 200
+    (schedule,) = listed.json()["schedules"]
+    assert schedule["account"] == "acc-1"
+    assert schedule["priority"] == "normal"
+    assert schedule["state"] == "idle"
+    assert 0 <= schedule["next_run_in_s"] <= 60
+
+    assert paused.json()["paused"] is True
+    assert paused.json()["next_run_in_s"] is None
+    assert triggered.status_code == 202
+    assert triggered.json()["state"] == "queued"
+    assert resumed.json()["paused"] is False
+    assert missing.status_code == 404
+
+
+@pytest.mark.asyncio
+async def test_schedules_route_is_404_without_scheduler():
+    app = FastAPI()
+    app.include_router(admin_router)
+
+    transport = ASGITransport(app=app)
+
+    async with AsyncClient(transport=transport, base_url="http://test") as client:
+        response = await client.get("/v1/admin/schedules")
+
+    assert response.status_code == 404
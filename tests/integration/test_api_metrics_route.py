@@ -0,0 +1,69 @@
+import pytest
+from fastapi import FastAPI
+from httpx import ASGITransport, AsyncClient
+
+from app.api.routes.inventory import router as inventory_router
+from app.api.routes.metrics import router as metrics_router
+from app.domain.marketplace import Listing
+from app.infrastructure.metrics import PrometheusMetrics
+
+
+class ListingsPort:
+    async def iter_listings(self):
+        yield [Listing(sku="SKU-1", condition_id="NEW", marketplace_qty=1)]
+
+    async def update_inventory(self, updates):
+        return []
+
+
+class ListingsFactory:
+    def build(self, config):
+        return ListingsPort()
+
+
+@pytest.mark.asyncio
+async def test_metrics_route_exposes_sync_phases():
+    app = FastAPI()
+    app.include_router(inventory_router)
+    app.include_router(metrics_router)
+    app.state.marketplace_factory = ListingsFactory()
+    app.state.metrics = PrometheusMetrics()
+
+    transport = ASGITransport(app=app)
+
+    async with AsyncClient(transport=transport, base_url="http://test") as client:
+        sync = await client.post(
+            "/v1/marketplaces/ebay/inventory/sync",
+            json={
+                "account": "acc-1",
+                "refresh_token": "t",
+                "inventory": [{"condition_id": "NEW", "quantity": 5}],
+            },
+        )
+        response = await client.get("/metrics")
+
+    assert sync.status_code == 200
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain; version=0.0.4")
+    for phase, rows in [
+        ("snapshot_build", 1),
+        ("fetch_listings", 1),
+        ("evaluate", 1),
+        ("update_inventory", 1),
+    ]:
+        assert (
+            f'sync_phase_rows_total{{marketplace="ebay",phase="{phase}"}} {rows}'
+        ) in response.text
+
+
+@pytest.mark.asyncio
+async def test_metrics_route_is_404_when_disabled():
+    app = FastAPI()
+    app.include_router(metrics_router)
+
+    transport = ASGITransport(app=app)
+
+    async with AsyncClient(transport=transport, base_url="http://test") as client:
+        response = await client.get("/metrics")
+
+    assert response.status_code == 404
@@ -1,24 +1,51 @@
+import asyncio
+
 import pytest
 from fastapi import FastAPI
 from httpx import ASGITransport, AsyncClient
 
+import app.api.deps as app_deps_module
 import app.api.routes.inventory as inventory_route_module
+from app.api.columnar import encode_columns
+from app.api.deps import build_sync_job_runner
 from app.api.routes.inventory import router as inventory_router
+from app.api.routes.jobs import router as jobs_router
+from app.api.schemas.inventory import SyncSettingsIn
+from app.application.service.coalescing import SyncCoalescer
+from app.application.service.delta_sync import InventoryBaselineStore
+from app.application.service.listings_cache import ListingsCache
+from app.application.service.sync_jobs import SyncJobWorkerPool
 from app.domain.inventory import InventoryKey
-from app.domain.marketplace import ListingQuantityUpdate
+from app.domain.marketplace import Listing, ListingQuantityUpdate, SyncResult
+from app.infrastructure.config import AppConfig, EbayDeveloperCredentials
+from app.infrastructure.jobs.sqlite_queue import SqliteJobQueue
 
 
 class FakeService:
     def __init__(self):
         self.seen_inventory = None
 
-    async def sync(self, inventory):
+    async def run(self, inventory):
         self.seen_inventory = inventory
 
-        return [
-            ListingQuantityUpdate(sku="SKU-1", listing_id="L1", qty=10),
-            ListingQuantityUpdate(sku="SKU-2", listing_id="L2", qty=0),
-        ]
+        return SyncResult(
+            updates=[
+                ListingQuantityUpdate(sku="SKU-1", listing_id="L1", qty=10),
+                ListingQuantityUpdate(sku="SKU-2", listing_id="L2", qty=0),
+            ]
+        )
+
+
+class FakeRunService:
+    def __init__(self):
+        self.seen_inventory = None
+
+    async def run(self, inventory):
+        self.seen_inventory = inventory
+        qty = inventory.get_qty_by_id("NEW")
+        return SyncResult(
+            updates=[ListingQuantityUpdate(sku="SKU-1", listing_id="L1", qty=qty)]
+        )
 
 
 @pytest.mark.asyncio
@@ -77,3 +104,451 @@ async def test_sync_inventory_route_maps_inventory_and_returns_updates(monkeypat
 
     assert inv.get_qty(InventoryKey(condition_id="NEW")) == 10
     assert inv.get_qty(InventoryKey(condition_id="USED")) == 3
+
+
+@pytest.mark.asyncio
+async def test_invalidate_listings_cache_route_drops_account_snapshot():
+    app = FastAPI()
+    app.include_router(inventory_router)
+    app.state.listings_cache = ListingsCache()
+    app.state.listings_cache.put(
+        ("ebay", "acc-1"),
+        [Listing(sku="SKU-1", condition_id="NEW", marketplace_qty=1)],
+    )
+
+    transport = ASGITransport(app=app)
+
+    async with AsyncClient(transport=transport, base_url="http://test") as client:
+        response = await client.delete(
+            "/v1/marketplaces/EBAY/accounts/acc-1/listings-cache"
+        )
+
+    assert response.status_code == 204
+    assert app.state.listings_cache.get(("ebay", "acc-1")) is None
+
+
+class FakeDeltaService:
+    def __init__(self):
+        self.seen_changes = None
+
+    async def run(self, changes):
+        self.seen_changes = changes
+        return SyncResult(
+            updates=[ListingQuantityUpdate(sku="SKU-1", listing_id="L1", qty=4)]
+        )
+
+
+@pytest.mark.asyncio
+async def test_delta_route_passes_changes_and_returns_updates(monkeypatch):
+    app = FastAPI()
+    app.include_router(inventory_router)
+
+    fake_service = FakeDeltaService()
+
+    def fake_build_delta_sync_service(*, request, marketplace, body):
+        return fake_service
+
+    monkeypatch.setattr(
+        inventory_route_module,
+        "build_delta_sync_service",
+        fake_build_delta_sync_service,
+    )
+
+    payload = {
+        "account": "acc-1",
+        "refresh_token": "user-token",
+        "changes": [{"condition_id": "NEW", "quantity": 4}],
+    }
+
+    transport = ASGITransport(app=app)
+
+    async with AsyncClient(transport=transport, base_url="http://test") as client:
+        response = await client.post(
+            "/v1/marketplaces/ebay/inventory/delta",
+            json=payload,
+        )
+
+    assert response.status_code == 200
+    assert response.json() == {
+        "updates": [{"sku": "SKU-1", "listing_id": "L1", "qty": 4}]
+    }
+    assert [(c.condition_id, c.quantity) for c in fake_service.seen_changes] == [
+        ("NEW", 4)
+    ]
+
+
+@pytest.mark.asyncio
+async def test_full_sync_drops_delta_listings_index(monkeypatch):
+    app = FastAPI()
+    app.include_router(inventory_router)
+    app.state.inventory_baselines = InventoryBaselineStore()
+    app.state.inventory_baselines.get(("ebay", "acc-1")).listings_by_condition = {}
+
+    monkeypatch.setattr(
+        inventory_route_module,
+        "build_sync_service",
+        lambda *, request, marketplace, body: FakeService(),
+    )
+
+    payload = {
+        "account": "acc-1",
+        "refresh_token": "user-token",
+        "inventory": [{"condition_id": "NEW", "quantity": 10}],
+    }
+
+    transport = ASGITransport(app=app)
+
+    async with AsyncClient(transport=transport, base_url="http://test") as client:
+        response = await client.post(
+            "/v1/marketplaces/EBAY/inventory/sync",
+            json=payload,
+        )
+
+    assert response.status_code == 200
+    baseline = app.state.inventory_baselines.get(("ebay", "acc-1"))
+    assert baseline.listings_by_condition is None
+
+
+@pytest.mark.asyncio
+async def test_concurrent_full_syncs_of_an_account_are_coalesced(monkeypatch):
+    app = FastAPI()
+    app.include_router(inventory_router)
+    app.state.inventory_baselines = InventoryBaselineStore()
+    app.state.inventory_baselines.get(("ebay", "acc-1")).listings_by_condition = {}
+    app.state.sync_coalescer = SyncCoalescer()
+
+    release = asyncio.Event()
+    runs: list[int] = []
+
+    class GatedService(FakeRunService):
+        async def run(self, inventory):
+            runs.append(inventory.get_qty_by_id("NEW"))
+            await release.wait()
+            return await super().run(inventory)
+
+    monkeypatch.setattr(
+        inventory_route_module,
+        "build_sync_service",
+        lambda *, request, marketplace, body: GatedService(),
+    )
+
+    def payload(qty: int) -> dict:
+        return {
+            "account": "acc-1",
+            "refresh_token": "user-token",
+            "inventory": [{"condition_id": "NEW", "quantity": qty}],
+        }
+
+    transport = ASGITransport(app=app)
+
+    async with AsyncClient(transport=transport, base_url="http://test") as client:
+        url = "/v1/marketplaces/EBAY/inventory/sync"
+        first = asyncio.create_task(client.post(url, json=payload(1)))
+        while not runs:
+            await asyncio.sleep(0.001)
+        later = [
+            asyncio.create_task(client.post(url, json=payload(qty))) for qty in (2, 3)
+        ]
+        while app.state.sync_coalescer.stats()[0].requests < 3:
+            await asyncio.sleep(0.001)
+        release.set()
+        responses = await asyncio.gather(first, *later)
+
+    assert runs == [1, 3]
+    assert [r.json()["updates"][0]["qty"] for r in responses] == [1, 3, 3]
+    baseline = app.state.inventory_baselines.get(("ebay", "acc-1"))
+    assert baseline.listings_by_condition is None
+
+
+@pytest.mark.asyncio
+async def test_ndjson_sync_route_streams_inventory(monkeypatch):
+    app = FastAPI()
+    app.include_router(inventory_router)
+    app.state.inventory_baselines = InventoryBaselineStore()
+    app.state.inventory_baselines.get(("ebay", "acc-1")).listings_by_condition = {}
+
+    fake_service = FakeService()
+    seen_settings = []
+
+    def fake_build_sync_service(*, request, marketplace, body):
+        seen_settings.append(body)
+        return fake_service
+
+    monkeypatch.setattr(
+        inventory_route_module,
+        "build_sync_service",
+        fake_build_sync_service,
+    )
+
+    async def body():
+        yield b'{"account": "acc-1", "refresh_token": "user-token"}\n'
+        yield b'{"condition_id": "NEW", "quantity": 10}\n{"condition_'
+        yield b'id": "USED", "quantity": 3}'
+
+    transport = ASGITransport(app=app)
+
+    async with AsyncClient(transport=transport, base_url="http://test") as client:
+        response = await client.post(
+            "/v1/marketplaces/EBAY/inventory/sync/ndjson",
+            content=body(),
+            headers={"Content-Type": "application/x-ndjson"},
+        )
+
+    assert response.status_code == 200
+    assert response.json()["updates"][0] == {
+        "sku": "SKU-1",
+        "listing_id": "L1",
+        "qty": 10,
+    }
+    assert seen_settings[0].account == "acc-1"
+
+    inv = fake_service.seen_inventory
+    assert inv.get_qty(InventoryKey(condition_id="NEW")) == 10
+    assert inv.get_qty(InventoryKey(condition_id="USED")) == 3
+
+    baseline = app.state.inventory_baselines.get(("ebay", "acc-1"))
+    assert baseline.listings_by_condition is None
+
+
+@pytest.mark.asyncio
+async def test_ndjson_sync_route_rejects_other_content_types():
+    app = FastAPI()
+    app.include_router(inventory_router)
+
+    transport = ASGITransport(app=app)
+
+    async with AsyncClient(transport=transport, base_url="http://test") as client:
+        response = await client.post(
+            "/v1/marketplaces/ebay/inventory/sync/ndjson",
+            json={"account": "acc-1"},
+        )
+
+    assert response.status_code == 415
+
+
+@pytest.mark.asyncio
+async def test_async_mode_queues_job_and_jobs_route_reports_result(
+    monkeypatch, tmp_path
+):
+    app = FastAPI()
+    app.include_router(inventory_router)
+    app.include_router(jobs_router)
+    app.state.inventory_baselines = InventoryBaselineStore()
+    app.state.inventory_baselines.get(("ebay", "acc-1")).listings_by_condition = {}
+    app.state.job_queue = SqliteJobQueue(path=str(tmp_path / "jobs.sqlite3"))
+    app.state.job_workers = SyncJobWorkerPool(
+        queue=app.state.job_queue,
+        runner=build_sync_job_runner(app.state),
+        concurrency={"ebay": 1},
+    )
+
+    fake_service = FakeRunService()
+    monkeypatch.setattr(
+        app_deps_module,
+        "_sync_service",
+        lambda state, marketplace, body: fake_service,
+    )
+
+    payload = {
+        "account": "acc-1",
+        "refresh_token": "user-token",
+        "inventory": [
+            {"condition_id": "NEW", "quantity": 10},
+            {"condition_id": "NEW", "quantity": 2},
+        ],
+    }
+
+    transport = ASGITransport(app=app)
+
+    await app.state.job_workers.start()
+    try:
+        async with AsyncClient(transport=transport, base_url="http://test") as client:
+            response = await client.post(
+                "/v1/marketplaces/EBAY/inventory/sync?mode=async",
+                json=payload,
+            )
+            assert response.status_code == 202
+            job_id = response.json()["job_id"]
+            assert response.headers["location"] == f"/v1/jobs/{job_id}"
+
+            async with asyncio.timeout(2):
+                while True:
+                    job = (await client.get(f"/v1/jobs/{job_id}")).json()
+                    if job["status"] in ("succeeded", "failed"):
+                        break
+                    await asyncio.sleep(0.01)
+    finally:
+        await app.state.job_workers.stop()
+
+    assert job["status"] == "succeeded"
+    assert job["marketplace"] == "ebay"
+    assert job["updates"] == [{"sku": "SKU-1", "listing_id": "L1", "qty": 12}]
+    assert job["failures"] == []
+    assert fake_service.seen_inventory.get_qty_by_id("NEW") == 12
+    baseline = app.state.inventory_baselines.get(("ebay", "acc-1"))
+    assert baseline.listings_by_condition is None
+
+
+@pytest.mark.asyncio
+async def test_async_mode_is_unavailable_without_job_queue():
+    app = FastAPI()
+    app.include_router(inventory_router)
+
+    payload = {"account": "acc-1", "refresh_token": "user-token", "inventory": []}
+
+    transport = ASGITransport(app=app)
+
+    async with AsyncClient(transport=transport, base_url="http://test") as client:
+        response = await client.post(
+            "/v1/marketplaces/ebay/inventory/sync?mode=async",
+            json=payload,
+        )
+
+    assert response.status_code == 503
+
+
+@pytest.mark.asyncio
+async def test_unknown_job_returns_404(tmp_path):
+    app = FastAPI()
+    app.include_router(jobs_router)
+    app.state.job_queue = SqliteJobQueue(path=str(tmp_path / "jobs.sqlite3"))
+
+    transport = ASGITransport(app=app)
+
+    async with AsyncClient(transport=transport, base_url="http://test") as client:
+        response = await client.get("/v1/jobs/missing")
+
+    assert response.status_code == 404
+
+
+class ListingsPort:
+    def __init__(self, listings):
+        self.listings = listings
+
+    async def fetch_listings(self):
+        return self.listings
+
+    async def iter_listings(self):
+        yield self.listings
+
+    async def update_inventory(self, updates):
+        return []
+
+
+class EbayOnlyFactory:
+    def build(self, config):
+        if config.marketplace != "ebay":
+            raise ValueError(f"Unsupported marketplace: {config.marketplace}")
+        return ListingsPort(
+            [
+                Listing(
+                    sku=f"SKU-{config.account}", condition_id="NEW", marketplace_qty=1
+                )
+            ]
+        )
+
+
+@pytest.mark.asyncio
+async def test_fan_out_route_returns_result_per_target():
+    app = FastAPI()
+    app.include_router(inventory_router)
+    app.state.config = AppConfig(
+        ebay_dev_creds=EbayDeveloperCredentials(client_id="id", client_secret="s"),
+        ebay_base_url="https://ebay.test",
+        amazon_base_url="https://amazon.test",
+    )
+    app.state.marketplace_factory = EbayOnlyFactory()
+    app.state.inventory_baselines = InventoryBaselineStore()
+    app.state.inventory_baselines.get(("ebay", "acc-1")).listings_by_condition = {}
+    app.state.sync_coalescer = SyncCoalescer()
+
+    payload = {
+        "targets": [
+            {"marketplace": "ebay", "account": "acc-1", "refresh_token": "t1"},
+            {"marketplace": "etsy", "account": "acc-2", "refresh_token": "t2"},
+            {"marketplace": "EBAY", "account": "acc-3", "refresh_token": "t3"},
+        ],
+        "inventory": [{"condition_id": "NEW", "quantity": 7}],
+    }
+
+    transport = ASGITransport(app=app)
+
+    async with AsyncClient(transport=transport, base_url="http://test") as client:
+        response = await client.post(
+            "/v1/marketplaces/inventory/fan-out",
+            json=payload,
+        )
+
+    assert response.status_code == 200
+    results = response.json()["results"]
+    assert [(r["marketplace"], r["account"], r["ok"]) for r in results] == [
+        ("ebay", "acc-1", True),
+        ("etsy", "acc-2", False),
+        ("ebay", "acc-3", True),
+    ]
+    assert results[0]["updates"] == [{"sku": "SKU-acc-1", "listing_id": None, "qty": 7}]
+    assert results[1]["error"] == "ValueError: Unsupported marketplace: etsy"
+    baselines = app.state.inventory_baselines
+    assert baselines.get(("ebay", "acc-1")).listings_by_condition is None
+    # targets run through the same single-flight as other full syncs
+    assert {s.marketplace: s.runs for s in app.state.sync_coalescer.stats()} == {
+        "ebay": 2,
+        "etsy": 1,
+    }
+
+
+@pytest.mark.asyncio
+async def test_fan_out_route_rejects_duplicate_targets():
+    app = FastAPI()
+    app.include_router(inventory_router)
+
+    target = {"marketplace": "ebay", "account": "acc-1", "refresh_token": "t1"}
+    payload = {"targets": [target, target], "inventory": []}
+
+    transport = ASGITransport(app=app)
+
+    async with AsyncClient(transport=transport, base_url="http://test") as client:
+        response = await client.post(
+            "/v1/marketplaces/inventory/fan-out",
+            json=payload,
+        )
+
+    assert response.status_code == 422
+
+
+@pytest.mark.asyncio
+async def test_columnar_sync_route_decodes_binary_columns(monkeypatch):
+    app = FastAPI()
+    app.include_router(inventory_router)
+
+    fake_service = FakeService()
+    monkeypatch.setattr(
+        inventory_route_module,
+        "build_sync_service",
+        lambda *, request, marketplace, body: fake_service,
+    )
+
+    body = encode_columns(
+        SyncSettingsIn(account="acc-1", refresh_token="user-token"),
+        ["NEW", "USED", "NEW"],
+        [10, 3, 2],
+    )
+
+    transport = ASGITransport(app=app)
+
+    async with AsyncClient(transport=transport, base_url="http://test") as client:
+        response = await client.post(
+            "/v1/marketplaces/ebay/inventory/sync/columnar",
+            content=body,
+            headers={"Content-Type": "application/x-inventory-columns"},
+        )
+        unsupported = await client.post(
+            "/v1/marketplaces/ebay/inventory/sync/columnar",
+            content=b"a,b",
+            headers={"Content-Type": "text/csv"},
+        )
+
+    assert response.status_code == 200
+    assert len(response.json()["updates"]) == 2
+    assert dict(fake_service.seen_inventory.quantities()) == {"NEW": 12, "USED": 3}
+    assert unsupported.status_code == 415
@@ -0,0 +1,168 @@
+import json
+
+import pytest
+from fastapi import FastAPI
+from httpx import ASGITransport, AsyncClient
+
+from app.api.routes.inventory import router as inventory_router
+from app.application.service.delta_sync import InventoryBaselineStore
+from app.domain.marketplace import Listing, ListingUpdateFailure
+
+
+class ListingsPort:
+    def __init__(self, listings, fail_skus=(), error=None):
+        self.listings = listings
+        self.fail_skus = set(fail_skus)
+        self.error = error
+        self.batches = []
+
+    async def iter_listings(self):
+        for i in range(0, len(self.listings), 2):
+            yield self.listings[i : i + 2]
+
+    async def update_inventory(self, updates):
+        if self.error is not None:
+            raise self.error
+        batch = list(updates)
+        self.batches.append([u.sku for u in batch])
+        return [
+            ListingUpdateFailure(sku=u.sku, listing_id=u.listing_id, reason="rejected")
+            for u in batch
+            if u.sku in self.fail_skus
+        ]
+
+
+class ListingsFactory:
+    def __init__(self, port):
+        self.port = port
+
+    def build(self, config):
+        return self.port
+
+
+LISTINGS = [
+    Listing(sku="SKU-1", condition_id="NEW", marketplace_qty=1, listing_id="L1"),
+    Listing(sku="SKU-2", condition_id="NEW", marketplace_qty=10),
+    Listing(sku="SKU-3", condition_id="NEW", marketplace_qty=2),
+    Listing(sku="SKU-4", condition_id="NEW", marketplace_qty=20_000),
+    Listing(sku="SKU-5", condition_id="USED", marketplace_qty=3),
+]
+
+PAYLOAD = {
+    "account": "acc-1",
+    "refresh_token": "t",
+    "inventory": [{"condition_id": "NEW", "quantity": 10}],
+}
+
+
+def make_app(port):
+    app = FastAPI()
+    app.include_router(inventory_router)
+    app.state.marketplace_factory = ListingsFactory(port)
+    app.state.inventory_baselines = InventoryBaselineStore()
+    app.state.inventory_baselines.get(("ebay", "acc-1")).listings_by_condition = {}
+    return app
+
+
+async def post(app, query, payload=PAYLOAD):
+    async with AsyncClient(
+        transport=ASGITransport(app=app), base_url="http://test"
+    ) as client:
+        return await client.post(
+            f"/v1/marketplaces/ebay/inventory/sync?{query}", json=payload
+        )
+
+
+@pytest.mark.asyncio
+async def test_summary_mode_returns_counts_only():
+    port = ListingsPort(LISTINGS, fail_skus={"SKU-3"})
+    app = make_app(port)
+
+    response = await post(app, "response=summary")
+
+    assert response.status_code == 200
+    assert response.json() == {
+        "evaluated": 5,
+        "skipped": {"unchanged": 1, "marketplace_over_limit": 1},
+        "updated": 2,
+        "failed": 1,
+    }
+    assert (
+        app.state.inventory_baselines.get(("ebay", "acc-1")).listings_by_condition
+        is None
+    )
+
+
+@pytest.mark.asyncio
+async def test_ndjson_mode_streams_update_batches_then_summary():
+    port = ListingsPort(LISTINGS, fail_skus={"SKU-5"})
+    app = make_app(port)
+
+    response = await post(app, "response=ndjson&batch_size=2")
+
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "application/x-ndjson"
+    records = [json.loads(line) for line in response.text.splitlines()]
+    assert records == [
+        {
+            "type": "update",
+            "sku": "SKU-1",
+            "listing_id": "L1",
+            "qty": 10,
+            "failure": None,
+        },
+        {
+            "type": "update",
+            "sku": "SKU-3",
+            "listing_id": None,
+            "qty": 10,
+            "failure": None,
+        },
+        {
+            "type": "update",
+            "sku": "SKU-5",
+            "listing_id": None,
+            "qty": 0,
+            "failure": "rejected",
+        },
+        {
+            "type": "summary",
+            "evaluated": 5,
+            "skipped": {"unchanged": 1, "marketplace_over_limit": 1},
+            "updated": 2,
+            "failed": 1,
+        },
+    ]
+    assert port.batches == [["SKU-1", "SKU-3"], ["SKU-5"]]
+    assert (
+        app.state.inventory_baselines.get(("ebay", "acc-1")).listings_by_condition
+        is None
+    )
+
+
+@pytest.mark.asyncio
+async def test_ndjson_mode_ends_with_error_record_when_sync_fails():
+    app = make_app(ListingsPort(LISTINGS, error=RuntimeError("marketplace down")))
+
+    response = await post(app, "response=ndjson")
+
+    assert response.status_code == 200
+    assert json.loads(response.text.splitlines()[-1]) == {
+        "type": "error",
+        "detail": "marketplace down",
+    }
+    assert (
+        app.state.inventory_baselines.get(("ebay", "acc-1")).listings_by_condition
+        is None
+    )
+
+
+@pytest.mark.asyncio
+async def test_response_modes_require_sync_mode():
+    app = make_app(ListingsPort(LISTINGS))
+
+    response = await post(app, "mode=async&response=summary")
+    invalid = await post(app, "response=xml")
+
+    assert response.status_code == 400
+    assert invalid.status_code == 422
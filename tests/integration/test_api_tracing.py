@@ -0,0 +1,95 @@
+import random
+
+import pytest
+from fastapi import FastAPI
+from httpx import ASGITransport, AsyncClient
+
+from app.api.routes.admin import router as admin_router
+from app.api.routes.inventory import router as inventory_router
+from app.api.tracing import TracingMiddleware
+from app.application.service.tracing import Tracer
+from app.domain.marketplace import Listing
+from app.infrastructure.tracing import RingBufferExporter
+
+
+class ListingsPort:
+    async def iter_listings(self):
+        yield [Listing(sku="SKU-1", condition_id="NEW", marketplace_qty=1)]
+
+    async def update_inventory(self, updates):
+        return []
+
+
+class ListingsFactory:
+    def build(self, config):
+        return ListingsPort()
+
+
+def _make_app(sample_rate: float) -> FastAPI:
+    app = FastAPI()
+    app.add_middleware(TracingMiddleware)
+    app.include_router(inventory_router)
+    app.include_router(admin_router)
+    app.state.marketplace_factory = ListingsFactory()
+    app.state.trace_buffer = RingBufferExporter()
+    app.state.tracer = Tracer(
+        exporters=[app.state.trace_buffer],
+        sample_rate=sample_rate,
+        rng=random.Random(0),
+    )
+    return app
+
+
+SYNC_BODY = {
+    "account": "acc-1",
+    "refresh_token": "t",
+    "inventory": [{"condition_id": "NEW", "quantity": 5}],
+}
+
+
+@pytest.mark.asyncio
+async def test_sampled_sync_is_traced_and_readable_from_admin():
+    app = _make_app(sample_rate=1.0)
+
+    transport = ASGITransport(app=app)
+
+    async with AsyncClient(transport=transport, base_url="http://test") as client:
+        sync = await client.post("/v1/marketplaces/ebay/inventory/sync", json=SYNC_BODY)
+        listing = await client.get("/v1/admin/traces")
+        trace_id = sync.headers["x-trace-id"]
+        detail = await client.get(f"/v1/admin/traces/{trace_id}")
+
+    assert sync.status_code == 200
+    (summary,) = listing.json()["traces"]
+    assert summary["trace_id"] == trace_id
+    assert summary["name"] == "POST /v1/marketplaces/ebay/inventory/sync"
+
+    root = detail.json()["root"]
+    assert root["attributes"] == {"status": 200}
+    assert [c["name"] for c in root["children"]] == [
+        "to_domain_snapshot",
+        "build_sync_service",
+        "sync_inventory",
+    ]
+    assert [c["name"] for c in root["children"][2]["children"]] == [
+        "fetch_page",
+        "evaluate",
+        "update_inventory",
+    ]
+
+
+@pytest.mark.asyncio
+async def test_unsampled_sync_has_no_trace():
+    app = _make_app(sample_rate=0.0)
+
+    transport = ASGITransport(app=app)
+
+    async with AsyncClient(transport=transport, base_url="http://test") as client:
+        sync = await client.post("/v1/marketplaces/ebay/inventory/sync", json=SYNC_BODY)
+        listing = await client.get("/v1/admin/traces")
+        missing = await client.get("/v1/admin/traces/unknown")
+
+    assert sync.status_code == 200
+    assert "x-trace-id" not in sync.headers
+    assert listing.json() == {"traces": []}
+    assert missing.status_code == 404
@@ -1,15 +1,68 @@
+import json
+
 import httpx
 from fastapi.testclient import TestClient
 
 from main import app
 
 
-def test_lifespan_smoke_initializes_and_closes_http_client(monkeypatch):
+def test_lifespan_smoke_initializes_and_closes_http_client(monkeypatch, tmp_path):
     monkeypatch.setenv("EBAY_CLIENT_ID", "test-ebay-client-id")
     monkeypatch.setenv("EBAY_CLIENT_SECRET", "test-ebay-client-secret")
+    monkeypatch.setenv("SYNC_JOB_DB_PATH", str(tmp_path / "jobs.sqlite3"))
 
     with TestClient(app):
         assert hasattr(app.state, "config")
         assert hasattr(app.state, "http")
         assert isinstance(app.state.http, httpx.AsyncClient)
         assert hasattr(app.state, "marketplace_factory")
+        assert app.state.marketplace_factory.token_manager is app.state.token_manager
+        assert app.state.job_workers.serves("ebay")
+        assert app.state.marketplace_factory.rate_limiter is app.state.rate_limiter
+        assert {s.pool for s in app.state.http_pools.stats()} == {
+            "default",
+            "api.ebay.com",
+            "sellingpartnerapi-na.amazon.com",
+        }
+        assert "http_pool_connections" in app.state.metrics.registry.render()
+        assert app.state.tracer.exporters == [app.state.trace_buffer]
+
+
+def test_lifespan_registers_and_stops_scheduled_syncs(monkeypatch, tmp_path):
+    schedules = tmp_path / "schedules.json"
+    schedules.write_text(
+        json.dumps(
+            {
+                "schedules": [
+                    {
+                        "marketplace": "eBay",
+                        "account": "acc-1",
+                        "refresh_token": "token",
+                        "interval_s": 3600,
+                        "priority": "high",
+                        "inventory_url": "https://wms.test/export",
+                    },
+                    {
+                        "marketplace": "amazon",
+                        "account": "acc-2",
+                        "refresh_token": "token",
+                        "interval_s": 3600,
+                        "inventory_path": str(tmp_path / "inventory.csv"),
+                    },
+                ]
+            }
+        )
+    )
+    monkeypatch.setenv("EBAY_CLIENT_ID", "test-ebay-client-id")
+    monkeypatch.setenv("EBAY_CLIENT_SECRET", "test-ebay-client-secret")
+    monkeypatch.setenv("SYNC_JOB_DB_PATH", str(tmp_path / "jobs.sqlite3"))
+    monkeypatch.setenv("SYNC_SCHEDULES_PATH", str(schedules))
+
+    with TestClient(app) as client:
+        schedule, file_schedule = client.get("/v1/admin/schedules").json()["schedules"]
+
+    assert file_schedule["account"] == "acc-2"
+    assert schedule["marketplace"] == "ebay"
+    assert schedule["account"] == "acc-1"
+    assert schedule["priority"] == "high"
+    assert schedule["runs"] == 0
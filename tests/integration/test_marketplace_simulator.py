@@ -0,0 +1,193 @@
+import random
+
+import httpx
+import pytest
+
+from app.domain.marketplace import ListingQuantityUpdate
+from app.infrastructure.auth.tokens import TokenManager
+from app.infrastructure.config import EbayDeveloperCredentials
+from app.infrastructure.marketplaces.amazon_client import (
+    AmazonAdapter,
+    AmazonUserCredentials,
+)
+from app.infrastructure.marketplaces.ebay_client import EbayAdapter, EbayUserCredentials
+from simulator import Latency, OperationLimit, SimulatorConfig, create_app
+from simulator.config import EBAY_GET_INVENTORY_ITEMS
+
+BASE_URL = "http://simulator"
+
+
+def client_for(app) -> httpx.AsyncClient:
+    return httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url=BASE_URL)
+
+
+def ebay_adapter(http: httpx.AsyncClient, page_size: int = 100) -> EbayAdapter:
+    return EbayAdapter(
+        http=http,
+        credentials=EbayUserCredentials(token="refresh"),
+        dev_creds=EbayDeveloperCredentials(client_id="id", client_secret="secret"),
+        base_url=BASE_URL,
+        tokens=TokenManager(http=http),
+        page_size=page_size,
+    )
+
+
+def amazon_adapter(http: httpx.AsyncClient, feed_threshold: int = 200) -> AmazonAdapter:
+    return AmazonAdapter(
+        http=http,
+        credentials=AmazonUserCredentials(
+            seller_partner_id="SELLER",
+            lwa_client_id="id",
+            lwa_client_secret="secret",
+            refresh_token="refresh",
+        ),
+        base_url=BASE_URL,
+        tokens=TokenManager(http=http),
+        lwa_token_url=f"{BASE_URL}/auth/o2/token",
+        feed_threshold=feed_threshold,
+    )
+
+
+class TestMarketplaceSimulator:
+    @staticmethod
+    @pytest.mark.asyncio
+    async def test_ebay_adapter_pages_through_whole_catalog():
+        app = create_app(SimulatorConfig(listings=250, conditions=40, seed=1))
+        catalog = app.state.simulator.catalog
+
+        async with client_for(app) as http:
+            listings = await ebay_adapter(http, page_size=100).fetch_listings()
+
+        assert [x.sku for x in listings] == [catalog.sku(i) for i in range(250)]
+        assert listings[41].condition_id == "COND-00000001"
+        assert [x.marketplace_qty for x in listings] == catalog.quantities
+
+    @staticmethod
+    @pytest.mark.asyncio
+    async def test_ebay_bulk_update_applies_known_skus_and_rejects_unknown():
+        app = create_app(SimulatorConfig(listings=10))
+        catalog = app.state.simulator.catalog
+
+        async with client_for(app) as http:
+            failures = await ebay_adapter(http).update_inventory(
+                [
+                    ListingQuantityUpdate(sku="SKU-00000003", qty=77),
+                    ListingQuantityUpdate(sku="SKU-99999999", qty=1),
+                ]
+            )
+
+        assert catalog.quantities[3] == 77
+        assert [f.sku for f in failures] == ["SKU-99999999"]
+        assert "not available" in failures[0].reason
+
+    @staticmethod
+    @pytest.mark.asyncio
+    async def test_amazon_patches_and_feed_update_the_catalog():
+        app = create_app(SimulatorConfig(listings=10))
+        catalog = app.state.simulator.catalog
+
+        async with client_for(app) as http:
+            patched = await amazon_adapter(http).update_inventory(
+                [
+                    ListingQuantityUpdate(sku="SKU-00000001", qty=11),
+                    ListingQuantityUpdate(sku="unknown", qty=1),
+                ]
+            )
+            fed = await amazon_adapter(http, feed_threshold=2).update_inventory(
+                [
+                    ListingQuantityUpdate(sku="SKU-00000002", qty=22),
+                    ListingQuantityUpdate(sku="SKU-00000004", qty=44),
+                ]
+            )
+
+        assert [f.sku for f in patched] == ["unknown"]
+        assert fed == []
+        assert catalog.quantities[1:5:1] == [11, 22, catalog.quantities[3], 44]
+        assert app.state.simulator.stats()["feeds"] == 1
+
+    @staticmethod
+    @pytest.mark.asyncio
+    async def test_throttles_over_the_limit_with_retry_after():
+        limit = OperationLimit(rate=1.0, burst=2)
+        app = create_app(SimulatorConfig(limits={EBAY_GET_INVENTORY_ITEMS: limit}))
+
+        async with client_for(app) as http:
+            statuses = []
+            for _ in range(3):
+                response = await http.get(
+                    "/sell/inventory/v1/inventory_item",
+                    params={"limit": 10},
+                    headers={"Authorization": "Bearer a"},
+                )
+                statuses.append(response.status_code)
+            other_account = await http.get(
+                "/sell/inventory/v1/inventory_item",
+                headers={"Authorization": "Bearer b"},
+            )
+
+        assert statuses == [200, 200, 429]
+        assert 0 < float(response.headers["Retry-After"]) <= 1
+        assert other_account.status_code == 200
+
+    @staticmethod
+    @pytest.mark.asyncio
+    async def test_injected_errors_do_not_touch_the_catalog():
+        app = create_app(SimulatorConfig(listings=5, error_rate=1.0))
+        before = list(app.state.simulator.catalog.quantities)
+
+        async with client_for(app) as http:
+            response = await http.post(
+                "/sell/inventory/v1/bulk_update_price_quantity",
+                json={
+                    "requests": [
+                        {
+                            "sku": "SKU-00000000",
+                            "shipToLocationAvailability": {"quantity": 9},
+                        }
+                    ]
+                },
+            )
+
+        assert response.status_code in (500, 502, 503)
+        assert app.state.simulator.catalog.quantities == before
+        stats = app.state.simulator.stats()
+        assert stats["responses"]["ebay.bulk_update_price_quantity"] == {
+            str(response.status_code): 1
+        }
+
+    @staticmethod
+    @pytest.mark.asyncio
+    async def test_rejects_oversized_bulk_update_and_page():
+        app = create_app(SimulatorConfig(max_page_size=50))
+
+        async with client_for(app) as http:
+            page = await http.get(
+                "/sell/inventory/v1/inventory_item", params={"limit": 51}
+            )
+            bulk = await http.post(
+                "/sell/inventory/v1/bulk_update_price_quantity",
+                json={"requests": [{"sku": f"SKU-{i:08d}"} for i in range(26)]},
+            )
+
+        assert page.status_code == 400
+        assert bulk.status_code == 400
+
+    @staticmethod
+    def test_latency_samples_match_median_and_p99():
+        rng = random.Random(0)
+        latency = Latency(median_s=0.01, p99_s=0.1)
+
+        samples = sorted(latency.sample(rng) for _ in range(20_000))
+
+        assert samples[10_000] == pytest.approx(0.01, rel=0.1)
+        assert samples[19_800] == pytest.approx(0.1, rel=0.15)
+        assert Latency(median_s=0.02).sample(rng) == 0.02
+        assert Latency().sample(rng) == 0.0
+
+    @staticmethod
+    def test_config_rejects_unknown_operations():
+        with pytest.raises(ValueError):
+            SimulatorConfig(limits={"ebay.unknown": OperationLimit(1.0, 1)})
+
+        with pytest.raises(ValueError):
+            SimulatorConfig(error_rate=1.5)
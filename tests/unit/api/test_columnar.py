@@ -0,0 +1,127 @@
+import json
+
+import msgpack
+import pytest
+from fastapi import HTTPException
+from fastapi.exceptions import RequestValidationError
+
+from app.api.columnar import (
+    decode_columnar,
+    decode_columnar_json,
+    decode_columnar_msgpack,
+    decode_columns,
+    encode_columns,
+)
+from app.api.schemas.inventory import SyncSettingsIn
+
+SETTINGS = {"account": "acc-1", "refresh_token": "t", "limit_qty_for_marketplace": 5}
+
+
+class TestColumnarJson:
+    @staticmethod
+    def test_columns_are_decoded_into_snapshot() -> None:
+        body = json.dumps(
+            {
+                **SETTINGS,
+                "condition_ids": ["NEW", "USED", "NEW"],
+                "quantities": [10, 3, 4],
+            }
+        ).encode()
+
+        settings, inventory = decode_columnar_json(body)
+
+        assert settings.account == "acc-1"
+        assert settings.limit_qty_for_marketplace == 5
+        assert dict(inventory.quantities()) == {"NEW": 14, "USED": 3}
+
+    @staticmethod
+    @pytest.mark.parametrize(
+        "columns",
+        [
+            {"condition_ids": ["NEW"], "quantities": [1, 2]},
+            {"condition_ids": ["NEW"], "quantities": [-1]},
+            {"condition_ids": ["NEW"], "quantities": ["many"]},
+        ],
+    )
+    def test_invalid_columns_are_rejected(columns: dict) -> None:
+        with pytest.raises(RequestValidationError):
+            decode_columnar_json(json.dumps({**SETTINGS, **columns}).encode())
+
+
+class TestColumnarMsgpack:
+    @staticmethod
+    def test_columns_are_decoded_into_snapshot() -> None:
+        body = msgpack.packb(
+            {**SETTINGS, "condition_ids": ["NEW", "USED"], "quantities": [10, 3]}
+        )
+
+        settings, inventory = decode_columnar_msgpack(body)
+
+        assert settings.refresh_token == "t"
+        assert dict(inventory.quantities()) == {"NEW": 10, "USED": 3}
+
+    @staticmethod
+    def test_invalid_msgpack_is_rejected() -> None:
+        with pytest.raises(RequestValidationError):
+            decode_columnar_msgpack(b"\xc1")
+
+
+class TestBinaryColumns:
+    @staticmethod
+    def test_round_trip() -> None:
+        body = encode_columns(
+            SyncSettingsIn(**SETTINGS), ["NEW", "ÜSED", "NEW"], [10, 2**40, 4]
+        )
+
+        settings, inventory = decode_columns(body)
+
+        assert settings == SyncSettingsIn(**SETTINGS)
+        assert dict(inventory.quantities()) == {"NEW": 14, "ÜSED": 2**40}
+
+    @staticmethod
+    def test_empty_inventory() -> None:
+        _, inventory = decode_columns(
+            encode_columns(SyncSettingsIn(**SETTINGS), [], [])
+        )
+
+        assert len(inventory) == 0
+
+    @staticmethod
+    @pytest.mark.parametrize(
+        "mangle",
+        [
+            lambda body: body[:-1],
+            lambda body: body + b"\0",
+            lambda body: b"JSON" + body[4:],
+            lambda body: body[:10],
+        ],
+    )
+    def test_malformed_bodies_are_rejected(mangle) -> None:
+        body = encode_columns(SyncSettingsIn(**SETTINGS), ["NEW", "USED"], [1, 2])
+
+        with pytest.raises(RequestValidationError):
+            decode_columns(mangle(body))
+
+    @staticmethod
+    def test_negative_quantities_are_rejected() -> None:
+        body = encode_columns(SyncSettingsIn(**SETTINGS), ["NEW"], [-1])
+
+        with pytest.raises(RequestValidationError):
+            decode_columns(body)
+
+
+class TestDecodeColumnar:
+    @staticmethod
+    def test_dispatches_on_content_type() -> None:
+        body = encode_columns(SyncSettingsIn(**SETTINGS), ["NEW"], [1])
+
+        _, inventory = decode_columnar("application/x-inventory-columns", body)
+
+        assert inventory.get_qty_by_id("NEW") == 1
+
+    @staticmethod
+    def test_unknown_content_type_is_415() -> None:
+        with pytest.raises(HTTPException) as exc_info:
+            decode_columnar("text/csv", b"")
+
+        assert exc_info.value.status_code == 415
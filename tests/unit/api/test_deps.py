@@ -1,8 +1,30 @@
+import asyncio
+
+import pytest
 from fastapi import FastAPI
 from starlette.requests import Request
 
-from app.api.deps import build_sync_service
+from app.api.deps import (
+    build_delta_sync_service,
+    build_scheduled_sync,
+    build_sync_service,
+    full_sync_of,
+)
 from app.api.schemas.inventory import InventoryItemIn, SyncInventoryRequest
+from app.api.schemas.schedules import SyncScheduleIn
+from app.application.service.coalescing import SyncCoalescer
+from app.application.service.delta_sync import InventoryBaselineStore
+from app.application.service.listings_cache import (
+    CachingMarketplacePortFactory,
+    ListingsCache,
+)
+from app.domain.inventory import (
+    InventoryItem,
+    InventorySnapshot,
+    InventorySnapshotBuilder,
+)
+from app.domain.marketplace import Listing
+from app.infrastructure.config import AppConfig, EbayDeveloperCredentials
 
 
 def _make_request_with_factory(factory_obj: object) -> Request:
@@ -54,3 +76,144 @@ def test_build_sync_service_wires_policy_config_and_factory():
     assert service.config.limit_qty_for_marketplace == 50
 
     assert service.policy.config is service.config
+
+
+def test_build_sync_service_wraps_factory_with_listings_cache():
+    factory = object()
+    request = _make_request_with_factory(factory)
+    request.app.state.listings_cache = ListingsCache()
+
+    body = SyncInventoryRequest(
+        account="acc-1",
+        refresh_token="token-1",
+        refresh_listings=True,
+        inventory=[],
+    )
+
+    service = build_sync_service(request=request, marketplace="ebay", body=body)
+
+    assert isinstance(service.marketplace_factory, CachingMarketplacePortFactory)
+    assert service.marketplace_factory.inner is factory
+    assert service.marketplace_factory.cache is request.app.state.listings_cache
+    assert service.marketplace_factory.bypass is True
+
+
+def test_build_sync_service_applies_pipeline_settings():
+    request = _make_request_with_factory(object())
+    request.app.state.config = AppConfig(
+        ebay_dev_creds=EbayDeveloperCredentials(client_id="id", client_secret="s"),
+        ebay_base_url="https://ebay.test",
+        amazon_base_url="https://amazon.test",
+        sync_update_batch_sizes={"amazon": 5000},
+        sync_pipeline_pages=8,
+    )
+    body = SyncInventoryRequest(account="acc-1", refresh_token="t", inventory=[])
+
+    amazon = build_sync_service(request=request, marketplace="Amazon", body=body)
+    ebay = build_sync_service(request=request, marketplace="ebay", body=body)
+
+    assert amazon.update_batch_size == 5000
+    assert amazon.pipeline_pages == 8
+    assert amazon.pipeline_batches == 2
+    # marketplaces without a configured size keep the service default
+    assert ebay.update_batch_size == 1000
+
+
+class OneListingPort:
+    def __init__(self) -> None:
+        self.updates: list = []
+
+    async def fetch_listings(self):
+        return [Listing(sku="SKU-1", condition_id="NEW", marketplace_qty=1)]
+
+    async def iter_listings(self):
+        yield await self.fetch_listings()
+
+    async def update_inventory(self, updates):
+        self.updates.extend(updates)
+        return []
+
+
+class OnePortFactory:
+    def __init__(self, port: OneListingPort) -> None:
+        self.port = port
+
+    def build(self, config):
+        return self.port
+
+
+class StaticSource:
+    async def load_snapshot(self) -> InventorySnapshot:
+        builder = InventorySnapshotBuilder()
+        builder.add("NEW", 7)
+        return builder.build()
+
+
+@pytest.mark.asyncio
+async def test_delta_sync_waits_for_a_running_full_sync():
+    port = OneListingPort()
+    request = _make_request_with_factory(OnePortFactory(port))
+    state = request.app.state
+    state.inventory_baselines = InventoryBaselineStore()
+    body = SyncInventoryRequest(account="acc-1", refresh_token="t", inventory=[])
+    service = build_delta_sync_service(request, "EBAY", body)
+
+    async with full_sync_of(state, "EBAY", "acc-1"):
+        delta = asyncio.create_task(
+            service.run([InventoryItem.create(condition_id="NEW", quantity=7)])
+        )
+        await asyncio.sleep(0.01)
+        assert not delta.done()
+        assert port.updates == []
+
+    result = await delta
+
+    assert [(u.sku, u.qty) for u in result.updates] == [("SKU-1", 7)]
+
+
+@pytest.mark.asyncio
+async def test_scheduled_sync_loads_inventory_from_its_source():
+    port = OneListingPort()
+    request = _make_request_with_factory(OnePortFactory(port))
+    state = request.app.state
+    state.inventory_baselines = InventoryBaselineStore()
+    state.inventory_baselines.get(("ebay", "acc-1")).listings_by_condition = {}
+    state.sync_coalescer = SyncCoalescer()
+    entry = SyncScheduleIn(
+        marketplace="EBAY",
+        account="acc-1",
+        refresh_token="t",
+        interval_s=60,
+        priority="high",
+        inventory_url="https://wms.test/export",
+    )
+
+    schedule = build_scheduled_sync(state, entry, StaticSource())
+    result = await schedule.sync()
+
+    assert schedule.key == ("ebay", "acc-1")
+    assert schedule.priority == "high"
+    assert [(u.sku, u.qty) for u in result.updates] == [("SKU-1", 7)]
+    assert port.updates == result.updates
+    assert state.sync_coalescer.stats()[0].runs == 1
+    assert (
+        state.inventory_baselines.get(("ebay", "acc-1")).listings_by_condition is None
+    )
+
+
+@pytest.mark.parametrize(
+    "sources",
+    [
+        {},
+        {"inventory_url": "https://wms.test/export", "inventory_path": "inv.csv"},
+    ],
+)
+def test_schedule_needs_exactly_one_inventory_source(sources):
+    with pytest.raises(ValueError, match="exactly one"):
+        SyncScheduleIn(
+            marketplace="ebay",
+            account="acc-1",
+            refresh_token="t",
+            interval_s=60,
+            **sources,
+        )
@@ -0,0 +1,75 @@
+from collections.abc import AsyncIterator
+
+import pytest
+from fastapi.exceptions import RequestValidationError
+
+from app.api.ndjson import iter_lines, read_sync_stream
+from app.domain.inventory import InventoryKey
+
+
+async def _chunks(*parts: bytes) -> AsyncIterator[bytes]:
+    for part in parts:
+        yield part
+
+
+class TestIterLines:
+    @staticmethod
+    @pytest.mark.asyncio
+    async def test_lines_are_reassembled_across_chunks() -> None:
+        lines = [
+            x async for x in iter_lines(_chunks(b'{"a"', b": 1}\n\n{", b'"b": 2}'))
+        ]
+
+        assert lines == [(1, b'{"a": 1}'), (3, b'{"b": 2}')]
+
+
+class TestReadSyncStream:
+    @staticmethod
+    @pytest.mark.asyncio
+    async def test_settings_and_rows_are_parsed() -> None:
+        settings, inventory = await read_sync_stream(
+            _chunks(
+                b'{"account": "acc-1", "refresh_token": "t", ',
+                b'"limit_qty_for_marketplace": 5}\n',
+                b'{"condition_id": "NEW", "quantity": 10}\n',
+                b'{"condition_id": "USED", "quantity": 3}\n',
+                b'{"condition_id": "NEW", "quantity": 4}\n',
+            )
+        )
+
+        assert settings.account == "acc-1"
+        assert settings.limit_qty_for_marketplace == 5
+        assert inventory.get_qty(InventoryKey(condition_id="NEW")) == 14
+        assert inventory.get_qty(InventoryKey(condition_id="USED")) == 3
+
+    @staticmethod
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize(
+        "row",
+        [
+            b"not json",
+            b"[1, 2]",
+            b'{"condition_id": "NEW", "quantity": "1"}',
+            b'{"condition_id": "NEW", "quantity": -1}',
+            b'{"condition_id": "", "quantity": 1}',
+        ],
+    )
+    async def test_invalid_row_reports_its_line(row: bytes) -> None:
+        settings = b'{"account": "acc-1", "refresh_token": "t"}\n'
+
+        with pytest.raises(RequestValidationError) as exc_info:
+            await read_sync_stream(_chunks(settings, b"\n", row))
+
+        assert exc_info.value.errors()[0]["loc"] == ("body", 3)
+
+    @staticmethod
+    @pytest.mark.asyncio
+    async def test_empty_body_is_rejected() -> None:
+        with pytest.raises(RequestValidationError):
+            await read_sync_stream(_chunks())
+
+    @staticmethod
+    @pytest.mark.asyncio
+    async def test_invalid_settings_are_rejected() -> None:
+        with pytest.raises(RequestValidationError):
+            await read_sync_stream(_chunks(b'{"account": "acc-1"}\n'))
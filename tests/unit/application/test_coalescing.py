@@ -0,0 +1,155 @@
+import asyncio
+
+import pytest
+
+from app.application.service.coalescing import SyncCoalescer
+from app.domain.marketplace import ListingQuantityUpdate, SyncResult
+
+
+class RecordingSyncMetrics:
+    def __init__(self) -> None:
+        self.requests: list[tuple[str, bool]] = []
+
+    def count_sync_request(self, marketplace: str, coalesced: bool) -> None:
+        self.requests.append((marketplace, coalesced))
+
+
+class GatedSyncs:
+    """Syncs that record which inventory they ran with and wait for `release`."""
+
+    def __init__(self) -> None:
+        self.ran: list[int] = []
+        self.release = asyncio.Event()
+        self.started = asyncio.Event()
+
+    def sync(self, qty: int, error: Exception | None = None):
+        async def run() -> SyncResult:
+            self.ran.append(qty)
+            self.started.set()
+            await self.release.wait()
+            if error is not None:
+                raise error
+            return SyncResult(
+                updates=[ListingQuantityUpdate(sku="SKU-1", listing_id=None, qty=qty)]
+            )
+
+        return run
+
+
+async def _settle() -> None:
+    for _ in range(5):
+        await asyncio.sleep(0)
+
+
+class TestSyncCoalescer:
+    @staticmethod
+    @pytest.mark.asyncio
+    async def test_requests_during_a_run_share_one_follow_up_run() -> None:
+        metrics = RecordingSyncMetrics()
+        coalescer = SyncCoalescer(metrics=metrics)
+        syncs = GatedSyncs()
+        key = ("ebay", "acc-1")
+
+        first = asyncio.create_task(coalescer.run(key, syncs.sync(1)))
+        await syncs.started.wait()
+        later = [
+            asyncio.create_task(coalescer.run(key, syncs.sync(qty)))
+            for qty in (2, 3, 4)
+        ]
+        await _settle()
+        syncs.release.set()
+
+        results = await asyncio.gather(first, *later)
+
+        # the latest inventory wins the follow-up run
+        assert syncs.ran == [1, 4]
+        assert [r.updates[0].qty for r in results] == [1, 4, 4, 4]
+        assert results[1] is results[3]
+        assert metrics.requests == [
+            ("ebay", False),
+            ("ebay", False),
+            ("ebay", True),
+            ("ebay", True),
+        ]
+        (stats,) = coalescer.stats()
+        assert (stats.requests, stats.runs, stats.coalesced) == (4, 2, 2)
+        assert stats.running == 0
+
+    @staticmethod
+    @pytest.mark.asyncio
+    async def test_accounts_run_independently() -> None:
+        coalescer = SyncCoalescer()
+        syncs = GatedSyncs()
+        syncs.release.set()
+
+        results = await asyncio.gather(
+            coalescer.run(("ebay", "acc-1"), syncs.sync(1)),
+            coalescer.run(("ebay", "acc-2"), syncs.sync(2)),
+            coalescer.run(("amazon", "acc-1"), syncs.sync(3)),
+        )
+
+        assert sorted(syncs.ran) == [1, 2, 3]
+        assert [r.updates[0].qty for r in results] == [1, 2, 3]
+
+    @staticmethod
+    @pytest.mark.asyncio
+    async def test_failure_reaches_every_caller_of_the_run() -> None:
+        coalescer = SyncCoalescer()
+        syncs = GatedSyncs()
+        key = ("ebay", "acc-1")
+
+        running = asyncio.create_task(coalescer.run(key, syncs.sync(1)))
+        await syncs.started.wait()
+        failing = [
+            asyncio.create_task(
+                coalescer.run(key, syncs.sync(qty, error=ConnectionError("down")))
+            )
+            for qty in (2, 3)
+        ]
+        await _settle()
+        syncs.release.set()
+
+        assert (await running).updates[0].qty == 1
+        for task in failing:
+            with pytest.raises(ConnectionError):
+                await task
+
+    @staticmethod
+    @pytest.mark.asyncio
+    async def test_cancelled_caller_does_not_cancel_the_run() -> None:
+        coalescer = SyncCoalescer()
+        syncs = GatedSyncs()
+        key = ("ebay", "acc-1")
+
+        leaving = asyncio.create_task(coalescer.run(key, syncs.sync(1)))
+        await syncs.started.wait()
+        staying = asyncio.create_task(coalescer.run(key, syncs.sync(2)))
+        await _settle()
+
+        leaving.cancel()
+        await _settle()
+        syncs.release.set()
+
+        assert (await staying).updates[0].qty == 2
+        assert syncs.ran == [1, 2]
+        assert leaving.cancelled()
+
+    @staticmethod
+    @pytest.mark.asyncio
+    async def test_close_cancels_waiting_callers() -> None:
+        coalescer = SyncCoalescer()
+        syncs = GatedSyncs()
+        key = ("ebay", "acc-1")
+
+        running = asyncio.create_task(coalescer.run(key, syncs.sync(1)))
+        await syncs.started.wait()
+        queued = asyncio.create_task(coalescer.run(key, syncs.sync(2)))
+        await _settle()
+
+        await coalescer.close()
+
+        for task in (running, queued):
+            with pytest.raises(asyncio.CancelledError):
+                await task
+        assert syncs.ran == [1]
+        assert coalescer.stats()[0].running == 0
@@ -0,0 +1,244 @@
+from __future__ import annotations
+
+from collections.abc import AsyncIterator, Iterable
+
+import pytest
+
+from app.application.service.delta_sync import DeltaSyncService, InventoryBaselineStore
+from app.domain.inventory import InventoryItem
+from app.domain.marketplace import (
+    Listing,
+    ListingQuantityUpdate,
+    ListingUpdateFailure,
+    MarketplaceConfig,
+    MarketplacePolicy,
+)
+
+
+class RecordingMarketplacePort:
+    """Fake MarketplacePort that records listing fetches and update calls."""
+
+    def __init__(
+        self,
+        listings: list[Listing],
+        failures: list[ListingUpdateFailure] | None = None,
+        error: Exception | None = None,
+    ) -> None:
+        self.listings = listings
+        self.failures = failures or []
+        self.error = error
+        self.fetches = 0
+        self.update_calls: list[list[ListingQuantityUpdate]] = []
+
+    async def fetch_listings(self) -> list[Listing]:
+        return self.listings
+
+    async def iter_listings(self) -> AsyncIterator[list[Listing]]:
+        self.fetches += 1
+        yield self.listings
+
+    async def update_inventory(
+        self, updates: Iterable[ListingQuantityUpdate]
+    ) -> list[ListingUpdateFailure]:
+        self.update_calls.append(list(updates))
+        if self.error is not None:
+            raise self.error
+        return self.failures
+
+
+class SinglePortFactory:
+    def __init__(self, port: RecordingMarketplacePort) -> None:
+        self.port = port
+
+    def build(self, config: MarketplaceConfig) -> RecordingMarketplacePort:
+        return self.port
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def _catalog() -> list[Listing]:
+    return [
+        Listing(sku="SKU-A1", condition_id="A", marketplace_qty=5),
+        Listing(sku="SKU-A2", condition_id="A", marketplace_qty=5),
+        Listing(sku="SKU-B1", condition_id="B", marketplace_qty=3),
+        Listing(sku="SKU-C1", condition_id="C", marketplace_qty=0),
+    ]
+
+
+def _make_service(
+    port: RecordingMarketplacePort,
+    store: InventoryBaselineStore,
+) -> DeltaSyncService:
+    config = MarketplaceConfig(
+        marketplace="ebay",
+        account="acc-1",
+        refresh_token="token",
+        limit_qty_for_marketplace=50,
+    )
+    return DeltaSyncService(
+        marketplace_factory=SinglePortFactory(port),
+        config=config,
+        policy=MarketplacePolicy(config=config),
+        baselines=store,
+    )
+
+
+def _change(condition_id: str, quantity: int) -> InventoryItem:
+    return InventoryItem.create(condition_id=condition_id, quantity=quantity)
+
+
+class TestDeltaSyncService:
+    @staticmethod
+    @pytest.mark.asyncio
+    async def test_only_listings_of_changed_condition_ids_are_updated() -> None:
+        port = RecordingMarketplacePort(_catalog())
+        service = _make_service(port, InventoryBaselineStore())
+
+        result = await service.run([_change("A", 8)])
+
+        assert [(u.sku, u.qty) for u in result.updates] == [
+            ("SKU-A1", 8),
+            ("SKU-A2", 8),
+        ]
+        assert port.update_calls == [result.updates]
+
+    @staticmethod
+    @pytest.mark.asyncio
+    async def test_index_is_reused_and_written_through_between_deltas() -> None:
+        port = RecordingMarketplacePort(_catalog())
+        service = _make_service(port, InventoryBaselineStore())
+
+        await service.run([_change("B", 7)])
+        second = await service.run([_change("B", 7)])
+
+        assert port.fetches == 1
+        assert second.updates == []
+
+    @staticmethod
+    @pytest.mark.asyncio
+    async def test_rejected_updates_are_retried_on_next_delta() -> None:
+        port = RecordingMarketplacePort(
+            _catalog(),
+            failures=[ListingUpdateFailure(sku="SKU-B1", reason="rejected")],
+        )
+        service = _make_service(port, InventoryBaselineStore())
+
+        await service.run([_change("B", 7)])
+        port.failures = []
+        second = await service.run([_change("B", 7)])
+
+        assert [u.sku for u in second.updates] == ["SKU-B1"]
+
+    @staticmethod
+    @pytest.mark.asyncio
+    async def test_failed_update_call_leaves_baseline_for_a_retry() -> None:
+        port = RecordingMarketplacePort(_catalog(), error=RuntimeError("down"))
+        store = InventoryBaselineStore()
+        service = _make_service(port, store)
+
+        with pytest.raises(RuntimeError):
+            await service.run([_change("B", 7)])
+
+        assert store.get(("ebay", "acc-1")).listings_by_condition is None
+
+        port.error = None
+        retried = await service.run([_change("B", 7)])
+
+        assert [u.sku for u in retried.updates] == ["SKU-B1"]
+        assert port.fetches == 2
+
+    @staticmethod
+    @pytest.mark.asyncio
+    async def test_duplicate_condition_ids_in_a_delta_are_summed() -> None:
+        port = RecordingMarketplacePort(_catalog())
+        store = InventoryBaselineStore()
+        service = _make_service(port, store)
+
+        result = await service.run([_change("B", 4), _change("B", 3)])
+
+        assert [(u.sku, u.qty) for u in result.updates] == [("SKU-B1", 7)]
+
+    @staticmethod
+    @pytest.mark.asyncio
+    async def test_accounts_over_index_limit_are_not_indexed() -> None:
+        port = RecordingMarketplacePort(_catalog())
+        store = InventoryBaselineStore(max_index_listings=3)
+        service = _make_service(port, store)
+
+        first = await service.run([_change("B", 7)])
+        await service.run([_change("C", 1)])
+
+        assert [u.sku for u in first.updates] == ["SKU-B1"]
+        assert store.get(("ebay", "acc-1")).listings_by_condition is None
+        assert port.fetches == 2
+
+    @staticmethod
+    @pytest.mark.asyncio
+    async def test_over_limit_index_keeps_only_staged_condition_ids() -> None:
+        port = RecordingMarketplacePort(_catalog())
+        service = _make_service(port, InventoryBaselineStore(max_index_listings=3))
+
+        index, complete = await service._build_index(port, {"A": 8})
+
+        assert complete is False
+        assert list(index) == ["A"]
+        assert [x.sku for x in index["A"]] == ["SKU-A1", "SKU-A2"]
+
+    @staticmethod
+    @pytest.mark.asyncio
+    async def test_stale_index_is_rebuilt() -> None:
+        clock = FakeClock()
+        port = RecordingMarketplacePort(_catalog())
+        service = _make_service(
+            port, InventoryBaselineStore(index_ttl_s=60, clock=clock)
+        )
+
+        await service.run([_change("C", 1)])
+        clock.now = 60
+        await service.run([_change("C", 2)])
+
+        assert port.fetches == 2
+
+
+class TestInventoryBaselineStore:
+    @staticmethod
+    def test_least_recently_used_account_is_dropped() -> None:
+        store = InventoryBaselineStore(max_accounts=2)
+        first = store.get(("ebay", "a"))
+        store.get(("ebay", "b"))
+        store.get(("ebay", "a"))
+        store.get(("ebay", "c"))
+
+        assert store.get(("ebay", "a")) is first
+        assert store.get(("ebay", "b")).listings_by_condition is None
+
+    @staticmethod
+    @pytest.mark.asyncio
+    async def test_locked_baseline_is_not_dropped() -> None:
+        store = InventoryBaselineStore(max_accounts=1)
+        held = store.get(("ebay", "a"))
+
+        async with held.lock:
+            store.get(("ebay", "b"))
+            assert store.get(("ebay", "a")) is held
+
+        store.get(("ebay", "c"))
+        assert store.get(("ebay", "a")) is not held
+
+    @staticmethod
+    def test_invalidate_index_drops_listings_index() -> None:
+        store = InventoryBaselineStore()
+        baseline = store.get(("ebay", "a"))
+        baseline.listings_by_condition = {}
+
+        store.invalidate_index(("ebay", "a"))
+        store.invalidate_index(("ebay", "b"))
+
+        assert baseline.listings_by_condition is None
+        assert len(store._baselines) == 1
@@ -0,0 +1,119 @@
+import asyncio
+
+import pytest
+
+from app.application.service.fan_out import FanOutSyncService
+from app.domain.inventory import InventorySnapshot, InventorySnapshotBuilder
+from app.domain.marketplace import ListingQuantityUpdate, MarketplaceConfig, SyncResult
+
+
+class FakeTargetService:
+    """Stands in for SyncInventoryService; records concurrency per run."""
+
+    def __init__(
+        self,
+        marketplace: str,
+        account: str,
+        tracker: dict[str, int],
+        delay: float = 0.02,
+        error: Exception | None = None,
+    ) -> None:
+        self.config = MarketplaceConfig(
+            marketplace=marketplace, account=account, refresh_token="token"
+        )
+        self.tracker = tracker
+        self.delay = delay
+        self.error = error
+        self.seen_inventory: InventorySnapshot | None = None
+
+    async def run(self, inventory: InventorySnapshot) -> SyncResult:
+        self.seen_inventory = inventory
+        t = self.tracker
+        t["running"] += 1
+        t[self.config.marketplace] = t.get(self.config.marketplace, 0) + 1
+        t["peak"] = max(t["peak"], t["running"])
+        key = f"peak:{self.config.marketplace}"
+        t[key] = max(t.get(key, 0), t[self.config.marketplace])
+        try:
+            await asyncio.sleep(self.delay)
+        finally:
+            t["running"] -= 1
+            t[self.config.marketplace] -= 1
+
+        if self.error is not None:
+            raise self.error
+        return SyncResult(
+            updates=[ListingQuantityUpdate(sku=self.config.account, qty=1)]
+        )
+
+
+def _inventory() -> InventorySnapshot:
+    builder = InventorySnapshotBuilder()
+    builder.add("NEW", 5)
+    return builder.build()
+
+
+def _tracker() -> dict[str, int]:
+    return {"running": 0, "peak": 0}
+
+
+class TestFanOutSyncService:
+    @staticmethod
+    @pytest.mark.asyncio
+    async def test_targets_share_snapshot_and_keep_order() -> None:
+        tracker = _tracker()
+        targets = [
+            FakeTargetService("ebay", "a", tracker, delay=0.03),
+            FakeTargetService("amazon", "b", tracker, delay=0.01),
+        ]
+        inventory = _inventory()
+
+        outcomes = await FanOutSyncService(targets=targets).run(inventory)
+
+        assert [o.config.account for o in outcomes] == ["a", "b"]
+        assert [o.result.updates[0].sku for o in outcomes] == ["a", "b"]
+        assert all(t.seen_inventory is inventory for t in targets)
+        assert tracker["peak"] == 2
+
+    @staticmethod
+    @pytest.mark.asyncio
+    async def test_failing_target_does_not_affect_others() -> None:
+        tracker = _tracker()
+        targets = [
+            FakeTargetService("ebay", "a", tracker, error=ValueError("bad token")),
+            FakeTargetService("ebay", "b", tracker),
+        ]
+
+        outcomes = await FanOutSyncService(targets=targets).run(_inventory())
+
+        assert outcomes[0].result is None
+        assert outcomes[0].error == "ValueError: bad token"
+        assert outcomes[1].error is None
+        assert outcomes[1].result is not None
+
+    @staticmethod
+    @pytest.mark.asyncio
+    async def test_global_and_per_marketplace_caps_are_respected() -> None:
+        tracker = _tracker()
+        targets = [
+            FakeTargetService(marketplace, f"{marketplace}-{i}", tracker)
+            for marketplace in ("ebay", "amazon")
+            for i in range(4)
+        ]
+        service = FanOutSyncService(
+            targets=targets, max_concurrency=3, marketplace_concurrency=2
+        )
+
+        await service.run(_inventory())
+
+        assert tracker["peak"] == 3
+        assert tracker["peak:ebay"] <= 2
+        assert tracker["peak:amazon"] <= 2
+
+    @staticmethod
+    def test_invalid_limits_are_rejected() -> None:
+        with pytest.raises(ValueError):
+            FanOutSyncService(targets=[], max_concurrency=0)
+
+        with pytest.raises(ValueError):
+            FanOutSyncService(targets=[], marketplace_concurrency=0)
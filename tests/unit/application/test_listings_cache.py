@@ -0,0 +1,264 @@
+from __future__ import annotations
+
+import asyncio
+from collections.abc import AsyncIterator, Iterable
+
+import pytest
+
+from app.application.service.listings_cache import (
+    CachingMarketplacePort,
+    CachingMarketplacePortFactory,
+    ListingsCache,
+)
+from app.application.service.sync_inventory import SyncInventoryService
+from app.domain.inventory import InventorySnapshotBuilder
+from app.domain.marketplace import (
+    Listing,
+    ListingQuantityUpdate,
+    ListingUpdateFailure,
+    MarketplaceConfig,
+    MarketplacePolicy,
+)
+
+
+class CountingMarketplacePort:
+    """Fake MarketplacePort that counts listing fetches."""
+
+    def __init__(
+        self,
+        listings: list[Listing],
+        failures: list[ListingUpdateFailure] | None = None,
+        error: Exception | None = None,
+    ) -> None:
+        self.listings = listings
+        self.failures = failures or []
+        self.error = error
+        self.fetches = 0
+
+    async def fetch_listings(self) -> list[Listing]:
+        return [x async for page in self.iter_listings() for x in page]
+
+    async def iter_listings(self) -> AsyncIterator[list[Listing]]:
+        self.fetches += 1
+        for start in range(0, len(self.listings), 2):
+            yield self.listings[start : start + 2]
+
+    async def update_inventory(
+        self, updates: Iterable[ListingQuantityUpdate]
+    ) -> list[ListingUpdateFailure]:
+        list(updates)
+        if self.error is not None:
+            raise self.error
+        return self.failures
+
+
+class StaticPortFactory:
+    def __init__(self, port: CountingMarketplacePort) -> None:
+        self.port = port
+
+    def build(self, config: MarketplaceConfig) -> CountingMarketplacePort:
+        return self.port
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def _listings(n: int, qty: int = 1) -> list[Listing]:
+    return [
+        Listing(sku=f"SKU-{i}", condition_id="NEW", marketplace_qty=qty)
+        for i in range(n)
+    ]
+
+
+def _port(
+    inner: CountingMarketplacePort,
+    cache: ListingsCache,
+    bypass: bool = False,
+) -> CachingMarketplacePort:
+    return CachingMarketplacePort(
+        inner=inner, cache=cache, key=("ebay", "acc-1"), bypass=bypass
+    )
+
+
+class TestListingsCache:
+    @staticmethod
+    def test_entry_expires_after_ttl() -> None:
+        clock = FakeClock()
+        cache = ListingsCache(ttl_s=10, clock=clock)
+        cache.put(("ebay", "acc"), _listings(2))
+
+        clock.now = 9.9
+        assert cache.get(("ebay", "acc")) is not None
+
+        clock.now = 10
+        assert cache.get(("ebay", "acc")) is None
+        assert cache.size == 0
+
+    @staticmethod
+    def test_least_recently_used_accounts_are_evicted_over_limit() -> None:
+        cache = ListingsCache(max_listings=5)
+        cache.put(("ebay", "a"), _listings(2))
+        cache.put(("ebay", "b"), _listings(2))
+        cache.get(("ebay", "a"))
+        cache.put(("ebay", "c"), _listings(2))
+
+        assert cache.get(("ebay", "b")) is None
+        assert cache.get(("ebay", "a")) is not None
+        assert cache.get(("ebay", "c")) is not None
+        assert cache.size == 4
+
+    @staticmethod
+    def test_snapshot_larger_than_limit_is_not_cached() -> None:
+        cache = ListingsCache(max_listings=3)
+
+        assert cache.put(("ebay", "a"), _listings(4)) is False
+        assert cache.get(("ebay", "a")) is None
+
+    @staticmethod
+    def test_invalidate_drops_only_that_account() -> None:
+        cache = ListingsCache()
+        cache.put(("ebay", "a"), _listings(1))
+        cache.put(("amazon", "a"), _listings(1))
+
+        assert cache.invalidate("ebay", "a") is True
+        assert cache.invalidate("ebay", "a") is False
+        assert cache.get(("amazon", "a")) is not None
+
+    @staticmethod
+    @pytest.mark.parametrize("kwargs", [{"ttl_s": 0}, {"max_listings": 0}])
+    def test_invalid_settings_raise(kwargs: dict) -> None:
+        with pytest.raises(ValueError):
+            ListingsCache(**kwargs)
+
+
+class TestCachingMarketplacePort:
+    @staticmethod
+    @pytest.mark.asyncio
+    async def test_second_fetch_is_served_from_cache() -> None:
+        inner = CountingMarketplacePort(_listings(5))
+        cache = ListingsCache()
+
+        first = await _port(inner, cache).fetch_listings()
+        second = await _port(inner, cache).fetch_listings()
+
+        assert first == second
+        assert inner.fetches == 1
+
+    @staticmethod
+    @pytest.mark.asyncio
+    async def test_bypass_refetches_and_refreshes_cache() -> None:
+        inner = CountingMarketplacePort(_listings(3))
+        cache = ListingsCache()
+        await _port(inner, cache).fetch_listings()
+
+        inner.listings = _listings(3, qty=9)
+        refreshed = await _port(inner, cache, bypass=True).fetch_listings()
+        cached = await _port(inner, cache).fetch_listings()
+
+        assert inner.fetches == 2
+        assert {x.marketplace_qty for x in refreshed} == {9}
+        assert cached == refreshed
+
+    @staticmethod
+    @pytest.mark.asyncio
+    async def test_accepted_updates_are_written_through() -> None:
+        inner = CountingMarketplacePort(
+            _listings(3),
+            failures=[ListingUpdateFailure(sku="SKU-2", reason="rejected")],
+        )
+        cache = ListingsCache()
+        port = _port(inner, cache)
+        await port.fetch_listings()
+
+        await port.update_inventory(
+            [
+                ListingQuantityUpdate(sku="SKU-0", qty=7),
+                ListingQuantityUpdate(sku="SKU-2", qty=8),
+                ListingQuantityUpdate(sku="SKU-9", qty=9),
+            ]
+        )
+
+        listings = await _port(inner, cache).fetch_listings()
+
+        assert [x.marketplace_qty for x in listings] == [7, 1, 1]
+        assert inner.fetches == 1
+
+    @staticmethod
+    @pytest.mark.asyncio
+    async def test_updates_sent_during_a_miss_reach_the_stored_snapshot() -> None:
+        class SlowPagesPort(CountingMarketplacePort):
+            async def iter_listings(self) -> AsyncIterator[list[Listing]]:
+                self.fetches += 1
+                for listing in self.listings:
+                    # let the pipeline send updates between pages
+                    await asyncio.sleep(0)
+                    yield [listing]
+
+        inner = SlowPagesPort(_listings(10, qty=5))
+        cache = ListingsCache()
+        config = MarketplaceConfig(
+            marketplace="ebay",
+            account="acc-1",
+            refresh_token="t",
+            limit_qty_for_sync_in_marketplace=100,
+            limit_qty_for_sync_in_warehouse=100,
+            limit_qty_for_marketplace=50,
+        )
+        builder = InventorySnapshotBuilder()
+        builder.add("NEW", 3)
+        inventory = builder.build()
+        service = SyncInventoryService(
+            marketplace_factory=CachingMarketplacePortFactory(
+                inner=StaticPortFactory(inner), cache=cache
+            ),
+            config=config,
+            policy=MarketplacePolicy(config=config),
+            update_batch_size=1,
+            pipeline_pages=1,
+        )
+
+        first = await service.run(inventory)
+        second = await service.run(inventory)
+
+        assert len(first.updates) == 10
+        assert [x.marketplace_qty for x in cache.get(("ebay", "acc-1"))] == [3] * 10
+        assert second.updates == []
+        assert inner.fetches == 1
+
+    @staticmethod
+    @pytest.mark.asyncio
+    async def test_failed_update_call_invalidates_cache() -> None:
+        inner = CountingMarketplacePort(_listings(2), error=RuntimeError("down"))
+        cache = ListingsCache()
+        port = _port(inner, cache)
+        await port.fetch_listings()
+
+        with pytest.raises(RuntimeError):
+            await port.update_inventory([ListingQuantityUpdate(sku="SKU-0", qty=3)])
+
+        assert cache.get(("ebay", "acc-1")) is None
+
+    @staticmethod
+    @pytest.mark.asyncio
+    async def test_factory_keys_cache_by_marketplace_and_account() -> None:
+        inner = CountingMarketplacePort(_listings(2))
+
+        class InnerFactory:
+            def build(self, config: MarketplaceConfig) -> CountingMarketplacePort:
+                return inner
+
+        cache = ListingsCache()
+        factory = CachingMarketplacePortFactory(inner=InnerFactory(), cache=cache)
+
+        for account in ("acc-1", "acc-1", "acc-2"):
+            config = MarketplaceConfig(
+                marketplace="ebay", account=account, refresh_token="t"
+            )
+            await factory.build(config).fetch_listings()
+
+        assert inner.fetches == 2
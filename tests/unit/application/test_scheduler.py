@@ -0,0 +1,212 @@
+import asyncio
+import random
+import time
+
+import pytest
+
+from app.application.service.scheduler import (
+    ScheduleState,
+    SyncPriority,
+    SyncSchedule,
+    SyncScheduler,
+)
+from app.domain.marketplace import SyncResult
+
+
+class RecordingSyncs:
+    """Scheduled syncs that record their runs, optionally waiting for `release`."""
+
+    def __init__(self, gated: bool = False) -> None:
+        self.ran: list[str] = []
+        self.running = 0
+        self.peak = 0
+        self.release = asyncio.Event()
+        if not gated:
+            self.release.set()
+
+    def schedule(
+        self,
+        account: str,
+        interval_s: float = 60.0,
+        priority: SyncPriority = SyncPriority.NORMAL,
+        error: Exception | None = None,
+    ) -> SyncSchedule:
+        async def sync() -> SyncResult:
+            self.ran.append(account)
+            self.running += 1
+            self.peak = max(self.peak, self.running)
+            try:
+                await self.release.wait()
+            finally:
+                self.running -= 1
+            if error is not None:
+                raise error
+            return SyncResult()
+
+        return SyncSchedule(
+            marketplace="ebay",
+            account=account,
+            interval_s=interval_s,
+            sync=sync,
+            priority=priority,
+        )
+
+
+async def _until(condition, timeout: float = 1.0) -> None:
+    async with asyncio.timeout(timeout):
+        while not condition():
+            await asyncio.sleep(0.001)
+
+
+class TestSyncScheduler:
+    @staticmethod
+    def test_first_runs_are_spread_over_the_interval() -> None:
+        scheduler = SyncScheduler(rng=random.Random(0))
+        syncs = RecordingSyncs()
+        for i in range(20):
+            scheduler.register(syncs.schedule(f"acc-{i}", interval_s=100.0))
+
+        next_runs = [s.next_run_in_s for s in scheduler.stats()]
+
+        assert all(r is not None and 0 <= r <= 100 for r in next_runs)
+        assert len({round(r or 0) for r in next_runs}) > 10
+
+    @staticmethod
+    @pytest.mark.asyncio
+    async def test_runs_schedules_on_their_interval() -> None:
+        def clock() -> float:
+            return time.monotonic() + 1000.0
+
+        scheduler = SyncScheduler(jitter=0.0, clock=clock)
+        syncs = RecordingSyncs()
+        scheduler.register(syncs.schedule("acc-1", interval_s=0.02))
+
+        await scheduler.start()
+        try:
+            await _until(lambda: len(syncs.ran) >= 3)
+        finally:
+            await scheduler.stop()
+
+        (stats,) = scheduler.stats()
+        assert stats.runs >= 3
+        assert stats.failures == 0
+        assert stats.last_duration_s is not None
+        assert stats.last_finished_at is not None
+        assert 1000.0 < stats.last_finished_at <= clock()
+
+    @staticmethod
+    @pytest.mark.asyncio
+    async def test_due_schedules_start_by_priority() -> None:
+        scheduler = SyncScheduler(max_concurrency=1)
+        syncs = RecordingSyncs(gated=True)
+        for account, priority in [
+            ("busy", SyncPriority.NORMAL),
+            ("small", SyncPriority.LOW),
+            ("normal", SyncPriority.NORMAL),
+            ("big", SyncPriority.HIGH),
+        ]:
+            scheduler.register(syncs.schedule(account, priority=priority))
+
+        await scheduler.start()
+        try:
+            scheduler.trigger(("ebay", "busy"))
+            await _until(lambda: syncs.ran == ["busy"])
+            for account in ("small", "normal", "big"):
+                scheduler.trigger(("ebay", account))
+            await asyncio.sleep(0.01)
+            syncs.release.set()
+            await _until(lambda: len(syncs.ran) == 4)
+        finally:
+            await scheduler.stop()
+
+        assert syncs.ran == ["busy", "big", "normal", "small"]
+
+    @staticmethod
+    @pytest.mark.asyncio
+    async def test_caps_concurrent_syncs() -> None:
+        scheduler = SyncScheduler(max_concurrency=2)
+        syncs = RecordingSyncs(gated=True)
+        for i in range(5):
+            scheduler.register(syncs.schedule(f"acc-{i}"))
+
+        await scheduler.start()
+        try:
+            for i in range(5):
+                scheduler.trigger(("ebay", f"acc-{i}"))
+            await _until(lambda: syncs.running == 2)
+            await asyncio.sleep(0.01)
+
+            states = [s.state for s in scheduler.stats()]
+            assert states.count(ScheduleState.RUNNING) == 2
+            assert states.count(ScheduleState.QUEUED) == 3
+
+            syncs.release.set()
+            await _until(lambda: len(syncs.ran) == 5)
+        finally:
+            await scheduler.stop()
+
+        assert syncs.peak == 2
+
+    @staticmethod
+    @pytest.mark.asyncio
+    async def test_paused_schedule_only_runs_when_triggered() -> None:
+        scheduler = SyncScheduler(jitter=0.0)
+        syncs = RecordingSyncs()
+        scheduler.register(syncs.schedule("acc-1", interval_s=0.01))
+
+        paused = scheduler.pause(("ebay", "acc-1"))
+        assert paused.paused
+        assert paused.next_run_in_s is None
+
+        await scheduler.start()
+        try:
+            await asyncio.sleep(0.05)
+            assert syncs.ran == []
+
+            scheduler.trigger(("ebay", "acc-1"))
+            await _until(lambda: scheduler.stats()[0].runs == 1)
+            await asyncio.sleep(0.05)
+            assert syncs.ran == ["acc-1"]
+
+            resumed = scheduler.resume(("ebay", "acc-1"))
+            assert resumed.next_run_in_s is not None
+            await _until(lambda: len(syncs.ran) >= 2)
+        finally:
+            await scheduler.stop()
+
+    @staticmethod
+    @pytest.mark.asyncio
+    async def test_failed_sync_is_recorded_and_rescheduled() -> None:
+        scheduler = SyncScheduler(jitter=0.0)
+        syncs = RecordingSyncs()
+        scheduler.register(
+            syncs.schedule("acc-1", interval_s=0.01, error=ConnectionError("down"))
+        )
+
+        await scheduler.start()
+        try:
+            await _until(lambda: scheduler.stats()[0].failures >= 2)
+        finally:
+            await scheduler.stop()
+
+        (stats,) = scheduler.stats()
+        assert stats.last_error == "ConnectionError: down"
+
+    @staticmethod
+    def test_rejects_duplicate_schedules_and_unknown_keys() -> None:
+        scheduler = SyncScheduler()
+        syncs = RecordingSyncs()
+        scheduler.register(syncs.schedule("acc-1"))
+
+        with pytest.raises(ValueError):
+            scheduler.register(syncs.schedule("acc-1"))
+        with pytest.raises(KeyError):
+            scheduler.trigger(("ebay", "acc-2"))
+
+    @staticmethod
+    @pytest.mark.parametrize(
+        "kwargs", [{"max_concurrency": 0}, {"jitter": -0.1}, {"jitter": 1.0}]
+    )
+    def test_rejects_invalid_settings(kwargs) -> None:
+        with pytest.raises(ValueError):
+            SyncScheduler(**kwargs)
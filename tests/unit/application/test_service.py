@@ -1,32 +1,93 @@
 from __future__ import annotations
 
-from collections.abc import Iterable
+import asyncio
+from collections.abc import AsyncIterator, Iterable, Sequence
 
 import pytest
 
 from app.application.ports.marketplaces import MarketplacePort
+from app.application.ports.metrics import SyncPhase
+from app.application.ports.tracing import Span
 from app.application.service.sync_inventory import SyncInventoryService
+from app.application.service.tracing import Tracer
 from app.domain.inventory import InventoryItem, InventoryKey, InventorySnapshot
 from app.domain.marketplace import (
     Listing,
+    ListingBatch,
     ListingQuantityUpdate,
+    ListingUpdateFailure,
     MarketplaceConfig,
     MarketplacePolicy,
+    SkipReason,
 )
 
 
 class FakeMarketplacePort(MarketplacePort):
     """In-memory fake implementation of MarketplacePort for testing."""
 
-    def __init__(self, listings: list[Listing]) -> None:
+    def __init__(
+        self,
+        listings: list[Listing],
+        failures: list[ListingUpdateFailure] | None = None,
+    ) -> None:
         self._listings = listings
+        self._failures = failures or []
         self.updates: list[ListingQuantityUpdate] = []
 
     async def fetch_listings(self) -> list[Listing]:
         return self._listings
 
-    async def update_inventory(self, updates: Iterable[ListingQuantityUpdate]) -> None:
+    async def iter_listings(self) -> AsyncIterator[list[Listing]]:
+        if self._listings:
+            yield self._listings
+
+    async def update_inventory(
+        self, updates: Iterable[ListingQuantityUpdate]
+    ) -> list[ListingUpdateFailure]:
         self.updates.extend(list(updates))
+        return self._failures
+
+
+class PagedFakeMarketplacePort(FakeMarketplacePort):
+    """Fake MarketplacePort that serves listings in several pages."""
+
+    def __init__(self, pages: list[Sequence[Listing]]) -> None:
+        super().__init__(listings=[x for page in pages for x in page])
+        self._pages = pages
+
+    async def iter_listings(self) -> AsyncIterator[Sequence[Listing]]:
+        for page in self._pages:
+            yield page
+
+
+class GatedMarketplacePort(FakeMarketplacePort):
+    """
+    Fake MarketplacePort serving one-listing pages, whose updates wait for
+    `release` and whose page fetch after `stall_after` pages waits for an
+    update to be sent.
+    """
+
+    def __init__(self, pages: int, stall_after: int | None = None) -> None:
+        super().__init__(listings=[])
+        self.pages = pages
+        self.stall_after = stall_after
+        self.fetched = 0
+        self.release = asyncio.Event()
+        self.updated = asyncio.Event()
+
+    async def iter_listings(self) -> AsyncIterator[list[Listing]]:
+        for i in range(self.pages):
+            if i == self.stall_after:
+                await self.updated.wait()
+            self.fetched += 1
+            yield [Listing(sku=f"SKU-{i}", condition_id="NEW", marketplace_qty=1)]
+
+    async def update_inventory(
+        self, updates: Iterable[ListingQuantityUpdate]
+    ) -> list[ListingUpdateFailure]:
+        self.updated.set()
+        await self.release.wait()
+        return await super().update_inventory(updates)
 
 
 class FakeMarketplacePortFactory:
@@ -43,6 +104,31 @@ class FakeMarketplacePortFactory:
         return self._port
 
 
+class RecordingMetrics:
+    """SyncMetrics fake that keeps every call."""
+
+    def __init__(self) -> None:
+        self.phases: list[tuple[str, SyncPhase, int]] = []
+        self.updates: list[tuple[str, int, int]] = []
+
+    def observe_phase(
+        self, marketplace: str, phase: SyncPhase, seconds: float, rows: int
+    ) -> None:
+        assert seconds >= 0
+        self.phases.append((marketplace, phase, rows))
+
+    def count_updates(self, marketplace: str, sent: int, failed: int) -> None:
+        self.updates.append((marketplace, sent, failed))
+
+
+class RecordingExporter:
+    def __init__(self) -> None:
+        self.traces: list[list[Span]] = []
+
+    def export(self, spans: Sequence[Span]) -> None:
+        self.traces.append(list(spans))
+
+
 class TestSyncInventoryService:
     @staticmethod
     def _make_config() -> MarketplaceConfig:
@@ -186,3 +272,462 @@ class TestSyncInventoryService:
         assert port.updates == updates
         assert factory.build_calls == 1
         assert factory.last_config == config
+
+    @pytest.mark.asyncio
+    async def test_listings_from_all_pages_are_evaluated(self) -> None:
+        inventory = self._make_inventory_for_condition_id("NEW", 20)
+
+        pages = [
+            [Listing(sku="SKU-1", condition_id="NEW", marketplace_qty=5)],
+            [Listing(sku="SKU-2", condition_id="NEW", marketplace_qty=20)],
+            [Listing(sku="SKU-3", condition_id="NEW", marketplace_qty=1)],
+        ]
+
+        config = self._make_config()
+        policy = self._make_policy(config)
+
+        port = PagedFakeMarketplacePort(pages=pages)
+        factory = FakeMarketplacePortFactory(port=port)
+
+        service = SyncInventoryService(
+            policy=policy,
+            config=config,
+            marketplace_factory=factory,
+        )
+
+        updates = await service.sync(inventory)
+
+        assert [u.sku for u in updates] == ["SKU-1", "SKU-3"]
+        assert port.updates == updates
+
+    @pytest.mark.asyncio
+    async def test_listing_batch_pages_are_evaluated(self) -> None:
+        inventory = self._make_inventory_for_condition_id("NEW", 20)
+
+        batch = ListingBatch.from_columns(
+            skus=["SKU-1", "SKU-2", "SKU-3"],
+            condition_ids=["NEW", "NEW", "USED"],
+            marketplace_qtys=[5, 20, 4],
+            listing_ids=["L-1", "L-2", None],
+        )
+
+        config = self._make_config()
+        port = PagedFakeMarketplacePort(pages=[batch])
+        service = SyncInventoryService(
+            policy=self._make_policy(config),
+            config=config,
+            marketplace_factory=FakeMarketplacePortFactory(port=port),
+        )
+
+        updates = await service.sync(inventory)
+
+        assert updates == [
+            ListingQuantityUpdate(sku="SKU-1", listing_id="L-1", qty=20),
+            ListingQuantityUpdate(sku="SKU-3", listing_id=None, qty=0),
+        ]
+
+    @pytest.mark.asyncio
+    async def test_run_surfaces_marketplace_failures(self) -> None:
+        inventory = self._make_inventory_for_condition_id("NEW", 20)
+
+        listings = [
+            Listing(sku="SKU-1", condition_id="NEW", marketplace_qty=5),
+            Listing(sku="SKU-2", condition_id="NEW", marketplace_qty=6),
+        ]
+        failure = ListingUpdateFailure(sku="SKU-2", reason="Invalid SKU")
+
+        config = self._make_config()
+        policy = self._make_policy(config)
+
+        port = FakeMarketplacePort(listings=listings, failures=[failure])
+        factory = FakeMarketplacePortFactory(port=port)
+
+        service = SyncInventoryService(
+            policy=policy,
+            config=config,
+            marketplace_factory=factory,
+        )
+
+        result = await service.run(inventory)
+
+        assert [u.sku for u in result.updates] == ["SKU-1", "SKU-2"]
+        assert result.failures == [failure]
+
+    @pytest.mark.parametrize("batch_evaluation", [False, True])
+    @pytest.mark.asyncio
+    async def test_batch_and_scalar_evaluation_produce_same_updates(
+        self, batch_evaluation: bool
+    ) -> None:
+        items = {
+            InventoryKey(condition_id=cid): InventoryItem.create(
+                condition_id=cid, quantity=qty
+            )
+            for cid, qty in [("A", 0), ("B", 7), ("C", 60), ("D", 150)]
+        }
+        inventory = InventorySnapshot.from_items(items)
+
+        listings = [
+            Listing(sku=f"SKU-{cid}-{mq}", condition_id=cid, marketplace_qty=mq)
+            for cid in ("A", "B", "C", "D", "MISSING")
+            for mq in (0, 7, 50, 100, 101)
+        ]
+
+        config = self._make_config()
+        port = PagedFakeMarketplacePort(pages=[listings[:11], listings[11:]])
+        service = SyncInventoryService(
+            policy=self._make_policy(config),
+            config=config,
+            marketplace_factory=FakeMarketplacePortFactory(port=port),
+            batch_evaluation=batch_evaluation,
+        )
+
+        updates = await service.sync(inventory)
+
+        assert [(u.sku, u.qty) for u in updates] == [
+            ("SKU-A-7", 0),
+            ("SKU-A-50", 0),
+            ("SKU-A-100", 0),
+            ("SKU-B-0", 7),
+            ("SKU-B-50", 7),
+            ("SKU-B-100", 7),
+            ("SKU-C-0", 50),
+            ("SKU-C-7", 50),
+            ("SKU-C-50", 50),
+            ("SKU-C-100", 50),
+            ("SKU-MISSING-7", 0),
+            ("SKU-MISSING-50", 0),
+            ("SKU-MISSING-100", 0),
+        ]
+
+    @pytest.mark.asyncio
+    async def test_records_phase_metrics(self) -> None:
+        inventory = self._make_inventory_for_condition_id("NEW", 20)
+        pages = [
+            [Listing(sku="SKU-1", condition_id="NEW", marketplace_qty=5)],
+            [
+                Listing(sku="SKU-2", condition_id="NEW", marketplace_qty=20),
+                Listing(sku="SKU-3", condition_id="NEW", marketplace_qty=1),
+            ],
+        ]
+        port = PagedFakeMarketplacePort(pages=pages)
+        port._failures = [ListingUpdateFailure(sku="SKU-3", reason="rejected")]
+
+        config = self._make_config()
+        metrics = RecordingMetrics()
+        service = SyncInventoryService(
+            policy=self._make_policy(config),
+            config=config,
+            marketplace_factory=FakeMarketplacePortFactory(port=port),
+            metrics=metrics,
+        )
+
+        await service.run(inventory)
+
+        assert metrics.phases == [
+            ("Ebay", SyncPhase.FETCH_LISTINGS, 3),
+            ("Ebay", SyncPhase.EVALUATE, 3),
+            ("Ebay", SyncPhase.UPDATE_INVENTORY, 2),
+        ]
+        assert metrics.updates == [("Ebay", 2, 1)]
+
+    @pytest.mark.asyncio
+    async def test_run_from_loads_the_warehouse_snapshot(self) -> None:
+        inventory = self._make_inventory_for_condition_id("NEW", 20)
+
+        class Warehouse:
+            async def load_snapshot(self) -> InventorySnapshot:
+                return inventory
+
+        port = FakeMarketplacePort(
+            listings=[Listing(sku="SKU-1", condition_id="NEW", marketplace_qty=5)]
+        )
+        config = self._make_config()
+        metrics = RecordingMetrics()
+        service = SyncInventoryService(
+            policy=self._make_policy(config),
+            config=config,
+            marketplace_factory=FakeMarketplacePortFactory(port=port),
+            metrics=metrics,
+        )
+
+        result = await service.run_from(Warehouse())
+
+        assert [(u.sku, u.qty) for u in result.updates] == [("SKU-1", 20)]
+        assert metrics.phases[0] == ("Ebay", SyncPhase.SNAPSHOT_BUILD, 1)
+
+    @pytest.mark.asyncio
+    async def test_traces_pages_evaluation_and_update(self) -> None:
+        inventory = self._make_inventory_for_condition_id("NEW", 20)
+        pages = [
+            [Listing(sku="SKU-1", condition_id="NEW", marketplace_qty=5)],
+            [Listing(sku="SKU-2", condition_id="NEW", marketplace_qty=20)],
+        ]
+        config = self._make_config()
+        service = SyncInventoryService(
+            policy=self._make_policy(config),
+            config=config,
+            marketplace_factory=FakeMarketplacePortFactory(
+                port=PagedFakeMarketplacePort(pages=pages)
+            ),
+        )
+        exporter = RecordingExporter()
+        tracer = Tracer(exporters=[exporter], sample_rate=1.0)
+
+        with tracer.trace("request"):
+            await service.run(inventory)
+
+        (spans,) = exporter.traces
+        assert [(s.name, s.attributes) for s in spans[1:]] == [
+            ("fetch_page", {"page": 1, "rows": 1}),
+            ("evaluate", {"page": 1, "rows": 1, "updates": 1}),
+            ("fetch_page", {"page": 2, "rows": 1}),
+            ("evaluate", {"page": 2, "rows": 1, "updates": 0}),
+            ("update_inventory", {"updates": 1, "failures": 0}),
+            (
+                "sync_inventory",
+                {"marketplace": "Ebay", "account": "Test_Acc", "inventory_rows": 1},
+            ),
+        ]
+
+    @pytest.mark.parametrize("batch_evaluation", [False, True])
+    @pytest.mark.asyncio
+    async def test_run_counts_evaluated_and_skipped_listings(
+        self, batch_evaluation: bool
+    ) -> None:
+        inventory = self._make_inventory_for_condition_id("NEW", 20)
+        listings = [
+            Listing(sku="SKU-1", condition_id="NEW", marketplace_qty=20),
+            Listing(sku="SKU-2", condition_id="NEW", marketplace_qty=200),
+            Listing(sku="SKU-3", condition_id="NEW", marketplace_qty=5),
+            Listing(sku="SKU-4", condition_id="NEW", marketplace_qty=20),
+        ]
+        config = self._make_config()
+        service = SyncInventoryService(
+            policy=self._make_policy(config),
+            config=config,
+            marketplace_factory=FakeMarketplacePortFactory(
+                port=FakeMarketplacePort(listings=listings)
+            ),
+            batch_evaluation=batch_evaluation,
+        )
+
+        result = await service.run(inventory)
+
+        assert result.evaluated == 4
+        assert result.skipped == {
+            SkipReason.UNCHANGED: 2,
+            SkipReason.MARKETPLACE_OVER_LIMIT: 1,
+        }
+        assert [u.sku for u in result.updates] == ["SKU-3"]
+
+    @pytest.mark.asyncio
+    async def test_update_batches_are_sent_while_pages_are_evaluated(self) -> None:
+        inventory = self._make_inventory_for_condition_id("NEW", 20)
+        pages = [
+            [
+                Listing(sku=f"SKU-{p}-{i}", condition_id="NEW", marketplace_qty=1)
+                for i in range(3)
+            ]
+            for p in range(3)
+        ]
+        port = PagedFakeMarketplacePort(pages=pages)
+        port._failures = [ListingUpdateFailure(sku="SKU-0-0", reason="rejected")]
+
+        config = self._make_config()
+        metrics = RecordingMetrics()
+        service = SyncInventoryService(
+            policy=self._make_policy(config),
+            config=config,
+            marketplace_factory=FakeMarketplacePortFactory(port=port),
+            metrics=metrics,
+        )
+        batches: list[tuple[list[str], int, int]] = []
+
+        async def on_batch(
+            updates: Sequence[ListingQuantityUpdate],
+            failures: Sequence[ListingUpdateFailure],
+        ) -> None:
+            # updates evaluated so far, to show batches go out mid-sync
+            batches.append(([u.sku for u in updates], len(port.updates), len(failures)))
+
+        result = await service.run(
+            inventory, on_update_batch=on_batch, update_batch_size=4
+        )
+
+        assert batches == [
+            (["SKU-0-0", "SKU-0-1", "SKU-0-2", "SKU-1-0"], 4, 1),
+            (["SKU-1-1", "SKU-1-2", "SKU-2-0", "SKU-2-1"], 8, 1),
+            (["SKU-2-2"], 9, 1),
+        ]
+        assert result.updates == []
+        assert result.failures == []
+        assert result.evaluated == 9
+        assert metrics.updates == [("Ebay", 9, 3)]
+
+    @pytest.mark.asyncio
+    async def test_rejects_non_positive_update_batch_size(self) -> None:
+        config = self._make_config()
+        service = SyncInventoryService(
+            policy=self._make_policy(config),
+            config=config,
+            marketplace_factory=FakeMarketplacePortFactory(
+                port=FakeMarketplacePort(listings=[])
+            ),
+        )
+
+        with pytest.raises(ValueError):
+            await service.run(InventorySnapshot.from_items({}), update_batch_size=0)
+
+    @pytest.mark.asyncio
+    async def test_sync_returns_updates_of_all_batches_in_order(self) -> None:
+        inventory = self._make_inventory_for_condition_id("NEW", 20)
+        pages = [
+            [
+                Listing(sku=f"SKU-{p}-{i}", condition_id="NEW", marketplace_qty=1)
+                for i in range(3)
+            ]
+            for p in range(4)
+        ]
+        port = PagedFakeMarketplacePort(pages=pages)
+        port._failures = [ListingUpdateFailure(sku="SKU-0-0", reason="rejected")]
+
+        config = self._make_config()
+        service = SyncInventoryService(
+            policy=self._make_policy(config),
+            config=config,
+            marketplace_factory=FakeMarketplacePortFactory(port=port),
+            update_batch_size=5,
+        )
+
+        result = await service.run(inventory)
+
+        assert [u.sku for u in result.updates] == [
+            f"SKU-{p}-{i}" for p in range(4) for i in range(3)
+        ]
+        assert port.updates == result.updates
+        # one failure reported per batch of 5, 5 and 2
+        assert len(result.failures) == 3
+
+    @pytest.mark.asyncio
+    async def test_update_batches_are_sent_before_all_pages_are_fetched(
+        self,
+    ) -> None:
+        # The third page is only served once an update was sent, which
+        # never happens if updates wait for the fetch to finish.
+        port = GatedMarketplacePort(pages=4, stall_after=2)
+        port.release.set()
+
+        config = self._make_config()
+        service = SyncInventoryService(
+            policy=self._make_policy(config),
+            config=config,
+            marketplace_factory=FakeMarketplacePortFactory(port=port),
+            update_batch_size=2,
+        )
+
+        updates = await asyncio.wait_for(
+            service.sync(self._make_inventory_for_condition_id("NEW", 20)), 1
+        )
+
+        assert [u.sku for u in updates] == ["SKU-0", "SKU-1", "SKU-2", "SKU-3"]
+
+    @pytest.mark.asyncio
+    async def test_slow_updates_hold_back_fetching(self) -> None:
+        port = GatedMarketplacePort(pages=1000)
+
+        config = self._make_config()
+        service = SyncInventoryService(
+            policy=self._make_policy(config),
+            config=config,
+            marketplace_factory=FakeMarketplacePortFactory(port=port),
+            update_batch_size=1,
+            pipeline_pages=2,
+            pipeline_batches=1,
+        )
+
+        task = asyncio.create_task(
+            service.sync(self._make_inventory_for_condition_id("NEW", 20))
+        )
+        await asyncio.wait_for(port.updated.wait(), 1)
+        for _ in range(20):
+            await asyncio.sleep(0)
+
+        # queued pages and batches plus one page or batch held by each stage
+        assert port.fetched <= 2 + 1 + 3
+
+        port.release.set()
+        updates = await asyncio.wait_for(task, 1)
+
+        assert len(updates) == 1000
+
+    @pytest.mark.asyncio
+    async def test_fetch_error_stops_the_sync(self) -> None:
+        class FailingPort(GatedMarketplacePort):
+            async def iter_listings(self) -> AsyncIterator[list[Listing]]:
+                yield [Listing(sku="SKU-0", condition_id="NEW", marketplace_qty=1)]
+                raise ConnectionError("listings unavailable")
+
+        # the update of the first page never finishes on its own
+        port = FailingPort(pages=0)
+
+        config = self._make_config()
+        service = SyncInventoryService(
+            policy=self._make_policy(config),
+            config=config,
+            marketplace_factory=FakeMarketplacePortFactory(port=port),
+            update_batch_size=1,
+        )
+
+        with pytest.raises(ConnectionError, match="listings unavailable"):
+            await asyncio.wait_for(
+                service.sync(self._make_inventory_for_condition_id("NEW", 20)), 1
+            )
+
+    @pytest.mark.asyncio
+    async def test_update_error_stops_the_sync(self) -> None:
+        class FailingPort(GatedMarketplacePort):
+            async def update_inventory(
+                self, updates: Iterable[ListingQuantityUpdate]
+            ) -> list[ListingUpdateFailure]:
+                raise ConnectionError("updates unavailable")
+
+        port = FailingPort(pages=1000)
+
+        config = self._make_config()
+        service = SyncInventoryService(
+            policy=self._make_policy(config),
+            config=config,
+            marketplace_factory=FakeMarketplacePortFactory(port=port),
+            update_batch_size=1,
+        )
+
+        with pytest.raises(ConnectionError, match="updates unavailable"):
+            await asyncio.wait_for(
+                service.sync(self._make_inventory_for_condition_id("NEW", 20)), 1
+            )
+        assert port.fetched < 1000
+
+    @staticmethod
+    @pytest.mark.parametrize(
+        "field", ["update_batch_size", "pipeline_pages", "pipeline_batches"]
+    )
+    def test_rejects_non_positive_pipeline_settings(field: str) -> None:
+        config = MarketplaceConfig(
+            marketplace="Ebay",
+            account="Test_Acc",
+            refresh_token="Token",
+            limit_qty_for_sync_in_marketplace=100,
+            limit_qty_for_sync_in_warehouse=100,
+            limit_qty_difference_for_sync=0,
+            limit_qty_for_marketplace=50,
+        )
+
+        with pytest.raises(ValueError, match=field):
+            SyncInventoryService(
+                policy=MarketplacePolicy(config=config),
+                config=config,
+                marketplace_factory=FakeMarketplacePortFactory(
+                    port=FakeMarketplacePort(listings=[])
+                ),
+                **{field: 0},
+            )
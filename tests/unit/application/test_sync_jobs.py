@@ -0,0 +1,132 @@
+import asyncio
+
+import pytest
+
+from app.application.ports.jobs import JobStatus, SyncJob
+from app.application.service.sync_jobs import SyncJobWorkerPool
+from app.domain.marketplace import ListingQuantityUpdate, SyncResult
+
+
+class InMemoryJobQueue:
+    """In-memory fake implementation of SyncJobQueue for testing."""
+
+    def __init__(self) -> None:
+        self.jobs: dict[str, SyncJob] = {}
+        self.requeue_calls = 0
+
+    async def enqueue(self, marketplace, payload) -> SyncJob:
+        job = SyncJob(
+            id=str(len(self.jobs) + 1),
+            marketplace=marketplace,
+            status=JobStatus.QUEUED,
+            payload=payload,
+            created_at=0.0,
+            updated_at=0.0,
+        )
+        self.jobs[job.id] = job
+        return job
+
+    async def claim(self, marketplace) -> SyncJob | None:
+        for job in self.jobs.values():
+            if job.marketplace == marketplace and job.status is JobStatus.QUEUED:
+                return self._set(job.id, status=JobStatus.RUNNING)
+        return None
+
+    async def complete(self, job_id, result) -> None:
+        self._set(job_id, status=JobStatus.SUCCEEDED, result=result)
+
+    async def fail(self, job_id, error) -> None:
+        self._set(job_id, status=JobStatus.FAILED, error=error)
+
+    async def get(self, job_id) -> SyncJob | None:
+        return self.jobs.get(job_id)
+
+    async def requeue_running(self) -> int:
+        self.requeue_calls += 1
+        return 0
+
+    def _set(self, job_id, **changes) -> SyncJob:
+        job = self.jobs[job_id]
+        fields = {
+            name: getattr(job, name) for name in SyncJob.__dataclass_fields__
+        } | changes
+        self.jobs[job_id] = SyncJob(**fields)
+        return self.jobs[job_id]
+
+
+async def _wait_until_finished(queue: InMemoryJobQueue) -> None:
+    async with asyncio.timeout(2):
+        while not all(job.finished for job in queue.jobs.values()):
+            await asyncio.sleep(0.01)
+
+
+class TestSyncJobWorkerPool:
+    @staticmethod
+    @pytest.mark.asyncio
+    async def test_jobs_are_run_and_results_stored() -> None:
+        queue = InMemoryJobQueue()
+        result = SyncResult(updates=[ListingQuantityUpdate(sku="SKU-1", qty=1)])
+
+        async def runner(job: SyncJob) -> SyncResult:
+            if job.payload.get("boom"):
+                raise RuntimeError("marketplace down")
+            return result
+
+        pool = SyncJobWorkerPool(
+            queue=queue, runner=runner, concurrency={"ebay": 1}, poll_interval_s=10
+        )
+        await pool.start()
+        try:
+            ok = await queue.enqueue("ebay", {})
+            failed = await queue.enqueue("ebay", {"boom": True})
+            pool.notify("ebay")
+
+            await _wait_until_finished(queue)
+        finally:
+            await pool.stop()
+
+        assert queue.requeue_calls == 1
+        assert queue.jobs[ok.id].result == result
+        assert queue.jobs[failed.id].status is JobStatus.FAILED
+        assert queue.jobs[failed.id].error == "RuntimeError: marketplace down"
+
+    @staticmethod
+    @pytest.mark.asyncio
+    async def test_concurrency_is_limited_per_marketplace() -> None:
+        queue = InMemoryJobQueue()
+        running: dict[str, int] = {"ebay": 0, "amazon": 0}
+        peak: dict[str, int] = {"ebay": 0, "amazon": 0}
+
+        async def runner(job: SyncJob) -> SyncResult:
+            running[job.marketplace] += 1
+            peak[job.marketplace] = max(peak[job.marketplace], running[job.marketplace])
+            await asyncio.sleep(0.02)
+            running[job.marketplace] -= 1
+            return SyncResult()
+
+        for marketplace in ["ebay", "amazon"] * 6:
+            await queue.enqueue(marketplace, {})
+
+        pool = SyncJobWorkerPool(
+            queue=queue,
+            runner=runner,
+            concurrency={"ebay": 3, "amazon": 1},
+            poll_interval_s=0.01,
+        )
+        await pool.start()
+        try:
+            await _wait_until_finished(queue)
+        finally:
+            await pool.stop()
+
+        assert peak == {"ebay": 3, "amazon": 1}
+
+    @staticmethod
+    def test_invalid_concurrency_is_rejected() -> None:
+        async def runner(job: SyncJob) -> SyncResult:
+            return SyncResult()
+
+        with pytest.raises(ValueError):
+            SyncJobWorkerPool(
+                queue=InMemoryJobQueue(), runner=runner, concurrency={"ebay": 0}
+            )
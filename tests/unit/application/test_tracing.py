@@ -0,0 +1,102 @@
+import asyncio
+import random
+
+import pytest
+
+from app.application.service.tracing import (
+    NOOP_SPAN,
+    Tracer,
+    record_span,
+    span,
+    tracing_active,
+)
+
+
+class ListExporter:
+    def __init__(self) -> None:
+        self.traces = []
+
+    def export(self, spans) -> None:
+        self.traces.append(list(spans))
+
+
+class TestTracer:
+    @staticmethod
+    def test_rejects_invalid_sample_rate():
+        with pytest.raises(ValueError):
+            Tracer(sample_rate=1.5)
+
+    @staticmethod
+    def test_unsampled_trace_records_nothing():
+        exporter = ListExporter()
+        tracer = Tracer(exporters=[exporter], sample_rate=0.0)
+
+        with tracer.trace("request") as root:
+            with span("child") as child:
+                child.set("rows", 1)
+                assert not tracing_active()
+            record_span("done", 0.0, 1.0)
+
+        assert root is NOOP_SPAN
+        assert root.trace_id is None
+        assert exporter.traces == []
+
+    @staticmethod
+    def test_sampled_trace_exports_span_tree_root_first():
+        exporter = ListExporter()
+        tracer = Tracer(exporters=[exporter], sample_rate=1.0, rng=random.Random(1))
+
+        with tracer.trace("request", path="/x") as root:
+            with span("child", rows=3) as child:
+                with span("grandchild"):
+                    pass
+                child.set("updates", 2)
+            record_span("waited", 10.0, 10.5)
+
+        (spans,) = exporter.traces
+        by_name = {s.name: s for s in spans}
+        assert [s.name for s in spans][0] == "request"
+        assert {s.trace_id for s in spans} == {root.trace_id}
+        assert by_name["request"].parent_id is None
+        assert by_name["request"].attributes == {"path": "/x"}
+        assert by_name["child"].parent_id == by_name["request"].span_id
+        assert by_name["child"].attributes == {"rows": 3, "updates": 2}
+        assert by_name["grandchild"].parent_id == by_name["child"].span_id
+        assert by_name["waited"].duration_s == pytest.approx(0.5)
+        assert not tracing_active()
+
+    @staticmethod
+    def test_span_records_error():
+        exporter = ListExporter()
+        tracer = Tracer(exporters=[exporter], sample_rate=1.0)
+
+        with pytest.raises(RuntimeError), tracer.trace("request"):
+            with span("failing"):
+                raise RuntimeError("boom")
+
+        (spans,) = exporter.traces
+        assert {s.name: s.error for s in spans} == {
+            "request": "RuntimeError: boom",
+            "failing": "RuntimeError: boom",
+        }
+
+    @staticmethod
+    @pytest.mark.asyncio
+    async def test_spans_of_child_tasks_join_the_trace():
+        exporter = ListExporter()
+        tracer = Tracer(exporters=[exporter], sample_rate=1.0)
+
+        async def work(i: int) -> None:
+            with span("task", i=i):
+                await asyncio.sleep(0)
+
+        with tracer.trace("request"):
+            async with asyncio.TaskGroup() as tg:
+                for i in range(3):
+                    tg.create_task(work(i))
+
+        (spans,) = exporter.traces
+        root = spans[0]
+        tasks = [s for s in spans if s.name == "task"]
+        assert len(tasks) == 3
+        assert {s.parent_id for s in tasks} == {root.span_id}
@@ -0,0 +1,42 @@
+import pytest
+
+from benchmarks.adapters import percentile, quantity_updates, run_benchmark
+from simulator import SimulatorConfig
+
+
+class TestAdapterBenchmark:
+    @staticmethod
+    @pytest.mark.asyncio
+    async def test_run_benchmark_against_in_process_simulator():
+        results = await run_benchmark(
+            SimulatorConfig(listings=300, limits={}), updates=60, patches=3
+        )
+
+        by_name = {r.name: r for r in results}
+        assert by_name["ebay.iter_listings"].items == 300
+        assert by_name["ebay.update_inventory"].items == 60
+        assert by_name["amazon.patch_listings"].items == 3
+        assert by_name["amazon.listings_feed"].items == 60
+        assert all(r.error is None for r in results)
+        # 2 pages of 200 plus the token exchange
+        assert by_name["ebay.iter_listings"].requests == 3
+        assert by_name["ebay.update_inventory"].statuses == {"200": 3}
+
+    @staticmethod
+    @pytest.mark.asyncio
+    async def test_run_benchmark_reports_aborted_phases():
+        results = await run_benchmark(
+            SimulatorConfig(listings=10, error_rate=1.0, limits={}), updates=5
+        )
+
+        assert results[0].error is not None
+        assert results[0].items == 0
+
+    @staticmethod
+    def test_percentile_and_updates():
+        assert percentile([], 99) == 0.0
+        assert percentile([0.5], 99) == 0.5
+        assert percentile([float(i) for i in range(1, 101)], 50) == pytest.approx(50.5)
+        updates = quantity_updates(listings=100, count=10)
+        assert len(updates) == 10
+        assert updates[1].sku == "SKU-00000010"
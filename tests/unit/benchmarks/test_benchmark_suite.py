@@ -0,0 +1,90 @@
+import json
+
+import pytest
+
+from benchmarks.catalog import CatalogSpec, generate_catalog
+from benchmarks.compare import compare, load_results
+from benchmarks.suite import run_suite, write_results
+
+
+class TestCatalog:
+    @staticmethod
+    def test_shapes_catalog_from_spec():
+        spec = CatalogSpec(listings=2_000, match_ratio=0.75, duplicate_ratio=0.2)
+
+        catalog = generate_catalog(spec)
+
+        stocked = {c for c, _ in catalog.inventory_rows}
+        matched = sum(c in stocked for c in catalog.listings.condition_ids)
+        assert len(catalog.listings) == 2_000
+        assert len(stocked) == 1_000
+        assert len(catalog.inventory_rows) == 1_200
+        assert matched / 2_000 == pytest.approx(0.75, abs=0.05)
+        assert all(0 <= q <= spec.max_qty for _, q in catalog.inventory_rows)
+
+    @staticmethod
+    def test_is_deterministic_per_seed():
+        spec = CatalogSpec(listings=500)
+
+        assert generate_catalog(spec) == generate_catalog(spec)
+
+    @staticmethod
+    @pytest.mark.parametrize(
+        "kwargs", [{"listings": 0}, {"match_ratio": 1.5}, {"skew": 0}]
+    )
+    def test_rejects_invalid_spec(kwargs):
+        with pytest.raises(ValueError):
+            CatalogSpec(**kwargs)
+
+
+class TestSuite:
+    @staticmethod
+    def test_runs_cases_and_writes_results(tmp_path):
+        results = run_suite([300], repeat=1)
+
+        path = tmp_path / "results.json"
+        write_results(str(path), results, CatalogSpec(), repeat=1)
+
+        names = {r.name for r in results}
+        assert {
+            "to_domain_snapshot",
+            "snapshot.get_qty",
+            "policy.scalar",
+            "service.sync.scalar",
+        } <= names
+        document = json.loads(path.read_text())
+        assert len(document["results"]) == len(results)
+        assert document["results"][0]["size"] == 300
+        assert document["results"][0]["rows_per_s"] > 0
+
+
+class TestCompare:
+    @staticmethod
+    def _write(path, best_s: float, peak_bytes: int) -> str:
+        path.write_text(
+            json.dumps(
+                {
+                    "results": [
+                        {
+                            "name": "policy.scalar",
+                            "size": 1000,
+                            "best_s": best_s,
+                            "peak_bytes": peak_bytes,
+                        }
+                    ]
+                }
+            )
+        )
+        return str(path)
+
+    def test_flags_slower_or_bigger_cases(self, tmp_path):
+        base = load_results(self._write(tmp_path / "base.json", 1.0, 1000))
+        slower = load_results(self._write(tmp_path / "slower.json", 1.2, 1000))
+        bigger = load_results(self._write(tmp_path / "bigger.json", 0.9, 1500))
+        same = load_results(self._write(tmp_path / "same.json", 1.05, 1000))
+
+        (c,) = compare(base, slower, threshold=0.1)
+        assert c.time_change == pytest.approx(0.2)
+        assert c.regressed
+        assert compare(base, bigger)[0].regressed
+        assert not compare(base, same)[0].regressed
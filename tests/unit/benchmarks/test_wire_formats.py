@@ -0,0 +1,23 @@
+from benchmarks.wire_formats import build_formats, run_formats
+
+
+class TestWireFormats:
+    @staticmethod
+    def test_every_format_decodes_to_the_same_snapshot():
+        rows = [("NEW", 10), ("USED", 3), ("NEW", 4)]
+
+        snapshots = {
+            wire.name: dict(wire.decode(wire.body)[1].quantities())
+            for wire in build_formats(rows)
+        }
+
+        assert {"json.rows", "json.columns", "binary.columns"} <= snapshots.keys()
+        assert all(s == {"NEW": 14, "USED": 3} for s in snapshots.values())
+
+    @staticmethod
+    def test_run_formats_reports_payload_sizes():
+        results = run_formats([200], repeat=1)
+
+        sizes = {r.result.name: r.payload_bytes for r in results}
+        assert all(r.result.size == 200 and r.result.rows == 200 for r in results)
+        assert sizes["decode.json.columns"] < sizes["decode.json.rows"]
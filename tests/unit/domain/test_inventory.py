@@ -1,9 +1,12 @@
+import sys
+
 import pytest
 
 from app.domain.inventory import (
     InventoryItem,
     InventoryKey,
     InventorySnapshot,
+    InventorySnapshotBuilder,
 )
 
 
@@ -138,3 +141,81 @@ class TestInventorySnapshot:
             "NEtest_items_returns_items_view_and_is_iterable": 10,
             "UEtest_items_returns_items_view_and_is_iterable": 5,
         }
+
+
+class TestInventorySnapshotBuilder:
+    def test_duplicate_condition_ids_are_summed(self) -> None:
+        builder = InventorySnapshotBuilder()
+        builder.add_many([("NEW", 3), ("USED", 1), ("NEW", 4)])
+
+        snapshot = builder.build()
+
+        assert len(snapshot) == 2
+        assert snapshot.get_qty(InventoryKey(condition_id="NEW")) == 7
+        assert snapshot.get_qty_by_id("USED") == 1
+        assert snapshot.get_qty_by_id("MISSING") == 0
+
+    def test_condition_ids_are_interned(self) -> None:
+        builder = InventorySnapshotBuilder()
+        builder.add("".join(["N", "EW"]), 1)
+
+        (condition_id,) = builder.build().quantities()
+
+        assert condition_id is sys.intern("NEW")
+
+    def test_build_leaves_builder_empty(self) -> None:
+        builder = InventorySnapshotBuilder()
+        builder.add("NEW", 1)
+
+        snapshot = builder.build()
+        builder.add("NEW", 5)
+
+        assert len(builder) == 1
+        assert snapshot.get_qty_by_id("NEW") == 1
+
+    @pytest.mark.parametrize(
+        ("condition_id", "quantity"),
+        [("", 1), ("NEW", -1)],
+    )
+    def test_invalid_rows_raise_value_error(
+        self, condition_id: str, quantity: int
+    ) -> None:
+        with pytest.raises(ValueError):
+            InventorySnapshotBuilder().add(condition_id, quantity)
+
+    def test_quantities_view_is_read_only(self) -> None:
+        builder = InventorySnapshotBuilder()
+        builder.add("NEW", 1)
+
+        quantities = builder.build().quantities()
+
+        with pytest.raises(TypeError):
+            quantities["NEW"] = 2  # type: ignore[index]
+
+    def test_add_columns_sums_and_interns_like_add(self) -> None:
+        builder = InventorySnapshotBuilder()
+        builder.add("NEW", 1)
+        builder.add_columns(["".join(["US", "ED"]), "NEW", "USED"], [2, 3, 4])
+
+        quantities = builder.build().quantities()
+
+        assert dict(quantities) == {"NEW": 4, "USED": 6}
+        assert next(c for c in quantities if c == "USED") is sys.intern("USED")
+
+    @pytest.mark.parametrize(
+        ("condition_ids", "quantities", "message"),
+        [
+            (["NEW", ""], [1, 1], "row 1"),
+            (["NEW", "USED"], [1, -1], "row 1"),
+            (["NEW"], [1, 2], "equal length"),
+        ],
+    )
+    def test_add_columns_rejects_invalid_columns_without_adding(
+        self, condition_ids: list[str], quantities: list[int], message: str
+    ) -> None:
+        builder = InventorySnapshotBuilder()
+
+        with pytest.raises(ValueError, match=message):
+            builder.add_columns(condition_ids, quantities)
+
+        assert len(builder) == 0
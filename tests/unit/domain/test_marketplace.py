@@ -4,9 +4,11 @@ import pytest
 
 from app.domain.marketplace import (
     Listing,
+    ListingBatch,
     ListingQuantityUpdate,
     MarketplaceConfig,
     MarketplacePolicy,
+    SkipReason,
 )
 
 
@@ -251,3 +253,99 @@ class TestMarketplacePolicy:
         policy = self._make_policy(limit_qty_for_marketplace=limit_marketplace)
 
         assert policy.calc_target_qty(warehouse_qty=warehouse_qty) == expected
+
+    @pytest.mark.parametrize(
+        "marketplace_qty,warehouse_qty,expected",
+        [
+            (101, 500, SkipReason.MARKETPLACE_OVER_LIMIT),
+            (10, 101, SkipReason.WAREHOUSE_OVER_LIMIT),
+            (10, 10, SkipReason.UNCHANGED),
+            (10, 12, SkipReason.BELOW_MIN_DIFFERENCE),
+            (10, 15, None),
+        ],
+    )
+    def test_skip_reason_reports_first_failing_rule(
+        self,
+        marketplace_qty: int,
+        warehouse_qty: int,
+        expected: SkipReason | None,
+    ) -> None:
+        policy = self._make_policy(limit_qty_difference_for_sync=5)
+
+        assert policy.skip_reason(marketplace_qty, warehouse_qty) is expected
+        assert policy.should_sync_qty(marketplace_qty, warehouse_qty) is (
+            expected is None
+        )
+
+
+class TestListingBatch:
+    @staticmethod
+    def _make_batch() -> ListingBatch:
+        return ListingBatch.from_columns(
+            skus=["SKU-1", "SKU-2", "SKU-3"],
+            condition_ids=["NEW", "USED", "NEW"],
+            marketplace_qtys=[1, 0, 7],
+            listing_ids=["L-1", None, "L-3"],
+            prices=[9.5, None, 3.0],
+        )
+
+    @staticmethod
+    def test_rows_are_materialized_as_listings() -> None:
+        batch = TestListingBatch._make_batch()
+
+        assert len(batch) == 3
+        assert batch[1] == Listing(
+            sku="SKU-2", condition_id="USED", marketplace_qty=0, price=None
+        )
+        assert batch[-1].listing_id == "L-3"
+        assert [listing.sku for listing in batch] == ["SKU-1", "SKU-2", "SKU-3"]
+
+    @staticmethod
+    def test_condition_ids_are_interned() -> None:
+        batch = ListingBatch.from_columns(
+            skus=["SKU-1", "SKU-2"],
+            condition_ids=["".join(["N", "EW"]), "".join(["NE", "W"])],
+            marketplace_qtys=[1, 2],
+        )
+
+        assert batch.condition_ids[0] is batch.condition_ids[1]
+
+    @staticmethod
+    def test_slice_returns_batch_copy() -> None:
+        batch = TestListingBatch._make_batch()
+
+        head = batch[:2]
+        batch.marketplace_qtys[0] = 42
+
+        assert isinstance(head, ListingBatch)
+        assert head.skus == ["SKU-1", "SKU-2"]
+        assert head[0].marketplace_qty == 1
+
+    @staticmethod
+    def test_from_listings_round_trips() -> None:
+        listings = list(TestListingBatch._make_batch())
+
+        assert ListingBatch.from_listings(listings) == TestListingBatch._make_batch()
+        assert list(ListingBatch.from_listings(listings)) == listings
+
+    @staticmethod
+    def test_concat_joins_batches_and_lists() -> None:
+        batch = TestListingBatch._make_batch()
+
+        joined = ListingBatch.concat([batch[:1], list(batch[1:])])
+
+        assert joined == batch
+
+    @staticmethod
+    @pytest.mark.parametrize(
+        "columns",
+        [
+            {"skus": ["SKU-1"], "condition_ids": [], "marketplace_qtys": [1]},
+            {"skus": [""], "condition_ids": ["NEW"], "marketplace_qtys": [1]},
+            {"skus": ["SKU-1"], "condition_ids": [""], "marketplace_qtys": [1]},
+            {"skus": ["SKU-1"], "condition_ids": ["NEW"], "marketplace_qtys": [-1]},
+        ],
+    )
+    def test_invalid_columns_are_rejected(columns: dict[str, list]) -> None:
+        with pytest.raises(ValueError):
+            ListingBatch.from_columns(**columns)
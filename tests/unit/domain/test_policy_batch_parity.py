@@ -0,0 +1,133 @@
+import random
+from collections import Counter
+
+import numpy as np
+import pytest
+
+from app.domain.marketplace import Listing, MarketplaceConfig, MarketplacePolicy
+
+
+def _make_policy(
+    limit_qty_for_sync_in_marketplace: int = 100,
+    limit_qty_for_sync_in_warehouse: int = 100,
+    limit_qty_difference_for_sync: int = 1,
+    limit_qty_for_marketplace: int = 50,
+) -> MarketplacePolicy:
+    return MarketplacePolicy(
+        config=MarketplaceConfig(
+            marketplace="ebay",
+            account="acc",
+            refresh_token="token",
+            limit_qty_for_sync_in_marketplace=limit_qty_for_sync_in_marketplace,
+            limit_qty_for_sync_in_warehouse=limit_qty_for_sync_in_warehouse,
+            limit_qty_difference_for_sync=limit_qty_difference_for_sync,
+            limit_qty_for_marketplace=limit_qty_for_marketplace,
+        )
+    )
+
+
+def _scalar(
+    policy: MarketplacePolicy,
+    marketplace_qtys: list[int],
+    warehouse_qtys: list[int],
+) -> tuple[list[bool], list[int]]:
+    decisions = []
+    targets = []
+    for mq, wq in zip(marketplace_qtys, warehouse_qtys, strict=True):
+        listing = Listing(sku="SKU", condition_id="NEW", marketplace_qty=mq)
+        decisions.append(policy.should_sync(listing, warehouse_qty=wq))
+        targets.append(policy.calc_target_qty(warehouse_qty=wq))
+    return decisions, targets
+
+
+def _assert_parity(
+    policy: MarketplacePolicy,
+    marketplace_qtys: list[int],
+    warehouse_qtys: list[int],
+) -> None:
+    expected_mask, expected_targets = _scalar(policy, marketplace_qtys, warehouse_qtys)
+
+    mask, targets = policy.evaluate_batch(marketplace_qtys, warehouse_qtys)
+
+    assert mask.tolist() == expected_mask
+    assert [t for t, m in zip(targets.tolist(), expected_mask, strict=True) if m] == [
+        t for t, m in zip(expected_targets, expected_mask, strict=True) if m
+    ]
+
+    expected_skips = Counter(
+        policy.skip_reason(mq, wq)
+        for mq, wq in zip(marketplace_qtys, warehouse_qtys, strict=True)
+    )
+    del expected_skips[None]
+    assert policy.count_skips_batch(marketplace_qtys, warehouse_qtys) == dict(
+        expected_skips
+    )
+
+    one_pass = policy.evaluate_batch(marketplace_qtys, warehouse_qtys, with_skips=True)
+    assert one_pass[0].tolist() == expected_mask
+    assert one_pass[1].tolist() == targets.tolist()
+    assert one_pass[2] == dict(expected_skips)
+
+
+class TestEvaluateBatchParity:
+    @staticmethod
+    @pytest.mark.parametrize(
+        "limits",
+        [
+            {},
+            {"limit_qty_difference_for_sync": 0},
+            {"limit_qty_difference_for_sync": 5},
+            {"limit_qty_for_sync_in_marketplace": 0},
+            {"limit_qty_for_sync_in_warehouse": 0},
+            {"limit_qty_for_marketplace": 0},
+            {
+                "limit_qty_for_sync_in_marketplace": 9999,
+                "limit_qty_for_sync_in_warehouse": 9999,
+                "limit_qty_for_marketplace": 9999,
+            },
+        ],
+    )
+    def test_exhaustive_small_grid_matches_scalar_path(limits: dict) -> None:
+        policy = _make_policy(**limits)
+        values = [0, 1, 2, 4, 5, 6, 49, 50, 51, 99, 100, 101, 150]
+
+        marketplace_qtys = [m for m in values for _ in values]
+        warehouse_qtys = [w for _ in values for w in values]
+
+        _assert_parity(policy, marketplace_qtys, warehouse_qtys)
+
+    @staticmethod
+    @pytest.mark.parametrize("seed", range(20))
+    def test_random_configs_and_quantities_match_scalar_path(seed: int) -> None:
+        rng = random.Random(seed)
+        policy = _make_policy(
+            limit_qty_for_sync_in_marketplace=rng.randint(0, 200),
+            limit_qty_for_sync_in_warehouse=rng.randint(0, 200),
+            limit_qty_difference_for_sync=rng.randint(0, 20),
+            limit_qty_for_marketplace=rng.randint(0, 200),
+        )
+        n = 2000
+        marketplace_qtys = [rng.randint(0, 250) for _ in range(n)]
+        warehouse_qtys = [
+            mq if rng.random() < 0.2 else rng.randint(0, 250) for mq in marketplace_qtys
+        ]
+
+        _assert_parity(policy, marketplace_qtys, warehouse_qtys)
+
+    @staticmethod
+    def test_accepts_numpy_arrays_and_empty_input() -> None:
+        policy = _make_policy()
+
+        mask, targets = policy.evaluate_batch(
+            np.array([], dtype=np.int64), np.array([], dtype=np.int64)
+        )
+
+        assert mask.tolist() == []
+        assert targets.tolist() == []
+
+    @staticmethod
+    def test_length_mismatch_raises() -> None:
+        policy = _make_policy()
+
+        with pytest.raises(ValueError):
+            policy.evaluate_batch([1, 2], [1])
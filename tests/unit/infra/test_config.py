@@ -33,3 +33,168 @@ class TestInfraConfig:
         assert cfg.ebay_dev_creds.client_secret == "secret"
         assert cfg.ebay_base_url == "ebay_base_url"
         assert cfg.amazon_base_url == "amazon_base_url"
+
+    @staticmethod
+    def test_load_config_reads_amazon_update_settings(monkeypatch):
+        monkeypatch.setenv("EBAY_CLIENT_ID", "id")
+        monkeypatch.setenv("EBAY_CLIENT_SECRET", "secret")
+        monkeypatch.setenv("AMAZON_FEED_THRESHOLD", "1000")
+        monkeypatch.setenv("AMAZON_PATCH_CONCURRENCY", "8")
+
+        cfg = load_config()
+
+        assert cfg.amazon_feed_threshold == 1000
+        assert cfg.amazon_patch_concurrency == 8
+
+    @staticmethod
+    def test_load_config_rejects_non_integer_setting(monkeypatch):
+        monkeypatch.setenv("EBAY_CLIENT_ID", "id")
+        monkeypatch.setenv("EBAY_CLIENT_SECRET", "secret")
+        monkeypatch.setenv("AMAZON_FEED_THRESHOLD", "many")
+
+        with pytest.raises(ValueError):
+            load_config()
+
+    @staticmethod
+    def test_load_config_reads_sync_job_workers(monkeypatch):
+        monkeypatch.setenv("EBAY_CLIENT_ID", "id")
+        monkeypatch.setenv("EBAY_CLIENT_SECRET", "secret")
+        monkeypatch.setenv("SYNC_JOB_WORKERS", "eBay=4, amazon=1")
+
+        cfg = load_config()
+
+        assert cfg.sync_job_workers == {"ebay": 4, "amazon": 1}
+
+    @staticmethod
+    @pytest.mark.parametrize("value", ["ebay", "ebay=x", "=2", "ebay=0"])
+    def test_load_config_rejects_invalid_sync_job_workers(monkeypatch, value):
+        monkeypatch.setenv("EBAY_CLIENT_ID", "id")
+        monkeypatch.setenv("EBAY_CLIENT_SECRET", "secret")
+        monkeypatch.setenv("SYNC_JOB_WORKERS", value)
+
+        with pytest.raises(ValueError):
+            load_config()
+
+    @staticmethod
+    def test_load_config_reads_http_pools(monkeypatch):
+        monkeypatch.setenv("EBAY_CLIENT_ID", "id")
+        monkeypatch.setenv("EBAY_CLIENT_SECRET", "secret")
+        monkeypatch.setenv("HTTP_POOL_CONNECTIONS", "ebay=10")
+        monkeypatch.setenv("HTTP2", "true")
+
+        cfg = load_config()
+
+        assert cfg.http_pool_connections == {"ebay": 10}
+        assert cfg.http2 is True
+
+    @staticmethod
+    def test_load_config_rejects_invalid_bool(monkeypatch):
+        monkeypatch.setenv("EBAY_CLIENT_ID", "id")
+        monkeypatch.setenv("EBAY_CLIENT_SECRET", "secret")
+        monkeypatch.setenv("HTTP2", "maybe")
+
+        with pytest.raises(ValueError):
+            load_config()
+
+    @staticmethod
+    def test_load_config_reads_trace_sample_rate(monkeypatch):
+        monkeypatch.setenv("EBAY_CLIENT_ID", "id")
+        monkeypatch.setenv("EBAY_CLIENT_SECRET", "secret")
+        monkeypatch.setenv("TRACE_SAMPLE_RATE", "0.25")
+
+        assert load_config().trace_sample_rate == 0.25
+
+    @staticmethod
+    @pytest.mark.parametrize("value", ["often", "2"])
+    def test_load_config_rejects_invalid_trace_sample_rate(monkeypatch, value):
+        monkeypatch.setenv("EBAY_CLIENT_ID", "id")
+        monkeypatch.setenv("EBAY_CLIENT_SECRET", "secret")
+        monkeypatch.setenv("TRACE_SAMPLE_RATE", value)
+
+        with pytest.raises(ValueError):
+            load_config()
+
+    @staticmethod
+    def test_load_config_reads_base_urls(monkeypatch):
+        monkeypatch.setenv("EBAY_CLIENT_ID", "id")
+        monkeypatch.setenv("EBAY_CLIENT_SECRET", "secret")
+        monkeypatch.setenv("EBAY_BASE_URL", "http://127.0.0.1:8081")
+        monkeypatch.setenv("AMAZON_BASE_URL", "http://127.0.0.1:8082")
+
+        cfg = load_config()
+
+        assert cfg.ebay_base_url == "http://127.0.0.1:8081"
+        assert cfg.amazon_base_url == "http://127.0.0.1:8082"
+        assert load_config(ebay_base_url="explicit").ebay_base_url == "explicit"
+
+    @staticmethod
+    def test_load_config_reads_sync_pipeline_settings(monkeypatch):
+        monkeypatch.setenv("EBAY_CLIENT_ID", "id")
+        monkeypatch.setenv("EBAY_CLIENT_SECRET", "secret")
+        monkeypatch.setenv("SYNC_UPDATE_BATCH_SIZES", "ebay=250")
+        monkeypatch.setenv("SYNC_PIPELINE_PAGES", "8")
+
+        cfg = load_config()
+
+        assert cfg.sync_update_batch_sizes == {"ebay": 250}
+        assert cfg.sync_pipeline_pages == 8
+        assert cfg.sync_pipeline_batches == 2
+
+    @staticmethod
+    @pytest.mark.parametrize(
+        ("name", "value"),
+        [("SYNC_UPDATE_BATCH_SIZES", "amazon=0"), ("SYNC_PIPELINE_BATCHES", "0")],
+    )
+    def test_load_config_rejects_invalid_sync_pipeline_settings(
+        monkeypatch, name, value
+    ):
+        monkeypatch.setenv("EBAY_CLIENT_ID", "id")
+        monkeypatch.setenv("EBAY_CLIENT_SECRET", "secret")
+        monkeypatch.setenv(name, value)
+
+        with pytest.raises(ValueError):
+            load_config()
+
+    @staticmethod
+    def test_load_config_can_disable_sync_coalescing(monkeypatch):
+        monkeypatch.setenv("EBAY_CLIENT_ID", "id")
+        monkeypatch.setenv("EBAY_CLIENT_SECRET", "secret")
+
+        assert load_config().sync_coalescing is True
+
+        monkeypatch.setenv("SYNC_COALESCING", "off")
+
+        assert load_config().sync_coalescing is False
+
+    @staticmethod
+    def test_load_config_reads_scheduler_settings(monkeypatch):
+        monkeypatch.setenv("EBAY_CLIENT_ID", "id")
+        monkeypatch.setenv("EBAY_CLIENT_SECRET", "secret")
+        monkeypatch.setenv("SYNC_SCHEDULES_PATH", "/etc/sync/schedules.json")
+        monkeypatch.setenv("SCHEDULER_MAX_CONCURRENCY", "2")
+        monkeypatch.setenv("SCHEDULER_JITTER", "0.25")
+        monkeypatch.setenv("HTTP_MAX_IN_FLIGHT", "50")
+
+        cfg = load_config()
+
+        assert cfg.sync_schedules_path == "/etc/sync/schedules.json"
+        assert cfg.scheduler_max_concurrency == 2
+        assert cfg.scheduler_jitter == 0.25
+        assert cfg.http_max_in_flight == 50
+
+    @staticmethod
+    @pytest.mark.parametrize(
+        ("name", "value"),
+        [
+            ("SCHEDULER_MAX_CONCURRENCY", "0"),
+            ("SCHEDULER_JITTER", "1"),
+            ("HTTP_MAX_IN_FLIGHT", "-1"),
+        ],
+    )
+    def test_load_config_rejects_invalid_scheduler_settings(monkeypatch, name, value):
+        monkeypatch.setenv("EBAY_CLIENT_ID", "id")
+        monkeypatch.setenv("EBAY_CLIENT_SECRET", "secret")
+        monkeypatch.setenv(name, value)
+
+        with pytest.raises(ValueError):
+            load_config()
@@ -0,0 +1,163 @@
+import os
+
+import pytest
+
+from app.infrastructure.inventory.file_source import FileInventorySource
+
+
+def _write(path, text: str) -> str:
+    path.write_text(text, encoding="utf-8")
+    return str(path)
+
+
+class TestFileInventorySource:
+    @staticmethod
+    @pytest.mark.asyncio
+    async def test_loads_csv_and_aggregates_duplicates(tmp_path):
+        path = _write(
+            tmp_path / "inventory.csv",
+            "sku,condition_id,quantity\r\nA,NEW,4\r\nB,USED,1\r\n\r\nC,NEW,2\r\n",
+        )
+
+        snapshot = await FileInventorySource(path).load_snapshot()
+
+        assert dict(snapshot.quantities()) == {"NEW": 6, "USED": 1}
+
+    @staticmethod
+    @pytest.mark.asyncio
+    async def test_loads_tsv_by_extension_with_renamed_columns(tmp_path):
+        path = _write(
+            tmp_path / "inventory.tsv",
+            "\ufeffqty\tcondition\n3\tNEW\n",
+        )
+
+        snapshot = await FileInventorySource(
+            path, condition_id_column="condition", quantity_column="qty"
+        ).load_snapshot()
+
+        assert dict(snapshot.quantities()) == {"NEW": 3}
+
+    @staticmethod
+    @pytest.mark.asyncio
+    async def test_parses_quoted_fields(tmp_path):
+        path = _write(
+            tmp_path / "inventory.csv",
+            'condition_id,quantity,note\n"NEW, boxed",2,"a ""b"""\nUSED,1,\n',
+        )
+
+        snapshot = await FileInventorySource(path).load_snapshot()
+
+        assert dict(snapshot.quantities()) == {"NEW, boxed": 2, "USED": 1}
+
+    @staticmethod
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("chunk_bytes", [1, 8, 10_000])
+    async def test_strips_values_and_reads_quoted_line_breaks(tmp_path, chunk_bytes):
+        path = _write(
+            tmp_path / "inventory.csv",
+            "condition_id,quantity,note\n"
+            " NEW , 12,\n"
+            'USED,1,"two\nlines, one row"\n'
+            '" NEW",3,\n',
+        )
+
+        snapshot = await FileInventorySource(
+            path, chunk_bytes=chunk_bytes
+        ).load_snapshot()
+
+        assert dict(snapshot.quantities()) == {"NEW": 15, "USED": 1}
+
+    @staticmethod
+    @pytest.mark.asyncio
+    async def test_strips_values_of_unquoted_files(tmp_path):
+        path = _write(tmp_path / "inventory.csv", "condition_id,quantity\nNEW , 4\n")
+
+        snapshot = await FileInventorySource(path, chunk_bytes=4).load_snapshot()
+
+        assert dict(snapshot.quantities()) == {"NEW": 4}
+
+    @staticmethod
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("chunk_bytes", [1, 7, 64, 10_000])
+    async def test_chunk_size_does_not_change_the_snapshot(tmp_path, chunk_bytes):
+        rows = "".join(f"C{i % 13},{i}\n" for i in range(200))
+        path = _write(tmp_path / "inventory.csv", "condition_id,quantity\n" + rows)
+
+        snapshot = await FileInventorySource(
+            path, chunk_bytes=chunk_bytes
+        ).load_snapshot()
+
+        expected: dict[str, int] = {}
+        for i in range(200):
+            expected[f"C{i % 13}"] = expected.get(f"C{i % 13}", 0) + i
+        assert dict(snapshot.quantities()) == expected
+
+    @staticmethod
+    @pytest.mark.asyncio
+    async def test_reuses_snapshot_until_the_file_changes(tmp_path, monkeypatch):
+        path = _write(tmp_path / "inventory.csv", "condition_id,quantity\nNEW,1\n")
+        source = FileInventorySource(path)
+        parses = 0
+        parse = FileInventorySource._parse
+
+        def counting_parse(self, data):
+            nonlocal parses
+            parses += 1
+            return parse(self, data)
+
+        monkeypatch.setattr(FileInventorySource, "_parse", counting_parse)
+
+        first = await source.load_snapshot()
+        assert await source.load_snapshot() is first
+
+        # rewritten with the same content: the hash matches
+        _write(tmp_path / "inventory.csv", "condition_id,quantity\nNEW,1\n")
+        os.utime(path, ns=(0, 10**9))
+        assert await source.load_snapshot() is first
+        assert parses == 1
+
+        _write(tmp_path / "inventory.csv", "condition_id,quantity\nNEW,5\n")
+        os.utime(path, ns=(0, 2 * 10**9))
+        changed = await source.load_snapshot()
+
+        assert dict(changed.quantities()) == {"NEW": 5}
+        assert parses == 2
+
+    @staticmethod
+    @pytest.mark.asyncio
+    async def test_reparses_rewrites_without_verify_hash(tmp_path):
+        path = _write(tmp_path / "inventory.csv", "condition_id,quantity\nNEW,1\n")
+        source = FileInventorySource(path, verify_hash=False)
+
+        first = await source.load_snapshot()
+        os.utime(path, ns=(0, 10**9))
+
+        assert await source.load_snapshot() is not first
+
+    @staticmethod
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize(
+        ("text", "message"),
+        [
+            ("condition_id,quantity\nNEW,1\nUSED,many\n", ":3: "),
+            ("condition_id,quantity\nNEW,1\n\nUSED,-1\n", ":4: "),
+            ("condition_id,quantity\nNEW\n", ":2: missing columns"),
+            ('condition_id,quantity\n"NEW",1\nUSED\n', ":3: missing columns"),
+            ('condition_id,quantity\n"NEW",x\n', ":2: "),
+            ("sku,quantity\nA,1\n", "header must have 'condition_id'"),
+            ("", "inventory file is empty"),
+        ],
+    )
+    async def test_rejects_malformed_files(tmp_path, text, message):
+        path = _write(tmp_path / "inventory.csv", text)
+
+        with pytest.raises(ValueError, match=message):
+            await FileInventorySource(path, chunk_bytes=4).load_snapshot()
+
+    @staticmethod
+    @pytest.mark.parametrize(
+        "kwargs", [{"path": ""}, {"delimiter": ";;"}, {"chunk_bytes": 0}]
+    )
+    def test_rejects_invalid_settings(kwargs):
+        with pytest.raises(ValueError):
+            FileInventorySource(**{"path": "inventory.csv", **kwargs})
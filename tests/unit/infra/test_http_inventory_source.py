@@ -0,0 +1,57 @@
+import httpx
+import pytest
+
+from app.infrastructure.inventory.http_source import HttpInventorySource
+
+
+def _source(payload=None, status_code=200, seen=None) -> HttpInventorySource:
+    def handler(request: httpx.Request) -> httpx.Response:
+        if seen is not None:
+            seen.append(request)
+        return httpx.Response(status_code, json=payload)
+
+    return HttpInventorySource(
+        http=httpx.AsyncClient(transport=httpx.MockTransport(handler)),
+        url="https://wms.test/export",
+        headers={"Authorization": "Bearer wms"},
+    )
+
+
+class TestHttpInventorySource:
+    @staticmethod
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("wrapped", [False, True])
+    async def test_loads_and_aggregates_rows(wrapped):
+        rows = [
+            {"condition_id": "NEW", "quantity": 4},
+            {"condition_id": "USED", "quantity": 1},
+            {"condition_id": "NEW", "quantity": 2},
+        ]
+        seen: list[httpx.Request] = []
+        source = _source({"inventory": rows} if wrapped else rows, seen=seen)
+
+        snapshot = await source.load_snapshot()
+
+        assert dict(snapshot.quantities()) == {"NEW": 6, "USED": 1}
+        assert seen[0].headers["authorization"] == "Bearer wms"
+
+    @staticmethod
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize(
+        "payload",
+        [
+            {"rows": []},
+            [{"condition_id": "NEW"}],
+            [{"condition_id": "NEW", "quantity": -1}],
+            [{"condition_id": "NEW", "quantity": "many"}],
+        ],
+    )
+    async def test_rejects_malformed_exports(payload):
+        with pytest.raises(ValueError):
+            await _source(payload).load_snapshot()
+
+    @staticmethod
+    @pytest.mark.asyncio
+    async def test_raises_on_error_status():
+        with pytest.raises(httpx.HTTPStatusError):
+            await _source([], status_code=503).load_snapshot()
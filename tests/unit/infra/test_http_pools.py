@@ -0,0 +1,235 @@
+import asyncio
+
+import httpx
+import pytest
+
+from app.infrastructure.http import pools
+from app.infrastructure.http.client import (
+    DEFAULT_POOL,
+    InFlightLimitTransport,
+    build_httpx_client,
+)
+from app.infrastructure.http.pools import PoolMonitor, PoolSettings
+from app.infrastructure.http.resilience import ResilientTransport, RetryPolicy
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class TracingUpstream(httpx.AsyncBaseTransport):
+    """Emits httpcore's trace events after waiting for `release`."""
+
+    def __init__(self, clock: FakeClock, trace_events: bool = True) -> None:
+        self.clock = clock
+        self.trace_events = trace_events
+        self.release = asyncio.Event()
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        trace = request.extensions.get("trace")
+        await self.release.wait()
+        if self.trace_events and trace is not None:
+            await trace("connection.connect_tcp.started", {})
+            self.clock.now += 0.25
+            await trace("http11.send_request_headers.started", {})
+        return httpx.Response(200)
+
+
+async def _start_http_server() -> tuple[asyncio.Server, int]:
+    async def handle(reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        while await reader.readuntil(b"\r\n\r\n"):
+            writer.write(b"HTTP/1.1 200 OK\r\nContent-Length: 2\r\n\r\nok")
+            await writer.drain()
+
+    async def guarded(reader, writer):
+        try:
+            await handle(reader, writer)
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            writer.close()
+
+    server = await asyncio.start_server(guarded, "127.0.0.1", 0)
+    return server, server.sockets[0].getsockname()[1]
+
+
+class TestPoolSettings:
+    @staticmethod
+    @pytest.mark.parametrize(
+        "kwargs",
+        [
+            {"max_connections": 0},
+            {"max_keepalive_connections": -1},
+            {"keepalive_expiry_s": -1},
+        ],
+    )
+    def test_rejects_invalid_settings(kwargs):
+        with pytest.raises(ValueError):
+            PoolSettings(**kwargs)
+
+    @staticmethod
+    def test_http2_falls_back_without_h2(monkeypatch):
+        monkeypatch.setattr(pools, "HAS_HTTP2", False)
+        monitor = PoolMonitor()
+
+        monitor.instrument("api", PoolSettings(http2=True))
+
+        (stats,) = monitor.stats()
+        assert stats.http2 is False
+
+
+class TestInstrumentedTransport:
+    @staticmethod
+    @pytest.mark.asyncio
+    async def test_measures_waiting_and_acquire_latency():
+        clock = FakeClock()
+        upstream = TracingUpstream(clock)
+        heard: list[tuple[str, float]] = []
+        monitor = PoolMonitor(listeners=[lambda *event: heard.append(event)])
+        transport = monitor.instrument("api", PoolSettings(), inner=upstream)
+        transport.clock = clock
+        outer_events: list[str] = []
+
+        async def outer_trace(name, info):
+            outer_events.append(name)
+
+        async with httpx.AsyncClient(
+            transport=transport, base_url="https://api.test"
+        ) as client:
+            tasks = [
+                asyncio.create_task(client.get("/", extensions={"trace": outer_trace}))
+                for _ in range(2)
+            ]
+            await asyncio.sleep(0)
+            assert monitor.stats()[0].waiting == 2
+
+            upstream.release.set()
+            await asyncio.gather(*tasks)
+
+        (stats,) = monitor.stats()
+        assert stats.waiting == 0
+        assert stats.acquired == 2
+        assert stats.max_acquire_s == pytest.approx(0.5)
+        assert [name for name, _ in heard] == ["api", "api"]
+        assert outer_events.count("http11.send_request_headers.started") == 2
+
+    @staticmethod
+    @pytest.mark.asyncio
+    async def test_leaves_waiting_count_without_trace_events():
+        upstream = TracingUpstream(FakeClock(), trace_events=False)
+        upstream.release.set()
+        monitor = PoolMonitor()
+        transport = monitor.instrument("api", PoolSettings(), inner=upstream)
+
+        async with httpx.AsyncClient(transport=transport) as client:
+            await client.get("https://api.test/")
+
+        (stats,) = monitor.stats()
+        assert stats.waiting == 0
+        assert stats.acquired == 0
+
+    @staticmethod
+    @pytest.mark.asyncio
+    async def test_retries_wrap_the_callers_trace_hook_once():
+        hooks: list = []
+
+        async def upstream(request: httpx.Request) -> httpx.Response:
+            trace = request.extensions["trace"]
+            hooks.append(trace)
+            await trace("http11.send_request_headers.started", {})
+            return httpx.Response(503 if len(hooks) == 1 else 200)
+
+        monitor = PoolMonitor()
+        instrumented = monitor.instrument(
+            "api", PoolSettings(), inner=httpx.MockTransport(upstream)
+        )
+        transport = ResilientTransport(
+            inner=instrumented,
+            retry=RetryPolicy(backoff_base_s=0, backoff_max_s=0),
+        )
+        outer_events: list[str] = []
+
+        async def outer_trace(name, info):
+            outer_events.append(name)
+
+        async with httpx.AsyncClient(transport=transport) as client:
+            response = await client.get(
+                "https://api.test/", extensions={"trace": outer_trace}
+            )
+
+        assert response.status_code == 200
+        assert len(hooks) == 2
+        assert response.request.extensions["trace"] is outer_trace
+        assert outer_events == ["http11.send_request_headers.started"] * 2
+        assert monitor.stats()[0].acquired == 2
+
+
+class TestBuildHttpxClient:
+    @staticmethod
+    @pytest.mark.asyncio
+    async def test_routes_hosts_to_separately_sized_pools():
+        server, port = await _start_http_server()
+        base_url = f"http://127.0.0.1:{port}"
+        monitor = PoolMonitor()
+        client = build_httpx_client(
+            default_pool=PoolSettings(max_connections=10),
+            host_pools={base_url: PoolSettings(max_connections=1)},
+            monitor=monitor,
+        )
+
+        try:
+            async with client:
+                responses = await asyncio.gather(
+                    *(client.get(f"{base_url}/items") for _ in range(3))
+                )
+                stats = {s.pool: s for s in monitor.stats()}
+        finally:
+            server.close()
+            await server.wait_closed()
+
+        assert [r.text for r in responses] == ["ok"] * 3
+        host = stats["127.0.0.1"]
+        assert host.max_connections == 1
+        assert host.acquired == 3
+        assert (host.connections, host.idle, host.active) == (1, 1, 0)
+        assert host.waiting == 0
+        assert stats[DEFAULT_POOL].max_connections == 10
+        assert stats[DEFAULT_POOL].acquired == 0
+
+
+class TestInFlightLimitTransport:
+    @staticmethod
+    @pytest.mark.asyncio
+    async def test_caps_requests_across_transports_sharing_a_limit():
+        in_flight = 0
+        peak = 0
+
+        async def handler(request: httpx.Request) -> httpx.Response:
+            nonlocal in_flight, peak
+            in_flight += 1
+            peak = max(peak, in_flight)
+            await asyncio.sleep(0.005)
+            in_flight -= 1
+            return httpx.Response(200)
+
+        limit = asyncio.Semaphore(2)
+        client = httpx.AsyncClient(
+            transport=InFlightLimitTransport(httpx.MockTransport(handler), limit),
+            mounts={
+                "http://other": InFlightLimitTransport(
+                    httpx.MockTransport(handler), limit
+                )
+            },
+        )
+
+        async with client:
+            responses = await asyncio.gather(
+                *(client.get(f"http://{host}/x") for host in ["one", "other"] * 4)
+            )
+
+        assert [r.status_code for r in responses] == [200] * 8
+        assert peak == 2
@@ -1,6 +1,16 @@
+import asyncio
+import json
+from urllib.parse import unquote
+
+import httpx
 import pytest
 
-from app.infrastructure.marketplaces.amazon_client import AmazonUserCredentials
+from app.domain.marketplace import ListingQuantityUpdate, ListingUpdateFailure
+from app.infrastructure.auth.tokens import TokenManager
+from app.infrastructure.marketplaces.amazon_client import (
+    AmazonAdapter,
+    AmazonUserCredentials,
+)
 
 
 class TestInfraAmazonCredentials:
@@ -35,3 +45,224 @@ class TestInfraAmazonCredentials:
             refresh_token="refresh",
         )
         assert creds.seller_partner_id == "seller"
+
+
+class FakeSpApi:
+    """Local stand-in for the Listings Items and Feeds endpoints."""
+
+    def __init__(self, delay_s: float = 0.0, invalid: frozenset = frozenset()) -> None:
+        self.delay_s = delay_s
+        self.invalid = invalid
+        self.patched: dict[str, dict] = {}
+        self.uploaded: dict[str, bytes] = {}
+        self.feeds: list[dict] = []
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+    async def __call__(self, request: httpx.Request) -> httpx.Response:
+        path = request.url.path
+
+        if request.method == "PATCH" and path.startswith("/listings/2021-08-01/items/"):
+            assert request.headers["x-amz-access-token"] == "refresh"
+            assert request.url.params["marketplaceIds"] == "ATVPDKIKX0DER"
+            raw_path = request.url.raw_path.decode().split("?")[0]
+            sku = unquote(raw_path.rsplit("/", 1)[1])
+            self.in_flight += 1
+            self.max_in_flight = max(self.max_in_flight, self.in_flight)
+            try:
+                await asyncio.sleep(self.delay_s)
+            finally:
+                self.in_flight -= 1
+            self.patched[sku] = json.loads(request.content)
+            if sku in self.invalid:
+                issue = {"code": "4000001", "message": "Bad SKU", "severity": "ERROR"}
+                return httpx.Response(
+                    200, json={"sku": sku, "status": "INVALID", "issues": [issue]}
+                )
+            return httpx.Response(200, json={"sku": sku, "status": "ACCEPTED"})
+
+        if request.method == "POST" and path == "/feeds/2021-06-30/documents":
+            doc_id = f"doc-{len(self.uploaded) + 1}"
+            self.uploaded[doc_id] = b""
+            return httpx.Response(
+                201,
+                json={"feedDocumentId": doc_id, "url": f"https://s3.test/{doc_id}"},
+            )
+
+        if request.method == "PUT" and request.url.host == "s3.test":
+            assert "x-amz-access-token" not in request.headers
+            self.uploaded[path.lstrip("/")] = request.content
+            return httpx.Response(200)
+
+        if request.method == "POST" and path == "/feeds/2021-06-30/feeds":
+            body = json.loads(request.content)
+            self.feeds.append(body)
+            return httpx.Response(202, json={"feedId": f"feed-{len(self.feeds)}"})
+
+        return httpx.Response(404)
+
+
+def _make_adapter(api, **kwargs) -> AmazonAdapter:
+    return AmazonAdapter(
+        http=httpx.AsyncClient(transport=httpx.MockTransport(api)),
+        credentials=AmazonUserCredentials(
+            seller_partner_id="seller",
+            lwa_client_id="client",
+            lwa_client_secret="secret",
+            refresh_token="refresh",
+        ),
+        base_url="https://sp.test",
+        **kwargs,
+    )
+
+
+def _updates(n: int) -> list[ListingQuantityUpdate]:
+    return [ListingQuantityUpdate(sku=f"SKU {i}/x", qty=i) for i in range(n)]
+
+
+class TestInfraAmazonUpdateInventory:
+    @staticmethod
+    @pytest.mark.asyncio
+    async def test_small_update_set_is_patched_per_sku_with_bounded_concurrency():
+        api = FakeSpApi(delay_s=0.01)
+        adapter = _make_adapter(api, feed_threshold=50, patch_concurrency=3)
+
+        failures = await adapter.update_inventory(_updates(10))
+
+        assert failures == []
+        assert api.feeds == []
+        assert len(api.patched) == 10
+        assert api.max_in_flight == 3
+
+        body = api.patched["SKU 7/x"]
+        assert body["productType"] == "PRODUCT"
+        assert body["patches"][0]["value"] == [
+            {"fulfillment_channel_code": "DEFAULT", "quantity": 7}
+        ]
+
+    @staticmethod
+    @pytest.mark.asyncio
+    async def test_large_update_set_is_submitted_as_one_listings_feed():
+        api = FakeSpApi()
+        adapter = _make_adapter(api, feed_threshold=50)
+
+        failures = await adapter.update_inventory(_updates(50))
+
+        assert failures == []
+        assert api.patched == {}
+        assert api.feeds == [
+            {
+                "feedType": "JSON_LISTINGS_FEED",
+                "marketplaceIds": ["ATVPDKIKX0DER"],
+                "inputFeedDocumentId": "doc-1",
+            }
+        ]
+
+        document = json.loads(api.uploaded["doc-1"])
+        assert document["header"]["sellerId"] == "seller"
+        assert [m["messageId"] for m in document["messages"]] == list(range(1, 51))
+        assert document["messages"][3]["sku"] == "SKU 3/x"
+        assert document["messages"][3]["operationType"] == "PATCH"
+
+    @staticmethod
+    @pytest.mark.asyncio
+    async def test_empty_update_set_makes_no_calls():
+        api = FakeSpApi()
+        adapter = _make_adapter(api)
+
+        assert await adapter.update_inventory([]) == []
+        assert api.patched == {}
+        assert api.feeds == []
+
+    @staticmethod
+    @pytest.mark.asyncio
+    async def test_rejected_patches_are_reported_as_failures():
+        api = FakeSpApi(invalid=frozenset({"SKU 2/x"}))
+        adapter = _make_adapter(api, feed_threshold=50)
+
+        failures = await adapter.update_inventory(_updates(5))
+
+        assert failures == [ListingUpdateFailure(sku="SKU 2/x", reason="Bad SKU")]
+
+    @staticmethod
+    @pytest.mark.asyncio
+    async def test_patch_http_error_fails_only_that_sku():
+        def handler(request: httpx.Request) -> httpx.Response:
+            if request.url.raw_path.decode().split("?")[0].endswith("SKU-1"):
+                return httpx.Response(503)
+            return httpx.Response(200, json={"status": "ACCEPTED"})
+
+        adapter = _make_adapter(handler, feed_threshold=50)
+        updates = [ListingQuantityUpdate(sku=f"SKU-{i}", qty=i) for i in range(3)]
+
+        failures = await adapter.update_inventory(updates)
+
+        assert [f.sku for f in failures] == ["SKU-1"]
+
+    @staticmethod
+    @pytest.mark.asyncio
+    async def test_patch_non_json_success_body_fails_only_that_sku():
+        def handler(request: httpx.Request) -> httpx.Response:
+            if request.url.raw_path.decode().split("?")[0].endswith("SKU-1"):
+                return httpx.Response(200, text="<html>maintenance</html>")
+            return httpx.Response(200, json={"status": "ACCEPTED"})
+
+        adapter = _make_adapter(handler, feed_threshold=50)
+        updates = [ListingQuantityUpdate(sku=f"SKU-{i}", qty=i) for i in range(3)]
+
+        failures = await adapter.update_inventory(updates)
+
+        assert [f.sku for f in failures] == ["SKU-1"]
+
+    @staticmethod
+    @pytest.mark.parametrize("field", ["feed_threshold", "patch_concurrency"])
+    def test_non_positive_update_settings_raise(field):
+        with pytest.raises(ValueError):
+            _make_adapter(FakeSpApi(), **{field: 0})
+
+
+class TestInfraAmazonTokens:
+    @staticmethod
+    @pytest.mark.asyncio
+    async def test_revoked_token_is_refreshed_and_patch_retried_once():
+        issued = 0
+        sent: list[str] = []
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            nonlocal issued
+            if request.url.host == "lwa.test":
+                issued += 1
+                return httpx.Response(
+                    200, json={"access_token": f"access-{issued}", "expires_in": 3600}
+                )
+
+            token = request.headers["x-amz-access-token"]
+            sent.append(token)
+            if token == "access-1":
+                return httpx.Response(401)
+            return httpx.Response(200, json={"sku": "SKU", "status": "ACCEPTED"})
+
+        adapter = _make_adapter(handler, lwa_token_url="https://lwa.test/o2/token")
+        adapter.tokens = TokenManager(http=adapter.http)
+
+        failures = await adapter.update_inventory([ListingQuantityUpdate("SKU", 1)])
+
+        assert failures == []
+        assert sent == ["access-1", "access-2"]
+
+    @staticmethod
+    @pytest.mark.asyncio
+    async def test_401_is_not_retried_without_token_manager():
+        calls = 0
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            nonlocal calls
+            calls += 1
+            return httpx.Response(401)
+
+        (failure,) = await _make_adapter(handler).update_inventory(
+            [ListingQuantityUpdate("SKU", 1)]
+        )
+
+        assert "401" in failure.reason
+        assert calls == 1
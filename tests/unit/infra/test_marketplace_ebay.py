@@ -0,0 +1,371 @@
+import asyncio
+import json
+
+import httpx
+import pytest
+
+from app.domain.marketplace import ListingQuantityUpdate, ListingUpdateFailure
+from app.infrastructure.auth.tokens import EBAY_TOKEN_PATH, TokenManager
+from app.infrastructure.config import EbayDeveloperCredentials
+from app.infrastructure.http.rate_limit import RateLimiter
+from app.infrastructure.marketplaces.ebay_client import (
+    EbayAdapter,
+    EbayMapper,
+    EbayUserCredentials,
+)
+
+
+def _inventory_item(sku: str, condition: str = "NEW", qty: int = 1) -> dict:
+    return {
+        "sku": sku,
+        "condition": condition,
+        "availability": {"shipToLocationAvailability": {"quantity": qty}},
+    }
+
+
+class FakeInventoryApi:
+    """Serves a fixed catalog through the getInventoryItems pagination contract."""
+
+    def __init__(self, total: int, delay_s: float = 0.0) -> None:
+        self.items = [_inventory_item(f"SKU-{i}", qty=i) for i in range(total)]
+        self.delay_s = delay_s
+        self.requested_offsets: list[int] = []
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+    async def __call__(self, request: httpx.Request) -> httpx.Response:
+        assert request.headers["Authorization"] == "Bearer user-token"
+
+        limit = int(request.url.params["limit"])
+        offset = int(request.url.params["offset"])
+        self.requested_offsets.append(offset)
+
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            await asyncio.sleep(self.delay_s)
+        finally:
+            self.in_flight -= 1
+
+        return httpx.Response(
+            200,
+            json={
+                "total": len(self.items),
+                "limit": limit,
+                "offset": offset,
+                "inventoryItems": self.items[offset : offset + limit],
+            },
+        )
+
+
+def _make_adapter(
+    handler,
+    page_size: int = 10,
+    prefetch_pages: int = 3,
+    update_concurrency: int = 4,
+) -> EbayAdapter:
+    return EbayAdapter(
+        http=httpx.AsyncClient(transport=httpx.MockTransport(handler)),
+        credentials=EbayUserCredentials(token="user-token"),
+        dev_creds=EbayDeveloperCredentials(client_id="id", client_secret="secret"),
+        base_url="https://ebay.test",
+        page_size=page_size,
+        prefetch_pages=prefetch_pages,
+        update_concurrency=update_concurrency,
+    )
+
+
+class TestEbayMapper:
+    @staticmethod
+    def test_map_listings_maps_quantity_and_skips_incomplete_items() -> None:
+        payload = {
+            "inventoryItems": [
+                _inventory_item("SKU-1", condition="NEW", qty=7),
+                {"sku": "SKU-2", "condition": "USED"},
+                {"sku": "SKU-3"},
+                {"condition": "NEW"},
+            ]
+        }
+
+        listings = EbayMapper.map_listings(payload)
+
+        assert [(x.sku, x.condition_id, x.marketplace_qty) for x in listings] == [
+            ("SKU-1", "NEW", 7),
+            ("SKU-2", "USED", 0),
+        ]
+
+    @staticmethod
+    def test_map_listings_handles_empty_page() -> None:
+        assert EbayMapper.map_listings({}) == []
+
+
+class TestEbayAdapterListings:
+    @staticmethod
+    @pytest.mark.asyncio
+    async def test_iter_listings_yields_every_page_in_order() -> None:
+        api = FakeInventoryApi(total=95)
+        adapter = _make_adapter(api)
+
+        pages = [page async for page in adapter.iter_listings()]
+
+        assert len(pages) == 10
+        assert [x.sku for page in pages for x in page] == [
+            f"SKU-{i}" for i in range(95)
+        ]
+        assert sorted(api.requested_offsets) == list(range(0, 95, 10))
+
+    @staticmethod
+    @pytest.mark.asyncio
+    async def test_page_requests_go_through_shared_limiter() -> None:
+        api = FakeInventoryApi(total=25)
+        adapter = _make_adapter(api)
+        adapter.limiter = RateLimiter()
+        adapter.account = "acc-1"
+
+        [page async for page in adapter.iter_listings()]
+
+        (stats,) = adapter.limiter.stats()
+        assert (stats.marketplace, stats.account, stats.operation) == (
+            "ebay",
+            "acc-1",
+            "inventory.get_inventory_items",
+        )
+        assert stats.acquired == 3
+
+    @staticmethod
+    @pytest.mark.asyncio
+    async def test_iter_listings_prefetches_within_window() -> None:
+        api = FakeInventoryApi(total=100, delay_s=0.01)
+        adapter = _make_adapter(api, prefetch_pages=3)
+
+        listings = await adapter.fetch_listings()
+
+        assert len(listings) == 100
+        assert api.max_in_flight == 3
+
+    @staticmethod
+    @pytest.mark.asyncio
+    async def test_iter_listings_follows_next_when_total_is_missing() -> None:
+        items = [_inventory_item(f"SKU-{i}") for i in range(25)]
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            offset = int(request.url.params["offset"])
+            page = items[offset : offset + 10]
+            payload = {"offset": offset, "inventoryItems": page}
+            if offset + 10 < len(items):
+                payload["next"] = "more"
+            return httpx.Response(200, json=payload)
+
+        adapter = _make_adapter(handler)
+
+        listings = await adapter.fetch_listings()
+
+        assert [x.sku for x in listings] == [f"SKU-{i}" for i in range(25)]
+
+    @staticmethod
+    @pytest.mark.asyncio
+    async def test_iter_listings_raises_on_http_error() -> None:
+        def handler(request: httpx.Request) -> httpx.Response:
+            return httpx.Response(500)
+
+        adapter = _make_adapter(handler)
+
+        with pytest.raises(httpx.HTTPStatusError):
+            await adapter.fetch_listings()
+
+    @staticmethod
+    @pytest.mark.parametrize(
+        "field", ["page_size", "prefetch_pages", "update_concurrency"]
+    )
+    def test_non_positive_settings_raise(field: str) -> None:
+        with pytest.raises(ValueError):
+            _make_adapter(lambda r: httpx.Response(200), **{field: 0})
+
+
+class FakeBulkUpdateApi:
+    """Stand-in for bulk_update_price_quantity that rejects selected SKUs."""
+
+    def __init__(self, rejected: set[str] = frozenset(), delay_s: float = 0.0) -> None:
+        self.rejected = rejected
+        self.delay_s = delay_s
+        self.batches: list[list[dict]] = []
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+    async def __call__(self, request: httpx.Request) -> httpx.Response:
+        assert request.url.path == "/sell/inventory/v1/bulk_update_price_quantity"
+
+        requests = json.loads(request.content)["requests"]
+        self.batches.append(requests)
+
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            await asyncio.sleep(self.delay_s)
+        finally:
+            self.in_flight -= 1
+
+        responses = []
+        for r in requests:
+            if r["sku"] in self.rejected:
+                responses.append(
+                    {
+                        "statusCode": 400,
+                        "sku": r["sku"],
+                        "errors": [{"errorId": 25702, "message": "SKU not found"}],
+                    }
+                )
+            else:
+                responses.append({"statusCode": 200, "sku": r["sku"]})
+
+        status = 207 if any(x["statusCode"] != 200 for x in responses) else 200
+        return httpx.Response(status, json={"responses": responses})
+
+
+def _updates(n: int) -> list[ListingQuantityUpdate]:
+    return [
+        ListingQuantityUpdate(sku=f"SKU-{i}", listing_id=f"O-{i}", qty=i)
+        for i in range(n)
+    ]
+
+
+class TestEbayAdapterUpdateInventory:
+    @staticmethod
+    @pytest.mark.asyncio
+    async def test_updates_are_sent_in_maximal_batches() -> None:
+        api = FakeBulkUpdateApi()
+        adapter = _make_adapter(api)
+
+        failures = await adapter.update_inventory(_updates(60))
+
+        assert failures == []
+        assert [len(b) for b in api.batches] == [25, 25, 10]
+        assert api.batches[0][3] == {
+            "sku": "SKU-3",
+            "shipToLocationAvailability": {"quantity": 3},
+            "offers": [{"offerId": "O-3", "availableQuantity": 3}],
+        }
+
+    @staticmethod
+    @pytest.mark.asyncio
+    async def test_batches_are_dispatched_with_bounded_concurrency() -> None:
+        api = FakeBulkUpdateApi(delay_s=0.01)
+        adapter = _make_adapter(api, update_concurrency=2)
+
+        await adapter.update_inventory(_updates(25 * 6))
+
+        assert len(api.batches) == 6
+        assert api.max_in_flight == 2
+
+    @staticmethod
+    @pytest.mark.asyncio
+    async def test_partial_failures_are_collected_across_batches() -> None:
+        api = FakeBulkUpdateApi(rejected={"SKU-2", "SKU-40"})
+        adapter = _make_adapter(api)
+
+        failures = await adapter.update_inventory(_updates(50))
+
+        assert failures == [
+            ListingUpdateFailure(sku="SKU-2", listing_id="O-2", reason="SKU not found"),
+            ListingUpdateFailure(
+                sku="SKU-40", listing_id="O-40", reason="SKU not found"
+            ),
+        ]
+
+    @staticmethod
+    @pytest.mark.asyncio
+    async def test_failed_batch_call_fails_only_its_skus() -> None:
+        calls = 0
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            nonlocal calls
+            calls += 1
+            if calls == 1:
+                return httpx.Response(500)
+            requests = json.loads(request.content)["requests"]
+            return httpx.Response(
+                200,
+                json={
+                    "responses": [
+                        {"statusCode": 200, "sku": r["sku"]} for r in requests
+                    ]
+                },
+            )
+
+        adapter = _make_adapter(handler, update_concurrency=1)
+
+        failures = await adapter.update_inventory(_updates(30))
+
+        assert [f.sku for f in failures] == [f"SKU-{i}" for i in range(25)]
+        assert calls == 2
+
+    @staticmethod
+    @pytest.mark.asyncio
+    async def test_non_json_batch_response_fails_only_its_skus() -> None:
+        calls = 0
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            nonlocal calls
+            calls += 1
+            if calls == 1:
+                return httpx.Response(200, text="<html>maintenance</html>")
+            return httpx.Response(200, json={"responses": []})
+
+        adapter = _make_adapter(handler, update_concurrency=1)
+
+        failures = await adapter.update_inventory(_updates(30))
+
+        assert [f.sku for f in failures] == [f"SKU-{i}" for i in range(25)]
+        assert calls == 2
+
+    @staticmethod
+    @pytest.mark.asyncio
+    async def test_empty_update_set_makes_no_calls() -> None:
+        api = FakeBulkUpdateApi()
+        adapter = _make_adapter(api)
+
+        assert await adapter.update_inventory([]) == []
+        assert api.batches == []
+
+
+class RevokingApi:
+    """Issues numbered access tokens and rejects the first one as revoked."""
+
+    def __init__(self) -> None:
+        self.issued = 0
+        self.api_tokens: list[str] = []
+
+    def __call__(self, request: httpx.Request) -> httpx.Response:
+        if request.url.path == EBAY_TOKEN_PATH:
+            self.issued += 1
+            return httpx.Response(
+                200, json={"access_token": f"access-{self.issued}", "expires_in": 7200}
+            )
+
+        token = request.headers["Authorization"].removeprefix("Bearer ")
+        self.api_tokens.append(token)
+        if token == "access-1":
+            return httpx.Response(401)
+        return httpx.Response(200, json={"total": 0, "inventoryItems": []})
+
+
+class TestEbayAdapterTokens:
+    @staticmethod
+    @pytest.mark.asyncio
+    async def test_revoked_token_is_refreshed_and_call_retried_once() -> None:
+        api = RevokingApi()
+        http = httpx.AsyncClient(transport=httpx.MockTransport(api))
+        adapter = EbayAdapter(
+            http=http,
+            credentials=EbayUserCredentials(token="refresh"),
+            dev_creds=EbayDeveloperCredentials(client_id="id", client_secret="s"),
+            base_url="https://ebay.test",
+            tokens=TokenManager(http=http),
+        )
+
+        first = await adapter.fetch_listings()
+        second = await adapter.fetch_listings()
+
+        assert first == second == []
+        assert api.api_tokens == ["access-1", "access-2", "access-2"]
+        assert api.issued == 2
@@ -0,0 +1,111 @@
+import httpx
+import pytest
+
+from app.application.ports.metrics import SyncPhase
+from app.infrastructure.http.pools import PoolMonitor, PoolSettings
+from app.infrastructure.metrics import MetricsRegistry, PrometheusMetrics
+
+
+class TestMetricsRegistry:
+    @staticmethod
+    def test_renders_counter_with_escaped_labels():
+        registry = MetricsRegistry()
+        counter = registry.counter("jobs_total", "Jobs run.", ("name",))
+
+        counter.labels('say "hi"\n').inc()
+        counter.labels('say "hi"\n').inc(2)
+
+        assert registry.render() == (
+            "# HELP jobs_total Jobs run.\n"
+            "# TYPE jobs_total counter\n"
+            'jobs_total{name="say \\"hi\\"\\n"} 3\n'
+        )
+
+    @staticmethod
+    def test_renders_cumulative_histogram_buckets():
+        registry = MetricsRegistry()
+        histogram = registry.histogram(
+            "latency_seconds", "Latency.", ("op",), buckets=(0.1, 1.0)
+        )
+
+        for value in (0.05, 0.1, 0.5, 3.0):
+            histogram.labels("get").observe(value)
+
+        lines = registry.render().splitlines()
+        assert lines[2:] == [
+            'latency_seconds_bucket{op="get",le="0.1"} 2',
+            'latency_seconds_bucket{op="get",le="1"} 3',
+            'latency_seconds_bucket{op="get",le="+Inf"} 4',
+            'latency_seconds_sum{op="get"} 3.65',
+            'latency_seconds_count{op="get"} 4',
+        ]
+
+    @staticmethod
+    def test_rejects_duplicate_metric_names():
+        registry = MetricsRegistry()
+        registry.counter("jobs_total", "Jobs run.")
+
+        with pytest.raises(ValueError):
+            registry.histogram("jobs_total", "Jobs run.")
+
+    @staticmethod
+    def test_rejects_unsorted_buckets():
+        with pytest.raises(ValueError):
+            MetricsRegistry().histogram("latency_seconds", "Latency.", buckets=(1, 0.5))
+
+
+class TestPrometheusMetrics:
+    @staticmethod
+    def test_records_sync_phases_and_updates():
+        metrics = PrometheusMetrics()
+
+        metrics.observe_phase("ebay", SyncPhase.FETCH_LISTINGS, 0.2, 100)
+        metrics.count_updates("ebay", sent=5, failed=2)
+
+        text = metrics.registry.render()
+        assert (
+            'sync_phase_duration_seconds_count{marketplace="ebay",'
+            'phase="fetch_listings"} 1'
+        ) in text
+        assert (
+            'sync_phase_rows_total{marketplace="ebay",phase="fetch_listings"} 100'
+            in (text)
+        )
+        assert 'sync_updates_total{marketplace="ebay",outcome="accepted"} 3' in text
+        assert 'sync_updates_total{marketplace="ebay",outcome="rejected"} 2' in text
+
+    @staticmethod
+    def test_counts_ran_and_coalesced_sync_requests():
+        metrics = PrometheusMetrics()
+
+        metrics.count_sync_request("ebay", coalesced=False)
+        metrics.count_sync_request("ebay", coalesced=True)
+        metrics.count_sync_request("ebay", coalesced=True)
+
+        text = metrics.registry.render()
+        assert 'sync_requests_total{marketplace="ebay",outcome="ran"} 1' in text
+        assert 'sync_requests_total{marketplace="ebay",outcome="coalesced"} 2' in text
+
+    @staticmethod
+    @pytest.mark.asyncio
+    async def test_records_outbound_requests_and_pool_usage():
+        monitor = PoolMonitor()
+        metrics = PrometheusMetrics()
+        metrics.watch_pools(monitor)
+        transport = monitor.instrument(
+            "api.test",
+            PoolSettings(),
+            inner=httpx.MockTransport(lambda request: httpx.Response(204)),
+        )
+
+        async with httpx.AsyncClient(transport=transport) as client:
+            await client.post("https://api.test/items")
+
+        text = metrics.registry.render()
+        assert (
+            'http_client_requests_total{pool="api.test",method="POST",status="204"} 1'
+        ) in text
+        assert (
+            'http_client_request_duration_seconds_count{pool="api.test",method="POST"} 1'
+        ) in text
+        assert 'http_pool_connections{pool="api.test",state="waiting"} 0' in text
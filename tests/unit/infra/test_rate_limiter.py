@@ -0,0 +1,185 @@
+import asyncio
+
+import httpx
+import pytest
+
+from app.infrastructure.http.rate_limit import RateLimit, RateLimiter, send_limited
+from app.infrastructure.http.resilience import ResilientTransport, RetryPolicy
+
+KEY = ("amazon", "acc-1", "listings_items.patch")
+
+
+class FakeTime:
+    """Clock plus sleep that advances it, so waits take no real time."""
+
+    def __init__(self) -> None:
+        self.now = 0.0
+        self.sleeps: list[float] = []
+
+    def clock(self) -> float:
+        return self.now
+
+    async def sleep(self, delay: float) -> None:
+        self.sleeps.append(delay)
+        self.now += delay
+        await asyncio.sleep(0)
+
+
+def _make_limiter(fake: FakeTime, rate: float = 2.0, burst: int = 2) -> RateLimiter:
+    return RateLimiter(
+        limits={(KEY[0], KEY[2]): RateLimit(rate=rate, burst=burst)},
+        clock=fake.clock,
+        sleep=fake.sleep,
+    )
+
+
+class TestRateLimiter:
+    @staticmethod
+    @pytest.mark.asyncio
+    async def test_burst_is_immediate_then_callers_wait_for_refill() -> None:
+        fake = FakeTime()
+        limiter = _make_limiter(fake, rate=2.0, burst=2)
+
+        waits = [await limiter.acquire(KEY) for _ in range(4)]
+
+        assert waits == [0.0, 0.0, 0.5, 0.5]
+        (stats,) = limiter.stats()
+        assert stats.acquired == 4
+        assert stats.total_wait_s == 1.0
+        assert stats.max_wait_s == 0.5
+
+    @staticmethod
+    @pytest.mark.asyncio
+    async def test_keys_have_independent_buckets() -> None:
+        fake = FakeTime()
+        limiter = _make_limiter(fake, rate=1.0, burst=1)
+        other_account = ("amazon", "acc-2", KEY[2])
+
+        await limiter.acquire(KEY)
+        waited = await limiter.acquire(other_account)
+
+        assert waited == 0.0
+
+    @staticmethod
+    @pytest.mark.asyncio
+    async def test_waiting_callers_are_visible_as_queue_depth() -> None:
+        limiter = RateLimiter(
+            limits={(KEY[0], KEY[2]): RateLimit(rate=50.0, burst=1)},
+        )
+        await limiter.acquire(KEY)
+
+        tasks = [asyncio.create_task(limiter.acquire(KEY)) for _ in range(3)]
+        await asyncio.sleep(0)
+
+        assert limiter.stats()[0].waiting == 3
+        await asyncio.gather(*tasks)
+        assert limiter.stats()[0].waiting == 0
+
+    @staticmethod
+    def test_amazon_rate_limit_header_sets_rate() -> None:
+        fake = FakeTime()
+        limiter = _make_limiter(fake, rate=5.0)
+
+        limiter.observe(KEY, 200, httpx.Headers({"x-amzn-RateLimit-Limit": "0.5"}))
+
+        assert limiter.stats()[0].rate == 0.5
+
+    @staticmethod
+    @pytest.mark.asyncio
+    async def test_throttled_response_slows_and_pauses_bucket() -> None:
+        fake = FakeTime()
+        limiter = _make_limiter(fake, rate=4.0, burst=4)
+
+        limiter.observe(KEY, 429, httpx.Headers({"Retry-After": "3"}))
+        waited = await limiter.acquire(KEY)
+
+        (stats,) = limiter.stats()
+        assert stats.throttled == 1
+        assert stats.rate == 2.0
+        assert waited >= 3.0
+
+    @staticmethod
+    def test_successes_recover_rate_towards_published_limit() -> None:
+        fake = FakeTime()
+        limiter = _make_limiter(fake, rate=4.0)
+
+        limiter.observe(KEY, 429, {})
+        for _ in range(20):
+            limiter.observe(KEY, 200, {})
+
+        assert limiter.stats()[0].rate == 4.0
+
+    @staticmethod
+    def test_idle_buckets_are_evicted_beyond_max_keys() -> None:
+        limiter = RateLimiter(max_keys=2)
+
+        for account in ("a", "b", "c"):
+            limiter.observe(("ebay", account, "op"), 200, {})
+
+        assert [s.account for s in limiter.stats()] == ["b", "c"]
+
+
+class TestSendLimited:
+    @staticmethod
+    @pytest.mark.asyncio
+    async def test_response_headers_are_fed_back_to_limiter() -> None:
+        def handler(request: httpx.Request) -> httpx.Response:
+            return httpx.Response(200, headers={"x-amzn-RateLimit-Limit": "1.5"})
+
+        limiter = RateLimiter()
+        async with httpx.AsyncClient(transport=httpx.MockTransport(handler)) as http:
+            response = await send_limited(
+                http, limiter, KEY, "PATCH", "https://sp.test/listings"
+            )
+
+        assert response.status_code == 200
+        (stats,) = limiter.stats()
+        assert stats.acquired == 1
+        assert stats.rate == 1.5
+
+    @staticmethod
+    @pytest.mark.asyncio
+    async def test_throttled_retries_go_through_the_limiter() -> None:
+        statuses = [429, 429, 200]
+        seen: list[httpx.Request] = []
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            seen.append(request)
+            return httpx.Response(statuses.pop(0), headers={"Retry-After": "1"})
+
+        fake = FakeTime()
+        limiter = _make_limiter(fake, rate=2.0, burst=5)
+        transport = ResilientTransport(
+            inner=httpx.MockTransport(handler),
+            retry=RetryPolicy(max_attempts=3),
+            sleep=fake.sleep,
+        )
+        async with httpx.AsyncClient(transport=transport) as http:
+            response = await send_limited(
+                http, limiter, KEY, "PATCH", "https://sp.test/listings"
+            )
+
+        assert response.status_code == 200
+        assert len(seen) == 3
+        (stats,) = limiter.stats()
+        assert stats.acquired == 3
+        assert stats.throttled == 2
+        assert stats.rate < 2.0
+        # retries waited out Retry-After in the limiter, not the transport
+        assert fake.sleeps[:2] == [1.0, 1.0]
+
+    @staticmethod
+    @pytest.mark.asyncio
+    async def test_throttled_retries_stop_after_attempts_or_long_retry_after() -> None:
+        def handler(request: httpx.Request) -> httpx.Response:
+            return httpx.Response(429, headers={"Retry-After": request.url.path[1:]})
+
+        fake = FakeTime()
+        limiter = _make_limiter(fake, burst=10)
+        async with httpx.AsyncClient(transport=httpx.MockTransport(handler)) as http:
+            short = await send_limited(http, limiter, KEY, "PATCH", "https://t/0")
+            long = await send_limited(http, limiter, KEY, "PATCH", "https://t/60")
+
+        assert short.status_code == long.status_code == 429
+        (stats,) = limiter.stats()
+        assert stats.throttled == 4
@@ -0,0 +1,226 @@
+import random
+
+import httpx
+import pytest
+
+from app.application.service.tracing import Tracer
+from app.infrastructure.http.resilience import (
+    CircuitBreaker,
+    CircuitOpenError,
+    CircuitState,
+    ResilientTransport,
+    RetryPolicy,
+    parse_retry_after,
+)
+
+
+class FakeTime:
+    def __init__(self) -> None:
+        self.now = 0.0
+        self.sleeps: list[float] = []
+
+    def clock(self) -> float:
+        return self.now
+
+    async def sleep(self, delay: float) -> None:
+        self.sleeps.append(delay)
+        self.now += delay
+
+
+class ScriptedUpstream:
+    """Answers requests from a script of status codes or exceptions."""
+
+    def __init__(self, *script) -> None:
+        self.script = list(script)
+        self.requests: list[httpx.Request] = []
+
+    def __call__(self, request: httpx.Request) -> httpx.Response:
+        self.requests.append(request)
+        step = self.script.pop(0) if len(self.script) > 1 else self.script[0]
+        if isinstance(step, Exception):
+            raise step
+        status, headers = step if isinstance(step, tuple) else (step, {})
+        return httpx.Response(status, headers=headers, json={"ok": status < 400})
+
+
+def _make_client(
+    upstream: ScriptedUpstream,
+    fake: FakeTime,
+    max_attempts: int = 3,
+    failure_threshold: int = 5,
+) -> httpx.AsyncClient:
+    transport = ResilientTransport(
+        inner=httpx.MockTransport(upstream),
+        retry=RetryPolicy(max_attempts=max_attempts, backoff_base_s=1.0),
+        failure_threshold=failure_threshold,
+        reset_timeout_s=30.0,
+        clock=fake.clock,
+        sleep=fake.sleep,
+        rng=random.Random(0),
+    )
+    return httpx.AsyncClient(transport=transport, base_url="https://api.test")
+
+
+class TestResilientTransport:
+    @staticmethod
+    @pytest.mark.asyncio
+    async def test_idempotent_request_is_retried_on_5xx() -> None:
+        fake = FakeTime()
+        upstream = ScriptedUpstream(503, 502, 200)
+
+        async with _make_client(upstream, fake) as client:
+            response = await client.get("/items")
+
+        assert response.status_code == 200
+        assert len(upstream.requests) == 3
+        assert len(fake.sleeps) == 2
+        assert fake.sleeps[0] <= 1.0
+        assert fake.sleeps[1] <= 2.0
+
+    @staticmethod
+    @pytest.mark.asyncio
+    async def test_traced_request_records_retries_and_bytes() -> None:
+        fake = FakeTime()
+        upstream = ScriptedUpstream(503, 200)
+        traces = []
+
+        class Exporter:
+            @staticmethod
+            def export(spans) -> None:
+                traces.append(list(spans))
+
+        tracer = Tracer(exporters=[Exporter()], sample_rate=1.0)
+
+        async with _make_client(upstream, fake) as client:
+            with tracer.trace("request"):
+                await client.put("/items", content=b"12345")
+
+        (spans,) = traces
+        (http_span,) = [s for s in spans if s.name == "http"]
+        assert http_span.attributes == {
+            "method": "PUT",
+            "host": "api.test",
+            "path": "/items",
+            "request_bytes": 5,
+            "retries": 1,
+            "status": 200,
+            "response_bytes": len(b'{"ok":true}'),
+        }
+
+    @staticmethod
+    @pytest.mark.asyncio
+    async def test_non_idempotent_request_is_not_retried_on_5xx() -> None:
+        fake = FakeTime()
+        upstream = ScriptedUpstream(503, 200)
+
+        async with _make_client(upstream, fake) as client:
+            response = await client.post("/feeds", json={})
+
+        assert response.status_code == 503
+        assert len(upstream.requests) == 1
+
+    @staticmethod
+    @pytest.mark.asyncio
+    async def test_opted_in_post_is_retried_with_same_body() -> None:
+        fake = FakeTime()
+        upstream = ScriptedUpstream(500, 200)
+
+        async with _make_client(upstream, fake) as client:
+            response = await client.post(
+                "/bulk", json={"qty": 3}, extensions={"idempotent": True}
+            )
+
+        assert response.status_code == 200
+        assert [r.content for r in upstream.requests] == [b'{"qty":3}'] * 2
+
+    @staticmethod
+    @pytest.mark.asyncio
+    async def test_throttled_post_honors_retry_after() -> None:
+        fake = FakeTime()
+        upstream = ScriptedUpstream((429, {"Retry-After": "2"}), 200)
+
+        async with _make_client(upstream, fake) as client:
+            response = await client.post("/feeds", json={})
+
+        assert response.status_code == 200
+        assert fake.sleeps == [2.0]
+
+    @staticmethod
+    @pytest.mark.asyncio
+    async def test_retry_after_beyond_backoff_cap_is_returned() -> None:
+        fake = FakeTime()
+        upstream = ScriptedUpstream((429, {"Retry-After": "3600"}), 200)
+
+        async with _make_client(upstream, fake) as client:
+            response = await client.get("/items")
+
+        assert response.status_code == 429
+        assert fake.sleeps == []
+
+    @staticmethod
+    @pytest.mark.asyncio
+    async def test_connect_errors_are_retried_then_raised() -> None:
+        fake = FakeTime()
+        upstream = ScriptedUpstream(httpx.ConnectError("refused"))
+
+        async with _make_client(upstream, fake, max_attempts=2) as client:
+            with pytest.raises(httpx.ConnectError):
+                await client.post("/feeds", json={})
+
+        assert len(upstream.requests) == 2
+
+    @staticmethod
+    @pytest.mark.asyncio
+    async def test_open_circuit_fails_fast_until_probe_succeeds() -> None:
+        fake = FakeTime()
+        upstream = ScriptedUpstream(503, 503, 200)
+
+        async with _make_client(
+            upstream, fake, max_attempts=1, failure_threshold=2
+        ) as client:
+            await client.get("/items")
+            await client.get("/items")
+
+            with pytest.raises(CircuitOpenError):
+                await client.get("/items")
+            assert len(upstream.requests) == 2
+
+            fake.now += 30
+            response = await client.get("/items")
+
+        assert response.status_code == 200
+        transport = client._transport
+        assert transport.breaker("api.test").state is CircuitState.CLOSED
+
+
+class TestCircuitBreaker:
+    @staticmethod
+    def test_failed_probe_reopens_circuit() -> None:
+        fake = FakeTime()
+        breaker = CircuitBreaker(
+            failure_threshold=1, reset_timeout_s=10, clock=fake.clock
+        )
+
+        breaker.record_failure()
+        fake.now += 10
+        assert breaker.allow()
+        assert not breaker.allow()
+
+        breaker.record_failure()
+
+        assert breaker.state is CircuitState.OPEN
+        assert not breaker.allow()
+
+
+class TestParseRetryAfter:
+    @staticmethod
+    @pytest.mark.parametrize(
+        ("value", "expected"),
+        [(None, None), ("", None), ("1.5", 1.5), ("-3", 0.0), ("soon", None)],
+    )
+    def test_delta_seconds(value, expected) -> None:
+        assert parse_retry_after(value) == expected
+
+    @staticmethod
+    def test_http_date_in_the_past_is_zero() -> None:
+        assert parse_retry_after("Wed, 21 Oct 2015 07:28:00 GMT") == 0.0
@@ -0,0 +1,130 @@
+import os
+import stat
+
+import pytest
+
+from app.application.ports.jobs import JobStatus
+from app.domain.marketplace import (
+    ListingQuantityUpdate,
+    ListingUpdateFailure,
+    SkipReason,
+    SyncResult,
+)
+from app.infrastructure.jobs.sqlite_queue import SqliteJobQueue
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        self.now += 1
+        return self.now
+
+
+def _make_queue(tmp_path, clock=None) -> SqliteJobQueue:
+    return SqliteJobQueue(
+        path=str(tmp_path / "jobs.sqlite3"),
+        clock=clock or FakeClock(),
+    )
+
+
+class TestSqliteJobQueue:
+    @staticmethod
+    @pytest.mark.asyncio
+    async def test_jobs_are_claimed_oldest_first_per_marketplace(tmp_path) -> None:
+        queue = _make_queue(tmp_path)
+        first = await queue.enqueue("ebay", {"n": 1})
+        await queue.enqueue("amazon", {"n": 2})
+        second = await queue.enqueue("ebay", {"n": 3})
+
+        claimed = [await queue.claim("ebay") for _ in range(3)]
+
+        assert [job.id if job else None for job in claimed] == [
+            first.id,
+            second.id,
+            None,
+        ]
+        assert claimed[0].status is JobStatus.RUNNING
+        assert claimed[0].payload == {"n": 1}
+
+    @staticmethod
+    @pytest.mark.asyncio
+    async def test_completed_job_keeps_result_and_drops_payload(tmp_path) -> None:
+        queue = _make_queue(tmp_path)
+        job = await queue.enqueue("ebay", {"settings": {"refresh_token": "t"}})
+        result = SyncResult(
+            updates=[ListingQuantityUpdate(sku="SKU-1", listing_id="L1", qty=3)],
+            failures=[ListingUpdateFailure(sku="SKU-1", reason="rejected")],
+            evaluated=4,
+            skipped={SkipReason.UNCHANGED: 3},
+        )
+
+        await queue.claim("ebay")
+        await queue.complete(job.id, result)
+        stored = await queue.get(job.id)
+
+        assert stored.status is JobStatus.SUCCEEDED
+        assert stored.finished
+        assert stored.result == result
+        assert stored.payload == {}
+
+    @staticmethod
+    @pytest.mark.asyncio
+    async def test_failed_job_records_error(tmp_path) -> None:
+        queue = _make_queue(tmp_path)
+        job = await queue.enqueue("ebay", {})
+
+        await queue.fail(job.id, "boom")
+        stored = await queue.get(job.id)
+
+        assert stored.status is JobStatus.FAILED
+        assert stored.error == "boom"
+        assert stored.result is None
+
+    @staticmethod
+    @pytest.mark.asyncio
+    async def test_running_jobs_survive_restart(tmp_path) -> None:
+        queue = _make_queue(tmp_path)
+        job = await queue.enqueue("ebay", {"n": 1})
+        await queue.claim("ebay")
+        queue.close()
+
+        reopened = _make_queue(tmp_path)
+        requeued = await reopened.requeue_running()
+        claimed = await reopened.claim("ebay")
+
+        assert requeued == 1
+        assert claimed.id == job.id
+
+    @staticmethod
+    @pytest.mark.asyncio
+    async def test_finished_jobs_expire_after_retention(tmp_path) -> None:
+        clock = FakeClock()
+        queue = SqliteJobQueue(
+            path=str(tmp_path / "jobs.sqlite3"), retention_s=60, clock=clock
+        )
+        old = await queue.enqueue("ebay", {})
+        await queue.fail(old.id, "boom")
+
+        clock.now += 120
+        recent = await queue.enqueue("ebay", {})
+        await queue.fail(recent.id, "boom")
+
+        assert await queue.get(old.id) is None
+        assert await queue.get(recent.id) is not None
+
+    @staticmethod
+    def test_file_is_private_to_its_owner(tmp_path) -> None:
+        path = tmp_path / "jobs.sqlite3"
+        path.touch(mode=0o644)
+        os.chmod(path, 0o644)
+
+        _make_queue(tmp_path).close()
+
+        assert stat.S_IMODE(path.stat().st_mode) == 0o600
+
+    @staticmethod
+    def test_empty_path_is_rejected() -> None:
+        with pytest.raises(ValueError):
+            SqliteJobQueue(path="")
@@ -0,0 +1,259 @@
+import asyncio
+from urllib.parse import parse_qs
+
+import httpx
+import pytest
+
+from app.infrastructure.auth.tokens import (
+    EbayTokenExchange,
+    LwaTokenExchange,
+    TokenManager,
+)
+from app.infrastructure.config import EbayDeveloperCredentials
+from app.infrastructure.marketplaces.ebay_client import (
+    EbayAdapter,
+    EbayUserCredentials,
+)
+
+
+class FakeExchange:
+    """TokenExchange that counts calls and hands out numbered tokens."""
+
+    def __init__(
+        self,
+        key: str = "acc-1",
+        expires_in: float = 3600,
+        delay_s: float = 0.0,
+        error: Exception | None = None,
+    ) -> None:
+        self.key = key
+        self.expires_in = expires_in
+        self.delay_s = delay_s
+        self.error = error
+        self.calls = 0
+
+    @property
+    def fingerprint(self) -> str:
+        return self.key
+
+    async def exchange(self, http: httpx.AsyncClient) -> tuple[str, float]:
+        self.calls += 1
+        await asyncio.sleep(self.delay_s)
+        if self.error is not None:
+            raise self.error
+        return f"{self.key}-access-{self.calls}", self.expires_in
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def _make_manager(**kwargs) -> TokenManager:
+    http = httpx.AsyncClient(
+        transport=httpx.MockTransport(lambda r: httpx.Response(500))
+    )
+    return TokenManager(http=http, **kwargs)
+
+
+class TestTokenManager:
+    @staticmethod
+    @pytest.mark.asyncio
+    async def test_concurrent_requests_share_a_single_exchange() -> None:
+        manager = _make_manager()
+        exchange = FakeExchange(delay_s=0.01)
+
+        tokens = await asyncio.gather(*(manager.get_token(exchange) for _ in range(50)))
+
+        assert exchange.calls == 1
+        assert set(tokens) == {"acc-1-access-1"}
+
+    @staticmethod
+    @pytest.mark.asyncio
+    async def test_token_is_reused_until_refresh_margin() -> None:
+        clock = FakeClock()
+        manager = _make_manager(refresh_margin_s=60, clock=clock)
+        exchange = FakeExchange(expires_in=3600)
+
+        assert await manager.get_token(exchange) == "acc-1-access-1"
+
+        clock.now += 3539
+        assert await manager.get_token(exchange) == "acc-1-access-1"
+
+        clock.now += 1
+        assert await manager.get_token(exchange) == "acc-1-access-2"
+        assert exchange.calls == 2
+
+    @staticmethod
+    @pytest.mark.asyncio
+    async def test_least_recently_used_account_is_evicted() -> None:
+        manager = _make_manager(max_entries=2)
+        a, b, c = FakeExchange("a"), FakeExchange("b"), FakeExchange("c")
+
+        await manager.get_token(a)
+        await manager.get_token(b)
+        await manager.get_token(a)
+        await manager.get_token(c)
+
+        assert len(manager) == 2
+
+        await manager.get_token(a)
+        await manager.get_token(b)
+
+        assert (a.calls, b.calls, c.calls) == (1, 2, 1)
+
+    @staticmethod
+    @pytest.mark.asyncio
+    async def test_failed_exchange_is_raised_to_all_waiters_and_not_cached() -> None:
+        manager = _make_manager()
+        exchange = FakeExchange(delay_s=0.01, error=RuntimeError("auth down"))
+
+        results = await asyncio.gather(
+            *(manager.get_token(exchange) for _ in range(3)),
+            return_exceptions=True,
+        )
+
+        assert all(isinstance(r, RuntimeError) for r in results)
+        assert exchange.calls == 1
+
+        exchange.error = None
+        assert await manager.get_token(exchange) == "acc-1-access-2"
+
+    @staticmethod
+    @pytest.mark.asyncio
+    async def test_cancelled_caller_does_not_cancel_shared_exchange() -> None:
+        manager = _make_manager()
+        exchange = FakeExchange(delay_s=0.02)
+
+        first = asyncio.ensure_future(manager.get_token(exchange))
+        second = asyncio.ensure_future(manager.get_token(exchange))
+        await asyncio.sleep(0)
+        first.cancel()
+
+        assert await second == "acc-1-access-1"
+        assert exchange.calls == 1
+
+    @staticmethod
+    @pytest.mark.asyncio
+    async def test_invalidate_forces_new_exchange() -> None:
+        manager = _make_manager()
+        exchange = FakeExchange()
+
+        rejected = await manager.get_token(exchange)
+        manager.invalidate(exchange, rejected)
+        await manager.get_token(exchange)
+
+        assert exchange.calls == 2
+
+    @staticmethod
+    @pytest.mark.asyncio
+    async def test_invalidate_keeps_a_token_that_replaced_the_rejected_one() -> None:
+        manager = _make_manager()
+        exchange = FakeExchange()
+
+        rejected = await manager.get_token(exchange)
+        manager.invalidate(exchange, rejected)
+        fresh = await manager.get_token(exchange)
+        # a second call that got 401 with the old token
+        manager.invalidate(exchange, rejected)
+
+        assert await manager.get_token(exchange) == fresh
+        assert exchange.calls == 2
+
+    @staticmethod
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("expires_in", [0, 5])
+    async def test_short_or_missing_lifetime_is_clamped(expires_in) -> None:
+        clock = FakeClock()
+        manager = _make_manager(
+            refresh_margin_s=60,
+            default_lifetime_s=300,
+            min_lifetime_s=30,
+            clock=clock,
+        )
+        exchange = FakeExchange(expires_in=expires_in)
+
+        await manager.get_token(exchange)
+        clock.now += 29
+        await manager.get_token(exchange)
+
+        assert exchange.calls == 1
+
+    @staticmethod
+    @pytest.mark.asyncio
+    async def test_missing_lifetime_uses_default_lifetime() -> None:
+        clock = FakeClock()
+        manager = _make_manager(
+            refresh_margin_s=60, default_lifetime_s=300, clock=clock
+        )
+        exchange = FakeExchange(expires_in=0)
+
+        await manager.get_token(exchange)
+        clock.now += 239
+        await manager.get_token(exchange)
+        clock.now += 1
+        await manager.get_token(exchange)
+
+        assert exchange.calls == 2
+
+
+class TestTokenExchanges:
+    @staticmethod
+    @pytest.mark.asyncio
+    async def test_ebay_exchange_uses_refresh_token_grant() -> None:
+        seen: list[httpx.Request] = []
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            seen.append(request)
+            return httpx.Response(
+                200, json={"access_token": "ebay-access", "expires_in": 7200}
+            )
+
+        exchange = EbayTokenExchange(
+            dev_creds=EbayDeveloperCredentials(client_id="id", client_secret="secret"),
+            refresh_token="refresh",
+            base_url="https://ebay.test",
+        )
+
+        async with httpx.AsyncClient(transport=httpx.MockTransport(handler)) as http:
+            assert await exchange.exchange(http) == ("ebay-access", 7200.0)
+
+        request = seen[0]
+        assert request.url == "https://ebay.test/identity/v1/oauth2/token"
+        assert request.headers["Authorization"].startswith("Basic ")
+        form = parse_qs(request.content.decode())
+        assert form["grant_type"] == ["refresh_token"]
+        assert form["refresh_token"] == ["refresh"]
+
+    @staticmethod
+    def test_fingerprints_separate_accounts_and_hide_secrets() -> None:
+        one = LwaTokenExchange(client_id="c", client_secret="s", refresh_token="r1")
+        two = LwaTokenExchange(client_id="c", client_secret="s", refresh_token="r2")
+
+        assert one.fingerprint != two.fingerprint
+        assert "r1" not in one.fingerprint
+
+    @staticmethod
+    @pytest.mark.asyncio
+    async def test_adapter_sends_managed_access_token() -> None:
+        def handler(request: httpx.Request) -> httpx.Response:
+            if request.url.path == "/identity/v1/oauth2/token":
+                return httpx.Response(
+                    200, json={"access_token": "ebay-access", "expires_in": 7200}
+                )
+            assert request.headers["Authorization"] == "Bearer ebay-access"
+            return httpx.Response(200, json={"total": 0, "inventoryItems": []})
+
+        http = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+        adapter = EbayAdapter(
+            http=http,
+            credentials=EbayUserCredentials(token="refresh"),
+            dev_creds=EbayDeveloperCredentials(client_id="id", client_secret="secret"),
+            base_url="https://ebay.test",
+            tokens=TokenManager(http=http),
+        )
+
+        assert await adapter.fetch_listings() == []
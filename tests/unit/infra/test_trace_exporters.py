@@ -0,0 +1,130 @@
+import json
+
+import pytest
+
+from app.application.ports.tracing import Span
+from app.infrastructure import tracing
+from app.infrastructure.tracing import (
+    JsonlFileExporter,
+    RingBufferExporter,
+    span_tree,
+)
+
+
+def _trace(trace_id: str) -> list[Span]:
+    return [
+        Span(trace_id, "r", None, "request", 100.0, 3.0),
+        Span(trace_id, "b", "r", "update", 102.0, 1.0, {"updates": 2}),
+        Span(trace_id, "a", "r", "fetch", 100.5, 1.5),
+        Span(trace_id, "c", "a", "http", 100.6, 1.0),
+        Span(trace_id, "d", "gone", "late", 104.0, 0.1),
+    ]
+
+
+class TestSpanTree:
+    @staticmethod
+    def test_nests_children_by_start_time():
+        tree = span_tree(_trace("t1"))
+
+        assert tree["name"] == "request"
+        assert [c["name"] for c in tree["children"]] == ["fetch", "update", "late"]
+        assert tree["children"][0]["children"][0]["name"] == "http"
+        assert tree["children"][1]["attributes"] == {"updates": 2}
+
+
+class TestRingBufferExporter:
+    @staticmethod
+    def test_keeps_most_recent_traces():
+        buffer = RingBufferExporter(max_traces=2)
+        for trace_id in ("t1", "t2", "t3"):
+            buffer.export(_trace(trace_id))
+
+        assert [spans[0].trace_id for spans in buffer.recent()] == ["t3", "t2"]
+        assert [spans[0].trace_id for spans in buffer.recent(1)] == ["t3"]
+        assert buffer.get("t1") is None
+        assert buffer.get("t2")[0].trace_id == "t2"
+
+
+class TestJsonlFileExporter:
+    @staticmethod
+    @pytest.mark.asyncio
+    async def test_writes_one_tree_per_line_and_rotates(tmp_path):
+        path = tmp_path / "traces.jsonl"
+        exporter = JsonlFileExporter(path=str(path), max_bytes=1, backups=2)
+
+        for trace_id in ("t1", "t2", "t3"):
+            exporter.export(_trace(trace_id))
+        await exporter.stop()
+
+        def trace_ids(p) -> list[str]:
+            return [json.loads(line)["trace_id"] for line in p.read_text().splitlines()]
+
+        assert not path.exists()
+        assert trace_ids(tmp_path / "traces.jsonl.1") == ["t3"]
+        assert trace_ids(tmp_path / "traces.jsonl.2") == ["t2"]
+        assert not (tmp_path / "traces.jsonl.3").exists()
+
+    @staticmethod
+    @pytest.mark.asyncio
+    async def test_appends_below_max_bytes(tmp_path):
+        path = tmp_path / "traces.jsonl"
+        exporter = JsonlFileExporter(path=str(path))
+
+        exporter.export(_trace("t1"))
+        exporter.export(_trace("t2"))
+        await exporter.stop()
+
+        assert len(path.read_text().splitlines()) == 2
+
+    @staticmethod
+    @pytest.mark.asyncio
+    async def test_export_only_buffers_until_the_writer_runs(tmp_path):
+        path = tmp_path / "traces.jsonl"
+        exporter = JsonlFileExporter(path=str(path))
+        await exporter.start()
+
+        exporter.export(_trace("t1"))
+        assert not path.exists()
+
+        exporter.export(_trace("t2"))
+        await exporter.stop()
+
+        assert len(path.read_text().splitlines()) == 2
+
+    @staticmethod
+    @pytest.mark.asyncio
+    async def test_export_defers_serialization_to_the_writer(tmp_path, monkeypatch):
+        exporter = JsonlFileExporter(path=str(tmp_path / "traces.jsonl"))
+        calls = 0
+        dumps = tracing.json.dumps
+
+        def counting_dumps(*args, **kwargs):
+            nonlocal calls
+            calls += 1
+            return dumps(*args, **kwargs)
+
+        monkeypatch.setattr(tracing.json, "dumps", counting_dumps)
+
+        exporter.export(_trace("t1"))
+        assert calls == 0
+
+        await exporter.stop()
+        assert calls == 1
+
+    @staticmethod
+    @pytest.mark.asyncio
+    async def test_drops_traces_beyond_max_pending(tmp_path):
+        path = tmp_path / "traces.jsonl"
+        exporter = JsonlFileExporter(path=str(path), max_pending=1)
+
+        exporter.export(_trace("t1"))
+        exporter.export(_trace("t2"))
+        await exporter.stop()
+
+        assert exporter.dropped == 1
+        assert len(path.read_text().splitlines()) == 1
+
+    @staticmethod
+    def test_rejects_empty_path():
+        with pytest.raises(ValueError):
+            JsonlFileExporter(path="")